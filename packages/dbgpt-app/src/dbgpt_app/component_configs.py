@@ -45,7 +45,11 @@ def initialize_components(
 
     system_app.register_instance(multi_agents)
 
-    _initialize_embedding_model(system_app, default_embedding_name)
+    _initialize_embedding_model(
+        system_app,
+        default_embedding_name,
+        embedding_cache=_create_embedding_cache(web_config),
+    )
     _initialize_rerank_model(system_app, default_rerank_name)
     _initialize_model_cache(system_app, web_config)
     _initialize_awel(system_app, web_config.awel_dirs)
@@ -75,7 +79,33 @@ def _initialize_model_cache(system_app: SystemApp, web_config: ServiceWebParamet
     else:
         persist_dir = f"{MODEL_DISK_CACHE_DIR}_{web_config.port}"
     persist_dir = resolve_root_path(persist_dir)
-    initialize_cache(system_app, storage_type, max_memory_mb, persist_dir)
+    initialize_cache(
+        system_app,
+        storage_type,
+        max_memory_mb,
+        persist_dir,
+        cache_policy=web_config.model_cache.cache_policy,
+        ttl_seconds=web_config.model_cache.ttl_seconds,
+        retrieval_policy=web_config.model_cache.retrieval_policy,
+        similarity_threshold=web_config.model_cache.similarity_threshold,
+    )
+
+
+def _create_embedding_cache(web_config: ServiceWebParameters):
+    from dbgpt.storage.cache.embedding_cache import create_embedding_cache
+
+    model_cache = web_config.model_cache
+    if not model_cache or not model_cache.enable_embedding_cache:
+        return None
+    persist_dir = None
+    if model_cache.storage_type == "disk":
+        persist_dir = model_cache.persist_dir or MODEL_DISK_CACHE_DIR
+        persist_dir = resolve_root_path(f"{persist_dir}_embedding")
+    return create_embedding_cache(
+        max_memory_mb=model_cache.max_memory_mb or 256,
+        persist_dir=persist_dir,
+        dtype=model_cache.embedding_cache_dtype,
+    )
 
 
 def _initialize_awel(system_app: SystemApp, awel_dirs: Optional[str] = None):
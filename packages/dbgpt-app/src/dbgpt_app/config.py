@@ -117,6 +117,19 @@ class RagParameters(BaseParameters):
         default=3,
         metadata={"help": _("knowledge rerank top k")},
     )
+    rerank_batch_size: int = field(
+        default=32,
+        metadata={"help": _("The max number of the chunks of a rerank model call")},
+    )
+    rerank_max_candidates: Optional[int] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The max number of the chunks to rerank, the chunks of the highest "
+                "retrieval scores are kept, None means no limit"
+            )
+        },
+    )
     storage: StorageConfig = field(
         default_factory=lambda: StorageConfig(),
         metadata={"help": _("Storage configuration")},
@@ -316,6 +329,20 @@ class ServiceWebParameters(BaseParameters):
             "help": _("The max sequence length of the embedding model, default is 512")
         },
     )
+    max_query_result_rows: Optional[int] = field(
+        default=10000,
+        metadata={
+            "help": _(
+                "The max number of rows fetched from the database for a query result "
+                "of the chat with database, chat dashboard and SQL editor, the rest "
+                "rows are not read. 0 or empty means no limit, default is 10000"
+            )
+        },
+    )
+
+    def get_max_query_result_rows(self) -> Optional[int]:
+        """Return the max number of rows of a query result, None means no limit."""
+        return self.max_query_result_rows or None
 
 
 @dataclass
@@ -368,7 +368,12 @@ class KnowledgeService:
                 rerank_embeddings = RerankEmbeddingFactory.get_instance(
                     CFG.SYSTEM_APP
                 ).create()
-                reranker = RerankEmbeddingsRanker(rerank_embeddings, topk=recall_top_k)
+                reranker = RerankEmbeddingsRanker(
+                    rerank_embeddings,
+                    topk=recall_top_k,
+                    batch_size=app_config.rag.rerank_batch_size,
+                    max_candidates=app_config.rag.rerank_max_candidates,
+                )
                 chunks = reranker.rank(candidates_with_scores=chunks, query=question)
 
             recall_score_threshold = doc_recall_test_request.recall_score_threshold
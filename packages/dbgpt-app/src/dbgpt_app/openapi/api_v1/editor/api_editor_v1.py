@@ -2,7 +2,7 @@ import json
 import logging
 import re
 import time
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Body, Depends
 
@@ -36,6 +36,14 @@ CHAT_FACTORY = ChatFactory()
 logger = logging.getLogger(__name__)
 
 
+def _max_query_result_rows() -> Optional[int]:
+    """Return the max number of rows of a query result, None means no limit."""
+    app_config = CFG.SYSTEM_APP.config.configs.get("app_config")
+    if not app_config:
+        return None
+    return app_config.service.web.get_max_query_result_rows()
+
+
 def get_conversation_serve() -> ConversationServe:
     return ConversationServe.get_instance(CFG.SYSTEM_APP)
 
@@ -197,7 +205,9 @@ async def editor_sql_run(run_param: dict = Body()):
     try:
         start_time = time.time() * 1000
         # Use the parameterized query and parameters
-        colunms, sql_result = conn.query_ex(result, params=params, timeout=30)
+        colunms, sql_result = conn.query_ex(
+            result, params=params, timeout=30, max_rows=_max_query_result_rows()
+        )
         # Convert result type safely
         sql_result = [
             tuple(str(x) if x is not None else None for x in row) for row in sql_result
@@ -278,7 +288,9 @@ async def chart_run(run_param: dict = Body()):
     try:
         start_time = time.time() * 1000
         # Use the parameterized query and parameters
-        colunms, sql_result = db_conn.query_ex(result, params=params, timeout=30)
+        colunms, sql_result = db_conn.query_ex(
+            result, params=params, timeout=30, max_rows=_max_query_result_rows()
+        )
         # Convert result type safely
         sql_result = [
             tuple(str(x) if x is not None else None for x in row) for row in sql_result
@@ -346,7 +358,9 @@ async def chart_editor_submit(chart_edit_context: ChatChartEditContext = Body())
                             field_names,
                             chart_values,
                         ) = dashboard_data_loader.get_chart_values_by_conn(
-                            db_conn, chart_edit_context.new_sql
+                            db_conn,
+                            chart_edit_context.new_sql,
+                            max_rows=_max_query_result_rows(),
                         )
                         find_chart["chart_sql"] = chart_edit_context.new_sql
                         find_chart["values"] = [value.dict() for value in chart_values]
@@ -105,7 +105,9 @@ class ChatDashboard(BaseChat):
         for chart_item in prompt_response:
             try:
                 field_names, values = dashboard_data_loader.get_chart_values_by_conn(
-                    self.database, chart_item.sql
+                    self.database,
+                    chart_item.sql,
+                    max_rows=self.app_config.service.web.get_max_query_result_rows(),
                 )
                 chart_datas.append(
                     ChartData(
@@ -1,6 +1,6 @@
 import datetime
 import logging
-from typing import List
+from typing import List, Optional
 
 from dbgpt._private.config import Config
 from dbgpt_app.scene.chat_dashboard.data_preparation.report_schma import ValueItem
@@ -10,11 +10,21 @@ logger = logging.getLogger(__name__)
 
 
 class DashboardDataLoader:
-    def get_sql_value(self, db_conn, chart_sql: str):
-        return db_conn.query_ex(chart_sql)
+    def get_sql_value(self, db_conn, chart_sql: str, max_rows: Optional[int] = None):
+        return db_conn.query_ex(chart_sql, max_rows=max_rows)
 
-    def get_chart_values_by_conn(self, db_conn, chart_sql: str):
-        field_names, datas = db_conn.query_ex(chart_sql)
+    def get_chart_values_by_conn(
+        self, db_conn, chart_sql: str, max_rows: Optional[int] = None
+    ):
+        """Get the chart values of the SQL.
+
+        Args:
+            db_conn: The database connector.
+            chart_sql (str): The SQL of the chart.
+            max_rows (Optional[int]): The max number of rows to fetch, None means
+                no limit.
+        """
+        field_names, datas = db_conn.query_ex(chart_sql, max_rows=max_rows)
         return self.get_chart_values_by_data(field_names, datas, chart_sql)
 
     def get_chart_values_by_data(self, field_names, datas, chart_sql: str):
@@ -117,7 +127,9 @@ class DashboardDataLoader:
             logger.exception(f"get_chart_values_by_conn failed:{str(e)}")
             raise e
 
-    def get_chart_values_by_db(self, db_name: str, chart_sql: str):
+    def get_chart_values_by_db(
+        self, db_name: str, chart_sql: str, max_rows: Optional[int] = None
+    ):
         logger.info(f"get_chart_values_by_db:{db_name},{chart_sql}")
         db_conn = CFG.local_db_manager.get_connector(db_name)
-        return self.get_chart_values_by_conn(db_conn, chart_sql)
+        return self.get_chart_values_by_conn(db_conn, chart_sql, max_rows=max_rows)
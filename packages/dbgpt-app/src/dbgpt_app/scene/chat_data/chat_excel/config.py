@@ -36,6 +36,15 @@ class ChatExcelConfig(GPTsAppCommonConfig):
             )
         },
     )
+    max_workspace_files: int = field(
+        default=64,
+        metadata={
+            "help": _(
+                "The max number of the parsed files kept in the workspace, the least "
+                "recently used ones are removed, 0 means no limit."
+            )
+        },
+    )
 
     memory: Optional[BaseGPTsAppMemoryConfig] = field(
         default_factory=lambda: BufferWindowGPTsAppMemoryConfig(
@@ -65,6 +65,8 @@ class ChatExcel(BaseChat):
             table_name=self._curr_table,
             duckdb_extensions_dir=self.curr_config.duckdb_extensions_dir,
             force_install=self.curr_config.force_install,
+            workspace_dir=os.path.join(DATA_DIR, "_chat_excel_tmp", "_workspace"),
+            max_workspace_files=self.curr_config.max_workspace_files or None,
         )
 
         self.api_call = ApiCall()
@@ -1,6 +1,9 @@
+import hashlib
 import io
 import logging
 import os
+import uuid
+import warnings
 from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
 
 import chardet
@@ -10,10 +13,15 @@ import pandas as pd
 import sqlparse
 
 from dbgpt.util.file_client import FileClient
-from dbgpt.util.pd_utils import csv_colunm_foramt
 
 logger = logging.getLogger(__name__)
 
+_WORKSPACE_ALIAS = "excel_workspace"
+_WORKSPACE_TABLE = "imported_table"
+_WORKSPACE_SUFFIX = ".duckdb"
+_WORKSPACE_MAX_FILES = 64
+_DATE_SAMPLE_SIZE = 100
+
 if TYPE_CHECKING:
     from duckdb import DuckDBPyConnection
 
@@ -103,6 +111,35 @@ def is_chinese(text):
     return False
 
 
+def _infer_column_type(column: pd.Series) -> pd.Series:
+    """Infer the type of a string column with vectorized conversions.
+
+    The numbers (the currency symbols and thousands separators are removed) are
+    tried first, then the dates, otherwise the column is kept as string.
+    """
+    non_null = column.notna().sum()
+    if not non_null:
+        return column
+    has_currency = column.str.contains(r"[$¥]", regex=True, na=False)
+    cleaned = column.where(
+        ~has_currency, column.str.replace(r"[$¥,]", "", regex=True)
+    ).str.strip()
+    numeric = pd.to_numeric(cleaned, errors="coerce")
+    if numeric.notna().sum() == non_null:
+        return numeric
+    with warnings.catch_warnings():
+        # Could not infer format warning of the non-date columns
+        warnings.simplefilter("ignore", UserWarning)
+        # Check a sample first, parsing the non-date values one by one is slow
+        sample = column.dropna().head(_DATE_SAMPLE_SIZE)
+        if pd.to_datetime(sample, errors="coerce").isna().any():
+            return column
+        dates = pd.to_datetime(column, errors="coerce")
+    if dates.notna().sum() == non_null:
+        return dates.dt.strftime("%Y-%m-%d")
+    return column
+
+
 def read_from_df(
     db: "DuckDBPyConnection",
     file_path,
@@ -120,61 +157,38 @@ def read_from_df(
         f"File Info:{len(file_info)},Detected Encoding: {encoding} "
         f"(Confidence: {confidence})"
     )
-    # read excel file
+    # Read all the cells as string once, the types are inferred column by column
     if file_name.endswith(".xlsx") or file_name.endswith(".xls"):
-        df_tmp = pd.read_excel(file_info, index_col=False)
-        df = pd.read_excel(
-            file_info,
-            index_col=False,
-            converters={i: csv_colunm_foramt for i in range(df_tmp.shape[1])},
-        )
+        df = pd.read_excel(file_info, index_col=False, dtype=str)
     elif file_name.endswith(".csv"):
-        df_tmp = pd.read_csv(
-            file_info if isinstance(file_info, str) else io.BytesIO(file_info),
-            index_col=False,
-            encoding=encoding,
-        )
         df = pd.read_csv(
             file_info if isinstance(file_info, str) else io.BytesIO(file_info),
             index_col=False,
             encoding=encoding,
-            converters={i: csv_colunm_foramt for i in range(df_tmp.shape[1])},
+            dtype=str,
         )
     else:
         raise ValueError("Unsupported file format.")
 
     df.replace("", np.nan, inplace=True)
 
-    unnamed_columns_tmp = [
+    unnamed_columns = [
         col
-        for col in df_tmp.columns
-        if col.startswith("Unnamed") and df_tmp[col].isnull().all()
+        for col in df.columns
+        if str(col).startswith("Unnamed") and df[col].isnull().all()
     ]
-    df_tmp.drop(columns=unnamed_columns_tmp, inplace=True)
-
-    df = df[df_tmp.columns.values]
+    df.drop(columns=unnamed_columns, inplace=True)
 
-    columns_map = {}
-    for column_name in df_tmp.columns:
-        df[column_name] = df[column_name].astype(str)
-        columns_map.update({column_name: excel_colunm_format(column_name)})
-        try:
-            df[column_name] = pd.to_datetime(df[column_name]).dt.strftime("%Y-%m-%d")
-        except ValueError:
-            try:
-                df[column_name] = pd.to_numeric(df[column_name])
-            except ValueError:
-                try:
-                    df[column_name] = df[column_name].astype(str)
-                except Exception:
-                    print("Can't transform column: " + column_name)
+    for column_name in df.columns:
+        df[column_name] = _infer_column_type(df[column_name])
 
-    df = df.rename(columns=lambda x: x.strip().replace(" ", "_"))
+    df = df.rename(columns=lambda x: excel_colunm_format(str(x)))
     # write data in duckdb
     db.register("temp_df_table", df)
     # The table is explicitly created due to the issue at
     # https://github.com/eosphoros-ai/DB-GPT/issues/2437.
     db.execute(f"CREATE TABLE {table_name} AS SELECT * FROM temp_df_table")
+    db.unregister("temp_df_table")
     return table_name
 
 
@@ -222,6 +236,126 @@ def read_direct(
         return read_from_df(db, file_path, file_name, table_name)
 
 
+def file_content_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Return the sha256 hash of the file content."""
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def read_from_workspace(
+    db: "DuckDBPyConnection",
+    workspace_dir: str,
+    file_path: str,
+    file_name: str,
+    table_name: str,
+    read_type: str = "df",
+    max_workspace_files: Optional[int] = _WORKSPACE_MAX_FILES,
+) -> str:
+    """Load the file from the workspace, import it to the workspace if missing.
+
+    The workspace is a DuckDB file keyed by the content hash of the file, so a file
+    is only parsed once. The workspace is attached read-only and the table is a
+    temporary view of the imported table, it is kept attached until the connection
+    is closed.
+
+    Args:
+        db(DuckDBPyConnection): The DuckDB connection.
+        workspace_dir(str): The directory of the workspace files.
+        file_path(str): The path of the file to import.
+        file_name(str): The name of the file.
+        table_name(str): The name of the view to create.
+        read_type(str): The read type, "df" or "direct".
+        max_workspace_files(Optional[int]): The max number of the workspace files
+            to keep, the least recently used ones are removed. None means no limit.
+
+    Returns:
+        str: The path of the workspace file.
+    """
+    os.makedirs(workspace_dir, exist_ok=True)
+    content_hash = file_content_hash(file_path)
+    workspace_path = os.path.join(
+        workspace_dir, f"{content_hash}_{read_type}{_WORKSPACE_SUFFIX}"
+    )
+    if not os.path.exists(workspace_path):
+        # Import to a temporary file, other chats never see a partial workspace
+        tmp_path = f"{workspace_path}.{uuid.uuid4().hex}.tmp"
+        logger.info(f"Import file {file_name} to the workspace {workspace_path}")
+        db.execute(f"ATTACH '{tmp_path}' AS {_WORKSPACE_ALIAS}")
+        try:
+            workspace_table = f"{_WORKSPACE_ALIAS}.{_WORKSPACE_TABLE}"
+            if read_type == "df":
+                read_from_df(db, file_path, file_name, workspace_table)
+            else:
+                read_direct(db, file_path, file_name, workspace_table)
+        except Exception:
+            db.execute(f"DETACH {_WORKSPACE_ALIAS}")
+            _remove_file(tmp_path)
+            raise
+        db.execute(f"DETACH {_WORKSPACE_ALIAS}")
+        os.replace(tmp_path, workspace_path)
+        if max_workspace_files:
+            evict_workspaces(workspace_dir, max_workspace_files, keep=workspace_path)
+    else:
+        logger.info(f"Reuse the workspace {workspace_path} of file {file_name}")
+        # The modification time is the last used time of the eviction
+        os.utime(workspace_path)
+
+    db.execute(f"ATTACH '{workspace_path}' AS {_WORKSPACE_ALIAS} (READ_ONLY)")
+    # A temporary view is not persisted, the database file never refers to the
+    # workspace
+    db.execute(
+        f"CREATE TEMP VIEW {table_name} AS SELECT * FROM "
+        f"{_WORKSPACE_ALIAS}.{_WORKSPACE_TABLE}"
+    )
+    return workspace_path
+
+
+def evict_workspaces(
+    workspace_dir: str, max_files: int, keep: Optional[str] = None
+) -> List[str]:
+    """Remove the least recently used workspace files beyond max_files.
+
+    Args:
+        workspace_dir(str): The directory of the workspace files.
+        max_files(int): The max number of the workspace files to keep.
+        keep(Optional[str]): The path of a workspace file never removed.
+
+    Returns:
+        List[str]: The paths of the removed workspace files.
+    """
+    workspaces = []
+    for name in os.listdir(workspace_dir):
+        path = os.path.join(workspace_dir, name)
+        if not name.endswith(_WORKSPACE_SUFFIX) or path == keep:
+            continue
+        try:
+            workspaces.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            # Removed by another process
+            continue
+    num_evict = len(workspaces) + (1 if keep else 0) - max_files
+    if num_evict <= 0:
+        return []
+    removed = []
+    for _, path in sorted(workspaces)[:num_evict]:
+        logger.info(f"Remove the least recently used workspace {path}")
+        # The chats which attached it still read the open file on POSIX systems
+        _remove_file(path)
+        removed.append(path)
+    return removed
+
+
+def _remove_file(file_path: str):
+    for path in (file_path, f"{file_path}.wal"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
 class ExcelReader:
     def __init__(
         self,
@@ -234,6 +368,8 @@ class ExcelReader:
         duckdb_extensions_dir: Optional[List[str]] = None,
         force_install: bool = False,
         show_columns: bool = False,
+        workspace_dir: Optional[str] = None,
+        max_workspace_files: Optional[int] = _WORKSPACE_MAX_FILES,
     ):
         if not file_name:
             file_name = os.path.basename(file_path)
@@ -254,7 +390,17 @@ class ExcelReader:
 
         if not db_exists:
             curr_table = self.temp_table_name
-            if read_type == "df":
+            if workspace_dir and os.path.isfile(file_path):
+                read_from_workspace(
+                    self.db,
+                    workspace_dir,
+                    file_path,
+                    file_name,
+                    curr_table,
+                    read_type,
+                    max_workspace_files=max_workspace_files,
+                )
+            elif read_type == "df":
                 read_from_df(self.db, file_path, file_name, curr_table)
             else:
                 read_direct(self.db, file_path, file_name, curr_table)
@@ -328,7 +474,8 @@ AND dc.schema_name = 'main';
 
     def get_create_table_sql(self, table_name: str) -> str:
         sql = f"""SELECT comment, table_name, database_name FROM duckdb_tables() \
-        where table_name = '{table_name}'"""
+        where table_name = '{table_name}' UNION ALL SELECT comment, view_name, \
+        database_name FROM duckdb_views() where view_name = '{table_name}'"""
 
         columns, datas = self.run(sql, table_name, transform=False)
         table_comment = datas[0][0]
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from .. import excel_reader
+from ..excel_reader import (
+    ExcelReader,
+    _infer_column_type,
+    evict_workspaces,
+    file_content_hash,
+)
+
+
+def _write_csv(path, rows):
+    with open(path, "w") as f:
+        f.write("id,name\n")
+        for i in range(rows):
+            f.write(f"{i},name_{i}\n")
+    return str(path)
+
+
+@pytest.fixture
+def import_calls(monkeypatch):
+    calls = []
+    read_direct = excel_reader.read_direct
+
+    def _read_direct(db, file_path, file_name, table_name):
+        calls.append(file_path)
+        return read_direct(db, file_path, file_name, table_name)
+
+    monkeypatch.setattr(excel_reader, "read_direct", _read_direct)
+    return calls
+
+
+def _reader(file_path, workspace_dir, **kwargs):
+    return ExcelReader(
+        "conv_1",
+        file_path,
+        read_type="direct",
+        workspace_dir=str(workspace_dir),
+        **kwargs,
+    )
+
+
+def test_file_content_hash(tmp_path):
+    file_a = _write_csv(tmp_path / "a.csv", 10)
+    file_b = _write_csv(tmp_path / "b.csv", 10)
+    file_c = _write_csv(tmp_path / "c.csv", 11)
+    with open(file_a, "rb") as f:
+        expected = hashlib.sha256(f.read()).hexdigest()
+    assert file_content_hash(file_a, chunk_size=7) == expected
+    # The key only depends on the file content
+    assert file_content_hash(file_b) == expected
+    assert file_content_hash(file_c) != expected
+
+
+def test_workspace_cache_hit_and_miss(tmp_path, import_calls):
+    workspace_dir = tmp_path / "workspace"
+    file_a = _write_csv(tmp_path / "a.csv", 10)
+    reader = _reader(file_a, workspace_dir)
+    assert import_calls == [file_a]
+    assert reader.run("SELECT count(*) FROM temp_table", "temp_table") == (
+        ["count_star()"],
+        [(10,)],
+    )
+    reader.close()
+
+    # The same content is read from the workspace
+    file_b = _write_csv(tmp_path / "b.csv", 10)
+    reader = _reader(file_b, workspace_dir)
+    assert import_calls == [file_a]
+    assert "CREATE TABLE temp_table" in reader.get_create_table_sql("temp_table")
+    reader.transform_table(
+        "temp_table",
+        "data_analysis_table",
+        excel_reader.TransformedExcelResponse(
+            description="test",
+            columns=[
+                {
+                    "old_column_name": "name",
+                    "new_column_name": "user_name",
+                    "column_description": "The user name",
+                }
+            ],
+            plans=[],
+        ),
+    )
+    df = reader.get_df_by_sql_ex("SELECT user_name FROM data_analysis_table")
+    assert df["user_name"].tolist()[:2] == ["name_0", "name_1"]
+    reader.close()
+
+    # The changed content is imported again
+    file_c = _write_csv(tmp_path / "c.csv", 11)
+    _reader(file_c, workspace_dir).close()
+    assert import_calls == [file_a, file_c]
+    assert len(os.listdir(workspace_dir)) == 2
+
+
+def test_evict_workspaces(tmp_path, import_calls):
+    workspace_dir = tmp_path / "workspace"
+    files = [_write_csv(tmp_path / f"{i}.csv", i + 1) for i in range(3)]
+    for file_path in files:
+        _reader(file_path, workspace_dir, max_workspace_files=2).close()
+        time.sleep(0.01)
+    workspaces = sorted(os.listdir(workspace_dir))
+    expected = sorted(f"{file_content_hash(f)}_direct.duckdb" for f in files[1:])
+    assert workspaces == expected
+
+    # Reusing a workspace makes it the most recently used
+    _reader(files[1], workspace_dir, max_workspace_files=2).close()
+    removed = evict_workspaces(str(workspace_dir), 1)
+    assert removed == [
+        os.path.join(workspace_dir, f"{file_content_hash(files[2])}_direct.duckdb")
+    ]
+    assert len(import_calls) == 3
+
+
+def test_infer_column_type_numbers_before_dates():
+    column = pd.Series(["20240101", "20240102", None])
+    assert _infer_column_type(column).tolist()[:2] == [20240101, 20240102]
+
+    column = pd.Series(["2024-01-01 10:00", "2024-01-02 08:30"])
+    assert _infer_column_type(column).tolist() == ["2024-01-01", "2024-01-02"]
+
+
+def test_infer_column_type_currency():
+    column = pd.Series(["$1,200", "¥ 30", "4.5"])
+    assert _infer_column_type(column).tolist() == [1200, 30, 4.5]
+
+    # The commas are only removed with a currency symbol
+    column = pd.Series(["1,200", "30"])
+    assert _infer_column_type(column).tolist() == ["1,200", "30"]
+
+
+def test_infer_column_type_keeps_strings():
+    column = pd.Series(["apple", "2024-01-01", None])
+    assert _infer_column_type(column) is column
+    empty = pd.Series([None, None], dtype=object)
+    assert _infer_column_type(empty) is empty
@@ -1,3 +1,4 @@
+import functools
 import logging
 from typing import Dict, Type
 
@@ -145,4 +146,7 @@ class ChatWithDbAutoExecute(BaseChat):
 
     def do_action(self, prompt_response):
         print(f"do_action:{prompt_response}")
-        return self.database.run_to_df
+        return functools.partial(
+            self.database.run_to_df,
+            max_rows=self.app_config.service.web.get_max_query_result_rows(),
+        )
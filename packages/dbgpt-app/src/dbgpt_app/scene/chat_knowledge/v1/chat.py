@@ -84,7 +84,12 @@ class ChatKnowledge(BaseChat):
             rerank_top_k = self.curr_config.knowledge_retrieve_rerank_top_k
             if not rerank_top_k:
                 rerank_top_k = self.rag_config.rerank_top_k
-            reranker = RerankEmbeddingsRanker(rerank_embeddings, topk=rerank_top_k)
+            reranker = RerankEmbeddingsRanker(
+                rerank_embeddings,
+                topk=rerank_top_k,
+                batch_size=self.rag_config.rerank_batch_size,
+                max_candidates=self.rag_config.rerank_max_candidates,
+            )
             if retriever_top_k < rerank_top_k or retriever_top_k < 20:
                 # We use reranker, so if the top_k is less than 20,
                 # we need to set it to 20
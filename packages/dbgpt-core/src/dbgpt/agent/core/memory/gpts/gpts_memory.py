@@ -3,12 +3,14 @@
 import asyncio
 import json
 import logging
+from abc import ABC, abstractmethod
 from asyncio import Queue
 from collections import defaultdict
 from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from dbgpt.util.executor_utils import blocking_func_to_async
+from dbgpt.util.json_utils import serialize
 from dbgpt.vis.client import VisAgentMessages, VisAgentPlans, VisAppLink, vis_client
 
 from ...action.base import ActionOutput
@@ -17,10 +19,250 @@ from .base import GptsMessage, GptsMessageMemory, GptsPlansMemory
 from .default_gpts_memory import DefaultGptsMessageMemory, DefaultGptsPlansMemory
 
 NONE_GOAL_PREFIX: str = "none_goal_count_"
+_APP_LINK_AGENTS = ["Intent Recognition Expert", "App Link"]
 
 logger = logging.getLogger(__name__)
 
 
+class _MessageViewCache(ABC):
+    """The cached views of the messages of a conversation.
+
+    The messages of a conversation are only appended, so the views of the old
+    messages are kept and only the new messages are rendered. The cache is rebuilt
+    if the messages are not the ones rendered before.
+    """
+
+    def __init__(self, memory: "GptsMemory"):
+        self._memory = memory
+        self._start = 0
+        self._count = 0
+        self._last: Optional[GptsMessage] = None
+
+    async def render(self, messages: List[GptsMessage], start: int = 0) -> list:
+        """Render the view of the messages from `start`.
+
+        Returns:
+            list: The parts of the view, the unchanged parts are the same objects
+                as the last render.
+        """
+        if (
+            start != self._start
+            or len(messages) < self._count
+            or (
+                self._count > self._start
+                and messages[self._count - 1] is not self._last
+            )
+        ):
+            self._reset()
+            self._start = start
+            self._count = start
+        for message in messages[self._count :]:
+            self._add_message(message)
+        if len(messages) > self._count:
+            self._count = len(messages)
+            self._last = messages[-1]
+        return await self._build()
+
+    def _reset(self):
+        self._count = 0
+        self._last = None
+
+    @abstractmethod
+    def _add_message(self, message: GptsMessage):
+        """Add a new message to the cached views."""
+
+    @abstractmethod
+    async def _build(self) -> list:
+        """Build the parts of the view from the cached views."""
+
+
+class _SimpleViewCache(_MessageViewCache):
+    """The simple message list of a conversation."""
+
+    def __init__(self, memory: "GptsMemory"):
+        super().__init__(memory)
+        self._views: List[Dict] = []
+
+    def _reset(self):
+        super()._reset()
+        self._views = []
+
+    def _add_message(self, message: GptsMessage):
+        if message.sender == "Human":
+            return
+        view_info = message.content
+        if message.action_report:
+            action_out = ActionOutput.from_dict(json.loads(message.action_report))
+            if action_out is not None:
+                view_info = action_out.content
+        self._views.append(
+            {
+                "sender": message.sender,
+                "receiver": message.receiver,
+                "model": message.model_name,
+                "markdown": view_info,
+            }
+        )
+
+    async def _build(self) -> list:
+        return list(self._views)
+
+
+class _VisViewCache(_MessageViewCache):
+    """The vis view of a conversation.
+
+    The messages are grouped by their goals, the agents view and the plan item of
+    every group are cached until the group is changed.
+
+    The plans view of a run of the goal groups is split into a part per plan
+    item, the parts joined by the line breaks are still a valid plans view. So a
+    new message only changes the part of its plan item and the last part, and the
+    parts of the closed goal groups are never sent again.
+    """
+
+    def __init__(self, memory: "GptsMemory"):
+        super().__init__(memory)
+        self._reset()
+
+    def _reset(self):
+        super()._reset()
+        self._groups: Dict[str, List[GptsMessage]] = {}
+        self._none_goal_count = 1
+        self._versions: Dict[str, int] = {}
+        self._group_views: Dict[str, str] = {}
+        self._plan_items: Dict[tuple, str] = {}
+        self._app_link_message: Optional[GptsMessage] = None
+        self._app_launcher_message: Optional[GptsMessage] = None
+        self._app_link_view: Optional[Tuple[GptsMessage, Any, str]] = None
+        self._last_view: Optional[Tuple[GptsMessage, str]] = None
+
+    def _add_message(self, message: GptsMessage):
+        if message.sender in _APP_LINK_AGENTS or message.receiver in _APP_LINK_AGENTS:
+            if message.sender in _APP_LINK_AGENTS and message.receiver == "AppLauncher":
+                self._app_link_message = message
+            if message.receiver != "Human":
+                return
+
+        if message.sender == "AppLauncher":
+            if message.receiver == "Human":
+                self._app_launcher_message = message
+            return
+
+        current_goal = message.current_goal
+        last_goal = next(reversed(self._groups)) if self._groups else None
+        if current_goal:
+            key = current_goal
+            if current_goal == last_goal:
+                self._groups[key].append(message)
+            else:
+                self._groups[key] = [message]
+        else:
+            key = f"{NONE_GOAL_PREFIX}{self._none_goal_count}"
+            self._groups[key] = [message]
+            self._none_goal_count += 1
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._group_views.pop(key, None)
+
+    async def _group_view(self, key: str) -> str:
+        if key not in self._group_views:
+            self._group_views[key] = await self._memory._messages_to_agents_vis(
+                self._groups[key]
+            )
+        return self._group_views[key]
+
+    async def _plan_item(self, key: str, num: int) -> str:
+        messages = self._groups[key]
+        item = {
+            "name": key,
+            "num": num,
+            "status": "complete",
+            "agent": messages[0].receiver if messages else "",
+            "markdown": await self._group_view(key),
+        }
+        return json.dumps(item, default=serialize, ensure_ascii=False)
+
+    async def _plan_parts(
+        self, keys: List[str], plan_items: Dict[tuple, str]
+    ) -> List[str]:
+        """Return the parts of the plans view of a run of the goal groups."""
+        if not keys:
+            return [""]
+        items = []
+        for i, key in enumerate(keys):
+            # The same numbering as the plans view built before
+            item_key = (key, self._versions[key], 2 * (i + 1))
+            item = self._plan_items.get(item_key)
+            if item is None:
+                item = await self._plan_item(key, item_key[2])
+            plan_items[item_key] = item
+            items.append(item)
+        head = f"```{VisAgentPlans.vis_tag()}\n["
+        if len(items) == 1:
+            return [f"{head}{items[0]}]\n```"]
+        return (
+            [f"{head}{items[0]},"]
+            + [f"{item}," for item in items[1:-1]]
+            + [f"{items[-1]}]\n```"]
+        )
+
+    async def _build(self) -> list:
+        vis_items: list = []
+        link_message = self._app_link_message
+        launcher_message = self._app_launcher_message
+        if link_message:
+            if (
+                self._app_link_view is None
+                or self._app_link_view[0] is not link_message
+                or self._app_link_view[1] is not launcher_message
+            ):
+                self._app_link_view = (
+                    link_message,
+                    launcher_message,
+                    await self._memory._messages_to_app_link_vis(
+                        link_message, launcher_message
+                    ),
+                )
+            vis_items.append(self._app_link_view[2])
+        if not self._groups:
+            return vis_items
+
+        plan_items: Dict[tuple, str] = {}
+        plan_keys: List[str] = []
+        for key in self._groups:
+            if key.startswith(NONE_GOAL_PREFIX):
+                vis_items.extend(await self._plan_parts(plan_keys, plan_items))
+                plan_keys = []
+                vis_items.append(await self._group_view(key))
+            else:
+                plan_keys.append(key)
+        if plan_keys:
+            vis_items.extend(await self._plan_parts(plan_keys, plan_items))
+        self._plan_items = plan_items
+
+        last_goal = next(reversed(self._groups))
+        if not last_goal.startswith(NONE_GOAL_PREFIX):
+            last_message = self._groups[last_goal][-1]
+            if self._last_view is None or self._last_view[0] is not last_message:
+                self._last_view = (
+                    last_message,
+                    await self._memory._messages_to_agents_vis([last_message], True),
+                )
+            vis_items.append(self._last_view[1])
+        return vis_items
+
+
+def _common_prefix_count(previous: Optional[list], current: list) -> int:
+    """Return the number of the leading parts not changed since the last push."""
+    if not previous:
+        return 0
+    count = 0
+    for a, b in zip(previous, current):
+        if a is not b and a != b:
+            break
+        count += 1
+    return count
+
+
 class GptsMemory:
     """GPTs memory."""
 
@@ -42,6 +284,9 @@ class GptsMemory:
         self.channels: defaultdict = defaultdict(Queue)
         self.enable_vis_map: defaultdict = defaultdict(bool)
         self.start_round_map: defaultdict = defaultdict(int)
+        self._vis_views: Dict[str, _VisViewCache] = {}
+        self._simple_views: Dict[str, _SimpleViewCache] = {}
+        self._pushed_views: Dict[str, list] = {}
 
     @property
     def plans_memory(self) -> GptsPlansMemory:
@@ -65,6 +310,7 @@ class GptsMemory:
         self.enable_vis_map[conv_id] = enable_vis_message
         self.messages_cache[conv_id] = history_messages if history_messages else []
         self.start_round_map[conv_id] = start_round
+        self._clear_views(conv_id)
 
     def enable_vis_message(self, conv_id):
         """Enable conversation message vis tag."""
@@ -92,18 +338,28 @@ class GptsMemory:
         start_round = self.start_round_map.pop(conv_id)  # noqa
         del start_round
 
+        # clear the cached views
+        self._clear_views(conv_id)
+
+    def _clear_views(self, conv_id: str):
+        self._vis_views.pop(conv_id, None)
+        self._simple_views.pop(conv_id, None)
+        self._pushed_views.pop(conv_id, None)
+
     async def push_message(self, conv_id: str, temp_msg: Optional[str] = None):
-        """Push conversation message."""
+        """Push conversation message.
+
+        Only the changes since the last push are put into the queue, a dict with
+        the number of the unchanged leading parts `offset` and the new parts
+        `parts`, see :meth:`chat_messages`.
+        """
         queue = self.queue(conv_id)
         enable_vis_tag = self.enable_vis_message(conv_id=conv_id)
         if enable_vis_tag:
             # 如果有临时消息内容需要push 拼接再最末尾，否则直接从短期记忆中发布最后消息
-            message_view = await self.app_link_chat_message(conv_id)
+            message_views = await self._app_link_chat_views(conv_id)
             if temp_msg:
-                temp_view = await self.agent_stream_message(temp_msg)
-                message_view = message_view + "\n" + temp_view
-            await queue.put(message_view)
-
+                message_views.append(await self.agent_stream_message(temp_msg))
         else:
             # 非VIS消息模式，直接推送简单消息列表即可，不做任何处理
             message_views = await self.simple_message(conv_id)
@@ -111,7 +367,9 @@ class GptsMemory:
                 temp_view = await self.agent_stream_message(temp_msg, False)
                 if temp_view and len(temp_view) > 0:
                     message_views.extend(temp_view)
-            await queue.put(message_views)
+        offset = _common_prefix_count(self._pushed_views.get(conv_id), message_views)
+        self._pushed_views[conv_id] = message_views
+        await queue.put({"offset": offset, "parts": message_views[offset:]})
 
     async def complete(self, conv_id: str):
         """Complete conversation message."""
@@ -178,45 +436,6 @@ class GptsMemory:
         # Just use the action_output now
         return [m["action_output"] for m in new_list if m["action_output"]]
 
-    async def _message_group_vis_build(self, message_group, vis_items: list):
-        num: int = 0
-        if message_group:
-            last_goal = next(reversed(message_group))
-            last_goal_message = None
-            if not last_goal.startswith(NONE_GOAL_PREFIX):
-                last_goal_messages = message_group[last_goal]
-                last_goal_message = last_goal_messages[-1]
-
-            plan_temps: List[dict] = []
-            need_show_singe_last_message = False
-            for key, value in message_group.items():
-                num = num + 1
-                if key.startswith(NONE_GOAL_PREFIX):
-                    vis_items.append(await self._messages_to_plan_vis(plan_temps))
-                    plan_temps = []
-                    num = 0
-                    vis_items.append(await self._messages_to_agents_vis(value))
-                else:
-                    num += 1
-                    plan_temps.append(
-                        {
-                            "name": key,
-                            "num": num,
-                            "status": "complete",
-                            "agent": value[0].receiver if value else "",
-                            "markdown": await self._messages_to_agents_vis(value),
-                        }
-                    )
-                    need_show_singe_last_message = True
-
-            if len(plan_temps) > 0:
-                vis_items.append(await self._messages_to_plan_vis(plan_temps))
-            if need_show_singe_last_message and last_goal_message:
-                vis_items.append(
-                    await self._messages_to_agents_vis([last_goal_message], True)
-                )
-        return "\n".join(vis_items)
-
     async def agent_stream_message(
         self,
         message: Union[Dict, str],
@@ -269,106 +488,40 @@ class GptsMemory:
         """Get agent simple message."""
         messages_cache = self.messages_cache[conv_id]
         if messages_cache and len(messages_cache) > 0:
-            messages = messages_cache
-        else:
-            messages = await blocking_func_to_async(
-                self._executor, self.message_memory.get_by_conv_id, conv_id=conv_id
-            )
-
-        simple_message_list = []
-        for message in messages:
-            if message.sender == "Human":
-                continue
-
-            action_report_str = message.action_report
-            view_info = message.content
-            action_out = None
-            if action_report_str and len(action_report_str) > 0:
-                action_out = ActionOutput.from_dict(json.loads(action_report_str))
-            if action_out is not None:
-                view_info = action_out.content
+            if conv_id not in self._simple_views:
+                self._simple_views[conv_id] = _SimpleViewCache(self)
+            return await self._simple_views[conv_id].render(messages_cache)
 
-            simple_message_list.append(
-                {
-                    "sender": message.sender,
-                    "receiver": message.receiver,
-                    "model": message.model_name,
-                    "markdown": view_info,
-                }
-            )
-
-        return simple_message_list
+        messages = await blocking_func_to_async(
+            self._executor, self.message_memory.get_by_conv_id, conv_id=conv_id
+        )
+        return await _SimpleViewCache(self).render(messages)
 
     async def app_link_chat_message(self, conv_id: str):
         """Get app link chat message."""
-        messages = []
-        if conv_id in self.messages_cache:
-            messages_cache = self.messages_cache[conv_id]
-            if messages_cache and len(messages_cache) > 0:
-                start_round = (
-                    self.start_round_map[conv_id]
-                    if conv_id in self.start_round_map
-                    else 0
-                )
-                messages = messages_cache[start_round:]
-        else:
+        return "\n".join(await self._app_link_chat_views(conv_id))
+
+    async def _app_link_chat_views(self, conv_id: str) -> List[str]:
+        """Get the vis views of the app link chat message.
+
+        Only the messages appended since the last call are rendered, the views of
+        the message groups rendered before are reused.
+        """
+        if conv_id not in self.messages_cache:
             messages = await blocking_func_to_async(
                 self._executor, self.message_memory.get_by_conv_id, conv_id=conv_id
             )
+            return await _VisViewCache(self).render(messages)
 
         # VIS消息组装
-        temp_group: Dict = {}
-        app_link_message: Optional[GptsMessage] = None
-        app_lanucher_message: Optional[GptsMessage] = None
-
-        none_goal_count = 1
-        for message in messages:
-            if message.sender in [
-                "Intent Recognition Expert",
-                "App Link",
-            ] or message.receiver in ["Intent Recognition Expert", "App Link"]:
-                if (
-                    message.sender in ["Intent Recognition Expert", "App Link"]
-                    and message.receiver == "AppLauncher"
-                ):
-                    app_link_message = message
-                if message.receiver != "Human":
-                    continue
-
-            if message.sender == "AppLauncher":
-                if message.receiver == "Human":
-                    app_lanucher_message = message
-                continue
-
-            current_gogal = message.current_goal
-
-            last_goal = next(reversed(temp_group)) if temp_group else None
-            if last_goal:
-                last_goal_messages = temp_group[last_goal]
-                if current_gogal:
-                    if current_gogal == last_goal:
-                        last_goal_messages.append(message)
-                    else:
-                        temp_group[current_gogal] = [message]
-                else:
-                    temp_group[f"{NONE_GOAL_PREFIX}{none_goal_count}"] = [message]
-                    none_goal_count += 1
-            else:
-                if current_gogal:
-                    temp_group[current_gogal] = [message]
-                else:
-                    temp_group[f"{NONE_GOAL_PREFIX}{none_goal_count}"] = [message]
-                    none_goal_count += 1
-
-        vis_items: list = []
-        if app_link_message:
-            vis_items.append(
-                await self._messages_to_app_link_vis(
-                    app_link_message, app_lanucher_message
-                )
-            )
-
-        return await self._message_group_vis_build(temp_group, vis_items)
+        if conv_id not in self._vis_views:
+            self._vis_views[conv_id] = _VisViewCache(self)
+        start_round = (
+            self.start_round_map[conv_id] if conv_id in self.start_round_map else 0
+        )
+        return await self._vis_views[conv_id].render(
+            self.messages_cache[conv_id], start_round
+        )
 
     async def _messages_to_agents_vis(
         self, messages: List[GptsMessage], is_last_message: bool = False
@@ -449,8 +602,18 @@ class GptsMemory:
     async def chat_messages(
         self,
         conv_id: str,
+        incremental: bool = False,
     ):
-        """Get chat messages."""
+        """Get chat messages.
+
+        Args:
+            conv_id(str): The conversation id.
+            incremental(bool): Whether to yield the changes pushed to the queue,
+                dicts with the number of the unchanged leading parts `offset` and
+                the new parts `parts`, instead of the whole views.
+        """
+        enable_vis_tag = self.enable_vis_message(conv_id=conv_id)
+        views: list = []
         while True:
             queue = self.queue(conv_id)
             if not queue:
@@ -460,5 +623,9 @@ class GptsMemory:
                 queue.task_done()
                 break
             else:
-                yield item
+                if incremental:
+                    yield item
+                else:
+                    views = views[: item["offset"]] + item["parts"]
+                    yield "\n".join(views) if enable_vis_tag else views
                 await asyncio.sleep(0.005)
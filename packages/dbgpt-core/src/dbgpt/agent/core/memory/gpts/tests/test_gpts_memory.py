@@ -0,0 +1,165 @@
+import json
+from typing import List, Optional
+
+import pytest
+
+from dbgpt.agent.core.action.base import ActionOutput
+from dbgpt.agent.core.memory.gpts import (
+    DefaultGptsMessageMemory,
+    GptsMemory,
+    GptsMessage,
+)
+
+_CONV_ID = "conv_1"
+
+
+def _message(
+    sender: str,
+    receiver: str,
+    content: str,
+    current_goal: Optional[str] = None,
+    success: bool = True,
+) -> GptsMessage:
+    action_output = ActionOutput(
+        content=f"{content} output", is_exe_success=success, view=f"{content} view"
+    )
+    return GptsMessage(
+        conv_id=_CONV_ID,
+        sender=sender,
+        receiver=receiver,
+        role="assistant",
+        content=content,
+        current_goal=current_goal,
+        action_report=json.dumps(action_output.to_dict()),
+    )
+
+
+def _messages() -> List[GptsMessage]:
+    return [
+        _message("Human", "Planner", "hello"),
+        _message("Planner", "Human", "plans"),
+        _message("Human", "DataScientist", "step 1", "goal 1"),
+        _message("DataScientist", "Human", "answer 1", "goal 1", success=False),
+        _message("DataScientist", "Human", "retry 1", "goal 1"),
+        _message("Human", "Reporter", "step 2", "goal 2"),
+        _message("Reporter", "Human", "answer 2", "goal 2"),
+        _message("Summarizer", "Human", "summary"),
+        _message("Human", "DataScientist", "step 3", "goal 3"),
+        _message("DataScientist", "Human", "answer 3", "goal 3"),
+    ]
+
+
+async def _full_view(message_memory, enable_vis: bool = True):
+    # Render all the messages loaded from the storage without cache
+    memory = GptsMemory(message_memory=message_memory)
+    if enable_vis:
+        return await memory.app_link_chat_message(_CONV_ID)
+    return await memory.simple_message(_CONV_ID)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("enable_vis", [True, False])
+async def test_render_appended_messages(enable_vis):
+    message_memory = DefaultGptsMessageMemory()
+    memory = GptsMemory(message_memory=message_memory)
+    memory.init(_CONV_ID, enable_vis_message=enable_vis)
+
+    rendered = []
+    render_agents_vis = memory._messages_to_agents_vis
+
+    async def _messages_to_agents_vis(messages, is_last_message=False):
+        rendered.extend(messages)
+        return await render_agents_vis(messages, is_last_message)
+
+    memory._messages_to_agents_vis = _messages_to_agents_vis
+
+    views = []
+    for message in _messages():
+        rendered.clear()
+        await memory.append_message(_CONV_ID, message)
+        # Only the group of the new message is rendered
+        assert all(m.current_goal == message.current_goal for m in rendered)
+        assert all(m is message for m in rendered if not m.current_goal)
+        # Nothing is rendered again for the temporary message
+        rendered.clear()
+        await memory.push_message(_CONV_ID, "thinking")
+        assert not rendered
+        views.append(await _full_view(message_memory, enable_vis))
+    await memory.complete(_CONV_ID)
+
+    streamed = [view async for view in memory.chat_messages(_CONV_ID)]
+    # Every message is pushed without and with the temporary message
+    assert streamed[::2] == views
+    if enable_vis:
+        assert views[-1].count("```agent-plans") == 2
+        assert all(v.endswith('"thinking"}]\n```') for v in streamed[1::2])
+    else:
+        assert [v["markdown"] for v in views[-1]][-2:] == [
+            "summary output",
+            "answer 3 output",
+        ]
+        assert all(v[-1]["markdown"] == "thinking" for v in streamed[1::2])
+
+
+@pytest.mark.asyncio
+async def test_push_incremental_views():
+    memory = GptsMemory()
+    memory.init(_CONV_ID)
+    for message in _messages()[:5]:
+        await memory.append_message(_CONV_ID, message)
+    await memory.push_message(_CONV_ID, "thinking")
+    await memory.append_message(_CONV_ID, _messages()[5])
+    await memory.complete(_CONV_ID)
+
+    items = [item async for item in memory.chat_messages(_CONV_ID, True)]
+    # The views of the messages without goal are not sent again
+    assert [item["offset"] for item in items] == [0, 2, 4, 4, 4, 6, 4]
+    # Only the temporary message is sent
+    assert len(items[5]["parts"]) == 1
+    assert "thinking" in items[5]["parts"][0]
+    # The plan items of the goal groups and the last message view
+    assert len(items[6]["parts"]) == 3
+    assert items[6]["parts"][0].startswith("```agent-plans")
+    assert items[6]["parts"][1].endswith("]\n```")
+
+    # The cache is rebuilt when the messages are replaced
+    messages = _messages()
+    memory.messages_cache[_CONV_ID] = messages[:3]
+    assert await memory.app_link_chat_message(_CONV_ID) == await _full_view(
+        _memory_of(messages[:3])
+    )
+
+
+@pytest.mark.asyncio
+async def test_push_closed_plan_items_once():
+    memory = GptsMemory()
+    memory.init(_CONV_ID)
+    for i in range(1, 4):
+        await memory.append_message(
+            _CONV_ID, _message("Human", "DataScientist", f"step {i}", f"goal {i}")
+        )
+    await memory.append_message(
+        _CONV_ID, _message("DataScientist", "Human", "answer 3", "goal 3")
+    )
+    await memory.complete(_CONV_ID)
+
+    items = [item async for item in memory.chat_messages(_CONV_ID, True)]
+    # The plan items of the closed goal groups are not sent again
+    assert [item["offset"] for item in items] == [0, 0, 1, 2]
+    assert len(items[-1]["parts"]) == 2
+    assert items[-1]["parts"][0].endswith("]\n```")
+    # The parts are joined to a valid plans view
+    view = await memory.app_link_chat_message(_CONV_ID)
+    plans = view.split("\n```")[0].split("```agent-plans\n")[1]
+    assert [item["name"] for item in json.loads(plans)] == [
+        "goal 1",
+        "goal 2",
+        "goal 3",
+    ]
+
+
+def _memory_of(messages: List[GptsMessage]) -> DefaultGptsMessageMemory:
+    message_memory = DefaultGptsMessageMemory()
+    for message in messages:
+        message_memory.append(message)
+    return message_memory
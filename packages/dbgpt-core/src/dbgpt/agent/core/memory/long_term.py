@@ -4,12 +4,15 @@ from concurrent.futures import Executor
 from datetime import datetime
 from typing import Any, Dict, Generic, List, Optional
 
+import numpy as np
+
 from dbgpt.core import Chunk
 from dbgpt.rag.retriever.time_weighted import TimeWeightedEmbeddingRetriever
 from dbgpt.storage.vector_store.base import VectorStoreBase
 from dbgpt.storage.vector_store.filters import MetadataFilter, MetadataFilters
 from dbgpt.util.annotations import immutable, mutable
 from dbgpt.util.executor_utils import blocking_func_to_async
+from dbgpt.util.similarity_util import top_k
 
 from .base import DiscardedMemoryFragments, Memory, T, WriteOperation
 
@@ -70,19 +73,19 @@ class LongTermRetriever(TimeWeightedEmbeddingRetriever):
             return self._retrieve_vector_store_only(query, filters, current_time)
 
         # Calculate combined scores for all documents
-        rescored_docs = [
-            (doc, self._get_combined_score(doc, relevance, current_time))
-            for doc, relevance in docs_and_scores.values()
-        ]
-
-        # Sort by score
-        rescored_docs.sort(key=lambda x: x[1], reverse=True)
+        docs = [doc for doc, _ in docs_and_scores.values()]
+        scores = self._get_combined_scores(
+            docs,
+            [relevance for _, relevance in docs_and_scores.values()],
+            current_time,
+        )
 
         result = []
         retrieved_num = 0
 
         # Process documents in order of score
-        for doc, _ in rescored_docs:
+        for i in top_k(scores, len(docs))[0].tolist():
+            doc = docs[i]
             # Skip documents that are marked for forgetting or merging
             if (
                 retrieved_num < self._k
@@ -140,34 +143,29 @@ class LongTermRetriever(TimeWeightedEmbeddingRetriever):
             )
         ]
 
-        # Apply time weighting
-        rescored_docs = []
-        for doc in filtered_docs:
+        # Apply time weighting, just use vector similarity if no time data
+        scores = np.array([doc.score for doc in filtered_docs], dtype=float)
+        hours_passed = np.zeros(len(filtered_docs))
+        timed = np.zeros(len(filtered_docs), dtype=bool)
+        for i, doc in enumerate(filtered_docs):
             if _METADATA_LAST_ACCESSED_AT in doc.metadata:
                 last_accessed_time = datetime.fromtimestamp(
                     float(doc.metadata[_METADATA_LAST_ACCESSED_AT])
                 )
-                hours_passed = self._get_hours_passed(current_time, last_accessed_time)
-                time_score = (1.0 - self.decay_rate) ** hours_passed
-
+                hours_passed[i] = self._get_hours_passed(
+                    current_time, last_accessed_time
+                )
+                timed[i] = True
                 # Add importance score if available
-                importance_score = 0
                 if _METADAT_IMPORTANCE in doc.metadata:
-                    importance_score = float(doc.metadata[_METADAT_IMPORTANCE])
-
-                # Combine scores
-                combined_score = doc.score + time_score + importance_score
-                rescored_docs.append((doc, combined_score))
-            else:
-                # Just use vector similarity if no time data
-                rescored_docs.append((doc, doc.score))
-
-        # Sort by combined score
-        rescored_docs.sort(key=lambda x: x[1], reverse=True)
+                    scores[i] += float(doc.metadata[_METADAT_IMPORTANCE])
+        # Combine scores
+        scores[timed] += (1.0 - self.decay_rate) ** hours_passed[timed]
 
         # Return top results, updating last_accessed_at
         result = []
-        for doc, _ in rescored_docs[: self._k]:
+        for i in top_k(scores, self._k)[0].tolist():
+            doc = filtered_docs[i]
             doc.metadata[_METADATA_LAST_ACCESSED_AT] = current_time
             result.append(doc)
 
@@ -8,7 +8,7 @@ from typing import Dict, List, Optional, Tuple
 from dbgpt.core import Embeddings
 from dbgpt.util.annotations import immutable, mutable
 from dbgpt.util.executor_utils import blocking_func_to_async
-from dbgpt.util.similarity_util import cosine_similarity, sigmoid_function
+from dbgpt.util.similarity_util import sigmoid_function, similarity_matrix
 
 from .base import (
     DiscardedMemoryFragments,
@@ -76,17 +76,14 @@ class EnhancedShortTermMemory(ShortTermMemory[T]):
         memory_fragment.update_embeddings(memory_fragment_embeddings)
 
         async with self._lock:
-            for idx, memory_embedding in enumerate(self.short_embeddings):
-                similarity = await blocking_func_to_async(
-                    self._executor,
-                    cosine_similarity,
-                    memory_embedding,
-                    memory_fragment_embeddings,
-                )
+            sigmoid_probs: List[float] = []
+            if self.short_embeddings:
+                similarities = similarity_matrix(
+                    memory_fragment_embeddings, self.short_embeddings
+                )[0]
                 # Sigmoid probability, transform similarity to [0, 1]
-                sigmoid_prob: float = await blocking_func_to_async(
-                    self._executor, sigmoid_function, similarity
-                )
+                sigmoid_probs = sigmoid_function(similarities).tolist()
+            for idx, sigmoid_prob in enumerate(sigmoid_probs):
                 if (
                     sigmoid_prob >= self.enhance_similarity_threshold
                     and random.random() < sigmoid_prob
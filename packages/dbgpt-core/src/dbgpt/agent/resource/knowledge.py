@@ -44,7 +44,10 @@ class RetrieverResource(Resource[ResourceParameters]):
                 CFG.SYSTEM_APP
             ).create()
             self.reranker = RerankEmbeddingsRanker(
-                rerank_embeddings, topk=app_config.rag.rerank_top_k
+                rerank_embeddings,
+                topk=app_config.rag.rerank_top_k,
+                batch_size=app_config.rag.rerank_batch_size,
+                max_candidates=app_config.rag.rerank_max_candidates,
             )
         else:
             self.reranker = None
@@ -650,7 +650,13 @@ class DAGContext:
         if not node_name_to_ids:
             node_name_to_ids = {}
         self._streaming_call = streaming_call
+        # The last task context set, used when read out of the running tasks
         self._curr_task_ctx: Optional[TaskContext] = None
+        # The upstream tasks may run concurrently, each asyncio task sees its own
+        # current task context
+        self._curr_task_ctx_var: contextvars.ContextVar[Optional[TaskContext]] = (
+            contextvars.ContextVar(f"awel_curr_task_ctx_{id(self)}", default=None)
+        )
         self._share_data: Dict[str, Any] = share_data
         self._node_to_outputs: Dict[str, TaskContext] = node_to_outputs
         self._node_name_to_ids: Dict[str, str] = node_name_to_ids
@@ -671,9 +677,10 @@ class DAGContext:
     @property
     def current_task_context(self) -> TaskContext:
         """Return the current task context."""
-        if not self._curr_task_ctx:
+        curr_task_ctx = self._curr_task_ctx_var.get() or self._curr_task_ctx
+        if not curr_task_ctx:
             raise RuntimeError("Current task context not set")
-        return self._curr_task_ctx
+        return curr_task_ctx
 
     @property
     def streaming_call(self) -> bool:
@@ -686,8 +693,10 @@ class DAGContext:
         When the task is running, the current task context
         will be set to the task context.
 
-        TODO: We should support parallel task running in the future.
+        It is safe for the tasks running concurrently in different asyncio tasks,
+        every asyncio task reads the task context set by itself.
         """
+        self._curr_task_ctx_var.set(_curr_task_ctx)
         self._curr_task_ctx = _curr_task_ctx
 
     def get_task_output(self, task_name: str) -> TaskOutput:
@@ -798,8 +807,14 @@ class DAG:
         tags: Optional[Dict[str, str]] = None,
         description: Optional[str] = None,
         default_dag_variables: Optional[DAGVariables] = None,
+        max_concurrency: Optional[int] = None,
     ) -> None:
-        """Initialize a DAG."""
+        """Initialize a DAG.
+
+        Args:
+            max_concurrency (Optional[int], optional): The max number of the tasks
+                running concurrently in one DAG run, None means no limit.
+        """
         self._dag_id = dag_id
         self._tags: Dict[str, str] = tags or {}
         self._description = description
@@ -812,6 +827,7 @@ class DAG:
         self._lock = asyncio.Lock()
         self._event_loop_task_id_to_ctx: Dict[int, DAGContext] = {}
         self._default_dag_variables = default_dag_variables
+        self._max_concurrency = max_concurrency
 
     def _append_node(self, node: DAGNode) -> None:
         if node.node_id in self.node_map:
@@ -6,7 +6,7 @@ This runner will run the workflow in the current process.
 import asyncio
 import logging
 import traceback
-from typing import Any, Dict, List, Optional, Set, cast
+from typing import Any, Coroutine, Dict, List, Optional, Set, cast
 
 from dbgpt.component import SystemApp
 from dbgpt.util.tracer import root_tracer
@@ -94,6 +94,11 @@ class DefaultWorkflowRunner(WorkflowRunner):
         )
         logger.debug(f"Node id {node.node_id}, call_data: {call_data}")
         skip_node_ids: Set[str] = set()
+        # The nodes running now, the node shared by the concurrent branches just run
+        # once
+        running_nodes: Dict[str, asyncio.Future] = {}
+        max_concurrency = node.dag._max_concurrency if node.dag else None
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
         system_app: Optional[SystemApp] = DAGVar.get_current_system_app()
 
         if node.dag:
@@ -112,7 +117,14 @@ class DefaultWorkflowRunner(WorkflowRunner):
             },
         ):
             await self._execute_node(
-                job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
+                job_manager,
+                node,
+                dag_ctx,
+                node_outputs,
+                skip_node_ids,
+                system_app,
+                running_nodes,
+                semaphore,
             )
         if not streaming_call and node.dag and exist_dag_ctx is None:
             # streaming call not work for dag end
@@ -130,24 +142,77 @@ class DefaultWorkflowRunner(WorkflowRunner):
         node_outputs: Dict[str, TaskContext],
         skip_node_ids: Set[str],
         system_app: Optional[SystemApp],
+        running_nodes: Optional[Dict[str, asyncio.Future]] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
     ):
         # Skip run node
         if node.node_id in node_outputs:
             return
+        if running_nodes is None:
+            running_nodes = {}
+        running = running_nodes.get(node.node_id)
+        if running is not None:
+            # Run by another branch, wait it. Shield it, the cancellation of current
+            # branch should not cancel the other one
+            await asyncio.shield(running)
+            return
+        running = asyncio.get_running_loop().create_future()
+        running.add_done_callback(_consume_exception)
+        running_nodes[node.node_id] = running
+        try:
+            await self._run_node(
+                job_manager,
+                node,
+                dag_ctx,
+                node_outputs,
+                skip_node_ids,
+                system_app,
+                running_nodes,
+                semaphore,
+            )
+        except BaseException as e:
+            if not running.done():
+                running.set_exception(e)
+            raise
+        else:
+            if not running.done():
+                running.set_result(None)
 
-        # Run all upstream nodes
-        # TODO: run in parallel, there are some code to be changed:
-        #  dag_ctx.set_current_task_context(task_ctx)
-        for upstream_node in node.upstream:
-            if isinstance(upstream_node, BaseOperator):
-                await self._execute_node(
-                    job_manager,
-                    upstream_node,
-                    dag_ctx,
-                    node_outputs,
-                    skip_node_ids,
-                    system_app,
-                )
+    async def _run_node(
+        self,
+        job_manager: JobManager,
+        node: BaseOperator,
+        dag_ctx: DAGContext,
+        node_outputs: Dict[str, TaskContext],
+        skip_node_ids: Set[str],
+        system_app: Optional[SystemApp],
+        running_nodes: Dict[str, asyncio.Future],
+        semaphore: Optional[asyncio.Semaphore],
+    ):
+        # Run all upstream nodes, the independent branches run concurrently
+        upstream_nodes = [
+            upstream_node
+            for upstream_node in node.upstream
+            if isinstance(upstream_node, BaseOperator)
+        ]
+        upstream_calls = [
+            self._execute_node(
+                job_manager,
+                upstream_node,
+                dag_ctx,
+                node_outputs,
+                skip_node_ids,
+                system_app,
+                running_nodes,
+                semaphore,
+            )
+            for upstream_node in upstream_nodes
+            if upstream_node.node_id not in node_outputs
+        ]
+        if len(upstream_calls) == 1:
+            await upstream_calls[0]
+        elif upstream_calls:
+            await _gather_or_cancel(upstream_calls)
 
         inputs = [
             node_outputs[upstream_node.node_id] for upstream_node in node.upstream
@@ -189,7 +254,11 @@ class DefaultWorkflowRunner(WorkflowRunner):
             with root_tracer.start_span(
                 "dbgpt.awel.workflow.run_operator", metadata=run_metadata
             ) as span:
-                await node._run(dag_ctx, task_ctx.log_id)
+                if semaphore is not None:
+                    async with semaphore:
+                        await node._run(dag_ctx, task_ctx.log_id)
+                else:
+                    await node._run(dag_ctx, task_ctx.log_id)
                 node_outputs[node.node_id] = dag_ctx.current_task_context
                 task_ctx.set_current_state(TaskState.SUCCESS)
 
@@ -212,6 +281,23 @@ class DefaultWorkflowRunner(WorkflowRunner):
             raise e
 
 
+async def _gather_or_cancel(calls: List[Coroutine[Any, Any, None]]) -> None:
+    """Run the calls concurrently, cancel the others if one of them fails."""
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def _consume_exception(future: asyncio.Future) -> None:
+    # The exception is raised by the branch running the node, mark it retrieved
+    if not future.cancelled():
+        future.exception()
+
+
 def _skip_current_downstream_by_node_name(
     branch_node: BranchOperator, skip_nodes: List[str], skip_node_ids: Set[str]
 ):
@@ -1,4 +1,5 @@
-from typing import List
+import asyncio
+from typing import Dict, List
 
 import pytest
 
@@ -138,3 +139,83 @@ async def test_branch_node(
         assert res.current_task_context.current_state == TaskState.SUCCESS
         expect_res = 999 if is_odd else 888
         assert res.current_task_context.task_output.output == expect_res
+
+
+class _SlowMapOperator(MapOperator[int, int]):
+    def __init__(self, value: int, stats: Dict[str, int], **kwargs):
+        super().__init__(**kwargs)
+        self._value = value
+        self._stats = stats
+
+    async def map(self, input_value: int) -> int:
+        self._stats["calls"] += 1
+        self._stats["running"] += 1
+        self._stats["max_running"] = max(
+            self._stats["max_running"], self._stats["running"]
+        )
+        await asyncio.sleep(0.05)
+        self._stats["running"] -= 1
+        return input_value + self._value
+
+
+def _new_stats() -> Dict[str, int]:
+    return {"calls": 0, "running": 0, "max_running": 0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "max_concurrency, expect_max_running",
+    [(None, 3), (1, 1), (2, 2)],
+)
+async def test_parallel_upstream_nodes(
+    runner: WorkflowRunner, max_concurrency, expect_max_running: int
+):
+    def join_func(p1, p2, p3) -> int:
+        return p1 + p2 + p3
+
+    stats = _new_stats()
+    with DAG("test_parallel_upstream_nodes", max_concurrency=max_concurrency):
+        input_node = InputOperator(SimpleInputSource(1))
+        join_node = JoinOperator(join_func)
+        for i in range(3):
+            input_node >> _SlowMapOperator(i, stats) >> join_node
+
+        res: DAGContext[int] = await runner.execute_workflow(join_node)
+        assert res.current_task_context.current_state == TaskState.SUCCESS
+        assert res.current_task_context.task_output.output == 6
+        assert stats["max_running"] == expect_max_running
+
+
+@pytest.mark.asyncio
+async def test_shared_upstream_node_run_once(runner: WorkflowRunner):
+    def join_func(p1, p2) -> int:
+        return p1 + p2
+
+    stats = _new_stats()
+    with DAG("test_shared_upstream_node_run_once"):
+        input_node = InputOperator(SimpleInputSource(1))
+        shared_node = _SlowMapOperator(10, stats)
+        join_node = JoinOperator(join_func)
+        input_node >> shared_node
+        shared_node >> MapOperator(lambda x: x * 2) >> join_node
+        shared_node >> MapOperator(lambda x: x * 3) >> join_node
+
+        res: DAGContext[int] = await runner.execute_workflow(join_node)
+        assert res.current_task_context.task_output.output == 55
+        assert stats["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_parallel_upstream_node_failed(runner: WorkflowRunner):
+    def fail_func(x: int) -> int:
+        raise ValueError("failed")
+
+    stats = _new_stats()
+    with DAG("test_parallel_upstream_node_failed"):
+        input_node = InputOperator(SimpleInputSource(1))
+        join_node = JoinOperator(lambda p1, p2: p1 + p2)
+        input_node >> MapOperator(fail_func) >> join_node
+        input_node >> _SlowMapOperator(1, stats) >> join_node
+
+        with pytest.raises(ValueError):
+            await runner.execute_workflow(join_node)
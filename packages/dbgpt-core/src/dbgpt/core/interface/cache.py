@@ -28,6 +28,10 @@ class CachePolicy(str, Enum):
 
     LRU = "lru"
     FIFO = "fifo"
+    LFU = "lfu"
+    TTL = "ttl"
+    # Evict the largest entries first
+    SIZE = "size"
 
 
 @dataclass
@@ -36,6 +40,9 @@ class CacheConfig:
 
     retrieval_policy: Optional[RetrievalPolicy] = RetrievalPolicy.EXACT_MATCH
     cache_policy: Optional[CachePolicy] = CachePolicy.LRU
+    # The min cosine similarity of the similarity match, None to use the default
+    # threshold of the cache storage
+    similarity_threshold: Optional[float] = None
 
 
 class CacheKey(Serializable, ABC, Generic[K]):
@@ -67,6 +74,26 @@ class CacheKey(Serializable, ABC, Generic[K]):
             K: The real object of current cache key
         """
 
+    def get_similarity_text(self) -> Optional[str]:
+        """Return the text to embed for the similarity match.
+
+        Returns:
+            Optional[str]: The text, None if the key does not support the similarity
+                match.
+        """
+        return None
+
+    def get_similarity_scope(self) -> bytes:
+        """Return the scope of the similarity match.
+
+        Only the keys with the same scope can match each other, e.g. the LLM cache
+        keys must have the same model and generation parameters.
+
+        Returns:
+            bytes: The scope bytes
+        """
+        return b""
+
 
 class CacheValue(Serializable, ABC, Generic[V]):
     """Cache value abstract class."""
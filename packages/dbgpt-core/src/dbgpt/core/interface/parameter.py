@@ -144,6 +144,19 @@ class EmbeddingDeployModelParameters(BaseDeployModelParameters, RegisterParamete
     concurrency: Optional[int] = field(
         default=100, metadata={"help": _("Model concurrency limit")}
     )
+    batch_wait_ms: Optional[float] = field(
+        default=5.0,
+        metadata={
+            "help": _(
+                "The max time in milliseconds to wait for concurrent embedding "
+                "requests to be merged into one batch, 0 to disable batching"
+            )
+        },
+    )
+    max_batch_size: Optional[int] = field(
+        default=64,
+        metadata={"help": _("The max number of texts of one merged batch")},
+    )
 
     @classmethod
     def worker_type(cls) -> "WorkerType":
@@ -118,6 +118,30 @@ class StorageItemAdapter(Generic[T, TDataRepresentation]):
             Any: The query for the resource identifier
         """
 
+    def get_query_for_identifiers(
+        self,
+        storage_format: Type[TDataRepresentation],
+        resource_ids: List[ResourceIdentifier],
+        **kwargs,
+    ) -> Any:
+        """Get one query for many resource identifiers.
+
+        The query may return more data than the identifiers, e.g. the cross product
+        of the conditions of a composite identifier, the caller matches the data
+        with the identifiers.
+
+        Args:
+            storage_format (Type[TDataRepresentation]): The storage format
+            resource_ids (List[ResourceIdentifier]): The resource identifiers
+            kwargs: The additional arguments
+
+        Returns:
+            Any: The query for the resource identifiers, None if the adapter does not
+                support it, then the storage combines the queries of
+                :meth:`get_query_for_identifier`.
+        """
+        return None
+
 
 class DefaultStorageItemAdapter(StorageItemAdapter[T, T]):
     """Default storage item adapter.
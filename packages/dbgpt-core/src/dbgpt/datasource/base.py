@@ -153,12 +153,16 @@ class BaseConnector(ABC):
             List: result list
         """
 
-    def run_to_df(self, command: str, fetch: str = "all"):
+    def run_to_df(
+        self, command: str, fetch: str = "all", max_rows: Optional[int] = None
+    ):
         """Execute sql command and return result as dataframe.
 
         Args:
             command (str): sql command
             fetch (str): fetch type
+            max_rows (Optional[int]): The max number of rows of a query result, None
+                means no limit.
 
         Returns:
             DataFrame: result dataframe
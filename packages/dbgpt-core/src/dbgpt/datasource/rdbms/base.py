@@ -1,5 +1,6 @@
 """Base class for RDBMS connectors."""
 
+import hashlib
 import logging
 import re
 import weakref
@@ -9,10 +10,13 @@ from contextlib import contextmanager
 from dataclasses import dataclass, field
 from functools import wraps
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     Generator,
     Iterable,
+    Iterator,
     List,
     Optional,
     Set,
@@ -37,6 +41,11 @@ from dbgpt.util.i18n_utils import _
 from dbgpt_ext.datasource.schema import DBType
 
 from ..parameter import BaseDatasourceParameters
+from .schema_cache import SchemaCache, get_schema_cache, schema_cached
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
@@ -125,6 +134,8 @@ class RDBMSConnector(BaseConnector):
         indexes_in_table_info: bool = False,
         custom_table_info: Optional[Dict[str, str]] = None,
         view_support: bool = False,
+        schema_cache_ttl: Optional[float] = 60.0,
+        schema_cache_background_refresh: bool = False,
     ):
         """Create engine from database URI.
 
@@ -138,6 +149,10 @@ class RDBMSConnector(BaseConnector):
            - indexes_in_table_info: bool = False,
            - custom_table_info: Optional[dict] = None,
            - view_support: bool = False,
+           - schema_cache_ttl: Optional[float] = 60.0, the seconds to serve the
+             cached schema metadata without any check, None or 0 disables the cache
+           - schema_cache_background_refresh: bool = False, reload the expired
+             schema metadata in the background
         """
         self._is_closed = False
         self._engine = engine
@@ -162,8 +177,23 @@ class RDBMSConnector(BaseConnector):
         self._sample_rows_in_table_info = sample_rows_in_table_info
         self._indexes_in_table_info = indexes_in_table_info
 
-        self._metadata = metadata or MetaData()
-        self._metadata.reflect(bind=self._engine)
+        self._schema_cache: Optional[SchemaCache] = None
+        if schema_cache_ttl:
+            self._schema_cache = get_schema_cache(
+                self._schema_cache_id(),
+                ttl=schema_cache_ttl,
+                background_refresh=schema_cache_background_refresh,
+            )
+        # Whether the metadata is shared with the other connectors of the same
+        # database, it is never reflected in place
+        self._shared_metadata = metadata is None and self._schema_cache is not None
+        if self._shared_metadata:
+            # Reflecting all the tables is slow for the large databases, share the
+            # reflected metadata with the other connectors of the same database
+            self._metadata = self._cached("metadata", self._reflect_metadata)
+        else:
+            self._metadata = metadata or MetaData()
+            self._metadata.reflect(bind=self._engine)
 
         self._all_tables: Set[str] = cast(Set[str], self._sync_tables_from_db())
 
@@ -222,6 +252,58 @@ class RDBMSConnector(BaseConnector):
         """Return string representation of dialect to use."""
         return self._engine.dialect.name
 
+    def _schema_cache_id(self) -> str:
+        """Return the id of the schema cache shared by the same database."""
+        parts = [
+            self.db_type,
+            self._engine.url.render_as_string(hide_password=False),
+            str(self._schema),
+            str(self.view_support),
+            str(self._sample_rows_in_table_info),
+            str(self._indexes_in_table_info),
+        ]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    def _cached(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Get the value from the schema cache, load it if missing or expired."""
+        if self._schema_cache is None:
+            return loader()
+        return self._schema_cache.get(key, loader, self._schema_fingerprint)
+
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Return a cheap fingerprint of the DDL of current database.
+
+        None means the schema changes can't be detected, the cached schema
+        metadata is reloaded after the TTL. The connectors which can query the
+        checksum of their catalog cheaply override it.
+        """
+        return None
+
+    def invalidate_schema_cache(self) -> None:
+        """Invalidate the schema cache of current database."""
+        if self._schema_cache is not None:
+            self._schema_cache.invalidate()
+
+    def _reflect_metadata(self) -> MetaData:
+        metadata = MetaData()
+        metadata.reflect(bind=self._engine)
+        return metadata
+
+    def _reflect_tables(self, schema: Optional[str] = None) -> None:
+        """Reflect the tables into the metadata of the connector.
+
+        The metadata shared from the schema cache is never reflected in place, it
+        is taken from the cache again, which only reflects a new metadata when the
+        schema has changed.
+
+        Args:
+            schema (Optional[str]): The schema to reflect, None for the default.
+        """
+        if self._shared_metadata:
+            self._metadata = self._cached("metadata", self._reflect_metadata)
+            return
+        self._metadata.reflect(bind=self._engine, schema=schema)
+
     def _sync_tables_from_db(self) -> Iterable[str]:
         """Read table information from database."""
         # TODO Use a background thread to refresh periodically
@@ -302,6 +384,7 @@ class RDBMSConnector(BaseConnector):
             cursor = session.execute(text("SELECT DATABASE()"))
             return cursor.scalar()
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self):
         """Return table simple info."""
         _sql = f"""
@@ -349,24 +432,31 @@ class RDBMSConnector(BaseConnector):
                 tables.append(self._custom_table_info[table.name])
                 continue
 
-            # add create table command
-            create_table = str(CreateTable(table).compile(self._engine))
-            table_info = f"{create_table.rstrip()}"
-            has_extra_info = (
-                self._indexes_in_table_info or self._sample_rows_in_table_info
+            tables.append(
+                self._cached(
+                    f"table_info:{table.name}",
+                    lambda: self._build_table_info(table),  # noqa: B023
+                )
             )
-            if has_extra_info:
-                table_info += "\n\n/*"
-            if self._indexes_in_table_info:
-                table_info += f"\n{self._get_table_indexes(table)}\n"
-            if self._sample_rows_in_table_info:
-                table_info += f"\n{self._get_sample_rows(table)}\n"
-            if has_extra_info:
-                table_info += "*/"
-            tables.append(table_info)
         final_str = "\n\n".join(tables)
         return final_str
 
+    def _build_table_info(self, table: Table) -> str:
+        # add create table command
+        create_table = str(CreateTable(table).compile(self._engine))
+        table_info = f"{create_table.rstrip()}"
+        has_extra_info = self._indexes_in_table_info or self._sample_rows_in_table_info
+        if has_extra_info:
+            table_info += "\n\n/*"
+        if self._indexes_in_table_info:
+            table_info += f"\n{self._get_table_indexes(table)}\n"
+        if self._sample_rows_in_table_info:
+            table_info += f"\n{self._get_sample_rows(table)}\n"
+        if has_extra_info:
+            table_info += "*/"
+        return table_info
+
+    @schema_cached("columns")
     def get_columns(self, table_name: str) -> List[Dict]:
         """Get columns about specified table.
 
@@ -482,6 +572,7 @@ class RDBMSConnector(BaseConnector):
         params: Optional[Dict[str, Any]] = None,
         fetch: str = "all",
         timeout: Optional[float] = None,
+        max_rows: Optional[int] = None,
     ) -> Tuple[List[str], Optional[List]]:
         """Execute a SQL command and return the results with optional timeout.
 
@@ -493,6 +584,8 @@ class RDBMSConnector(BaseConnector):
             fetch (str): fetch type, either 'all' or 'one'
             timeout (Optional[float]): Query timeout in seconds. If None, no timeout is
                 applied.
+            max_rows (Optional[int]): The max number of rows to fetch, the rows are
+                fetched by a server-side cursor if set. If None, fetch all the rows.
 
         Returns:
             Tuple[List[str], Optional[List]]: (field_names, results)
@@ -513,7 +606,9 @@ class RDBMSConnector(BaseConnector):
         def _execute_query(session, sql_text, query_params):
             cursor = session.execute(sql_text, query_params)
             if cursor.returns_rows:
-                if fetch == "all":
+                if fetch == "all" and max_rows is not None:
+                    result = cursor.fetchmany(max_rows)
+                elif fetch == "all":
                     result = cursor.fetchall()
                 elif fetch == "one":
                     result = cursor.fetchone()
@@ -530,6 +625,10 @@ class RDBMSConnector(BaseConnector):
         with self.session_scope() as session:
             try:
                 sql = text(query)
+                if max_rows is not None:
+                    sql = sql.execution_options(
+                        stream_results=True, max_row_buffer=max(max_rows, 1)
+                    )
 
                 # Handle timeout based on database dialect
                 if timeout is not None:
@@ -609,6 +708,115 @@ class RDBMSConnector(BaseConnector):
                             f"Failed to reset timeout settings: {reset_error}"
                         )
 
+    def query_batches(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        max_rows: Optional[int] = None,
+    ) -> Iterator[Tuple[List[str], List]]:
+        """Execute a query and yield the results in batches.
+
+        The rows are fetched by a server-side cursor if the driver supports it, so
+        the whole result set is never materialized. Only for query command.
+
+        Args:
+            query (str): SQL query to run
+            params (Optional[dict]): Parameters for the query
+            batch_size (int): The number of rows of every batch
+            max_rows (Optional[int]): The max number of rows to fetch, None means no
+                limit.
+
+        Yields:
+            Tuple[List[str], List]: (field_names, rows) of every batch, at least one
+                batch is yielded if the query returns rows.
+        """
+        logger.info(f"Query[{query}] in batches of {batch_size}, max_rows={max_rows}")
+        if not query:
+            return
+        sql = text(self._format_sql(query)).execution_options(
+            stream_results=True, max_row_buffer=batch_size
+        )
+        with self.session_scope(commit=False) as session:
+            cursor = session.execute(sql, params or {})
+            if not cursor.returns_rows:
+                return
+            field_names = list(cursor.keys())
+            remaining = max_rows
+            yielded = False
+            try:
+                while remaining is None or remaining > 0:
+                    size = (
+                        batch_size if remaining is None else min(batch_size, remaining)
+                    )
+                    rows = cursor.fetchmany(size)
+                    if not rows:
+                        break
+                    if remaining is not None:
+                        remaining -= len(rows)
+                    yielded = True
+                    yield field_names, rows
+                if not yielded:
+                    yield field_names, []
+            finally:
+                # Stop fetching the rest rows from the server
+                cursor.close()
+
+    def query_df_chunks(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = 1000,
+        max_rows: Optional[int] = None,
+    ) -> Iterator["pd.DataFrame"]:
+        """Execute a query and yield the results as DataFrame chunks.
+
+        Args:
+            query (str): SQL query to run
+            params (Optional[dict]): Parameters for the query
+            chunk_size (int): The number of rows of every chunk
+            max_rows (Optional[int]): The max number of rows to fetch, None means no
+                limit.
+        """
+        import pandas as pd
+
+        for field_names, rows in self.query_batches(
+            query, params, chunk_size, max_rows
+        ):
+            yield pd.DataFrame(rows, columns=field_names)
+
+    def query_arrow_batches(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        max_rows: Optional[int] = None,
+    ) -> Iterator["pa.RecordBatch"]:
+        """Execute a query and yield the results as Arrow record batches.
+
+        Args:
+            query (str): SQL query to run
+            params (Optional[dict]): Parameters for the query
+            batch_size (int): The number of rows of every batch
+            max_rows (Optional[int]): The max number of rows to fetch, None means no
+                limit.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError(
+                "pyarrow is not installed, please install it with `pip install "
+                "pyarrow`."
+            )
+
+        for field_names, rows in self.query_batches(
+            query, params, batch_size, max_rows
+        ):
+            columns = list(zip(*rows)) if rows else [[] for _ in field_names]
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(column) for column in columns], names=field_names
+            )
+
     def _format_sql(self, sql: str) -> str:
         """Format SQL command."""
         if not sql:
@@ -637,6 +845,7 @@ class RDBMSConnector(BaseConnector):
             )
             with self.session_scope(commit=False) as session:
                 cursor = session.execute(text(command))
+                self.invalidate_schema_cache()
                 if cursor.returns_rows:
                     result = cursor.fetchall()
                     field_names = tuple(i[0:] for i in cursor.keys())
@@ -650,12 +859,45 @@ class RDBMSConnector(BaseConnector):
                 else:
                     return self.get_simple_fields(table_name)
 
-    def run_to_df(self, command: str, fetch: str = "all"):
-        """Execute sql command and return result as dataframe."""
+    def run_to_df(
+        self, command: str, fetch: str = "all", max_rows: Optional[int] = None
+    ):
+        """Execute sql command and return result as dataframe.
+
+        The result of a query is built from the streamed chunks, the rows are never
+        all held as Python tuples. If `max_rows` is set, at most `max_rows` rows are
+        fetched and the rest of the result is never read from the database.
+
+        Args:
+            command (str): sql command
+            fetch (str): fetch type
+            max_rows (Optional[int]): The max number of rows of a query result, None
+                means no limit.
+        """
         import pandas as pd
 
         # Pandas has too much dependence and the import time is too long
         # TODO: Remove the dependency on pandas
+        _, ttype, sql_type, _ = self.__sql_parse(command)
+        if fetch == "all" and ttype == sqlparse.tokens.DML and sql_type == "SELECT":
+            if max_rows is None:
+                chunks = list(self.query_df_chunks(command))
+            else:
+                # Fetch one more row to know whether the result is truncated
+                chunks = list(
+                    self.query_df_chunks(
+                        command, chunk_size=max_rows + 1, max_rows=max_rows + 1
+                    )
+                )
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            if max_rows is not None and len(df) > max_rows:
+                logger.warning(
+                    f"The result of the query is truncated to {max_rows} rows: "
+                    f"{command}"
+                )
+                df = df.iloc[:max_rows]
+            return df
+
         result_lst = self.run(command, fetch)
         colunms = result_lst[0]
         values = result_lst[1:]
@@ -763,6 +1005,7 @@ class RDBMSConnector(BaseConnector):
                 return token.get_real_name()
         return None
 
+    @schema_cached("indexes")
     def get_indexes(self, table_name: str) -> List[Dict]:
         """Get table indexes about specified table.
 
@@ -804,14 +1047,14 @@ class RDBMSConnector(BaseConnector):
     def get_charset(self) -> str:
         """Get character_set."""
         # Special handling for Doris database
-        if hasattr(self, 'db_type') and self.db_type == 'doris':
+        if hasattr(self, "db_type") and self.db_type == "doris":
             return "utf-8"
-        
+
         try:
-        with self.session_scope() as session:
-            cursor = session.execute(text("SELECT @@character_set_database"))
-            character_set = cursor.fetchone()[0]  # type: ignore
-            return character_set
+            with self.session_scope() as session:
+                cursor = session.execute(text("SELECT @@character_set_database"))
+                character_set = cursor.fetchone()[0]  # type: ignore
+                return character_set
         except Exception:
             # Fallback for databases that don't support MySQL system variables
             return "utf-8"
@@ -819,14 +1062,14 @@ class RDBMSConnector(BaseConnector):
     def get_collation(self):
         """Get collation."""
         # Special handling for Doris database
-        if hasattr(self, 'db_type') and self.db_type == 'doris':
+        if hasattr(self, "db_type") and self.db_type == "doris":
             return "utf8_general_ci"
-            
+
         try:
-        with self.session_scope() as session:
-            cursor = session.execute(text("SELECT @@collation_database"))
-            collation = cursor.fetchone()[0]
-            return collation
+            with self.session_scope() as session:
+                cursor = session.execute(text("SELECT @@collation_database"))
+                collation = cursor.fetchone()[0]
+                return collation
         except Exception:
             # Fallback for databases that don't support MySQL system variables
             return "utf8_general_ci"
@@ -862,6 +1105,7 @@ class RDBMSConnector(BaseConnector):
                 (table_comment[0], table_comment[1]) for table_comment in table_comments
             ]
 
+    @schema_cached("table_comment")
     def get_table_comment(self, table_name: str) -> Dict:
         """Get table comments.
 
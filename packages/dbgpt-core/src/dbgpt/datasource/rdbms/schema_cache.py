@@ -0,0 +1,222 @@
+"""Schema metadata cache of the RDBMS connectors.
+
+The connectors are created for every chat turn, so the cache is shared by all the
+connectors of the same database. The cached entries are served for `ttl` seconds,
+then revalidated by a cheap DDL fingerprint of the database if the connector
+supports it, otherwise reloaded.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Set, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+FingerprintFunc = Callable[[], Optional[str]]
+
+_REFRESH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="schema_cache_refresh"
+)
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    loaded_at: float
+
+
+class SchemaCache:
+    """The schema metadata cache of one database."""
+
+    def __init__(self, ttl: float = 60.0, background_refresh: bool = False):
+        """Create a new SchemaCache.
+
+        Args:
+            ttl (float): The seconds to serve an entry without any check.
+            background_refresh (bool): Whether to serve the expired entry and reload
+                it in the background, when the schema can't be revalidated.
+        """
+        self._ttl = ttl
+        self._background_refresh = background_refresh
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.RLock()
+        self._refreshing: Set[str] = set()
+        # The DDL fingerprint of the database when the entries were loaded
+        self._fingerprint: Optional[str] = None
+        self._fingerprint_supported = True
+        self._validated_at = 0.0
+
+    def get(
+        self,
+        key: str,
+        loader: Callable[[], T],
+        fingerprint_func: Optional[FingerprintFunc] = None,
+    ) -> T:
+        """Get the cached value of the key, load it if missing or expired.
+
+        Args:
+            key (str): The cache key.
+            loader (Callable[[], T]): Load the value from the database.
+            fingerprint_func (Optional[FingerprintFunc]): Return the DDL fingerprint
+                of the database, or None if not supported.
+
+        Returns:
+            T: The value.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.loaded_at < self._ttl:
+                return entry.value
+        if entry is not None:
+            if self._is_unchanged(fingerprint_func):
+                entry.loaded_at = time.monotonic()
+                return entry.value
+            if self._background_refresh and key in self._entries:
+                self._refresh_in_background(key, loader)
+                return entry.value
+        return self._load(key, loader, fingerprint_func)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Invalidate the entry of the key, or all the entries."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._fingerprint = None
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        """Return the number of the entries."""
+        return len(self._entries)
+
+    def _is_unchanged(self, fingerprint_func: Optional[FingerprintFunc]) -> bool:
+        """Check whether the schema is unchanged since the entries were loaded.
+
+        All the entries are dropped if the DDL fingerprint has changed.
+        """
+        if not fingerprint_func or not self._fingerprint_supported:
+            return False
+        now = time.monotonic()
+        if now - self._validated_at < self._ttl:
+            return True
+        fingerprint = self._compute_fingerprint(fingerprint_func)
+        with self._lock:
+            if fingerprint is None:
+                return False
+            if fingerprint == self._fingerprint:
+                self._validated_at = now
+                return True
+            logger.info("Database schema changed, invalidate the schema cache")
+            self._entries.clear()
+            self._fingerprint = None
+            return False
+
+    def _load(
+        self,
+        key: str,
+        loader: Callable[[], T],
+        fingerprint_func: Optional[FingerprintFunc],
+    ) -> T:
+        # Take the fingerprint before loading, a DDL in between is detected by the
+        # next revalidation
+        fingerprint = None
+        if fingerprint_func and self._fingerprint_supported and not self._fingerprint:
+            fingerprint = self._compute_fingerprint(fingerprint_func)
+        value = loader()
+        now = time.monotonic()
+        with self._lock:
+            if fingerprint is not None and not self._fingerprint:
+                self._fingerprint = fingerprint
+                self._validated_at = now
+            self._entries[key] = _CacheEntry(value, now)
+        return value
+
+    def _compute_fingerprint(self, fingerprint_func: FingerprintFunc) -> Optional[str]:
+        try:
+            fingerprint = fingerprint_func()
+        except Exception as e:
+            # A transient error, e.g. a timeout, reload the entries this time and
+            # revalidate again after the next TTL
+            logger.warning(f"Compute the schema fingerprint failed: {e}")
+            return None
+        if fingerprint is None:
+            # Not supported by the connector, fall back to the plain TTL
+            self._fingerprint_supported = False
+        return fingerprint
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                self._load(key, loader, None)
+            except Exception as e:
+                logger.warning(f"Refresh the schema cache of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        _REFRESH_EXECUTOR.submit(_refresh)
+
+
+_SCHEMA_CACHES: Dict[str, SchemaCache] = {}
+_SCHEMA_CACHES_LOCK = threading.Lock()
+
+
+def get_schema_cache(
+    cache_id: str, ttl: float = 60.0, background_refresh: bool = False
+) -> SchemaCache:
+    """Get the shared schema cache of the database, create it if not exists.
+
+    Args:
+        cache_id (str): The unique id of the database.
+        ttl (float): The seconds to serve an entry without any check.
+        background_refresh (bool): Whether to reload the expired entry in the
+            background.
+    """
+    with _SCHEMA_CACHES_LOCK:
+        cache = _SCHEMA_CACHES.get(cache_id)
+        if cache is None:
+            cache = SchemaCache(ttl=ttl, background_refresh=background_refresh)
+            _SCHEMA_CACHES[cache_id] = cache
+        return cache
+
+
+def schema_cached(name: str):
+    """Cache the result of the connector method in the schema cache.
+
+    The connector must have the `_schema_cache` attribute, None disables the
+    cache, and may have the `_schema_fingerprint` method.
+
+    Args:
+        name (str): The name of the cached method, the prefix of the cache key.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache: Optional[SchemaCache] = getattr(self, "_schema_cache", None)
+            if cache is None:
+                return func(self, *args, **kwargs)
+            key = name
+            if args or kwargs:
+                key = f"{name}:{args!r}:{sorted(kwargs.items())!r}"
+            return cache.get(
+                key,
+                lambda: func(self, *args, **kwargs),
+                getattr(self, "_schema_fingerprint", None),
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,118 @@
+import time
+
+from ..schema_cache import SchemaCache, schema_cached
+
+
+class _Loader:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+def test_serve_within_ttl():
+    cache = SchemaCache(ttl=60)
+    loader = _Loader()
+    assert cache.get("k", loader) == 1
+    assert cache.get("k", loader) == 1
+    assert loader.calls == 1
+
+
+def test_reload_after_ttl_without_fingerprint():
+    cache = SchemaCache(ttl=0.01)
+    loader = _Loader()
+    cache.get("k", loader)
+    time.sleep(0.02)
+    assert cache.get("k", loader) == 2
+
+
+def test_revalidate_by_fingerprint():
+    cache = SchemaCache(ttl=0.01)
+    loader = _Loader()
+    fingerprint = ["v1"]
+    assert cache.get("k", loader, lambda: fingerprint[0]) == 1
+    time.sleep(0.02)
+    # Unchanged schema, keep the entry
+    assert cache.get("k", loader, lambda: fingerprint[0]) == 1
+    fingerprint[0] = "v2"
+    time.sleep(0.02)
+    assert cache.get("k", loader, lambda: fingerprint[0]) == 2
+    assert loader.calls == 2
+
+
+def test_unsupported_fingerprint_fallback_to_ttl():
+    cache = SchemaCache(ttl=0.01)
+    loader = _Loader()
+    cache.get("k", loader, lambda: None)
+    time.sleep(0.02)
+    assert cache.get("k", loader, lambda: None) == 2
+
+
+def test_fingerprint_error_retried():
+    errors = [RuntimeError("timeout")]
+
+    def _fingerprint():
+        if errors:
+            raise errors.pop()
+        return "v1"
+
+    cache = SchemaCache(ttl=0.01)
+    loader = _Loader()
+    # The failed fingerprint falls back to the TTL once
+    assert cache.get("k", loader, _fingerprint) == 1
+    time.sleep(0.02)
+    assert cache.get("k", loader, _fingerprint) == 2
+    time.sleep(0.02)
+    # The schema is revalidated by the fingerprint again
+    assert cache.get("k", loader, _fingerprint) == 2
+    assert loader.calls == 2
+
+
+def test_background_refresh():
+    cache = SchemaCache(ttl=0.01, background_refresh=True)
+    loader = _Loader()
+    cache.get("k", loader)
+    time.sleep(0.02)
+    # Serve the expired value, reload it in the background
+    assert cache.get("k", loader) == 1
+    for _ in range(100):
+        if loader.calls == 2:
+            break
+        time.sleep(0.01)
+    assert cache.get("k", loader) == 2
+
+
+def test_invalidate():
+    cache = SchemaCache(ttl=60)
+    loader = _Loader()
+    cache.get("a", loader)
+    cache.get("b", loader)
+    cache.invalidate("a")
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_schema_cached_decorator():
+    class _Connector:
+        def __init__(self, cache):
+            self._schema_cache = cache
+            self.calls = 0
+
+        @schema_cached("columns")
+        def get_columns(self, table_name):
+            self.calls += 1
+            return [table_name]
+
+    conn = _Connector(SchemaCache(ttl=60))
+    assert conn.get_columns("a") == ["a"]
+    assert conn.get_columns("a") == ["a"]
+    assert conn.get_columns("b") == ["b"]
+    assert conn.calls == 2
+
+    conn = _Connector(None)
+    conn.get_columns("a")
+    conn.get_columns("a")
+    assert conn.calls == 2
@@ -35,6 +35,9 @@ class ModelInstance:
     last_heartbeat: Optional[datetime] = None
     # Remove from the registry
     remove_from_registry: Optional[bool] = False
+    # The load reported by heartbeat, used by the load aware routing
+    in_flight: Optional[int] = 0
+    latency_ewma_ms: Optional[float] = None
 
     def to_dict(self) -> Dict:
         """Convert to dict"""
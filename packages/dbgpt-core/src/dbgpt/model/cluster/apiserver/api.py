@@ -8,6 +8,7 @@ import asyncio
 import json
 import logging
 import os
+from contextlib import aclosing
 from typing import Any, Dict, Generator, List, Optional
 
 import shortuuid
@@ -49,7 +50,12 @@ from dbgpt.model.base import ModelInstance
 from dbgpt.model.cluster.manager_base import WorkerManager, WorkerManagerFactory
 from dbgpt.model.cluster.registry import ModelRegistry
 from dbgpt.model.parameter import ModelAPIServerParameters, WorkerType
-from dbgpt.util.chat_util import transform_to_sse
+from dbgpt.util.chat_util import merge_async_iterators, transform_to_sse
+from dbgpt.util.embedding_utils import (
+    EMBEDDING_ENCODING_BASE64,
+    EMBEDDING_ENCODING_FLOAT,
+    encode_embedding_base64,
+)
 from dbgpt.util.fastapi import create_app
 from dbgpt.util.tracer import initialize_tracer, root_tracer, trace
 from dbgpt.util.tracer.tracer_impl import TracerParameters
@@ -184,6 +190,47 @@ def check_requests(request) -> Optional[JSONResponse]:
     return None
 
 
+def _sum_usage(usages: List[UsageInfo]) -> UsageInfo:
+    """Sum the usage of the choices."""
+    return UsageInfo(
+        prompt_tokens=sum(usage.prompt_tokens for usage in usages),
+        total_tokens=sum(usage.total_tokens for usage in usages),
+        completion_tokens=sum(usage.completion_tokens or 0 for usage in usages),
+    )
+
+
+class _StreamedText:
+    """The text streamed to the client for one choice.
+
+    The model outputs are either cumulative, then the new text is sliced out, or
+    incremental (see :mod:`dbgpt.model.cluster.worker.delta_stream`), then the
+    new text is used as is. The replacement character of an incomplete UTF-8
+    sequence is removed, it is replaced by the decoded character later.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._length = 0
+
+    def update(self, text: str, incremental: bool) -> str:
+        """Return the new text of the output."""
+        decoded_unicode = text.replace("\ufffd", "")
+        if incremental:
+            delta_text = decoded_unicode
+            self._parts.append(decoded_unicode)
+        else:
+            delta_text = decoded_unicode[self._length :]
+            if len(decoded_unicode) > self._length:
+                self._parts = [decoded_unicode]
+        self._length += len(delta_text)
+        return delta_text
+
+    @property
+    def text(self) -> str:
+        """The full text streamed."""
+        return "".join(self._parts)
+
+
 class APIServer(BaseComponent):
     name = ComponentType.MODEL_API_SERVER
 
@@ -295,21 +342,24 @@ class APIServer(BaseComponent):
     ) -> Generator[str, Any, None]:
         """Chat stream completion generator
 
+        The n completions are generated concurrently, and their chunks are sent as
+        soon as they are generated, distinguished by the choice index.
+
         Args:
             model_name (str): Model name
             params (Dict[str, Any]): The parameters pass to model worker
             n (int): How many completions to generate for each prompt.
         """
         worker_manager = self.get_worker_manager()
+        # Only the new text of every output is needed
+        params = {**params, "stream_delta": True}
         id = f"chatcmpl-{shortuuid.random()}"
         finish_stream_events = []
-        curr_usage = UsageInfo()
-        last_usage = UsageInfo()
+        choice_usages = [UsageInfo() for _ in range(n)]
+        streamed_texts = [_StreamedText() for _ in range(n)]
+        streamed_thinkings = [_StreamedText() for _ in range(n)]
+        spans = []
         for i in range(n):
-            last_usage.prompt_tokens += curr_usage.prompt_tokens
-            last_usage.completion_tokens += curr_usage.completion_tokens
-            last_usage.total_tokens += curr_usage.total_tokens
-
             # First chunk with role
             choice_data = ChatCompletionResponseStreamChoice(
                 index=i,
@@ -320,46 +370,38 @@ class APIServer(BaseComponent):
                 id=id,
                 choices=[choice_data],
                 model=model_name,
-                usage=last_usage,
+                usage=_sum_usage(choice_usages),
             )
             yield transform_to_sse(chunk)
-
-            delta_text = ""
-            previous_text = ""
-            thinking_text = ""
-            previous_thinking_text = ""
-            full_text = ""
-
-            span = root_tracer.start_span(
-                "API.chat_completion_stream_generator",
-                metadata={
-                    "model": model_name,
-                    "params": json.dumps(params, ensure_ascii=False),
-                },
+            spans.append(
+                root_tracer.start_span(
+                    "API.chat_completion_stream_generator",
+                    metadata={
+                        "model": model_name,
+                        "params": json.dumps(params, ensure_ascii=False),
+                        "index": i,
+                    },
+                )
             )
 
-            async for model_output in worker_manager.generate_stream(params):
+        # Every stream has its own params, the worker manager modifies them
+        streams = [worker_manager.generate_stream({**params}) for _ in range(n)]
+        async with aclosing(merge_async_iterators(streams)) as outputs:
+            async for i, model_output in outputs:
                 model_output: ModelOutput = model_output
                 if model_output.error_code != 0:
                     yield transform_to_sse(model_output.to_dict())
                     yield transform_to_sse("[DONE]")
                     return
+                delta_text = None
+                thinking_text = None
                 if model_output.has_text:
-                    full_text = model_output.text
-                    decoded_unicode = model_output.text.replace("\ufffd", "")
-                    delta_text = decoded_unicode[len(previous_text) :]
-                    previous_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_text)
-                        else previous_text
+                    delta_text = streamed_texts[i].update(
+                        model_output.text, model_output.incremental
                     )
                 if model_output.has_thinking:
-                    decoded_unicode = model_output.thinking_text.replace("\ufffd", "")
-                    thinking_text = decoded_unicode[len(previous_thinking_text) :]
-                    previous_thinking_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_thinking_text)
-                        else previous_thinking_text
+                    thinking_text = streamed_thinkings[i].update(
+                        model_output.thinking_text, model_output.incremental
                     )
 
                 if not delta_text:
@@ -369,15 +411,9 @@ class APIServer(BaseComponent):
 
                 has_usage = False
                 if model_output.usage:
-                    curr_usage = UsageInfo.model_validate(model_output.usage)
+                    choice_usages[i] = UsageInfo.model_validate(model_output.usage)
                     has_usage = True
-                    usage = UsageInfo(
-                        prompt_tokens=last_usage.prompt_tokens
-                        + curr_usage.prompt_tokens,
-                        total_tokens=last_usage.total_tokens + curr_usage.total_tokens,
-                        completion_tokens=last_usage.completion_tokens
-                        + curr_usage.completion_tokens,
-                    )
+                    usage = _sum_usage(choice_usages)
                 else:
                     usage = UsageInfo()
                 choice_data = ChatCompletionResponseStreamChoice(
@@ -397,9 +433,10 @@ class APIServer(BaseComponent):
                         continue
 
                 yield transform_to_sse(chunk)
+        for span, streamed_text in zip(spans, streamed_texts):
             span.end(
                 metadata={
-                    "full_text": full_text,
+                    "full_text": streamed_text.text,
                 }
             )
 
@@ -423,7 +460,7 @@ class APIServer(BaseComponent):
         choices = []
         chat_completions = []
         for i in range(n):
-            model_output = asyncio.create_task(worker_manager.generate(params))
+            model_output = asyncio.create_task(worker_manager.generate({**params}))
             chat_completions.append(model_output)
         try:
             all_tasks = await asyncio.gather(*chat_completions)
@@ -459,65 +496,54 @@ class APIServer(BaseComponent):
         id = f"cmpl-{shortuuid.random()}"
         finish_stream_events = []
         params["span_id"] = root_tracer.get_current_span_id()
-        curr_usage = UsageInfo()
-        last_usage = UsageInfo()
-        for text in request.prompt:
-            for i in range(request.n):
-                params["prompt"] = text
-                previous_text = ""
-                last_usage.prompt_tokens += curr_usage.prompt_tokens
-                last_usage.completion_tokens += curr_usage.completion_tokens
-                last_usage.total_tokens += curr_usage.total_tokens
-
-                async for model_output in worker_manager.generate_stream(params):
-                    model_output: ModelOutput = model_output
-                    if model_output.error_code != 0:
-                        yield transform_to_sse(model_output.to_dict())
-                        yield transform_to_sse("[DONE]")
-                        return
-                    decoded_unicode = model_output.text.replace("\ufffd", "")
-                    delta_text = decoded_unicode[len(previous_text) :]
-                    previous_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_text)
-                        else previous_text
-                    )
+        params["stream_delta"] = True
+        # The n completions of all the prompts are generated concurrently, the
+        # choice index is `prompt_index * n + i`, as in `completion_generate`
+        streams = [
+            worker_manager.generate_stream({**params, "prompt": text})
+            for text in request.prompt
+            for _ in range(request.n)
+        ]
+        choice_usages = [UsageInfo() for _ in streams]
+        streamed_texts = [_StreamedText() for _ in streams]
+        async with aclosing(merge_async_iterators(streams)) as outputs:
+            async for i, model_output in outputs:
+                model_output: ModelOutput = model_output
+                if model_output.error_code != 0:
+                    yield transform_to_sse(model_output.to_dict())
+                    yield transform_to_sse("[DONE]")
+                    return
+                delta_text = streamed_texts[i].update(
+                    model_output.text, model_output.incremental
+                )
 
-                    if len(delta_text) == 0:
-                        delta_text = None
+                if len(delta_text) == 0:
+                    delta_text = None
 
-                    choice_data = CompletionResponseStreamChoice(
-                        index=i,
-                        text=delta_text or "",
-                        # TODO: logprobs
-                        logprobs=None,
-                        finish_reason=model_output.finish_reason,
-                    )
-                    if model_output.usage:
-                        curr_usage = UsageInfo.model_validate(model_output.usage)
-                        usage = UsageInfo(
-                            prompt_tokens=last_usage.prompt_tokens
-                            + curr_usage.prompt_tokens,
-                            total_tokens=last_usage.total_tokens
-                            + curr_usage.total_tokens,
-                            completion_tokens=last_usage.completion_tokens
-                            + curr_usage.completion_tokens,
-                        )
-                    else:
-                        usage = UsageInfo()
-                    chunk = CompletionStreamResponse(
-                        id=id,
-                        object="text_completion",
-                        choices=[choice_data],
-                        model=request.model,
-                        usage=UsageInfo.model_validate(usage),
-                    )
-                    if delta_text is None:
-                        if model_output.finish_reason is not None:
-                            finish_stream_events.append(chunk)
-                        continue
-                    yield transform_to_sse(chunk)
-                last_usage = curr_usage
+                choice_data = CompletionResponseStreamChoice(
+                    index=i,
+                    text=delta_text or "",
+                    # TODO: logprobs
+                    logprobs=None,
+                    finish_reason=model_output.finish_reason,
+                )
+                if model_output.usage:
+                    choice_usages[i] = UsageInfo.model_validate(model_output.usage)
+                    usage = _sum_usage(choice_usages)
+                else:
+                    usage = UsageInfo()
+                chunk = CompletionStreamResponse(
+                    id=id,
+                    object="text_completion",
+                    choices=[choice_data],
+                    model=request.model,
+                    usage=usage,
+                )
+                if delta_text is None:
+                    if model_output.finish_reason is not None:
+                        finish_stream_events.append(chunk)
+                    continue
+                yield transform_to_sse(chunk)
         # There is not "content" field in the last delta message, so exclude_none to
         # exclude field "content".
         for finish_chunk in finish_stream_events:
@@ -532,8 +558,9 @@ class APIServer(BaseComponent):
         completions = []
         for text in request.prompt:
             for i in range(request.n):
-                params["prompt"] = text
-                model_output = asyncio.create_task(worker_manager.generate(params))
+                model_output = asyncio.create_task(
+                    worker_manager.generate({**params, "prompt": text})
+                )
                 completions.append(model_output)
         try:
             all_tasks = await asyncio.gather(*completions)
@@ -738,6 +765,16 @@ async def create_embeddings(
     request: EmbeddingsRequest, api_server: APIServer = Depends(get_api_server)
 ):
     await api_server.get_model_instances_or_raise(request.model, worker_type="text2vec")
+    if request.encoding_format not in (
+        None,
+        EMBEDDING_ENCODING_FLOAT,
+        EMBEDDING_ENCODING_BASE64,
+    ):
+        return create_error_response(
+            ErrorCode.PARAM_OUT_OF_RANGE,
+            f"{request.encoding_format} is not one of ['float', 'base64'] - "
+            "'encoding_format'",
+        )
     texts = request.input
     if isinstance(texts, str):
         texts = [texts]
@@ -758,6 +795,8 @@ async def create_embeddings(
     # Request all embeddings in parallel
     batch_embeddings: List[List[List[float]]] = await asyncio.gather(*async_tasks)
     for num_batch, embeddings in enumerate(batch_embeddings):
+        if request.encoding_format == EMBEDDING_ENCODING_BASE64:
+            embeddings = [encode_embedding_base64(emb) for emb in embeddings]
         data += [
             {
                 "object": "embedding",
@@ -802,7 +841,12 @@ async def create_relevance(
     )
 
 
-def _initialize_all(controller_addr: str, system_app: SystemApp):
+def _initialize_all(
+    controller_addr: str,
+    system_app: SystemApp,
+    worker_max_connections: int = 100,
+    routing_strategy: Optional[str] = None,
+):
     from dbgpt.model.cluster.controller.controller import ModelRegistryClient
     from dbgpt.model.cluster.worker.manager import _DefaultWorkerManagerFactory
     from dbgpt.model.cluster.worker.remote_manager import RemoteWorkerManager
@@ -818,7 +862,11 @@ def _initialize_all(controller_addr: str, system_app: SystemApp):
     registry = system_app.get_component(
         ComponentType.MODEL_REGISTRY, ModelRegistry, default_component=None
     )
-    worker_manager = RemoteWorkerManager(registry)
+    worker_manager = RemoteWorkerManager(
+        registry,
+        max_connections=worker_max_connections,
+        routing_strategy=routing_strategy,
+    )
 
     # Register worker manager component if not exist
     system_app.get_component(
@@ -891,7 +939,12 @@ def initialize_apiserver(
         logger.warning(message)
         return create_error_response(ErrorCode.VALIDATION_TYPE_ERROR, message)
 
-    _initialize_all(apiserver_params.controller_addr, system_app)
+    _initialize_all(
+        apiserver_params.controller_addr,
+        system_app,
+        worker_max_connections=apiserver_params.worker_max_connections or 100,
+        routing_strategy=apiserver_params.routing_strategy,
+    )
 
     if not embedded_mod:
         import uvicorn
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
@@ -13,6 +15,7 @@ from dbgpt.model.cluster.worker.manager import _DefaultWorkerManagerFactory
 from dbgpt.model.parameter import ModelAPIServerParameters
 from dbgpt.util.fastapi import create_app
 from dbgpt.util.openai_utils import chat_completion, chat_completion_stream
+from dbgpt.util.tracer import TracerParameters
 from dbgpt.util.utils import LoggingParameters
 
 app = create_app()
@@ -31,7 +34,7 @@ async def system_app():
 
 
 @pytest_asyncio.fixture
-async def client(request, system_app: SystemApp):
+async def client(request, system_app: SystemApp, tmp_path):
     param = getattr(request, "param", {})
     api_keys = param.get("api_keys", [])
     client_api_key = param.get("client_api_key")
@@ -43,8 +46,15 @@ async def client(request, system_app: SystemApp):
     if client_api_key:
         headers["Authorization"] = "Bearer " + client_api_key
     print(f"param: {param}")
+    # Keep the logs and the tracer file of the tests out of the working directory
     api_params = ModelAPIServerParameters(
-        log=LoggingParameters(level="INFO"), api_keys=api_keys
+        log=LoggingParameters(
+            level="INFO", file=str(tmp_path / "dbgpt_model_apiserver.log")
+        ),
+        trace=TracerParameters(
+            file=str(tmp_path / "dbgpt_model_apiserver_tracer.jsonl")
+        ),
+        api_keys=api_keys,
     )
     app = create_app()
     if api_settings:
@@ -96,3 +106,40 @@ async def test_chat_completions(client: AsyncClient, expected_messages):
         await chat_completion("/api/v1/chat/completions", chat_data, client)
         == expected_messages
     )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "client",
+    [{"stream_messages": ["Hello", " world."]}],
+    indirect=["client"],
+)
+async def test_chat_completions_with_n_choices(client: AsyncClient):
+    chat_data = {
+        "model": "test-model-name-0",
+        "messages": [{"role": "user", "content": "Hello"}],
+        "stream": True,
+        "n": 3,
+    }
+    texts = {}
+    roles = []
+    async with client.stream(
+        "POST", "/api/v1/chat/completions", json=chat_data
+    ) as response:
+        async for line in response.aiter_lines():
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            choice = json.loads(line[len("data: ") :])["choices"][0]
+            if choice["delta"].get("role"):
+                roles.append(choice["index"])
+            texts.setdefault(choice["index"], "")
+            texts[choice["index"]] += choice["delta"].get("content") or ""
+    assert roles == [0, 1, 2]
+    assert texts == {i: "Hello world." for i in range(3)}
+
+    res = await client.post(
+        "/api/v1/chat/completions", json={**chat_data, "stream": False}
+    )
+    choices = res.json()["choices"]
+    assert [choice["index"] for choice in choices] == [0, 1, 2]
+    assert all(choice["message"]["content"] == "Hello world." for choice in choices)
@@ -34,6 +34,9 @@ class PromptRequest(BaseModel):
     frequency_penalty: Optional[float] = None
     chat_model: Optional[bool] = True
     """Whether to use chat model"""
+    stream_delta: bool = False
+    """Whether to stream only the new text of every output, see
+    :mod:`dbgpt.model.cluster.worker.delta_stream`"""
 
 
 class EmbeddingsRequest(BaseModel):
@@ -43,6 +46,9 @@ class EmbeddingsRequest(BaseModel):
     span_id: Optional[str] = None
     query: Optional[str] = None
     """For rerank model, query is required"""
+    encoding_format: Optional[str] = None
+    """The encoding of the embeddings in the response, "float" (default), "base64"
+    or "binary", see :mod:`dbgpt.util.embedding_utils`"""
 
 
 class CountTokenRequest(BaseModel):
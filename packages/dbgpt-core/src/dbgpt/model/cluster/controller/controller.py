@@ -180,7 +180,11 @@ def initialize_controller(
         controller.backend = _RemoteModelController(remote_controller_addr)
     else:
         if not registry:
-            registry = EmbeddedModelRegistry()
+            registry = EmbeddedModelRegistry(
+                routing_strategy=(
+                    controller_params.routing_strategy if controller_params else None
+                )
+            )
         controller.backend = LocalModelController(registry=registry)
 
     if app:
@@ -267,6 +271,7 @@ def _create_registry(controller_params: ModelControllerParameters) -> ModelRegis
         return EmbeddedModelRegistry(
             heartbeat_interval_secs=controller_params.heartbeat_interval_secs,
             heartbeat_timeout_secs=controller_params.heartbeat_timeout_secs,
+            routing_strategy=controller_params.routing_strategy,
         )
     elif isinstance(controller_params.registry, DBModelRegistryParameters):
         from dbgpt.datasource.rdbms.base import (
@@ -307,6 +312,7 @@ def _create_registry(controller_params: ModelControllerParameters) -> ModelRegis
             try_to_create_db=try_to_create_db,
             heartbeat_interval_secs=controller_params.heartbeat_interval_secs,
             heartbeat_timeout_secs=controller_params.heartbeat_timeout_secs,
+            routing_strategy=controller_params.routing_strategy,
         )
         return registry
     else:
@@ -1,19 +1,23 @@
 import asyncio
 from abc import ABC, abstractmethod
 from concurrent.futures import Future
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import AsyncIterator, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.core import ModelMetadata, ModelOutput
 from dbgpt.core.interface.parameter import BaseDeployModelParameters
 from dbgpt.model.base import WorkerApplyOutput, WorkerSupportedModel
 from dbgpt.model.cluster.base import WorkerApplyRequest, WorkerStartupRequest
+from dbgpt.model.cluster.routing import WorkerLoadStats
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.model.parameter import ModelWorkerParameters
 from dbgpt.util.parameter_utils import ParameterDescription
 
+if TYPE_CHECKING:
+    from dbgpt.model.cluster.worker.embedding_batcher import EmbeddingBatcher
+
 
 @dataclass
 class WorkerRunData:
@@ -31,6 +35,9 @@ class WorkerRunData:
     _last_heartbeat: Optional[datetime] = None
     # Remove from the registry, Just for stop worker
     remove_from_registry: bool = False
+    load_stats: WorkerLoadStats = field(default_factory=WorkerLoadStats)
+    # Merge the concurrent requests of local embedding workers
+    embedding_batcher: Optional["EmbeddingBatcher"] = None
 
     def _to_print_key(self):
         model_name = self.model_params.name
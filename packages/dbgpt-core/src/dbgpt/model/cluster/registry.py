@@ -1,15 +1,15 @@
 import itertools
 import logging
-import random
 import threading
 import time
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.model.base import ModelInstance
+from dbgpt.model.cluster.routing import RoutingStrategy, select_instance
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +23,17 @@ class ModelRegistry(BaseComponent, ABC):
 
     name = ComponentType.MODEL_REGISTRY
 
-    def __init__(self, system_app: SystemApp | None = None):
+    # The default routing strategy of `select_one_health_instance`
+    routing_strategy: RoutingStrategy = RoutingStrategy.RANDOM
+
+    def __init__(
+        self,
+        system_app: SystemApp | None = None,
+        routing_strategy: Optional[str] = None,
+    ):
         self.system_app = system_app
+        if routing_strategy:
+            self.routing_strategy = RoutingStrategy(routing_strategy)
         super().__init__(system_app)
 
     def init_app(self, system_app: SystemApp):
@@ -93,22 +102,31 @@ class ModelRegistry(BaseComponent, ABC):
         - List[ModelInstance]: A list of instances for the all models.
         """
 
-    async def select_one_health_instance(self, model_name: str) -> ModelInstance:
+    async def select_one_health_instance(
+        self, model_name: str, routing_strategy: Optional[RoutingStrategy] = None
+    ) -> ModelInstance:
         """
         Selects one healthy and enabled instance for a given model.
 
         Args:
         - model_name (str): Name of the model.
+        - routing_strategy (RoutingStrategy, optional): The strategy to select the
+            instance by the load reported in heartbeats. Defaults to
+            `self.routing_strategy`.
 
         Returns:
-        - ModelInstance: One randomly selected healthy and enabled instance, or None
+        - ModelInstance: One selected healthy and enabled instance, or None
             if no such instance exists.
         """
         instances = await self.get_all_instances(model_name, healthy_only=True)
         instances = [i for i in instances if i.enabled]
         if not instances:
             return None
-        return random.choice(instances)
+        return select_instance(
+            instances,
+            lambda ins: (ins.in_flight or 0, ins.latency_ewma_ms),
+            routing_strategy or self.routing_strategy,
+        )
 
     @abstractmethod
     async def send_heartbeat(self, instance: ModelInstance) -> bool:
@@ -130,8 +148,9 @@ class EmbeddedModelRegistry(ModelRegistry):
         system_app: SystemApp | None = None,
         heartbeat_interval_secs: int = 60,
         heartbeat_timeout_secs: int = 120,
+        routing_strategy: Optional[str] = None,
     ):
-        super().__init__(system_app)
+        super().__init__(system_app, routing_strategy=routing_strategy)
         self.registry: Dict[str, List[ModelInstance]] = defaultdict(list)
         self.heartbeat_interval_secs = heartbeat_interval_secs
         self.heartbeat_timeout_secs = heartbeat_timeout_secs
@@ -238,4 +257,6 @@ class EmbeddedModelRegistry(ModelRegistry):
         ins = exist_ins[0]
         ins.last_heartbeat = datetime.now()
         ins.healthy = True
+        ins.in_flight = instance.in_flight
+        ins.latency_ewma_ms = instance.latency_ewma_ms
         return True
@@ -17,6 +17,7 @@ from dbgpt.util.executor_utils import blocking_func_to_async
 
 from ...base import ModelInstance
 from ..registry import ModelRegistry
+from ..routing import InstanceLoad
 
 logger = logging.getLogger(__name__)
 
@@ -170,12 +171,15 @@ class StorageModelRegistry(ModelRegistry):
         executor: Optional[Executor] = None,
         heartbeat_interval_secs: float | int = 60,
         heartbeat_timeout_secs: int = 120,
+        routing_strategy: Optional[str] = None,
     ):
-        super().__init__(system_app)
+        super().__init__(system_app, routing_strategy=routing_strategy)
         self._storage = storage
         self._executor = executor or ThreadPoolExecutor(max_workers=2)
         self.heartbeat_interval_secs = heartbeat_interval_secs
         self.heartbeat_timeout_secs = heartbeat_timeout_secs
+        # The load reported by heartbeats is volatile, keep it in memory only
+        self._instance_loads: Dict[Tuple[str, str, int], InstanceLoad] = {}
         self.heartbeat_thread = threading.Thread(target=self._heartbeat_checker)
         self.heartbeat_thread.daemon = True
         self.heartbeat_thread.start()
@@ -243,6 +247,9 @@ class StorageModelRegistry(ModelRegistry):
                 ):
                     instance.healthy = False
                     self._storage.update(instance)
+                    self._instance_loads.pop(
+                        (instance.model_name, instance.host, instance.port), None
+                    )
             time.sleep(self.heartbeat_interval_secs)
 
     async def register_instance(self, instance: ModelInstance) -> bool:
@@ -282,6 +289,7 @@ class StorageModelRegistry(ModelRegistry):
         model_name = instance.model_name.strip()
         host = instance.host.strip()
         port = instance.port
+        self._instance_loads.pop((model_name, host, port), None)
         _, exist_ins = await self._get_instances_by_model(
             model_name, host, port, healthy_only=False
         )
@@ -330,7 +338,7 @@ class StorageModelRegistry(ModelRegistry):
         )
         if healthy_only:
             instances = [ins for ins in instances if ins.healthy is True]
-        return [ModelInstanceStorageItem.to_model_instance(ins) for ins in instances]
+        return [self._to_model_instance(ins) for ins in instances]
 
     async def get_all_model_instances(
         self, healthy_only: bool = False
@@ -351,9 +359,14 @@ class StorageModelRegistry(ModelRegistry):
         )
         if healthy_only:
             all_instances = [ins for ins in all_instances if ins.healthy is True]
-        return [
-            ModelInstanceStorageItem.to_model_instance(ins) for ins in all_instances
-        ]
+        return [self._to_model_instance(ins) for ins in all_instances]
+
+    def _to_model_instance(self, item: ModelInstanceStorageItem) -> ModelInstance:
+        instance = ModelInstanceStorageItem.to_model_instance(item)
+        load = self._instance_loads.get((item.model_name, item.host, item.port))
+        if load:
+            instance.in_flight, instance.latency_ewma_ms = load
+        return instance
 
     async def send_heartbeat(self, instance: ModelInstance) -> bool:
         """Receive heartbeat from model instance.
@@ -370,6 +383,10 @@ class StorageModelRegistry(ModelRegistry):
         model_name = instance.model_name.strip()
         host = instance.host.strip()
         port = instance.port
+        self._instance_loads[(model_name, host, port)] = (
+            instance.in_flight or 0,
+            instance.latency_ewma_ms,
+        )
         _, exist_ins = await self._get_instances_by_model(
             model_name, host, port, healthy_only=False
         )
@@ -0,0 +1,112 @@
+"""Load aware routing of the requests to the model instances."""
+
+import random
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# The load of an instance: (number of in-flight requests, latency EWMA in ms)
+InstanceLoad = Tuple[int, Optional[float]]
+
+
+class RoutingStrategy(str, Enum):
+    """The strategy to select one instance from the model instances."""
+
+    RANDOM = "random"
+    # Select the instance with the least in-flight requests
+    LEAST_OUTSTANDING = "least_outstanding"
+    # Sample two instances randomly, select the one with less in-flight requests
+    POWER_OF_TWO = "power_of_two"
+    # Select the instance with the lowest expected latency, which is the latency
+    # EWMA weighted by the number of in-flight requests
+    LATENCY_EWMA = "latency_ewma"
+
+    @staticmethod
+    def values() -> List[str]:
+        """Return all values of the strategies."""
+        return [item.value for item in RoutingStrategy]
+
+
+class WorkerLoadStats:
+    """The load statistics of one model instance.
+
+    Only touched by the event loop thread, so no lock is needed.
+    """
+
+    def __init__(self, alpha: float = 0.3):
+        """Create a new WorkerLoadStats.
+
+        Args:
+            alpha (float): The smoothing factor of the latency EWMA.
+        """
+        self.alpha = alpha
+        self.in_flight = 0
+        self.latency_ewma_ms: Optional[float] = None
+
+    def record_latency(self, latency_ms: float) -> None:
+        """Add a latency sample to the EWMA."""
+        if self.latency_ewma_ms is None:
+            self.latency_ewma_ms = latency_ms
+        else:
+            self.latency_ewma_ms += self.alpha * (latency_ms - self.latency_ewma_ms)
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Track one request, count it in-flight and record its latency."""
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.record_latency((time.perf_counter() - start) * 1000)
+
+    @property
+    def load(self) -> InstanceLoad:
+        """Return the current load."""
+        return self.in_flight, self.latency_ewma_ms
+
+
+def _expected_latency(load: InstanceLoad, default_latency: float) -> float:
+    in_flight, latency = load
+    return (in_flight + 1) * (latency if latency is not None else default_latency)
+
+
+def select_instance(
+    instances: List[T],
+    get_load: Callable[[T], InstanceLoad],
+    strategy: Optional[RoutingStrategy] = None,
+) -> T:
+    """Select one instance by the routing strategy.
+
+    Ties are broken randomly, so the idle instances share the traffic.
+
+    Args:
+        instances (List[T]): The candidate instances, must not be empty.
+        get_load (Callable[[T], InstanceLoad]): Return the load of an instance.
+        strategy (Optional[RoutingStrategy]): The routing strategy, default is
+            random.
+
+    Returns:
+        T: The selected instance.
+    """
+    strategy = RoutingStrategy(strategy or RoutingStrategy.RANDOM)
+    if len(instances) == 1 or strategy == RoutingStrategy.RANDOM:
+        return random.choice(instances)
+    if strategy == RoutingStrategy.POWER_OF_TWO:
+        candidates = random.sample(instances, 2)
+        return min(candidates, key=lambda ins: get_load(ins)[0])
+
+    loads = [get_load(ins) for ins in instances]
+    if strategy == RoutingStrategy.LEAST_OUTSTANDING:
+        scores: List[float] = [load[0] for load in loads]
+    else:
+        # The instances without latency samples are treated as the average one
+        known = [load[1] for load in loads if load[1] is not None]
+        default_latency = sum(known) / len(known) if known else 1.0
+        scores = [_expected_latency(load, default_latency) for load in loads]
+    best = min(scores)
+    return random.choice([ins for ins, s in zip(instances, scores) if s == best])
@@ -218,3 +218,17 @@ async def test_heartbeat_checker(
     await registry.send_heartbeat(model_instance)
     # Should be healthy again
     await check_heartbeat(model_instance.model_name, True)
+
+
+@pytest.mark.asyncio
+async def test_deregister_instance_prunes_load(registry, model_instance):
+    """Test the reported load is dropped when the instance is deregistered."""
+    model_instance.in_flight = 3
+    await registry.send_heartbeat(model_instance)
+    instances = await registry.get_all_instances(model_instance.model_name)
+    assert instances[0].in_flight == 3
+
+    await registry.deregister_instance(model_instance)
+    assert not registry._instance_loads
+    instances = await registry.get_all_instances(model_instance.model_name)
+    assert not instances[0].in_flight
@@ -0,0 +1,107 @@
+from collections import Counter
+from typing import Dict
+
+import pytest
+
+from dbgpt.model.base import ModelInstance
+from dbgpt.model.cluster.controller.controller import _create_registry
+from dbgpt.model.cluster.registry import EmbeddedModelRegistry
+from dbgpt.model.cluster.routing import (
+    InstanceLoad,
+    RoutingStrategy,
+    WorkerLoadStats,
+    select_instance,
+)
+from dbgpt.model.cluster.worker.remote_manager import RemoteWorkerManager
+from dbgpt.model.parameter import ModelControllerParameters
+
+
+def _select(loads: Dict[str, InstanceLoad], strategy: RoutingStrategy) -> str:
+    return select_instance(list(loads.keys()), lambda ins: loads[ins], strategy)
+
+
+def test_least_outstanding():
+    loads = {"a": (3, None), "b": (0, None), "c": (5, None)}
+    for _ in range(10):
+        assert _select(loads, RoutingStrategy.LEAST_OUTSTANDING) == "b"
+
+
+def test_power_of_two_never_selects_the_busiest():
+    loads = {"a": (3, None), "b": (0, None), "c": (5, None)}
+    counter = Counter(_select(loads, RoutingStrategy.POWER_OF_TWO) for _ in range(200))
+    assert counter["c"] == 0
+    assert counter["b"] > counter["a"]
+
+
+def test_latency_ewma():
+    # Proxy instance is fast but busy, local instance is slow and idle
+    loads = {"proxy": (4, 100.0), "local": (0, 1000.0)}
+    assert _select(loads, RoutingStrategy.LATENCY_EWMA) == "proxy"
+    loads = {"proxy": (20, 100.0), "local": (0, 1000.0)}
+    assert _select(loads, RoutingStrategy.LATENCY_EWMA) == "local"
+
+
+def test_random_with_single_instance():
+    assert _select({"a": (100, None)}, RoutingStrategy.LEAST_OUTSTANDING) == "a"
+    assert _select({"a": (100, None)}, RoutingStrategy.RANDOM) == "a"
+
+
+def test_worker_load_stats():
+    stats = WorkerLoadStats(alpha=0.5)
+    with stats.track():
+        assert stats.in_flight == 1
+    assert stats.in_flight == 0
+    assert stats.latency_ewma_ms is not None
+    stats.latency_ewma_ms = 100.0
+    stats.record_latency(200.0)
+    assert stats.load == (0, 150.0)
+
+
+@pytest.mark.asyncio
+async def test_registry_select_by_heartbeat_load():
+    registry = EmbeddedModelRegistry()
+    for port, in_flight in [(8001, 10), (8002, 1)]:
+        ins = ModelInstance(model_name="test@llm", host="127.0.0.1", port=port)
+        await registry.register_instance(ins)
+        ins.in_flight = in_flight
+        await registry.send_heartbeat(ins)
+    selected = await registry.select_one_health_instance(
+        "test@llm", RoutingStrategy.LEAST_OUTSTANDING
+    )
+    assert selected.port == 8002
+
+
+@pytest.mark.asyncio
+async def test_registry_routing_strategy_from_controller_params():
+    params = ModelControllerParameters(routing_strategy="least_outstanding")
+    registry = _create_registry(params)
+    assert registry.routing_strategy == RoutingStrategy.LEAST_OUTSTANDING
+    for port, in_flight in [(8001, 10), (8002, 1)]:
+        ins = ModelInstance(model_name="test@llm", host="127.0.0.1", port=port)
+        await registry.register_instance(ins)
+        ins.in_flight = in_flight
+        await registry.send_heartbeat(ins)
+    for _ in range(10):
+        selected = await registry.select_one_health_instance("test@llm")
+        assert selected.port == 8002
+    assert EmbeddedModelRegistry().routing_strategy == RoutingStrategy.RANDOM
+
+
+@pytest.mark.asyncio
+async def test_remote_manager_prunes_loads_of_removed_instances():
+    registry = EmbeddedModelRegistry()
+    manager = RemoteWorkerManager(model_registry=registry)
+    instances = [
+        ModelInstance(model_name="test@llm", host="127.0.0.1", port=port)
+        for port in [8001, 8002]
+    ]
+    for ins in instances:
+        await registry.register_instance(ins)
+    await manager.get_model_instances("llm", "test")
+    assert len(manager._load_stats) == 2
+
+    instances[0].remove_from_registry = True
+    await registry.deregister_instance(instances[0])
+    await manager.get_model_instances("llm", "test")
+    assert list(manager._load_stats) == [("test@llm", "127.0.0.1", 8002)]
+    assert list(manager._reported_loads) == [("test@llm", "127.0.0.1", 8002)]
@@ -0,0 +1,190 @@
+"""Delta encoding of the model output stream between the model workers.
+
+The model workers yield :class:`ModelOutput` objects with the cumulative text, so
+sending every output as is makes the bytes serialized and sent grow quadratically
+with the length of the answer. In the delta mode of ``/worker/generate_stream``,
+the worker sends only the text appended since the previous output and the
+increments of the integer usage fields, and the receiver rebuilds the cumulative
+output only when its consumer needs it.
+
+A delta message looks like:
+
+.. code-block:: python
+
+    {
+        "error_code": 0,
+        "incremental": True,
+        # The text and thinking parts of the content: [type, offset, delta], the
+        # cumulative part is the previous part truncated to `offset` plus `delta`
+        "parts": [["thinking", 10, ""], ["text", 42, " SELECT"]],
+        # The increments of the integer fields, the latest value of the others
+        "usage": {"completion_tokens": 1, "total_tokens": 1},
+        "finish_reason": None,
+        "model_context": None,
+        "metrics": None,
+    }
+
+The outputs with other media content are sent in full, without ``parts``.
+"""
+
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from dbgpt.core import ModelOutput
+from dbgpt.core.interface.media import MediaContent, MediaContentType
+
+_DELTA_TYPES = (MediaContentType.TEXT, MediaContentType.THINKING)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _common_prefix_length(previous: str, current: str) -> int:
+    """Return the length of the common prefix of two strings.
+
+    The new text almost always extends the previous one, which is checked by one
+    `startswith`. Otherwise, e.g. a replacement character of an incomplete UTF-8
+    sequence is replaced by the decoded character, the length is searched by
+    bisection with slice comparisons.
+    """
+    if current.startswith(previous):
+        return len(previous)
+    low, high = 0, min(len(previous), len(current))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if previous[:mid] == current[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _text_parts(output: ModelOutput) -> Optional[List[MediaContent]]:
+    """Return the content of the output if it only has text and thinking parts."""
+    contents = output.content
+    if isinstance(contents, MediaContent):
+        contents = [contents]
+    if not isinstance(contents, list):
+        return None
+    types = [content.type for content in contents]
+    if any(t not in _DELTA_TYPES for t in types) or len(set(types)) != len(types):
+        return None
+    return contents
+
+
+class DeltaStreamEncoder:
+    """Encode the cumulative outputs of one stream into delta messages."""
+
+    def __init__(self):
+        self._parts: Dict[str, str] = {}
+        self._usage: Dict[str, Any] = {}
+
+    def encode(self, output: ModelOutput) -> Dict[str, Any]:
+        """Encode the output to a delta message.
+
+        Args:
+            output(ModelOutput): The cumulative output of the model.
+
+        Returns:
+            Dict[str, Any]: The message to send.
+        """
+        contents = _text_parts(output)
+        if contents is None:
+            self._parts = {}
+            self._usage = {}
+            return asdict(output)
+        parts = []
+        for content in contents:
+            value = content.object.data or ""
+            previous = self._parts.get(content.type, "")
+            offset = _common_prefix_length(previous, value)
+            parts.append([content.type, offset, value[offset:]])
+            self._parts[content.type] = value
+        return {
+            "error_code": output.error_code,
+            "incremental": True,
+            "parts": parts,
+            "usage": self._encode_usage(output.usage),
+            "finish_reason": output.finish_reason,
+            "model_context": output.model_context,
+            "metrics": asdict(output.metrics) if output.metrics else None,
+        }
+
+    def _encode_usage(
+        self, usage: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        if usage is None:
+            return None
+        increments = {}
+        for key, value in usage.items():
+            previous = self._usage.get(key, 0)
+            if _is_int(value) and _is_int(previous):
+                if value != previous or key not in self._usage:
+                    increments[key] = value - previous
+            elif key not in self._usage or value != previous:
+                increments[key] = value
+        self._usage.update(usage)
+        return increments
+
+
+class DeltaStreamDecoder:
+    """Decode the messages of one stream sent by :class:`DeltaStreamEncoder`.
+
+    The messages sent in full, e.g. by the workers which do not support the delta
+    mode, are decoded as is.
+    """
+
+    def __init__(self):
+        self._parts: Dict[str, str] = {}
+        self._usage: Dict[str, Any] = {}
+
+    def decode(self, data: Dict[str, Any], incremental: bool = False) -> ModelOutput:
+        """Decode a message to the model output.
+
+        Args:
+            data(Dict[str, Any]): The received message.
+            incremental(bool): Whether to return only the text appended by the
+                message, with `incremental` set to True, instead of rebuilding the
+                cumulative text. The usage is always cumulative.
+
+        Returns:
+            ModelOutput: The decoded model output.
+        """
+        if "parts" not in data:
+            self._parts = {}
+            self._usage = {}
+            return ModelOutput(**data)
+        contents = []
+        for part_type, offset, delta in data["parts"]:
+            if incremental:
+                value = delta
+            else:
+                value = self._parts.get(part_type, "")[:offset] + delta
+                self._parts[part_type] = value
+            if part_type == MediaContentType.THINKING:
+                contents.append(MediaContent.build_thinking(value))
+            else:
+                contents.append(MediaContent.build_text(value))
+        return ModelOutput(
+            error_code=data["error_code"],
+            content=contents[0] if len(contents) == 1 else contents,
+            incremental=incremental,
+            usage=self._decode_usage(data.get("usage")),
+            finish_reason=data.get("finish_reason"),
+            model_context=data.get("model_context"),
+            metrics=data.get("metrics"),
+        )
+
+    def _decode_usage(
+        self, increments: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        if increments is None:
+            return None
+        for key, value in increments.items():
+            previous = self._usage.get(key, 0)
+            if _is_int(value) and _is_int(previous):
+                self._usage[key] = previous + value
+            else:
+                self._usage[key] = value
+        return dict(self._usage)
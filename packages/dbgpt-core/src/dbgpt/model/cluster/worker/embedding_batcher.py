@@ -0,0 +1,87 @@
+"""Micro-batching of the concurrent embedding requests."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EmbedFunc = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embedding requests into one model call.
+
+    The requests arriving within `max_wait_ms` are merged until the batch has
+    `max_batch_size` texts, then embedded by one call of `embed_func` and the vectors
+    are fanned back out to every request. A request which is larger than
+    `max_batch_size` is sent in its own batch.
+    """
+
+    def __init__(
+        self,
+        embed_func: EmbedFunc,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        """Create a new EmbeddingBatcher.
+
+        Args:
+            embed_func (EmbedFunc): Embed a list of texts.
+            max_batch_size (int): The max number of texts of one batch.
+            max_wait_ms (float): The max time to wait for more requests.
+        """
+        self._embed_func = embed_func
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed the texts in the next batch."""
+        if not texts:
+            return []
+        if len(texts) >= self._max_batch_size:
+            return await self._embed_func(texts)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if self._pending_size + len(texts) > self._max_batch_size:
+            self._flush()
+        self._pending.append((texts, future))
+        self._pending_size += len(texts)
+        if self._pending_size >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_size = self._pending, [], 0
+        task = asyncio.create_task(self._run_batch(batch))
+        # Keep a reference until the task is done
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[List[str], asyncio.Future]]) -> None:
+        texts = [text for request_texts, _ in batch for text in request_texts]
+        logger.debug(f"Embed {len(texts)} texts of {len(batch)} requests in a batch")
+        try:
+            vectors = await self._embed_func(texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for request_texts, future in batch:
+            end = start + len(request_texts)
+            if not future.done():
+                future.set_result(vectors[start:end])
+            start = end
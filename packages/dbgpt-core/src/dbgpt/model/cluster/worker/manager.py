@@ -3,7 +3,6 @@ import itertools
 import json
 import logging
 import os
-import random
 import sys
 import time
 import traceback
@@ -12,7 +11,7 @@ from dataclasses import asdict
 from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
 
 from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
 from dbgpt.component import SystemApp
 from dbgpt.configs.model_config import LOGDIR
@@ -41,7 +40,10 @@ from dbgpt.model.cluster.manager_base import (
     WorkerRunData,
 )
 from dbgpt.model.cluster.registry import ModelRegistry
+from dbgpt.model.cluster.routing import InstanceLoad, RoutingStrategy, select_instance
 from dbgpt.model.cluster.storage import ModelStorage, ModelStorageItem
+from dbgpt.model.cluster.worker.delta_stream import DeltaStreamEncoder
+from dbgpt.model.cluster.worker.embedding_batcher import EmbeddingBatcher
 from dbgpt.model.cluster.worker_base import ModelWorker
 from dbgpt.model.parameter import (
     ModelsDeployParameters,
@@ -49,6 +51,14 @@ from dbgpt.model.parameter import (
     WorkerType,
 )
 from dbgpt.model.utils.llm_utils import list_supported_models
+from dbgpt.util.embedding_utils import (
+    EMBEDDING_DIMENSIONS_HEADER,
+    EMBEDDING_ENCODING_BASE64,
+    EMBEDDING_ENCODING_BINARY,
+    EMBEDDINGS_BINARY_MEDIA_TYPE,
+    embeddings_to_bytes,
+    encode_embedding_base64,
+)
 from dbgpt.util.fastapi import create_app, register_event_handler
 from dbgpt.util.parameter_utils import (
     ParameterDescription,
@@ -95,6 +105,7 @@ class LocalWorkerManager(WorkerManager):
         host: str = None,
         port: int = None,
         model_storage: Optional[ModelStorage] = None,
+        routing_strategy: Optional[RoutingStrategy] = None,
     ) -> None:
         """Create a LocalWorkerManager instance.
 
@@ -109,6 +120,8 @@ class LocalWorkerManager(WorkerManager):
             port (int, optional): Port. Defaults to None.
             model_storage (Optional[ModelStorage], optional): Model storage. Defaults
                 to None. It is used to store model metadata.
+            routing_strategy (Optional[RoutingStrategy], optional): The strategy to
+                select one of the model instances. Defaults to random.
         """
         self.workers: Dict[str, List[WorkerRunData]] = dict()
         self.executor = ThreadPoolExecutor(max_workers=os.cpu_count() * 5)
@@ -119,6 +132,9 @@ class LocalWorkerManager(WorkerManager):
         self.host = host
         self.port = port
         self.model_storage = model_storage
+        self.routing_strategy = RoutingStrategy(
+            routing_strategy or RoutingStrategy.RANDOM
+        )
         self.start_listeners = []
 
         self.run_data = WorkerRunData(
@@ -251,6 +267,10 @@ class LocalWorkerManager(WorkerManager):
             semaphore=asyncio.Semaphore(concurrency),
             command_args=command_args,
         )
+        if worker_type == WorkerType.TEXT2VEC.value:
+            worker_run_data.embedding_batcher = self._build_embedding_batcher(
+                worker_run_data
+            )
         instances = self.workers.get(worker_key)
         if not instances:
             instances = [worker_run_data]
@@ -262,6 +282,29 @@ class LocalWorkerManager(WorkerManager):
             logger.warning(f"Instance {worker_key} exist")
             return False
 
+    def _build_embedding_batcher(
+        self, worker_run_data: WorkerRunData
+    ) -> Optional[EmbeddingBatcher]:
+        batch_wait_ms = getattr(worker_run_data.model_params, "batch_wait_ms", None)
+        if not batch_wait_ms or batch_wait_ms <= 0:
+            return None
+        max_batch_size = (
+            getattr(worker_run_data.model_params, "max_batch_size", None) or 64
+        )
+
+        async def _embed(texts: List[str]) -> List[List[float]]:
+            params = {"model": worker_run_data.model_params.name, "input": texts}
+            async with worker_run_data.semaphore:
+                if worker_run_data.worker.support_async():
+                    return await worker_run_data.worker.async_embeddings(params)
+                return await self.run_blocking_func(
+                    worker_run_data.worker.embeddings, params
+                )
+
+        return EmbeddingBatcher(
+            _embed, max_batch_size=max_batch_size, max_wait_ms=batch_wait_ms
+        )
+
     def _remove_worker(
         self, worker_params: ModelWorkerParameters, model_name: str
     ) -> None:
@@ -410,8 +453,12 @@ class LocalWorkerManager(WorkerManager):
                 f"Cound not found worker instances for model name {model_name} and "
                 f"worker type {worker_type}"
             )
-        worker_run_data = random.choice(worker_instances)
-        return worker_run_data
+        return select_instance(
+            worker_instances, self._get_instance_load, self.routing_strategy
+        )
+
+    def _get_instance_load(self, worker_run_data: WorkerRunData) -> InstanceLoad:
+        return worker_run_data.load_stats.load
 
     async def select_one_instance(
         self, worker_type: str, model_name: str, healthy_only: bool = True
@@ -457,21 +504,21 @@ class LocalWorkerManager(WorkerManager):
                     error_code=1,
                 )
                 return
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    async for outout in worker_run_data.worker.async_generate_stream(
-                        params
-                    ):
-                        yield outout
-                else:
-                    if not async_wrapper:
-                        from starlette.concurrency import iterate_in_threadpool
-
-                        async_wrapper = iterate_in_threadpool
-                    async for output in async_wrapper(
-                        worker_run_data.worker.generate_stream(params)
-                    ):
-                        yield output
+            worker = worker_run_data.worker
+            with worker_run_data.load_stats.track():
+                async with worker_run_data.semaphore:
+                    if worker.support_async():
+                        async for outout in worker.async_generate_stream(params):
+                            yield outout
+                    else:
+                        if not async_wrapper:
+                            from starlette.concurrency import iterate_in_threadpool
+
+                            async_wrapper = iterate_in_threadpool
+                        async for output in async_wrapper(
+                            worker.generate_stream(params)
+                        ):
+                            yield output
 
     async def generate(self, params: Dict) -> ModelOutput:
         """Generate non stream result"""
@@ -486,13 +533,14 @@ class LocalWorkerManager(WorkerManager):
                     text=f"**LLMServer Generate Error, Please CheckErrorInfo.**: {e}",
                     error_code=1,
                 )
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_generate(params)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.generate, params
-                    )
+            with worker_run_data.load_stats.track():
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_generate(params)
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.generate, params
+                        )
 
     async def embeddings(self, params: Dict) -> List[List[float]]:
         """Embed input"""
@@ -505,13 +553,17 @@ class LocalWorkerManager(WorkerManager):
                 worker_run_data = await self._get_model(params, worker_type=worker_type)
             except Exception as e:
                 raise e
-            async with worker_run_data.semaphore:
-                if worker_run_data.worker.support_async():
-                    return await worker_run_data.worker.async_embeddings(params)
-                else:
-                    return await self.run_blocking_func(
-                        worker_run_data.worker.embeddings, params
-                    )
+            with worker_run_data.load_stats.track():
+                batcher = worker_run_data.embedding_batcher
+                if batcher and "query" not in params:
+                    return await batcher.embed(params["input"])
+                async with worker_run_data.semaphore:
+                    if worker_run_data.worker.support_async():
+                        return await worker_run_data.worker.async_embeddings(params)
+                    else:
+                        return await self.run_blocking_func(
+                            worker_run_data.worker.embeddings, params
+                        )
 
     def sync_embeddings(self, params: Dict) -> List[List[float]]:
         worker_type = params.get("worker_type", WorkerType.TEXT2VEC.value)
@@ -870,10 +922,12 @@ router = APIRouter()
 async def generate_json_stream(params):
     from starlette.concurrency import iterate_in_threadpool
 
+    encoder = DeltaStreamEncoder() if params.pop("stream_delta", False) else None
     async for output in worker_manager.generate_stream(
         params, async_wrapper=iterate_in_threadpool
     ):
-        yield json.dumps(asdict(output), ensure_ascii=False).encode() + b"\0"
+        data = encoder.encode(output) if encoder else asdict(output)
+        yield json.dumps(data, ensure_ascii=False).encode() + b"\0"
 
 
 @router.post("/worker/generate_stream")
@@ -889,6 +943,7 @@ async def api_generate_stream(request: PromptRequest):
 @router.post("/worker/generate")
 async def api_generate(request: PromptRequest):
     params = request.dict(exclude_none=True)
+    params.pop("stream_delta", None)
     span_id = root_tracer.get_current_span_id()
     if "span_id" not in params and span_id:
         params["span_id"] = span_id
@@ -898,10 +953,23 @@ async def api_generate(request: PromptRequest):
 @router.post("/worker/embeddings")
 async def api_embeddings(request: EmbeddingsRequest):
     params = request.dict(exclude_none=True)
+    encoding_format = params.pop("encoding_format", None)
     span_id = root_tracer.get_current_span_id()
     if "span_id" not in params and span_id:
         params["span_id"] = span_id
-    return await worker_manager.embeddings(params)
+    embeddings = await worker_manager.embeddings(params)
+    if encoding_format == EMBEDDING_ENCODING_BASE64:
+        return [encode_embedding_base64(embedding) for embedding in embeddings]
+    if encoding_format == EMBEDDING_ENCODING_BINARY:
+        data = embeddings_to_bytes(embeddings)
+        if data is not None:
+            dim = len(embeddings[0]) if embeddings else 0
+            return Response(
+                content=data,
+                media_type=EMBEDDINGS_BINARY_MEDIA_TYPE,
+                headers={EMBEDDING_DIMENSIONS_HEADER: str(dim)},
+            )
+    return embeddings
 
 
 @router.post("/worker/count_token")
@@ -1066,7 +1134,10 @@ def _create_local_model_manager(
             f"controller_addr: {worker_params.controller_addr}"
         )
         return LocalWorkerManager(
-            host=register_host, port=port, model_storage=model_storage
+            host=register_host,
+            port=port,
+            model_storage=model_storage,
+            routing_strategy=worker_params.routing_strategy,
         )
     else:
         from dbgpt.model.cluster.controller.controller import ModelRegistryClient
@@ -1089,8 +1160,13 @@ def _create_local_model_manager(
             return await client.deregister_instance(instance)
 
         async def send_heartbeat_func(worker_run_data: WorkerRunData):
+            in_flight, latency_ewma_ms = worker_run_data.load_stats.load
             instance = ModelInstance(
-                model_name=worker_run_data.worker_key, host=register_host, port=port
+                model_name=worker_run_data.worker_key,
+                host=register_host,
+                port=port,
+                in_flight=in_flight,
+                latency_ewma_ms=latency_ewma_ms,
             )
             return await client.send_heartbeat(instance)
 
@@ -1101,6 +1177,7 @@ def _create_local_model_manager(
             host=register_host,
             port=port,
             model_storage=model_storage,
+            routing_strategy=worker_params.routing_strategy,
         )
 
 
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any, Callable, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from dbgpt.model.base import ModelInstance, WorkerApplyOutput, WorkerSupportedModel
 from dbgpt.model.cluster.base import (
@@ -9,14 +9,33 @@ from dbgpt.model.cluster.base import (
     WorkerStartupRequest,
 )
 from dbgpt.model.cluster.registry import ModelRegistry
+from dbgpt.model.cluster.routing import InstanceLoad, RoutingStrategy, WorkerLoadStats
 from dbgpt.model.cluster.worker.manager import LocalWorkerManager, WorkerRunData, logger
-from dbgpt.model.cluster.worker.remote_worker import RemoteModelWorker
+from dbgpt.model.cluster.worker.remote_worker import HttpClientPool, RemoteModelWorker
 from dbgpt.model.parameter import WorkerType
 
 
 class RemoteWorkerManager(LocalWorkerManager):
-    def __init__(self, model_registry: ModelRegistry = None) -> None:
-        super().__init__(model_registry=model_registry)
+    def __init__(
+        self,
+        model_registry: ModelRegistry = None,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        routing_strategy: Optional[RoutingStrategy] = None,
+    ) -> None:
+        super().__init__(
+            model_registry=model_registry, routing_strategy=routing_strategy
+        )
+        # The load of the requests sent by current client, and the load of all
+        # clients reported by the heartbeats of the remote instances.
+        self._load_stats: Dict[Tuple[str, str, int], WorkerLoadStats] = {}
+        self._reported_loads: Dict[Tuple[str, str, int], InstanceLoad] = {}
+        # Shared by all remote workers, the worker instances are rebuilt from the
+        # registry on every request.
+        self._client_pool = HttpClientPool(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
 
     async def start(self):
         for listener in self.start_listeners:
@@ -26,7 +45,7 @@ class RemoteWorkerManager(LocalWorkerManager):
                 listener(self)
 
     async def stop(self, ignore_exception: bool = False):
-        pass
+        await self._client_pool.aclose()
 
     async def _fetch_from_worker(
         self,
@@ -39,33 +58,30 @@ class RemoteWorkerManager(LocalWorkerManager):
         success_handler: Callable = None,
         error_handler: Callable = None,
     ) -> Any:
-        # Lazy import to avoid high time cost
-        import httpx
-
         url = worker_run_data.worker.worker_addr + endpoint
         headers = {**worker_run_data.worker.headers, **(additional_headers or {})}
         timeout = worker_run_data.worker.timeout
 
-        async with httpx.AsyncClient() as client:
-            request = client.build_request(
-                method,
-                url,
-                json=json,  # using json for data to ensure it sends as application/json
-                params=params,
-                headers=headers,
-                timeout=timeout,
-            )
+        client = self._client_pool.get_client()
+        request = client.build_request(
+            method,
+            url,
+            json=json,  # using json for data to ensure it sends as application/json
+            params=params,
+            headers=headers,
+            timeout=timeout,
+        )
 
-            response = await client.send(request)
-            if response.status_code != 200:
-                if error_handler:
-                    return error_handler(response)
-                else:
-                    error_msg = f"Request to {url} failed, error: {response.text}"
-                    raise Exception(error_msg)
-            if success_handler:
-                return success_handler(response)
-            return response.json()
+        response = await client.send(request)
+        if response.status_code != 200:
+            if error_handler:
+                return error_handler(response)
+            else:
+                error_msg = f"Request to {url} failed, error: {response.text}"
+                raise Exception(error_msg)
+        if success_handler:
+            return success_handler(response)
+        return response.json()
 
     async def _apply_to_worker_manager_instances(self):
         pass
@@ -146,8 +162,15 @@ class RemoteWorkerManager(LocalWorkerManager):
         return worker_instances
 
     def _build_single_worker_instance(self, model_name: str, instance: ModelInstance):
-        worker = RemoteModelWorker()
+        worker = RemoteModelWorker(client_pool=self._client_pool)
         worker.load_worker(model_name, host=instance.host, port=instance.port)
+        load_key = (instance.model_name, instance.host, instance.port)
+        if load_key not in self._load_stats:
+            self._load_stats[load_key] = WorkerLoadStats()
+        self._reported_loads[load_key] = (
+            instance.in_flight or 0,
+            instance.latency_ewma_ms,
+        )
         wr = WorkerRunData(
             host=instance.host,
             port=instance.port,
@@ -158,9 +181,41 @@ class RemoteWorkerManager(LocalWorkerManager):
             model_params=None,
             stop_event=asyncio.Event(),
             semaphore=asyncio.Semaphore(100),  # Not limit in client
+            load_stats=self._load_stats[load_key],
         )
         return wr
 
+    def _prune_loads(
+        self, instances: List[ModelInstance], worker_key: Optional[str] = None
+    ) -> None:
+        """Drop the loads of the instances not returned by the registry.
+
+        The instances which are deregistered or expired are not returned, so their
+        loads are not kept forever.
+
+        Args:
+            instances(List[ModelInstance]): The instances returned by the registry.
+            worker_key(Optional[str]): Only prune the loads of the instances of the
+                worker key, all instances if None.
+        """
+        alive = {(ins.model_name, ins.host, ins.port) for ins in instances}
+        for key in list(self._load_stats):
+            if (worker_key is None or key[0] == worker_key) and key not in alive:
+                del self._load_stats[key]
+                self._reported_loads.pop(key, None)
+
+    def _get_instance_load(self, worker_run_data: WorkerRunData) -> InstanceLoad:
+        in_flight, latency = worker_run_data.load_stats.load
+        reported_in_flight, reported_latency = self._reported_loads.get(
+            (worker_run_data.worker_key, worker_run_data.host, worker_run_data.port),
+            (0, None),
+        )
+        # The reported in-flight requests include the ones of current client, but
+        # it may be outdated for a heartbeat interval.
+        return max(in_flight, reported_in_flight), (
+            latency if latency is not None else reported_latency
+        )
+
     async def get_model_instances(
         self, worker_type: str, model_name: str, healthy_only: bool = True
     ) -> List[WorkerRunData]:
@@ -168,6 +223,7 @@ class RemoteWorkerManager(LocalWorkerManager):
         instances: List[ModelInstance] = await self.model_registry.get_all_instances(
             worker_key, healthy_only
         )
+        self._prune_loads(instances, worker_key)
         return self._build_worker_instances(model_name, instances)
 
     async def get_all_model_instances(
@@ -176,6 +232,7 @@ class RemoteWorkerManager(LocalWorkerManager):
         instances: List[
             ModelInstance
         ] = await self.model_registry.get_all_model_instances(healthy_only=healthy_only)
+        self._prune_loads(instances)
         result = []
         for instance in instances:
             name, wt = WorkerType.parse_worker_key(instance.model_name)
@@ -191,6 +248,7 @@ class RemoteWorkerManager(LocalWorkerManager):
         instances: List[ModelInstance] = self.model_registry.sync_get_all_instances(
             worker_key, healthy_only
         )
+        self._prune_loads(instances, worker_key)
         return self._build_worker_instances(model_name, instances)
 
     async def worker_apply(self, apply_req: WorkerApplyRequest) -> WorkerApplyOutput:
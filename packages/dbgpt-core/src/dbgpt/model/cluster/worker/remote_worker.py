@@ -1,21 +1,139 @@
+import asyncio
 import json
 import logging
-from typing import Dict, Iterator, List
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+)
 
 from dbgpt.core import ModelMetadata, ModelOutput
+from dbgpt.model.cluster.worker.delta_stream import DeltaStreamDecoder
 from dbgpt.model.cluster.worker_base import ModelWorker
+from dbgpt.model.parameter import WorkerType
+from dbgpt.util.embedding_utils import (
+    EMBEDDING_DIMENSIONS_HEADER,
+    EMBEDDING_ENCODING_BINARY,
+    EMBEDDINGS_BINARY_MEDIA_TYPE,
+    embeddings_from_bytes,
+)
 from dbgpt.util.tracer import DBGPT_TRACER_SPAN_ID, root_tracer
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
+_STREAM_DELIMITER = b"\0"
+
+
+class HttpClientPool:
+    """Long-lived HTTP connection pool to the remote model workers.
+
+    The underlying `httpx.AsyncClient` keeps the connections to every worker alive
+    across requests, so the streams do not pay a TCP/TLS handshake each time. The
+    connections are bound to an event loop, so one client is created per loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+    ):
+        """Create a new HttpClientPool.
+
+        Args:
+            max_connections (int): The max number of connections.
+            max_keepalive_connections (int): The max number of idle connections.
+            keepalive_expiry (float): The seconds an idle connection is kept alive.
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def get_client(self) -> "httpx.AsyncClient":
+        """Return the client of the running event loop."""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close the client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+async def _iter_delimited(
+    raw_chunks: AsyncIterator[bytes], delimiter: bytes = _STREAM_DELIMITER
+) -> AsyncIterator[bytes]:
+    """Split a raw byte stream into the delimited messages.
+
+    The received bytes are appended to one bytearray, every message is sliced out
+    once and the consumed prefix is dropped once per raw chunk, so the buffer is not
+    copied for every message.
+    """
+    buffer = bytearray()
+    async for raw_chunk in raw_chunks:
+        # The delimiter can not be in the bytes which have been scanned
+        start = max(len(buffer) - len(delimiter) + 1, 0)
+        buffer += raw_chunk
+        consumed = 0
+        view = memoryview(buffer)
+        try:
+            while (end := buffer.find(delimiter, start)) != -1:
+                if end > consumed:
+                    yield bytes(view[consumed:end])
+                consumed = start = end + len(delimiter)
+        finally:
+            view.release()
+        if consumed:
+            del buffer[:consumed]
+
+
+def _embeddings_params(params: Dict) -> Dict:
+    """Ask for the binary embeddings, the scores of the rerank models stay JSON."""
+    worker_type = params.get("worker_type", WorkerType.TEXT2VEC.value)
+    if worker_type != WorkerType.TEXT2VEC.value or "encoding_format" in params:
+        return params
+    return {**params, "encoding_format": EMBEDDING_ENCODING_BINARY}
+
+
+def _parse_embeddings(headers: Mapping[str, str], content: bytes) -> Any:
+    """Parse the embeddings response, JSON or binary float32 embeddings."""
+    if headers.get("content-type", "").startswith(EMBEDDINGS_BINARY_MEDIA_TYPE):
+        dim = int(headers.get(EMBEDDING_DIMENSIONS_HEADER, 0))
+        return embeddings_from_bytes(content, dim)
+    return json.loads(content)
+
 
 class RemoteModelWorker(ModelWorker):
-    def __init__(self) -> None:
+    def __init__(self, client_pool: Optional[HttpClientPool] = None) -> None:
         self.headers = {}
         # TODO Configured by ModelParameters
         self.timeout = 3600
         self.host = None
         self.port = None
+        self._client_pool = client_pool or HttpClientPool()
 
     @property
     def worker_addr(self) -> str:
@@ -43,30 +161,27 @@ class RemoteModelWorker(ModelWorker):
         raise NotImplementedError
 
     async def async_generate_stream(self, params: Dict) -> Iterator[ModelOutput]:
-        """Asynchronous generate stream"""
-        import httpx
+        """Asynchronous generate stream
 
-        async with httpx.AsyncClient() as client:
-            delimiter = b"\0"
-            buffer = b""
-            url = self.worker_addr + "/generate_stream"
-            logger.debug(f"Send async_generate_stream to url {url}, params: {params}")
-            async with client.stream(
-                "POST",
-                url,
-                headers=self._get_trace_headers(),
-                json=params,
-                timeout=self.timeout,
-            ) as response:
-                async for raw_chunk in response.aiter_raw():
-                    buffer += raw_chunk
-                    while delimiter in buffer:
-                        chunk, buffer = buffer.split(delimiter, 1)
-                        if not chunk:
-                            continue
-                        chunk = chunk.decode()
-                        data = json.loads(chunk)
-                        yield ModelOutput(**data)
+        The remote worker is asked to send only the new text of every output. The
+        cumulative outputs are rebuilt here, unless `stream_delta` in params is
+        True, then the incremental outputs are yielded as is.
+        """
+        client = self._client_pool.get_client()
+        url = self.worker_addr + "/generate_stream"
+        logger.debug(f"Send async_generate_stream to url {url}, params: {params}")
+        incremental = bool(params.get("stream_delta"))
+        decoder = DeltaStreamDecoder()
+        async with client.stream(
+            "POST",
+            url,
+            headers=self._get_trace_headers(),
+            json={**params, "stream_delta": True},
+            timeout=self.timeout,
+        ) as response:
+            async for chunk in _iter_delimited(response.aiter_raw()):
+                data = json.loads(chunk)
+                yield decoder.decode(data, incremental=incremental)
 
     def generate(self, params: Dict) -> ModelOutput:
         """Generate non stream"""
@@ -74,58 +189,50 @@ class RemoteModelWorker(ModelWorker):
 
     async def async_generate(self, params: Dict) -> ModelOutput:
         """Asynchronous generate non stream"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            url = self.worker_addr + "/generate"
-            logger.debug(f"Send async_generate to url {url}, params: {params}")
-            response = await client.post(
-                url,
-                headers=self._get_trace_headers(),
-                json=params,
-                timeout=self.timeout,
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Request to {url} failed, error: {response.text}")
-            return ModelOutput(**response.json())
+        client = self._client_pool.get_client()
+        url = self.worker_addr + "/generate"
+        logger.debug(f"Send async_generate to url {url}, params: {params}")
+        response = await client.post(
+            url,
+            headers=self._get_trace_headers(),
+            json=params,
+            timeout=self.timeout,
+        )
+        if response.status_code not in [200, 201]:
+            raise Exception(f"Request to {url} failed, error: {response.text}")
+        return ModelOutput(**response.json())
 
     def count_token(self, prompt: str) -> int:
         raise NotImplementedError
 
     async def async_count_token(self, prompt: str) -> int:
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            url = self.worker_addr + "/count_token"
-            logger.debug(f"Send async_count_token to url {url}, params: {prompt}")
-            response = await client.post(
-                url,
-                headers=self._get_trace_headers(),
-                json={"prompt": prompt},
-                timeout=self.timeout,
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Request to {url} failed, error: {response.text}")
-            return response.json()
+        client = self._client_pool.get_client()
+        url = self.worker_addr + "/count_token"
+        logger.debug(f"Send async_count_token to url {url}, params: {prompt}")
+        response = await client.post(
+            url,
+            headers=self._get_trace_headers(),
+            json={"prompt": prompt},
+            timeout=self.timeout,
+        )
+        if response.status_code not in [200, 201]:
+            raise Exception(f"Request to {url} failed, error: {response.text}")
+        return response.json()
 
     async def async_get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Asynchronously get model metadata"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            url = self.worker_addr + "/model_metadata"
-            logger.debug(
-                f"Send async_get_model_metadata to url {url}, params: {params}"
-            )
-            response = await client.post(
-                url,
-                headers=self._get_trace_headers(),
-                json=params,
-                timeout=self.timeout,
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Request to {url} failed, error: {response.text}")
-            return ModelMetadata.from_dict(response.json())
+        client = self._client_pool.get_client()
+        url = self.worker_addr + "/model_metadata"
+        logger.debug(f"Send async_get_model_metadata to url {url}, params: {params}")
+        response = await client.post(
+            url,
+            headers=self._get_trace_headers(),
+            json=params,
+            timeout=self.timeout,
+        )
+        if response.status_code not in [200, 201]:
+            raise Exception(f"Request to {url} failed, error: {response.text}")
+        return ModelMetadata.from_dict(response.json())
 
     def get_model_metadata(self, params: Dict) -> ModelMetadata:
         """Get model metadata"""
@@ -140,29 +247,27 @@ class RemoteModelWorker(ModelWorker):
         response = requests.post(
             url,
             headers=self._get_trace_headers(),
-            json=params,
+            json=_embeddings_params(params),
             timeout=self.timeout,
         )
         if response.status_code not in [200, 201]:
             raise Exception(f"Request to {url} failed, error: {response.text}")
-        return response.json()
+        return _parse_embeddings(response.headers, response.content)
 
     async def async_embeddings(self, params: Dict) -> List[List[float]]:
         """Asynchronous get embeddings for input"""
-        import httpx
-
-        async with httpx.AsyncClient() as client:
-            url = self.worker_addr + "/embeddings"
-            logger.debug(f"Send async_embeddings to url {url}")
-            response = await client.post(
-                url,
-                headers=self._get_trace_headers(),
-                json=params,
-                timeout=self.timeout,
-            )
-            if response.status_code not in [200, 201]:
-                raise Exception(f"Request to {url} failed, error: {response.text}")
-            return response.json()
+        client = self._client_pool.get_client()
+        url = self.worker_addr + "/embeddings"
+        logger.debug(f"Send async_embeddings to url {url}")
+        response = await client.post(
+            url,
+            headers=self._get_trace_headers(),
+            json=_embeddings_params(params),
+            timeout=self.timeout,
+        )
+        if response.status_code not in [200, 201]:
+            raise Exception(f"Request to {url} failed, error: {response.text}")
+        return _parse_embeddings(response.headers, response.content)
 
     def _get_trace_headers(self):
         span_id = root_tracer.get_current_span_id()
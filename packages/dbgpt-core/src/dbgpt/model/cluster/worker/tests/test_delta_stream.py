@@ -0,0 +1,112 @@
+import json
+from dataclasses import asdict
+from typing import List
+
+from dbgpt.core import ModelOutput
+from dbgpt.core.interface.media import MediaContent, MediaObject
+from dbgpt.model.cluster.apiserver.api import _StreamedText
+from dbgpt.model.cluster.worker.delta_stream import (
+    DeltaStreamDecoder,
+    DeltaStreamEncoder,
+    _common_prefix_length,
+)
+
+
+def _outputs() -> List[ModelOutput]:
+    return [
+        ModelOutput.build(thinking="Let", is_reasoning_model=True),
+        ModelOutput.build(thinking="Let me think"),
+        ModelOutput.build(
+            text="SELECT �",
+            thinking="Let me think",
+            usage={"prompt_tokens": 10, "completion_tokens": 5, "speed": 1.5},
+        ),
+        ModelOutput.build(
+            text="SELECT é",
+            thinking="Let me think",
+            usage={"prompt_tokens": 10, "completion_tokens": 6, "speed": 2.5},
+        ),
+        ModelOutput.build(
+            text="SELECT é FROM t",
+            thinking="Let me think",
+            usage={"prompt_tokens": 10, "completion_tokens": 9, "speed": 2.5},
+            finish_reason="stop",
+        ),
+    ]
+
+
+def _round_trip(outputs: List[ModelOutput], incremental: bool = False):
+    encoder = DeltaStreamEncoder()
+    decoder = DeltaStreamDecoder()
+    messages = [json.dumps(encoder.encode(output)) for output in outputs]
+    decoded = [decoder.decode(json.loads(msg), incremental) for msg in messages]
+    return messages, decoded
+
+
+def test_common_prefix_length():
+    assert _common_prefix_length("", "abc") == 0
+    assert _common_prefix_length("ab", "abc") == 2
+    assert _common_prefix_length("ab�", "abc") == 2
+    assert _common_prefix_length("abcd", "ab") == 2
+    assert _common_prefix_length("xbc", "abc") == 0
+
+
+def test_rebuild_cumulative_outputs():
+    outputs = _outputs()
+    messages, decoded = _round_trip(outputs)
+    for output, result in zip(outputs, decoded):
+        assert asdict(result) == asdict(output)
+        assert not result.incremental
+
+    # Only the new text and the changed usage are sent
+    last = json.loads(messages[-1])
+    assert last["parts"] == [["thinking", 12, ""], ["text", 8, " FROM t"]]
+    assert last["usage"] == {"completion_tokens": 3}
+    assert json.loads(messages[3])["usage"] == {"completion_tokens": 1, "speed": 2.5}
+
+
+def test_decode_incremental_outputs():
+    _, decoded = _round_trip(_outputs(), incremental=True)
+    assert all(output.incremental for output in decoded)
+    assert [output.thinking_text for output in decoded] == [
+        "Let",
+        " me think",
+        "",
+        "",
+        "",
+    ]
+    assert [output.text for output in decoded[2:]] == ["SELECT �", "é", " FROM t"]
+    assert decoded[-1].usage == {
+        "prompt_tokens": 10,
+        "completion_tokens": 9,
+        "speed": 2.5,
+    }
+    assert decoded[-1].finish_reason == "stop"
+
+    streamed = _StreamedText()
+    deltas = [streamed.update(output.text, True) for output in decoded[2:]]
+    assert deltas == ["SELECT ", "é", " FROM t"]
+    assert streamed.text == "SELECT é FROM t"
+
+
+def test_full_messages():
+    image = ModelOutput(
+        error_code=0,
+        content=MediaContent(
+            type="image", object=MediaObject(data="http://a/b.png", format="url")
+        ),
+    )
+    outputs = [ModelOutput(error_code=0, text="a"), image]
+    outputs.append(ModelOutput(error_code=1, text="a error"))
+    messages, decoded = _round_trip(outputs)
+    assert "parts" not in json.loads(messages[1])
+    # The text is sent in full after a full message
+    assert json.loads(messages[2])["parts"] == [["text", 0, "a error"]]
+    for output, result in zip(outputs, decoded):
+        assert asdict(result) == asdict(output)
+
+    # The messages of the workers without the delta mode
+    decoder = DeltaStreamDecoder()
+    for output in _outputs():
+        data = json.loads(json.dumps(asdict(output)))
+        assert asdict(decoder.decode(data, incremental=True)) == asdict(output)
@@ -0,0 +1,61 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from dbgpt.model.cluster.worker.embedding_batcher import EmbeddingBatcher
+
+
+class MockEmbedFunc:
+    def __init__(self, fail: bool = False):
+        self.calls: List[List[str]] = []
+        self.fail = fail
+
+    async def __call__(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(texts)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ValueError("embedding failed")
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_merge_concurrent_requests():
+    embed_func = MockEmbedFunc()
+    batcher = EmbeddingBatcher(embed_func, max_batch_size=64, max_wait_ms=10)
+    results = await asyncio.gather(
+        batcher.embed(["a"]), batcher.embed(["bb", "ccc"]), batcher.embed(["dddd"])
+    )
+    assert results == [[[1.0]], [[2.0], [3.0]], [[4.0]]]
+    assert embed_func.calls == [["a", "bb", "ccc", "dddd"]]
+
+
+@pytest.mark.asyncio
+async def test_flush_when_batch_is_full():
+    embed_func = MockEmbedFunc()
+    batcher = EmbeddingBatcher(embed_func, max_batch_size=2, max_wait_ms=1000)
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.embed(["a"]), batcher.embed(["bb"])), timeout=1
+    )
+    assert results == [[[1.0]], [[2.0]]]
+    assert embed_func.calls == [["a", "bb"]]
+
+
+@pytest.mark.asyncio
+async def test_large_request_in_own_batch():
+    embed_func = MockEmbedFunc()
+    batcher = EmbeddingBatcher(embed_func, max_batch_size=2, max_wait_ms=10)
+    results = await asyncio.gather(
+        batcher.embed(["a"]), batcher.embed(["bb", "ccc", "dddd"])
+    )
+    assert results == [[[1.0]], [[2.0], [3.0], [4.0]]]
+    assert sorted(embed_func.calls) == [["a"], ["bb", "ccc", "dddd"]]
+
+
+@pytest.mark.asyncio
+async def test_propagate_error():
+    batcher = EmbeddingBatcher(MockEmbedFunc(fail=True), max_wait_ms=1)
+    results = await asyncio.gather(
+        batcher.embed(["a"]), batcher.embed(["b"]), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
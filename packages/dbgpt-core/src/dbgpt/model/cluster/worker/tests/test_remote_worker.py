@@ -0,0 +1,104 @@
+import json
+from typing import AsyncIterator, List
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from dbgpt.model.cluster.worker.remote_worker import (
+    HttpClientPool,
+    _embeddings_params,
+    _iter_delimited,
+    _parse_embeddings,
+)
+from dbgpt.util.embedding_utils import decode_embedding, embeddings_to_bytes
+
+
+async def _aiter(chunks: List[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(chunks: List[bytes]) -> List[bytes]:
+    return [msg async for msg in _iter_delimited(_aiter(chunks))]
+
+
+@pytest.mark.asyncio
+async def test_iter_delimited_split_messages():
+    messages = [json.dumps({"text": f"hello {i}"}).encode() for i in range(3)]
+    data = b"\0".join(messages) + b"\0"
+    assert await _collect([data]) == messages
+    # One byte per raw chunk
+    assert await _collect([data[i : i + 1] for i in range(len(data))]) == messages
+
+
+@pytest.mark.asyncio
+async def test_iter_delimited_skip_empty_and_incomplete():
+    assert await _collect([b"\0\0a", b"b\0", b"\0c"]) == [b"ab"]
+
+
+@pytest.mark.asyncio
+async def test_iter_delimited_multi_bytes_delimiter():
+    chunks = [b"a\r", b"\nb\r", b"\n"]
+    result = [msg async for msg in _iter_delimited(_aiter(chunks), b"\r\n")]
+    assert result == [b"a", b"b"]
+
+
+@pytest.mark.asyncio
+async def test_http_client_pool_reuse_client():
+    pool = HttpClientPool(max_connections=10)
+    client = pool.get_client()
+    assert pool.get_client() is client
+    await pool.aclose()
+    assert client.is_closed
+    assert pool.get_client() is not client
+    await pool.aclose()
+
+
+def test_embeddings_params():
+    params = {"model": "m", "input": ["a"]}
+    assert _embeddings_params(params)["encoding_format"] == "binary"
+    assert "encoding_format" not in params
+    rerank_params = {**params, "worker_type": "reranker", "query": "q"}
+    assert _embeddings_params(rerank_params) is rerank_params
+
+
+def test_parse_embeddings():
+    embeddings = [[0.5, 1.0], [-2.0, 0.25]]
+    headers = httpx.Headers(
+        {"content-type": "application/octet-stream", "x-embedding-dimensions": "2"}
+    )
+    assert _parse_embeddings(headers, embeddings_to_bytes(embeddings)) == embeddings
+    # The workers which do not support the binary embeddings
+    headers = httpx.Headers({"content-type": "application/json"})
+    assert _parse_embeddings(headers, json.dumps(embeddings).encode()) == embeddings
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoding_format", [None, "float", "base64", "binary"])
+async def test_api_embeddings_encoding_format(monkeypatch, encoding_format):
+    from fastapi import FastAPI
+
+    from dbgpt.model.cluster.worker import manager
+
+    embeddings = [[0.5, 1.0], [-2.0, 0.25]]
+    worker_manager = MagicMock()
+    worker_manager.embeddings = AsyncMock(return_value=embeddings)
+    monkeypatch.setattr(manager.worker_manager, "worker_manager", worker_manager)
+    app = FastAPI()
+    app.include_router(manager.router, prefix="/api")
+
+    request = {"model": "m", "input": ["a", "b"]}
+    if encoding_format:
+        request["encoding_format"] = encoding_format
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app), base_url="http://test"
+    ) as client:
+        response = await client.post("/api/worker/embeddings", json=request)
+    assert response.status_code == 200
+    params = worker_manager.embeddings.call_args[0][0]
+    assert "encoding_format" not in params
+    result = _parse_embeddings(response.headers, response.content)
+    if encoding_format == "base64":
+        result = [decode_embedding(embedding) for embedding in result]
+    assert result == embeddings
@@ -15,6 +15,8 @@ from dbgpt.util.configure.manager import RegisterParameters
 from dbgpt.util.i18n_utils import _
 from dbgpt.util.parameter_utils import BaseParameters
 
+_ROUTING_STRATEGIES = ["random", "least_outstanding", "power_of_two", "latency_ewma"]
+
 
 class WorkerType(str, Enum):
     LLM = "llm"
@@ -122,6 +124,16 @@ class ModelControllerParameters(BaseServerParameters):
             )
         },
     )
+    routing_strategy: Optional[str] = field(
+        default="random",
+        metadata={
+            "valid_values": _ROUTING_STRATEGIES,
+            "help": _(
+                "The strategy of the registry to select one of the healthy model "
+                "instances by the load reported in heartbeats"
+            ),
+        },
+    )
 
 
 @dataclass
@@ -144,6 +156,17 @@ class ModelAPIServerParameters(BaseServerParameters):
     ignore_stop_exceeds_error: Optional[bool] = field(
         default=False, metadata={"help": _("Ignore exceeds stop words error")}
     )
+    worker_max_connections: Optional[int] = field(
+        default=100,
+        metadata={"help": _("The max number of HTTP connections to the model workers")},
+    )
+    routing_strategy: Optional[str] = field(
+        default="random",
+        metadata={
+            "valid_values": _ROUTING_STRATEGIES,
+            "help": _("The strategy to select one of the model instances"),
+        },
+    )
 
 
 @dataclass
@@ -189,6 +212,13 @@ class ModelWorkerParameters(BaseServerParameters):
         default=20,
         metadata={"help": _("The interval for sending heartbeats (seconds)")},
     )
+    routing_strategy: Optional[str] = field(
+        default="random",
+        metadata={
+            "valid_values": _ROUTING_STRATEGIES,
+            "help": _("The strategy to select one of the local model instances"),
+        },
+    )
 
 
 @dataclass
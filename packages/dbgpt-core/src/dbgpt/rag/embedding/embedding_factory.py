@@ -3,7 +3,8 @@
 import logging
 import os
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Type
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, List, Optional, Type
 
 from dbgpt.component import BaseComponent, SystemApp
 from dbgpt.core import Embeddings, RerankEmbeddings
@@ -12,6 +13,9 @@ from dbgpt.core.awel.flow import ResourceCategory, register_resource
 from dbgpt.core.interface.parameter import EmbeddingDeployModelParameters
 from dbgpt.util.i18n_utils import _
 
+if TYPE_CHECKING:
+    from dbgpt.storage.cache.embedding_cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,6 +38,36 @@ class EmbeddingFactory(BaseComponent, ABC):
             Embeddings: The embedding instance.
         """
 
+    def _with_cache(
+        self,
+        embeddings: Embeddings,
+        model_name: Optional[str],
+        embedding_cache: Optional["EmbeddingCache"] = None,
+        executor: Optional[Executor] = None,
+    ) -> Embeddings:
+        """Wrap the embeddings with the embedding cache if the cache is set.
+
+        Args:
+            embeddings (Embeddings): The embeddings to wrap.
+            model_name (Optional[str]): The model name, the cached vectors are
+                isolated by it.
+            embedding_cache (Optional[EmbeddingCache]): The embedding cache.
+            executor (Optional[Executor]): The executor to access the cache in the
+                asynchronous methods.
+
+        Returns:
+            Embeddings: The cached embeddings, or the embeddings without cache.
+        """
+        if not embedding_cache:
+            return embeddings
+        if not model_name:
+            raise ValueError("model_name must be provided to cache the embeddings.")
+        from dbgpt.storage.cache.embedding_cache import CachedEmbeddings
+
+        return CachedEmbeddings(
+            embeddings, model_name, embedding_cache, executor=executor
+        )
+
 
 class RerankEmbeddingFactory(BaseComponent, ABC):
     """Class for RerankEmbeddingFactory."""
@@ -63,9 +97,18 @@ class DefaultEmbeddingFactory(EmbeddingFactory):
         system_app: Optional[SystemApp] = None,
         default_model_name: Optional[str] = None,
         default_model_path: Optional[str] = None,
+        embedding_cache: Optional["EmbeddingCache"] = None,
         **kwargs: Any,
     ) -> None:
-        """Create a new DefaultEmbeddingFactory."""
+        """Create a new DefaultEmbeddingFactory.
+
+        Args:
+            system_app (Optional[SystemApp]): The system app.
+            default_model_name (Optional[str]): The model name.
+            default_model_path (Optional[str]): The model path.
+            embedding_cache (Optional[EmbeddingCache]): The embedding cache, the
+                embeddings are not cached if not set.
+        """
         super().__init__(system_app=system_app)
         if not default_model_path:
             default_model_path = default_model_name
@@ -74,7 +117,9 @@ class DefaultEmbeddingFactory(EmbeddingFactory):
         self._default_model_name = default_model_name
         self._default_model_path = default_model_path
         self._kwargs = kwargs
-        self._model = self._load_model()
+        self._model = self._with_cache(
+            self._load_model(), self._default_model_name, embedding_cache
+        )
 
     def init_app(self, system_app):
         """Init the app."""
@@ -215,13 +260,24 @@ class WrappedEmbeddingFactory(EmbeddingFactory):
         self,
         system_app: Optional[SystemApp] = None,
         embeddings: Optional[Embeddings] = None,
+        model_name: Optional[str] = None,
+        embedding_cache: Optional["EmbeddingCache"] = None,
         **kwargs: Any,
     ) -> None:
-        """Create a new DefaultEmbeddingFactory."""
+        """Create a new WrappedEmbeddingFactory.
+
+        Args:
+            system_app (Optional[SystemApp]): The system app.
+            embeddings (Optional[Embeddings]): The embeddings to wrap.
+            model_name (Optional[str]): The model name, required by the embedding
+                cache.
+            embedding_cache (Optional[EmbeddingCache]): The embedding cache, the
+                embeddings are not cached if not set.
+        """
         super().__init__(system_app=system_app)
         if not embeddings:
             raise ValueError("embeddings must be provided.")
-        self._model = embeddings
+        self._model = self._with_cache(embeddings, model_name, embedding_cache)
 
     def init_app(self, system_app):
         """Init the app."""
@@ -278,6 +334,14 @@ class DefaultEmbeddings(Embeddings):
         """Asynchronous Embed search docs."""
         return await self.embeddings.aembed_documents(texts)
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed multiple query texts."""
+        return self.embeddings.embed_queries(texts)
+
     async def aembed_query(self, text: str) -> List[float]:
         """Asynchronous Embed query text."""
         return await self.embeddings.aembed_query(text)
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts."""
+        return await self.embeddings.aembed_queries(texts)
@@ -15,6 +15,7 @@ from dbgpt.model.adapter.embed_metadata import (
     EMBED_COMMON_HF_BGE_MODELS,
     EMBED_COMMON_HF_JINA_MODELS,
 )
+from dbgpt.util.embedding_utils import decode_embedding
 from dbgpt.util.i18n_utils import _
 from dbgpt.util.tracer import DBGPT_TRACER_SPAN_ID, root_tracer
 
@@ -274,6 +275,10 @@ class HuggingFaceEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        return self.embed_documents(texts)
+
 
 @register_resource(
     _("HuggingFace Instructor Embeddings"),
@@ -414,6 +419,12 @@ class HuggingFaceInstructEmbeddings(BaseModel, Embeddings):
         embedding = self.client.encode([instruction_pair], **self.encode_kwargs)[0]
         return embedding.tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        instruction_pairs = [[self.query_instruction, text] for text in texts]
+        embeddings = self.client.encode(instruction_pairs, **self.encode_kwargs)
+        return embeddings.tolist()
+
 
 # TODO: Support AWEL flow
 class HuggingFaceBgeEmbeddings(BaseModel, Embeddings):
@@ -531,6 +542,12 @@ class HuggingFaceBgeEmbeddings(BaseModel, Embeddings):
         )
         return embedding.tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        texts = [self.query_instruction + t.replace("\n", " ") for t in texts]
+        embeddings = self.client.encode(texts, **self.encode_kwargs)
+        return embeddings.tolist()
+
 
 @register_resource(
     _("HuggingFace Inference API Embeddings"),
@@ -623,6 +640,10 @@ class HuggingFaceInferenceAPIEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        return self.embed_documents(texts)
+
 
 def _handle_request_result(res: requests.Response) -> List[List[float]]:
     """Parse the result from a request.
@@ -643,8 +664,8 @@ def _handle_request_result(res: requests.Response) -> List[List[float]]:
     embeddings = resp["data"]
     # Sort resulting embeddings by index
     sorted_embeddings = sorted(embeddings, key=lambda e: e["index"])  # type: ignore
-    # Return just the embeddings
-    return [result["embedding"] for result in sorted_embeddings]
+    # Return just the embeddings, the base64 embeddings are decoded
+    return [decode_embedding(result["embedding"]) for result in sorted_embeddings]
 
 
 @dataclass
@@ -681,6 +702,17 @@ class OpenAPIEmbeddingDeployModelParameters(EmbeddingDeployModelParameters):
             "help": _("The timeout for the request in seconds."),
         },
     )
+    encoding_format: Optional[str] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The encoding format of the embeddings in the response, 'base64' is "
+                "much smaller and faster to decode than 'float', but not every "
+                "OpenAI compatible API supports it. Default is None, the parameter "
+                "is not passed to the API."
+            ),
+        },
+    )
 
     @property
     def real_provider_model_name(self) -> str:
@@ -806,6 +838,11 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
     pass_trace_id: bool = Field(
         default=True, description="Whether to pass the trace ID to the API."
     )
+    encoding_format: Optional[str] = Field(
+        default=None,
+        description="The encoding format of the embeddings in the response, "
+        "'base64' or 'float', None to not pass it to the API.",
+    )
 
     session: Optional[requests.Session] = None
 
@@ -842,8 +879,15 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
             api_key=parameters.api_key,
             model_name=parameters.real_provider_model_name,
             timeout=parameters.timeout,
+            encoding_format=parameters.encoding_format,
         )
 
+    def _request_payload(self, texts: List[str]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"input": texts, "model": self.model_name}
+        if self.encoding_format:
+            payload["encoding_format"] = self.encoding_format
+        return payload
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Get the embeddings for a list of texts.
 
@@ -862,7 +906,7 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
             headers[DBGPT_TRACER_SPAN_ID] = current_span_id
         res = self.session.post(  # type: ignore
             self.api_url,
-            json={"input": texts, "model": self.model_name},
+            json=self._request_payload(texts),
             timeout=self.timeout,
             headers=headers,
         )
@@ -879,6 +923,10 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of multiple queries in one call."""
+        return self.embed_documents(texts)
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs.
 
@@ -898,7 +946,7 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
             headers=headers, timeout=aiohttp.ClientTimeout(total=self.timeout)
         ) as session:
             async with session.post(
-                self.api_url, json={"input": texts, "model": self.model_name}
+                self.api_url, json=self._request_payload(texts)
             ) as resp:
                 resp.raise_for_status()
                 data = await resp.json()
@@ -906,13 +954,20 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
                     raise RuntimeError(data["detail"])
                 embeddings = data["data"]
                 sorted_embeddings = sorted(embeddings, key=lambda e: e["index"])
-                return [result["embedding"] for result in sorted_embeddings]
+                return [
+                    decode_embedding(result["embedding"])
+                    for result in sorted_embeddings
+                ]
 
     async def aembed_query(self, text: str) -> List[float]:
         """Asynchronous Embed query text."""
         embeddings = await self.aembed_documents([text])
         return embeddings[0]
 
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts."""
+        return await self.aembed_documents(texts)
+
 
 register_embedding_adapter(
     HuggingFaceEmbeddings,
@@ -0,0 +1,48 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from dbgpt.rag.embedding.embeddings import OpenAPIEmbeddings
+from dbgpt.util.embedding_utils import encode_embedding_base64
+
+_EMBEDDINGS = [[0.5, -1.0], [2.0, 0.25]]
+
+
+def _embeddings(encoding_format, response_data):
+    session = requests.Session()
+    session.post = MagicMock()
+    session.post.return_value.json.return_value = {"data": response_data}
+    embeddings = OpenAPIEmbeddings(session=session, encoding_format=encoding_format)
+    return embeddings, session
+
+
+@pytest.mark.parametrize("encoding_format", ["base64", None])
+def test_embed_documents(encoding_format):
+    # The embeddings in the response are not in order
+    if encoding_format == "base64":
+        data = [
+            {"index": i, "embedding": encode_embedding_base64(emb)}
+            for i, emb in enumerate(_EMBEDDINGS)
+        ]
+    else:
+        data = [{"index": i, "embedding": emb} for i, emb in enumerate(_EMBEDDINGS)]
+    embeddings, session = _embeddings(encoding_format, data[::-1])
+    assert embeddings.embed_documents(["a", "b"]) == _EMBEDDINGS
+
+    payload = session.post.call_args.kwargs["json"]
+    if encoding_format:
+        assert payload["encoding_format"] == encoding_format
+    else:
+        assert "encoding_format" not in payload
+
+
+def test_encoding_format_not_passed_by_default():
+    session = requests.Session()
+    session.post = MagicMock()
+    session.post.return_value.json.return_value = {
+        "data": [{"index": 0, "embedding": _EMBEDDINGS[0]}]
+    }
+    embeddings = OpenAPIEmbeddings(session=session)
+    assert embeddings.embed_query("a") == _EMBEDDINGS[0]
+    assert "encoding_format" not in session.post.call_args.kwargs["json"]
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 from dbgpt.core import Document
 from dbgpt.rag.text_splitter.text_splitter import (
@@ -164,6 +164,22 @@ class Knowledge(ABC):
         documents = self._load()
         return self._postprocess(documents)
 
+    def iter_load(self) -> Iterator[Document]:
+        """Load knowledge lazily, the documents are yielded once extracted.
+
+        The default implementation yields the documents of :meth:`load`.
+        """
+        yield from self.load()
+
+    def load_stream(self) -> Optional[Tuple[Iterator[str], Dict[str, Any]]]:
+        """Return the text blocks and the metadata of a plain text knowledge.
+
+        A single text file is split as a stream without reading the whole file, see
+        :meth:`TextSplitter.iter_stream_documents`. The default is None, the
+        knowledge is split by the documents of :meth:`iter_load`.
+        """
+        return None
+
     def extract(
         self,
         documents: List[Document],
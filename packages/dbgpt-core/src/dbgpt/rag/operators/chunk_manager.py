@@ -62,8 +62,9 @@ class ChunkManagerOperator(MapOperator[Knowledge, List[Chunk]]):
 
     async def map(self, knowledge: Knowledge) -> List[Chunk]:
         """Persist chunks in vector db."""
-        documents = knowledge.load()
         chunk_manager = ChunkManager(
             knowledge=knowledge, chunk_parameter=self._chunk_parameters
         )
-        return chunk_manager.split(documents)
+        return await self.blocking_func_to_async(
+            lambda: list(chunk_manager.iter_chunks())
+        )
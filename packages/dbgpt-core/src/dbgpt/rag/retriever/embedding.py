@@ -1,7 +1,6 @@
 """Embedding retriever."""
 
-from functools import reduce
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional
 
 from dbgpt.core import Chunk
 from dbgpt.rag.retriever.base import BaseRetriever, RetrieverStrategy
@@ -23,6 +22,7 @@ class EmbeddingRetriever(BaseRetriever):
         query_rewrite: Optional[QueryRewrite] = None,
         rerank: Optional[Ranker] = None,
         retrieve_strategy: Optional[RetrieverStrategy] = RetrieverStrategy.EMBEDDING,
+        concurrency_limit: Optional[int] = 5,
     ):
         """Create EmbeddingRetriever.
 
@@ -31,6 +31,8 @@ class EmbeddingRetriever(BaseRetriever):
             top_k (int): top k
             query_rewrite (Optional[QueryRewrite]): query rewrite
             rerank (Ranker): rerank
+            concurrency_limit (Optional[int]): The max number of the queries searched
+                concurrently, None means no limit.
 
         Examples:
             .. code-block:: python
@@ -70,6 +72,7 @@ class EmbeddingRetriever(BaseRetriever):
         self._index_store = index_store
         self._rerank = rerank or DefaultRanker(self._top_k)
         self._retrieve_strategy = retrieve_strategy
+        self._concurrency_limit = concurrency_limit
 
     def load_document(self, chunks: List[Chunk], **kwargs: Dict[str, Any]) -> List[str]:
         """Load document in vector database.
@@ -97,8 +100,7 @@ class EmbeddingRetriever(BaseRetriever):
             self._index_store.similar_search(query, self._top_k, filters)
             for query in queries
         ]
-        res_candidates = cast(List[Chunk], reduce(lambda x, y: x + y, candidates))
-        return res_candidates
+        return _merge_candidates(candidates)
 
     def _retrieve_with_score(
         self,
@@ -122,9 +124,7 @@ class EmbeddingRetriever(BaseRetriever):
             )
             for query in queries
         ]
-        new_candidates_with_score = cast(
-            List[Chunk], reduce(lambda x, y: x + y, candidates_with_score)
-        )
+        new_candidates_with_score = _merge_candidates(candidates_with_score)
         new_candidates_with_score = self._rerank.rank(new_candidates_with_score, query)
         return new_candidates_with_score
 
@@ -157,8 +157,7 @@ class EmbeddingRetriever(BaseRetriever):
             self._similarity_search(query, filters, root_tracer.get_current_span_id())
             for query in queries
         ]
-        new_candidates = await run_async_tasks(tasks=candidates, concurrency_limit=1)
-        return new_candidates
+        return await self._run_async_tasks(candidates)
 
     async def _aretrieve_with_score(
         self,
@@ -202,18 +201,27 @@ class EmbeddingRetriever(BaseRetriever):
             "dbgpt.rag.retriever.embeddings.similarity_search_with_score",
             metadata={"query": query, "score_threshold": score_threshold},
         ):
-            candidates_with_score = [
-                self._similarity_search_with_score(
-                    query, score_threshold, filters, root_tracer.get_current_span_id()
+            if len(queries) == 1:
+                res_candidates_with_score = [
+                    await self._similarity_search_with_score(
+                        query,
+                        score_threshold,
+                        filters,
+                        root_tracer.get_current_span_id(),
+                    )
+                ]
+            else:
+                # Embed and search all the rewritten queries in one batch
+                res_candidates_with_score = (
+                    await self._index_store.asimilar_search_with_scores_batch(
+                        queries,
+                        self._top_k,
+                        score_threshold,
+                        filters,
+                        concurrency_limit=self._concurrency_limit,
+                    )
                 )
-                for query in queries
-            ]
-            res_candidates_with_score = await run_async_tasks(
-                tasks=candidates_with_score, concurrency_limit=1
-            )
-            new_candidates_with_score = cast(
-                List[Chunk], reduce(lambda x, y: x + y, res_candidates_with_score)
-            )
+            new_candidates_with_score = _merge_candidates(res_candidates_with_score)
 
         with root_tracer.start_span(
             "dbgpt.rag.retriever.embeddings.rerank",
@@ -246,9 +254,10 @@ class EmbeddingRetriever(BaseRetriever):
 
     async def _run_async_tasks(self, tasks) -> List[Chunk]:
         """Run async tasks."""
-        candidates = await run_async_tasks(tasks=tasks, concurrency_limit=1)
-        candidates = reduce(lambda x, y: x + y, candidates)
-        return cast(List[Chunk], candidates)
+        candidates = await run_async_tasks(
+            tasks=tasks, concurrency_limit=self._concurrency_limit
+        )
+        return _merge_candidates(candidates)
 
     async def _similarity_search_with_score(
         self,
@@ -274,3 +283,17 @@ class EmbeddingRetriever(BaseRetriever):
     def name(cls):
         """Return retriever name."""
         return "embedding_retriever"
+
+
+def _merge_candidates(candidates: List[List[Chunk]]) -> List[Chunk]:
+    """Merge the candidates of the queries, deduplicated by chunk id.
+
+    The chunk found by several queries keeps its best score and its first position.
+    """
+    merged: Dict[str, Chunk] = {}
+    for chunks in candidates:
+        for chunk in chunks:
+            exist = merged.get(chunk.chunk_id)
+            if exist is None or chunk.score > exist.score:
+                merged[chunk.chunk_id] = chunk
+    return list(merged.values())
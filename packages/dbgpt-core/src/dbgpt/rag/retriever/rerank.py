@@ -1,16 +1,97 @@
 """Rerank module for RAG retriever."""
 
+import hashlib
+import threading
 from abc import ABC, abstractmethod
-from typing import Callable, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from dbgpt.core import Chunk, RerankEmbeddings
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
-from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
+from dbgpt.util.chat_util import run_async_tasks
+from dbgpt.util.executor_utils import (
+    blocking_func_to_async,
+    blocking_func_to_async_no_executor,
+)
 from dbgpt.util.i18n_utils import _
+from dbgpt.util.similarity_util import top_k
 
 RANK_FUNC = Callable[[List[Chunk]], List[Chunk]]
 
 
+class RerankScoreCache:
+    """LRU cache of the rerank scores.
+
+    A score is keyed by the model name, the query hash and the chunk id, and the
+    hash of the chunk content in case the content of a chunk id is updated. The
+    rankers share the default cache, so the repeated queries only score the new
+    candidates.
+    """
+
+    def __init__(self, max_size: int = 50000):
+        """Create a new RerankScoreCache.
+
+        Args:
+            max_size(int): The max number of the cached scores.
+        """
+        self._max_size = max_size
+        self._scores: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(model_name: str, query: str, chunks: Sequence[Chunk]) -> List[Tuple]:
+        query_hash = hashlib.sha256(query.encode("utf-8")).digest()
+        return [
+            (model_name, query_hash, chunk.chunk_id, hash(chunk.content))
+            for chunk in chunks
+        ]
+
+    def get_many(
+        self, model_name: str, query: str, chunks: Sequence[Chunk]
+    ) -> List[Optional[float]]:
+        """Return the cached scores of the chunks, None if not cached."""
+        keys = self._keys(model_name, query, chunks)
+        scores: List[Optional[float]] = []
+        with self._lock:
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                scores.append(score)
+        return scores
+
+    def put_many(
+        self,
+        model_name: str,
+        query: str,
+        chunks: Sequence[Chunk],
+        scores: Sequence[float],
+    ) -> None:
+        """Cache the scores of the chunks."""
+        keys = self._keys(model_name, query, chunks)
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._scores[key] = float(score)
+                self._scores.move_to_end(key)
+            while len(self._scores) > self._max_size:
+                self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all the cached scores."""
+        with self._lock:
+            self._scores.clear()
+
+    def __len__(self) -> int:
+        """Return the number of the cached scores."""
+        return len(self._scores)
+
+
+_DEFAULT_SCORE_CACHE = RerankScoreCache()
+
+
 class Ranker(ABC):
     """Base Ranker."""
 
@@ -74,14 +155,13 @@ class Ranker(ABC):
     def _rerank_with_scores(
         self, candidates_with_scores: List[Chunk], rank_scores: List[float]
     ) -> List[Chunk]:
-        """Rerank candidates with scores."""
+        """Rerank candidates with scores, return the top k candidates."""
         for candidate, score in zip(candidates_with_scores, rank_scores):
             candidate.score = float(score)
 
-        new_candidates_with_scores = sorted(
-            candidates_with_scores, key=lambda x: x.score, reverse=True
-        )
-        return new_candidates_with_scores
+        scores = np.asarray(rank_scores, dtype=np.float64).reshape(-1)
+        indexes = top_k(scores, self.topk)[0]
+        return [candidates_with_scores[i] for i in indexes.tolist()]
 
 
 @register_resource(
@@ -174,6 +254,169 @@ class RRFRanker(Ranker):
         return candidates_with_scores
 
 
+class _ModelRanker(Ranker):
+    """Base ranker scoring the candidates by a rerank model.
+
+    The candidates are capped by their first stage scores before they are
+    scored, the cached scores are reused, and the contents to score are sent to
+    the model in batches.
+    """
+
+    def __init__(
+        self,
+        topk: int,
+        model_name: str,
+        rank_fn: Optional[RANK_FUNC] = None,
+        batch_size: int = 32,
+        max_candidates: Optional[int] = None,
+        score_cache: Optional[RerankScoreCache] = _DEFAULT_SCORE_CACHE,
+        executor: Optional[Executor] = None,
+    ):
+        """Create a model ranker.
+
+        Args:
+            topk(int): The number of top k documents.
+            model_name(str): The model name, the namespace of the cached scores.
+            rank_fn(Optional[callable]): The rank function.
+            batch_size(int): The max number of the contents of a model call.
+            max_candidates(Optional[int]): The max number of the candidates to
+                score, the candidates of the highest first stage scores are kept,
+                None means no limit.
+            score_cache(Optional[RerankScoreCache]): The score cache, None to
+                disable it.
+            executor(Optional[Executor]): The executor to run the blocking model
+                calls of the async methods.
+        """
+        super().__init__(topk, rank_fn)
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self._model_name = model_name
+        self._batch_size = batch_size
+        self._max_candidates = max_candidates
+        self._score_cache = score_cache
+        self._executor = executor
+
+    def _need_rank(self, candidates: List[Chunk], query: Optional[str]) -> bool:
+        return bool(candidates) and bool(query)
+
+    @abstractmethod
+    def _predict(self, query: str, contents: List[str]) -> List[float]:
+        """Score a batch of contents."""
+
+    async def _apredict(self, query: str, contents: List[str]) -> List[float]:
+        """Score a batch of contents asynchronously."""
+        return await blocking_func_to_async(
+            self._executor, self._predict, query, contents
+        )
+
+    def _cap_candidates(self, candidates: List[Chunk]) -> List[Chunk]:
+        """Keep the candidates of the highest first stage scores."""
+        if self._max_candidates is None or len(candidates) <= self._max_candidates:
+            return candidates
+        scores = np.asarray([c.score or 0.0 for c in candidates], dtype=np.float64)
+        indexes = top_k(scores, self._max_candidates)[0]
+        return [candidates[i] for i in indexes.tolist()]
+
+    def _lookup_scores(
+        self, candidates: List[Chunk], query: str
+    ) -> Tuple[List[Optional[float]], List[List[str]]]:
+        """Return the cached scores and the batches of the contents to score.
+
+        The duplicate contents are only scored once.
+        """
+        if self._score_cache is not None:
+            scores = self._score_cache.get_many(self._model_name, query, candidates)
+        else:
+            scores = [None] * len(candidates)
+        contents = list(
+            dict.fromkeys(
+                candidate.content or ""
+                for candidate, score in zip(candidates, scores)
+                if score is None
+            )
+        )
+        batches = [
+            contents[i : i + self._batch_size]
+            for i in range(0, len(contents), self._batch_size)
+        ]
+        return scores, batches
+
+    def _fill_scores(
+        self,
+        candidates: List[Chunk],
+        query: str,
+        scores: List[Optional[float]],
+        batches: List[List[str]],
+        batch_scores: List[Sequence[float]],
+    ) -> List[float]:
+        """Fill the missing scores by the model scores, and cache them."""
+        content_scores: Dict[str, float] = {}
+        for contents, predicted in zip(batches, batch_scores):
+            content_scores.update(zip(contents, (float(s) for s in predicted)))
+        scored = [
+            candidate for candidate, score in zip(candidates, scores) if score is None
+        ]
+        if self._score_cache is not None and scored:
+            self._score_cache.put_many(
+                self._model_name,
+                query,
+                scored,
+                [content_scores[c.content or ""] for c in scored],
+            )
+        return [
+            score if score is not None else content_scores[candidate.content or ""]
+            for candidate, score in zip(candidates, scores)
+        ]
+
+    def rank(
+        self, candidates_with_scores: List[Chunk], query: Optional[str] = None
+    ) -> List[Chunk]:
+        """Rerank the candidates by the model.
+
+        Args:
+            candidates_with_scores: List[Chunk], candidates with scores
+            query: Optional[str], query text
+        Returns:
+            List[Chunk], reranked candidates
+        """
+        if not self._need_rank(candidates_with_scores, query):
+            return candidates_with_scores
+        query = query or ""
+        candidates = self._cap_candidates(candidates_with_scores)
+        scores, batches = self._lookup_scores(candidates, query)
+        batch_scores = [self._predict(query, contents) for contents in batches]
+        rank_scores = self._fill_scores(
+            candidates, query, scores, batches, batch_scores
+        )
+        return self._rerank_with_scores(candidates, rank_scores)
+
+    async def arank(
+        self, candidates_with_scores: List[Chunk], query: Optional[str] = None
+    ) -> List[Chunk]:
+        """Rerank the candidates by the model asynchronously.
+
+        The batches are scored concurrently.
+
+        Args:
+            candidates_with_scores: List[Chunk], candidates with scores
+            query: Optional[str], query text
+        Returns:
+            List[Chunk], reranked candidates
+        """
+        if not self._need_rank(candidates_with_scores, query):
+            return candidates_with_scores
+        query = query or ""
+        candidates = self._cap_candidates(candidates_with_scores)
+        scores, batches = self._lookup_scores(candidates, query)
+        batch_scores = await run_async_tasks(
+            [self._apredict(query, contents) for contents in batches]
+        )
+        rank_scores = self._fill_scores(
+            candidates, query, scores, batches, batch_scores
+        )
+        return self._rerank_with_scores(candidates, rank_scores)
+
+
 @register_resource(
     _("CrossEncoder Rerank"),
     "cross_encoder_ranker",
@@ -200,7 +443,7 @@ class RRFRanker(Ranker):
         ),
     ],
 )
-class CrossEncoderRanker(Ranker):
+class CrossEncoderRanker(_ModelRanker):
     """CrossEncoder Ranker."""
 
     def __init__(
@@ -209,6 +452,10 @@ class CrossEncoderRanker(Ranker):
         model: str = "BAAI/bge-reranker-base",
         device: str = "cpu",
         rank_fn: Optional[RANK_FUNC] = None,
+        batch_size: int = 32,
+        max_candidates: Optional[int] = None,
+        score_cache: Optional[RerankScoreCache] = _DEFAULT_SCORE_CACHE,
+        executor: Optional[Executor] = None,
     ):
         """Cross Encoder rank algorithm implementation.
 
@@ -217,6 +464,13 @@ class CrossEncoderRanker(Ranker):
             model: str - rerank model name, e.g., 'BAAI/bge-reranker-base'.
             device: str - device name, e.g., 'cpu'.
             rank_fn: Optional[callable] - The rank function.
+            batch_size: int - The batch size of the cross encoder.
+            max_candidates: Optional[int] - The max number of the candidates to
+                score, the candidates of the highest first stage scores are kept.
+            score_cache: Optional[RerankScoreCache] - The score cache, None to
+                disable it.
+            executor: Optional[Executor] - The executor to run the cross encoder
+                of `arank`.
         Refer: https://www.sbert.net/examples/applications/cross-encoder/README.html
         """
         try:
@@ -226,41 +480,27 @@ class CrossEncoderRanker(Ranker):
                 "please `pip install sentence-transformers`",
             )
         self._model = CrossEncoder(model, max_length=512, device=device)
-        super().__init__(topk, rank_fn)
-
-    def rank(
-        self, candidates_with_scores: List[Chunk], query: Optional[str] = None
-    ) -> List[Chunk]:
-        """Cross Encoder rank algorithm implementation.
-
-        Args:
-            candidates_with_scores: List[Chunk], candidates with scores
-            query: Optional[str], query text
-        Returns:
-            List[Chunk], reranked candidates
-        """
-        if len(candidates_with_scores) <= 1:
-            return candidates_with_scores
-        contents = [candidate.content for candidate in candidates_with_scores]
-        query_content_pairs = [
-            [
-                query if query is not None else "",
-                content if content is not None else "",
-            ]
-            for content in contents
-        ]
-        rank_scores = self._model.predict(sentences=query_content_pairs)
+        super().__init__(
+            topk,
+            model,
+            rank_fn,
+            batch_size=batch_size,
+            max_candidates=max_candidates,
+            score_cache=score_cache,
+            executor=executor,
+        )
 
-        for candidate, score in zip(candidates_with_scores, rank_scores):
-            candidate.score = float(score)
+    def _need_rank(self, candidates: List[Chunk], query: Optional[str]) -> bool:
+        return len(candidates) > 1
 
-        new_candidates_with_scores = sorted(
-            candidates_with_scores, key=lambda x: x.score, reverse=True
+    def _predict(self, query: str, contents: List[str]) -> List[float]:
+        query_content_pairs = [[query, content] for content in contents]
+        return self._model.predict(
+            sentences=query_content_pairs, batch_size=self._batch_size
         )
-        return new_candidates_with_scores[: self.topk]
 
 
-class RerankEmbeddingsRanker(Ranker):
+class RerankEmbeddingsRanker(_ModelRanker):
     """Rerank Embeddings Ranker."""
 
     def __init__(
@@ -268,52 +508,38 @@ class RerankEmbeddingsRanker(Ranker):
         rerank_embeddings: RerankEmbeddings,
         topk: int = 4,
         rank_fn: Optional[RANK_FUNC] = None,
+        batch_size: int = 32,
+        max_candidates: Optional[int] = None,
+        score_cache: Optional[RerankScoreCache] = _DEFAULT_SCORE_CACHE,
     ):
-        """Rerank Embeddings rank algorithm implementation."""
-        self._model = rerank_embeddings
-        super().__init__(topk, rank_fn)
-
-    def rank(
-        self, candidates_with_scores: List[Chunk], query: Optional[str] = None
-    ) -> List[Chunk]:
         """Rerank Embeddings rank algorithm implementation.
 
         Args:
-            candidates_with_scores: List[Chunk], candidates with scores
-            query: Optional[str], query text
-        Returns:
-            List[Chunk], reranked candidates
+            rerank_embeddings(RerankEmbeddings): The rerank model.
+            topk(int): The number of top k documents.
+            rank_fn(Optional[callable]): The rank function.
+            batch_size(int): The max number of the contents of a model call.
+            max_candidates(Optional[int]): The max number of the candidates to
+                score, the candidates of the highest first stage scores are kept.
+            score_cache(Optional[RerankScoreCache]): The score cache, None to
+                disable it. It is disabled if the model has no model name.
         """
-        if not candidates_with_scores or not query:
-            return candidates_with_scores
-
-        contents = [candidate.content for candidate in candidates_with_scores]
-        rank_scores = self._model.predict(query, contents)
-        new_candidates_with_scores = self._rerank_with_scores(
-            candidates_with_scores, rank_scores
+        self._model = rerank_embeddings
+        model_name = getattr(rerank_embeddings, "model_name", None)
+        super().__init__(
+            topk,
+            model_name or type(rerank_embeddings).__name__,
+            rank_fn,
+            batch_size=batch_size,
+            max_candidates=max_candidates,
+            score_cache=score_cache if model_name else None,
         )
-        return new_candidates_with_scores[: self.topk]
 
-    async def arank(
-        self, candidates_with_scores: List[Chunk], query: Optional[str] = None
-    ) -> List[Chunk]:
-        """Rerank Embeddings rank algorithm implementation.
+    def _predict(self, query: str, contents: List[str]) -> List[float]:
+        return self._model.predict(query, contents)
 
-        Args:
-            candidates_with_scores: List[Chunk], candidates with scores
-            query: Optional[str], query text
-        Returns:
-            List[Chunk], reranked candidates
-        """
-        if not candidates_with_scores or not query:
-            return candidates_with_scores
-
-        contents = [candidate.content for candidate in candidates_with_scores]
-        rank_scores = await self._model.apredict(query, contents)
-        new_candidates_with_scores = self._rerank_with_scores(
-            candidates_with_scores, rank_scores
-        )
-        return new_candidates_with_scores[: self.topk]
+    async def _apredict(self, query: str, contents: List[str]) -> List[float]:
+        return await self._model.apredict(query, contents)
 
 
 class RetrieverNameRanker(Ranker):
@@ -0,0 +1,93 @@
+from typing import List
+
+import pytest
+
+from dbgpt.core import Chunk, RerankEmbeddings
+from dbgpt.rag.retriever.rerank import RerankEmbeddingsRanker, RerankScoreCache
+
+
+class _LengthRerankEmbeddings(RerankEmbeddings):
+    """Score the candidates by the content length, record the calls."""
+
+    model_name = "length-reranker"
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def predict(self, query: str, candidates: List[str]) -> List[float]:
+        self.calls.append(candidates)
+        return [float(len(candidate)) for candidate in candidates]
+
+
+def _candidates(n: int = 10) -> List[Chunk]:
+    return [
+        Chunk(chunk_id=f"id_{i}", content="x" * (i + 1), score=1.0 - i / 100)
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def model():
+    return _LengthRerankEmbeddings()
+
+
+def test_rank_in_batches(model):
+    ranker = RerankEmbeddingsRanker(model, topk=3, batch_size=4, score_cache=None)
+    results = ranker.rank(_candidates(), "query")
+    assert [chunk.chunk_id for chunk in results] == ["id_9", "id_8", "id_7"]
+    assert [chunk.score for chunk in results] == [10.0, 9.0, 8.0]
+    assert [len(call) for call in model.calls] == [4, 4, 2]
+
+
+def test_score_cache(model):
+    cache = RerankScoreCache()
+    ranker = RerankEmbeddingsRanker(model, topk=3, score_cache=cache)
+    ranker.rank(_candidates(5), "query")
+    assert len(cache) == 5
+
+    # Only the new candidates of a repeated query are scored
+    results = ranker.rank(_candidates(7), "query")
+    assert model.calls[1] == ["x" * 6, "x" * 7]
+    assert [chunk.chunk_id for chunk in results] == ["id_6", "id_5", "id_4"]
+
+    ranker.rank(_candidates(2), "another query")
+    assert len(model.calls) == 3
+    assert len(cache) == 9
+
+
+def test_score_cache_is_bounded():
+    cache = RerankScoreCache(max_size=3)
+    chunks = _candidates(5)
+    cache.put_many("model", "query", chunks, [1.0] * 5)
+    assert len(cache) == 3
+    assert cache.get_many("model", "query", chunks) == [None, None, 1.0, 1.0, 1.0]
+    assert cache.get_many("other", "query", chunks) == [None] * 5
+    # The content of a chunk id is changed
+    changed = Chunk(chunk_id="id_4", content="changed")
+    assert cache.get_many("model", "query", [changed]) == [None]
+
+
+def test_max_candidates_and_duplicates(model):
+    candidates = _candidates() + [Chunk(chunk_id="dup", content="x", score=2.0)]
+    ranker = RerankEmbeddingsRanker(model, topk=10, max_candidates=4, score_cache=None)
+    results = ranker.rank(candidates, "query")
+    # The candidates of the highest retrieval scores are kept
+    assert sorted(chunk.chunk_id for chunk in results) == [
+        "dup",
+        "id_0",
+        "id_1",
+        "id_2",
+    ]
+    # The duplicate content is scored once
+    assert model.calls == [["x", "xx", "xxx"]]
+
+
+@pytest.mark.asyncio
+async def test_arank(model):
+    ranker = RerankEmbeddingsRanker(model, topk=2, batch_size=3)
+    results = await ranker.arank(_candidates(7), "async query")
+    assert [chunk.chunk_id for chunk in results] == ["id_6", "id_5"]
+    assert sorted(len(call) for call in model.calls) == [1, 3, 3]
+    # Nothing to rerank without a query
+    candidates = _candidates(3)
+    assert await ranker.arank(candidates, None) is candidates
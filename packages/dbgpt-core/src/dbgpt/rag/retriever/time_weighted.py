@@ -3,13 +3,16 @@
 import datetime
 import logging
 from copy import deepcopy
-from typing import Any, Dict, List, Optional, Protocol, Tuple
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
 
 from dbgpt.core import Chunk
 from dbgpt.rag.retriever.rerank import Ranker
 from dbgpt.rag.retriever.rewrite import QueryRewrite
 from dbgpt.storage.base import IndexStoreBase
 from dbgpt.storage.vector_store.filters import MetadataFilters
+from dbgpt.util.similarity_util import top_k
 
 from .embedding import EmbeddingRetriever
 
@@ -44,6 +47,11 @@ def _get_hours_passed(time: datetime.datetime, ref_time: datetime.datetime) -> f
     return (time - ref_time).total_seconds() / 3600
 
 
+def _top_k_docs(docs: List[Chunk], scores: np.ndarray, k: int) -> List[Chunk]:
+    """Return the k documents with the highest scores, sorted by score."""
+    return [docs[i] for i in top_k(scores, k)[0].tolist()]
+
+
 class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
     """Time weighted embedding retriever with external storage support."""
 
@@ -172,23 +180,22 @@ class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
                 query, topk=self._top_k, score_threshold=0, filters=filters
             )
 
-            # Apply time weighting to vector store results
-            rescored_docs = []
-            for doc in docs_and_scores:
-                # Extract time information from metadata
-                if "last_accessed_at" in doc.metadata and "created_at" in doc.metadata:
-                    rescored_docs.append(
-                        (doc, self._get_combined_score(doc, doc.score, current_time))
-                    )
-                else:
-                    # If time info not available, just use vector similarity
-                    rescored_docs.append((doc, doc.score))
-
-            # Sort by combined score
-            rescored_docs.sort(key=lambda x: x[1], reverse=True)
+            # Apply time weighting to vector store results, if time info not
+            # available, just use vector similarity
+            scores = np.array([doc.score for doc in docs_and_scores], dtype=float)
+            timed = [
+                i
+                for i, doc in enumerate(docs_and_scores)
+                if "last_accessed_at" in doc.metadata and "created_at" in doc.metadata
+            ]
+            if timed:
+                timed_docs = [docs_and_scores[i] for i in timed]
+                scores[timed] = self._get_combined_scores(
+                    timed_docs, [doc.score for doc in timed_docs], current_time
+                )
 
-            # Return top k results
-            return [doc for doc, _ in rescored_docs[: self._k]]
+            # Return top k results by combined score
+            return _top_k_docs(docs_and_scores, scores, self._k)
 
         # Normal operation with memory stream
         # Get the most recent documents
@@ -207,16 +214,16 @@ class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
         if not docs_and_scores:
             return self._retrieve_vector_store_only(query, filters, current_time)
 
-        rescored_docs = [
-            (doc, self._get_combined_score(doc, relevance, current_time))
-            for doc, relevance in docs_and_scores.values()
-        ]
-
-        rescored_docs.sort(key=lambda x: x[1], reverse=True)
+        docs = [doc for doc, _ in docs_and_scores.values()]
+        scores = self._get_combined_scores(
+            docs,
+            [relevance for _, relevance in docs_and_scores.values()],
+            current_time,
+        )
         result = []
 
         # Ensure frequently accessed memories aren't forgotten
-        for doc, _ in rescored_docs[: self._k]:
+        for doc in _top_k_docs(docs, scores, self._k):
             if "buffer_idx" in doc.metadata:
                 buffer_idx = doc.metadata["buffer_idx"]
                 if 0 <= buffer_idx < len(self.memory_stream):
@@ -256,26 +263,23 @@ class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
             query, topk=self._top_k, score_threshold=0, filters=filters
         )
 
-        # Apply time weighting
-        rescored_docs = []
-        for doc in docs:
-            # Update last_accessed_at time if it exists
-            if "last_accessed_at" in doc.metadata:
-                last_accessed_time = doc.metadata["last_accessed_at"]
-                hours_passed = _get_hours_passed(current_time, last_accessed_time)
-                time_score = (1.0 - self.decay_rate) ** hours_passed
-                # Combine with vector similarity score
-                combined_score = doc.score + time_score
-                rescored_docs.append((doc, combined_score))
-            else:
-                # Just use vector similarity if no time data
-                rescored_docs.append((doc, doc.score))
-
-        # Sort by combined score
-        rescored_docs.sort(key=lambda x: x[1], reverse=True)
+        # Apply time weighting, just use vector similarity if no time data
+        scores = np.array([doc.score for doc in docs], dtype=float)
+        timed = [i for i, doc in enumerate(docs) if "last_accessed_at" in doc.metadata]
+        if timed:
+            hours_passed = np.array(
+                [
+                    _get_hours_passed(
+                        current_time, docs[i].metadata["last_accessed_at"]
+                    )
+                    for i in timed
+                ]
+            )
+            # Combine with vector similarity score
+            scores[timed] += (1.0 - self.decay_rate) ** hours_passed
 
-        # Return top results
-        return [doc for doc, _ in rescored_docs[: self._k]]
+        # Return top results by combined score
+        return _top_k_docs(docs, scores, self._k)
 
     def _get_combined_score(
         self,
@@ -293,22 +297,42 @@ class TimeWeightedEmbeddingRetriever(EmbeddingRetriever):
         Returns:
             Combined score value
         """
-        # Default last_accessed_at to creation time if not present
-        last_accessed_at = chunk.metadata.get("last_accessed_at")
-        if last_accessed_at is None:
-            last_accessed_at = chunk.metadata.get("created_at", current_time)
-
-        hours_passed = _get_hours_passed(current_time, last_accessed_at)
-        score = (1.0 - self.decay_rate) ** hours_passed
+        return float(
+            self._get_combined_scores([chunk], [vector_relevance], current_time)[0]
+        )
 
-        for key in self.other_score_keys:
-            if key in chunk.metadata:
-                score += chunk.metadata[key]
+    def _get_combined_scores(
+        self,
+        chunks: Sequence[Chunk],
+        vector_relevances: Sequence[Optional[float]],
+        current_time: datetime.datetime,
+    ) -> np.ndarray:
+        """Calculate the combined scores of the documents in one batch.
 
-        if vector_relevance is not None:
-            score += vector_relevance
+        Args:
+            chunks: The document chunks
+            vector_relevances: Vector similarity score of every chunk
+            current_time: Current time for calculating decay
 
-        return score
+        Returns:
+            The combined score of every chunk
+        """
+        hours_passed = np.zeros(len(chunks))
+        scores = np.zeros(len(chunks))
+        for i, (chunk, relevance) in enumerate(zip(chunks, vector_relevances)):
+            # Default last_accessed_at to creation time if not present
+            last_accessed_at = chunk.metadata.get("last_accessed_at")
+            if last_accessed_at is None:
+                last_accessed_at = chunk.metadata.get("created_at", current_time)
+            hours_passed[i] = _get_hours_passed(current_time, last_accessed_at)
+
+            for key in self.other_score_keys:
+                if key in chunk.metadata:
+                    scores[i] += chunk.metadata[key]
+            if relevance is not None:
+                scores[i] += relevance
+
+        return scores + (1.0 - self.decay_rate) ** hours_passed
 
     def get_salient_docs(
         self, query: str, filters: Optional[MetadataFilters] = None
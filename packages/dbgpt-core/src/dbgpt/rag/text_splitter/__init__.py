@@ -8,6 +8,7 @@ from .text_splitter import (  # noqa: F401
     SeparatorTextSplitter,
     SpacyTextSplitter,
     TextSplitter,
+    iter_text_blocks,
 )
 
 __ALL__ = [
@@ -18,4 +19,5 @@ __ALL__ = [
     "SeparatorTextSplitter",
     "SpacyTextSplitter",
     "TextSplitter",
+    "iter_text_blocks",
 ]
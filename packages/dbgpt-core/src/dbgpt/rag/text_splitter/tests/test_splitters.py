@@ -1,7 +1,15 @@
-from dbgpt.core import Chunk
+import io
+import types
+
+from dbgpt.core import Chunk, Document
+from dbgpt.rag.text_splitter import text_splitter
 from dbgpt.rag.text_splitter.text_splitter import (
     CharacterTextSplitter,
     MarkdownHeaderTextSplitter,
+    ParagraphTextSplitter,
+    RecursiveCharacterTextSplitter,
+    SeparatorTextSplitter,
+    iter_text_blocks,
 )
 
 
@@ -63,3 +71,139 @@ def test_character_text_splitter_empty_doc() -> None:
     output = splitter.split_text(text)
     expected_output = ["db", "gpt"]
     assert output == expected_output
+
+
+def _blocks(text: str, size: int):
+    return (text[i : i + size] for i in range(0, len(text), size))
+
+
+def _contents(chunks):
+    return [(chunk.content, chunk.metadata) for chunk in chunks]
+
+
+def test_iter_stream_splits() -> None:
+    """Test splitting a stream like str.split, with separators across blocks."""
+    text = "a||b||||c|d||"
+    for size in range(1, len(text) + 1):
+        splits = text_splitter._iter_stream_splits(_blocks(text, size), "||")
+        assert list(splits) == text.split("||")
+    assert list(text_splitter._iter_stream_splits([], "||")) == [""]
+    assert list(text_splitter._iter_stream_splits(["ab", "c"], "")) == list("abc")
+
+
+def test_iter_stream_splits_without_separator() -> None:
+    """Test a long split is cut to bound the pending text."""
+    text = "a" * 100 + "|" + "b" * 30 + "||c"
+    splits = list(
+        text_splitter._iter_stream_splits(_blocks(text, 7), "||", max_split_size=20)
+    )
+    # The cut splits are joined without the separator
+    assert "".join(splits) == text.replace("||", "")
+    assert max(len(split) for split in splits) <= 20 + 7
+    assert splits[-1] == "c"
+
+
+def test_character_text_splitter_stream() -> None:
+    """Test splitting a stream gives the chunks of the whole text."""
+    text = " ".join(f"word{i}" for i in range(200))
+    splitter = CharacterTextSplitter(separator=" ", chunk_size=30, chunk_overlap=10)
+    output = splitter.iter_split_stream(_blocks(text, 7))
+    assert isinstance(output, types.GeneratorType)
+    assert list(output) == splitter.split_text(text)
+
+
+def test_separator_and_paragraph_text_splitter_stream() -> None:
+    """Test splitting a stream by the separator splitters."""
+    text = "first\n\nsecond\n\n\n\nthird\n"
+    splitter = SeparatorTextSplitter(separator="\n\n", enable_merge=False)
+    assert list(splitter.iter_split_stream(_blocks(text, 3))) == [
+        "first",
+        "second",
+        "third\n",
+    ]
+    merge_splitter = SeparatorTextSplitter(
+        separator="\n\n", enable_merge=True, chunk_size=14, chunk_overlap=0
+    )
+    assert list(
+        merge_splitter.iter_split_stream(_blocks(text, 3))
+    ) == merge_splitter.split_text(text)
+
+    paragraph_splitter = ParagraphTextSplitter()
+    assert list(paragraph_splitter.iter_split_stream(_blocks(text, 3))) == [
+        "first",
+        "second",
+        "third",
+    ]
+
+
+def test_recursive_text_splitter_stream(monkeypatch) -> None:
+    """Test the default streaming split by segments."""
+    monkeypatch.setattr(text_splitter, "_STREAM_SEGMENT_SIZE", 50)
+    text = "\n".join(f"line {i} " + "x" * 10 for i in range(20))
+    splitter = RecursiveCharacterTextSplitter(
+        separators=["\n", " ", ""], chunk_size=40, chunk_overlap=0, separator="\n"
+    )
+    assert list(splitter.iter_split_text(text)) == splitter.split_text(text)
+    output = list(splitter.iter_split_stream(_blocks(text, 16)))
+    assert all(len(chunk) <= 40 for chunk in output)
+    assert "\n".join(output) == text
+
+
+def test_md_header_text_splitter_stream() -> None:
+    """Test splitting a markdown stream gives the chunks of the whole text."""
+    markdown_document = (
+        "# dbgpt\n\n"
+        "    ## description\n\n"
+        "my name is dbgpt\n"
+        "```python\n# not a header\n```\n\n"
+        " ## content\n\n"
+        "my name is aries"
+    )
+    splitter = MarkdownHeaderTextSplitter()
+    expected = splitter.split_text(markdown_document)
+    for size in (1, 5, 64):
+        output = splitter.iter_split_stream(_blocks(markdown_document, size))
+        assert _contents(output) == _contents(expected)
+
+    chunks = list(
+        splitter.iter_stream_documents(
+            iter_text_blocks(io.StringIO(markdown_document), block_size=4),
+            metadata={"source": "readme.md"},
+        )
+    )
+    assert [chunk.content for chunk in chunks] == [c.content for c in expected]
+    assert chunks[-1].metadata == {
+        "Header1": "dbgpt",
+        "Header2": "content",
+        "source": "readme.md",
+    }
+
+
+def test_iter_documents_is_lazy() -> None:
+    """Test the documents are split one at a time."""
+    consumed = []
+
+    def documents():
+        for i in range(3):
+            consumed.append(i)
+            yield Document(content=f"doc{i} a b", metadata={"index": i})
+
+    splitter = CharacterTextSplitter(separator=" ", chunk_size=6, chunk_overlap=0)
+    chunks = splitter.iter_documents(documents())
+    first = next(chunks)
+    assert first.content == "doc0 a"
+    assert first.metadata == {"index": 0}
+    assert consumed == [0]
+    rest = list(chunks)
+    assert [chunk.content for chunk in rest] == ["b", "doc1 a", "b", "doc2 a", "b"]
+    chunks = splitter.split_documents(
+        [Document(content="doc0 a b", metadata={"index": 0})]
+    )
+    assert _contents(chunks) == _contents([first, rest[0]])
+
+
+def test_iter_text_blocks(tmp_path) -> None:
+    """Test reading a text file in blocks."""
+    path = tmp_path / "large.log"
+    path.write_text("0123456789", encoding="utf-8")
+    assert list(iter_text_blocks(str(path), block_size=4)) == ["0123", "4567", "89"]
@@ -3,7 +3,22 @@
 import copy
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Iterable, List, Optional, TypedDict, Union, cast
+from collections import deque
+from itertools import repeat
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypedDict,
+    Union,
+    cast,
+)
 
 from dbgpt.core import Chunk, Document
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
@@ -11,6 +26,98 @@ from dbgpt.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
 
+# The min number of characters of a segment in the default streaming split, the
+# segment ends at the next separator
+_STREAM_SEGMENT_SIZE = 1 << 20
+# The max number of characters of a segment without any separator
+_STREAM_SEGMENT_MAX_SIZE = 4 * _STREAM_SEGMENT_SIZE
+
+
+def iter_text_blocks(
+    file: Union[str, IO[str]], block_size: int = 1 << 20, encoding: str = "utf-8"
+) -> Iterator[str]:
+    """Read a text file in blocks, to split it as a stream.
+
+    Args:
+        file(Union[str, IO[str]]): The path or the opened text file.
+        block_size(int): The number of characters of a block.
+        encoding(str): The encoding of the file, used when a path is given.
+
+    Returns:
+        Iterator[str]: The text blocks.
+    """
+    if isinstance(file, str):
+        with open(file, "r", encoding=encoding) as f:
+            yield from iter_text_blocks(f, block_size)
+        return
+    while True:
+        block = file.read(block_size)
+        if not block:
+            return
+        yield block
+
+
+def _iter_stream_splits(
+    stream: Iterable[str],
+    separator: str,
+    max_split_size: int = _STREAM_SEGMENT_MAX_SIZE,
+) -> Iterator[str]:
+    """Split a text stream by the separator like ``str.split``, lazily.
+
+    A separator across two blocks is found too, only the text after the last
+    separator is kept in memory. A split longer than ``max_split_size`` characters
+    is cut, so a stream without any separator never grows the memory.
+    """
+    if not separator:
+        for block in stream:
+            yield from block
+        return
+    pending = ""
+    for block in stream:
+        # The separators before are found already
+        start = max(0, len(pending) - len(separator) + 1)
+        pending += block
+        index = pending.find(separator, start)
+        begin = 0
+        while index >= 0:
+            yield pending[begin:index]
+            begin = index + len(separator)
+            index = pending.find(separator, begin)
+        pending = pending[begin:]
+        if len(pending) > max_split_size:
+            # Keep the text which may be the beginning of a separator
+            cut = len(pending) - len(separator) + 1
+            yield pending[:cut]
+            pending = pending[cut:]
+    yield pending
+
+
+def _iter_stream_segments(
+    stream: Iterable[str], separator: str, segment_size: int, max_segment_size: int
+) -> Iterator[str]:
+    """Cut a text stream into segments at the separators."""
+    blocks: List[str] = []
+    size = 0
+    for block in stream:
+        blocks.append(block)
+        size += len(block)
+        if size < segment_size:
+            continue
+        text = "".join(blocks)
+        index = text.find(separator, segment_size) if separator else -1
+        if index < 0 and len(text) < max_segment_size:
+            blocks, size = [text], len(text)
+            continue
+        if index < 0:
+            yield text
+            blocks, size = [], 0
+        else:
+            yield text[:index]
+            rest = text[index + len(separator) :]
+            blocks, size = [rest], len(rest)
+    if blocks:
+        yield "".join(blocks)
+
 
 class TextSplitter(ABC):
     """Interface for splitting text into chunks.
@@ -47,6 +154,47 @@ class TextSplitter(ABC):
     def split_text(self, text: str, **kwargs) -> List[str]:
         """Split text into multiple components."""
 
+    def iter_split_text(self, text: str, **kwargs) -> Iterator[str]:
+        """Split text into multiple components lazily."""
+        yield from self.split_text(text, **kwargs)
+
+    def iter_split_stream(self, stream: Iterable[str], **kwargs) -> Iterator[str]:
+        """Split a text stream into chunks lazily, with bounded memory.
+
+        The stream is cut into segments of about 1M characters at the separator,
+        and every segment is split by :meth:`iter_split_text`, so a chunk never
+        spans two segments. The splitters which merge the splits of a separator
+        split the stream exactly like the whole text.
+
+        Args:
+            stream(Iterable[str]): The text blocks, e.g. an opened text file or
+                the blocks of :func:`iter_text_blocks`.
+
+        Returns:
+            Iterator[str]: The chunks.
+        """
+        separator = kwargs.get("separator") or self._separator or "\n"
+        for segment in _iter_stream_segments(
+            stream, separator, _STREAM_SEGMENT_SIZE, _STREAM_SEGMENT_MAX_SIZE
+        ):
+            yield from self.iter_split_text(segment, **kwargs)
+
+    def iter_stream_documents(
+        self, stream: Iterable[str], metadata: Optional[dict] = None, **kwargs
+    ) -> Iterator[Chunk]:
+        """Split a text stream into chunks lazily, see :meth:`iter_split_stream`.
+
+        Args:
+            stream(Iterable[str]): The text blocks.
+            metadata(Optional[dict]): The metadata of the chunks.
+
+        Returns:
+            Iterator[Chunk]: The chunks.
+        """
+        metadata = metadata or {}
+        for text in self.iter_split_stream(stream, **kwargs):
+            yield Chunk(content=text, metadata=copy.deepcopy(metadata))
+
     def create_documents(
         self,
         texts: List[str],
@@ -55,29 +203,42 @@ class TextSplitter(ABC):
         **kwargs,
     ) -> List[Chunk]:
         """Create documents from a list of texts."""
-        _metadatas = metadatas or [{}] * len(texts)
-        chunks = []
-        for i, text in enumerate(texts):
-            if _metadatas[i].get("type") == "excel":
-                table_chunk = Chunk(content=text, metadata=copy.deepcopy(_metadatas[i]))
-                chunks.append(table_chunk)
+        return list(self.iter_create_documents(texts, metadatas, separator, **kwargs))
+
+    def iter_create_documents(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[Iterable[dict]] = None,
+        separator: Optional[str] = None,
+        **kwargs,
+    ) -> Iterator[Chunk]:
+        """Create documents from texts lazily."""
+        for text, metadata in zip(texts, metadatas or repeat({})):
+            if metadata.get("type") == "excel":
+                yield Chunk(content=text, metadata=copy.deepcopy(metadata))
             else:
-                for chunk in self.split_text(text, separator=separator, **kwargs):
-                    new_doc = Chunk(
-                        content=chunk, metadata=copy.deepcopy(_metadatas[i])
-                    )
-                    chunks.append(new_doc)
-        return chunks
+                for chunk in self.iter_split_text(text, separator=separator, **kwargs):
+                    yield Chunk(content=chunk, metadata=copy.deepcopy(metadata))
 
     def split_documents(self, documents: Iterable[Document], **kwargs) -> List[Chunk]:
         """Split documents."""
-        texts = []
-        metadatas = []
+        return list(self.iter_documents(documents, **kwargs))
+
+    def iter_documents(
+        self, documents: Iterable[Document], **kwargs
+    ) -> Iterator[Chunk]:
+        """Split documents lazily, one document is split at a time.
+
+        Args:
+            documents(Iterable[Document]): The documents, may be a generator.
+
+        Returns:
+            Iterator[Chunk]: The chunks.
+        """
         for doc in documents:
-            # Iterable just supports one iteration
-            texts.append(doc.content)
-            metadatas.append(doc.metadata)
-        return self.create_documents(texts, metadatas, **kwargs)
+            yield from self.iter_create_documents(
+                [doc.content], [doc.metadata], **kwargs
+            )
 
     def _join_docs(self, docs: List[str], separator: str, **kwargs) -> Optional[str]:
         text = separator.join(docs)
@@ -94,6 +255,17 @@ class TextSplitter(ABC):
         chunk_size: Optional[int] = None,
         chunk_overlap: Optional[int] = None,
     ) -> List[str]:
+        return list(
+            self._iter_merge_splits(splits, separator, chunk_size, chunk_overlap)
+        )
+
+    def _iter_merge_splits(
+        self,
+        splits: Iterable[str | dict],
+        separator: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+    ) -> Iterator[str]:
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
         if chunk_size is None:
@@ -104,8 +276,8 @@ class TextSplitter(ABC):
             separator = self._separator
         separator_len = self._length_function(separator)
 
-        docs = []
-        current_doc: List[str] = []
+        # Only the splits of the current chunk are kept in memory
+        current_doc: Deque[str] = deque()
         total = 0
         for s in splits:
             d = cast(str, s)
@@ -120,9 +292,9 @@ class TextSplitter(ABC):
                         f"which is longer than the specified {chunk_size}"
                     )
                 if len(current_doc) > 0:
-                    doc = self._join_docs(current_doc, separator)
+                    doc = self._join_docs(list(current_doc), separator)
                     if doc is not None:
-                        docs.append(doc)
+                        yield doc
                     # Keep on popping if:
                     # - we have a larger chunk than in the chunk overlap
                     # - or if we still have any chunks and the length is long
@@ -134,13 +306,12 @@ class TextSplitter(ABC):
                         total -= self._length_function(current_doc[0]) + (
                             separator_len if len(current_doc) > 1 else 0
                         )
-                        current_doc = current_doc[1:]
+                        current_doc.popleft()
             current_doc.append(d)
             total += _len + (separator_len if len(current_doc) > 1 else 0)
-        doc = self._join_docs(current_doc, separator)
+        doc = self._join_docs(list(current_doc), separator)
         if doc is not None:
-            docs.append(doc)
-        return docs
+            yield doc
 
     def clean(self, documents: List[dict], filters: List[str]):
         """Clean the documents."""
@@ -243,14 +414,23 @@ class CharacterTextSplitter(TextSplitter):
         self, text: str, separator: Optional[str] = None, **kwargs
     ) -> List[str]:
         """Split incoming text and return chunks."""
+        return list(self.iter_split_text(text, separator, **kwargs))
+
+    def iter_split_text(
+        self, text: str, separator: Optional[str] = None, **kwargs
+    ) -> Iterator[str]:
+        """Split incoming text and yield chunks."""
+        return self.iter_split_stream([text], separator, **kwargs)
+
+    def iter_split_stream(
+        self, stream: Iterable[str], separator: Optional[str] = None, **kwargs
+    ) -> Iterator[str]:
+        """Split a text stream and yield chunks, the same as the whole text."""
         # First we naively split the large input into a bunch of smaller ones.
         if separator is None:
             separator = self._separator
-        if separator:
-            splits = text.split(separator)
-        else:
-            splits = list(text)
-        return self._merge_splits(splits, separator, **kwargs)
+        splits = _iter_stream_splits(stream, separator)
+        return self._iter_merge_splits(splits, separator, **kwargs)
 
 
 @register_resource(
@@ -289,7 +469,12 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         self, text: str, separator: Optional[str] = None, **kwargs
     ) -> List[str]:
         """Split incoming text and return chunks."""
-        final_chunks = []
+        return list(self.iter_split_text(text, separator, **kwargs))
+
+    def iter_split_text(
+        self, text: str, separator: Optional[str] = None, **kwargs
+    ) -> Iterator[str]:
+        """Split incoming text and yield chunks."""
         # Get appropriate separator to use
         separator = self._separators[-1]
         for _s in self._separators:
@@ -300,10 +485,8 @@ class RecursiveCharacterTextSplitter(TextSplitter):
                 separator = _s
                 break
         # Now that we have the separator, split the text
-        if separator:
-            splits = text.split(separator)
-        else:
-            splits = list(text)
+        # The text is in memory already, never cut a long split
+        splits = _iter_stream_splits([text], separator, max_split_size=len(text))
         # Now go merging things, recursively splitting longer texts.
         _good_splits = []
         for s in splits:
@@ -311,25 +494,21 @@ class RecursiveCharacterTextSplitter(TextSplitter):
                 _good_splits.append(s)
             else:
                 if _good_splits:
-                    merged_text = self._merge_splits(
+                    yield from self._iter_merge_splits(
                         _good_splits,
                         separator,
                         chunk_size=kwargs.get("chunk_size", None),
                         chunk_overlap=kwargs.get("chunk_overlap", None),
                     )
-                    final_chunks.extend(merged_text)
                     _good_splits = []
-                other_info = self.split_text(s)
-                final_chunks.extend(other_info)
+                yield from self.iter_split_text(s)
         if _good_splits:
-            merged_text = self._merge_splits(
+            yield from self._iter_merge_splits(
                 _good_splits,
                 separator,
                 chunk_size=kwargs.get("chunk_size", None),
                 chunk_overlap=kwargs.get("chunk_overlap", None),
             )
-            final_chunks.extend(merged_text)
-        return final_chunks
 
 
 @register_resource(
@@ -484,27 +663,32 @@ class MarkdownHeaderTextSplitter(TextSplitter):
         self._separator = separator
         self._chunk_overlap = chunk_overlap
 
-    def create_documents(
+    def iter_create_documents(
         self,
-        texts: List[str],
-        metadatas: Optional[List[dict]] = None,
+        texts: Iterable[str],
+        metadatas: Optional[Iterable[dict]] = None,
         separator: Optional[str] = None,
         **kwargs,
-    ) -> List[Chunk]:
-        """Create documents from a list of texts."""
-        _metadatas = metadatas or [{}] * len(texts)
-        chunks = []
-        for i, text in enumerate(texts):
-            if _metadatas[i].get("type") == "excel":
-                table_chunk = Chunk(content=text, metadata=copy.deepcopy(_metadatas[i]))
-                chunks.append(table_chunk)
+    ) -> Iterator[Chunk]:
+        """Create documents from texts lazily."""
+        for text, metadata in zip(texts, metadatas or repeat({})):
+            if metadata.get("type") == "excel":
+                yield Chunk(content=text, metadata=copy.deepcopy(metadata))
             else:
-                for chunk in self.split_text(text, separator, **kwargs):
-                    metadata = chunk.metadata or {}
-                    metadata.update(_metadatas[i])
-                    new_doc = Chunk(content=chunk.content, metadata=metadata)
-                    chunks.append(new_doc)
-        return chunks
+                for chunk in self.iter_split_text(text, separator, **kwargs):
+                    chunk_metadata = chunk.metadata or {}
+                    chunk_metadata.update(metadata)
+                    yield Chunk(content=chunk.content, metadata=chunk_metadata)
+
+    def iter_stream_documents(
+        self, stream: Iterable[str], metadata: Optional[dict] = None, **kwargs
+    ) -> Iterator[Chunk]:
+        """Split a markdown stream into chunks lazily, with the header metadata."""
+        metadata = metadata or {}
+        for chunk in self.iter_split_stream(stream, **kwargs):
+            chunk_metadata = chunk.metadata or {}
+            chunk_metadata.update(copy.deepcopy(metadata))
+            yield Chunk(content=chunk.content, metadata=chunk_metadata)
 
     def aggregate_lines_to_chunks(self, lines: List[LineType]) -> List[Chunk]:
         """Aggregate lines into chunks based on common metadata.
@@ -512,27 +696,28 @@ class MarkdownHeaderTextSplitter(TextSplitter):
         Args:
             lines: Line of text / associated header metadata
         """
-        aggregated_chunks: List[LineType] = []
+        return list(self._iter_aggregate_lines(lines))
 
+    def _iter_aggregate_lines(self, lines: Iterable[LineType]) -> Iterator[Chunk]:
+        """Aggregate the consecutive lines with the same metadata lazily."""
+        current_metadata: Optional[Dict[str, str]] = None
+        current_content: List[str] = []
         for line in lines:
-            if (
-                aggregated_chunks
-                and aggregated_chunks[-1]["metadata"] == line["metadata"]
-            ):
-                # If the last line in the aggregated list
-                # has the same metadata as the current line,
+            if current_metadata is not None and current_metadata == line["metadata"]:
+                # If the last line has the same metadata as the current line,
                 # append the current content to the last lines's content
-                aggregated_chunks[-1]["content"] += "  \n" + line["content"]
+                current_content.append(line["content"])
             else:
-                # Otherwise, append the current line to the aggregated list
+                if current_metadata is not None:
+                    yield Chunk(
+                        content="  \n".join(current_content),
+                        metadata=current_metadata,
+                    )
                 subtitles = "-".join((list(line["metadata"].values())))
-                line["content"] = f'"{subtitles}": ' + line["content"]
-                aggregated_chunks.append(line)
-
-        return [
-            Chunk(content=chunk["content"], metadata=chunk["metadata"])
-            for chunk in aggregated_chunks
-        ]
+                current_metadata = line["metadata"]
+                current_content = [f'"{subtitles}": ' + line["content"]]
+        if current_metadata is not None:
+            yield Chunk(content="  \n".join(current_content), metadata=current_metadata)
 
     def split_text(  # type: ignore
         self,
@@ -550,17 +735,60 @@ class MarkdownHeaderTextSplitter(TextSplitter):
             chunk_size(int): The size of each chunk
             chunk_overlap(int): The overlap between chunks
         """
+        return list(
+            self.iter_split_text(text, separator, chunk_size, chunk_overlap, **kwargs)
+        )
+
+    def iter_split_text(  # type: ignore
+        self,
+        text: str,
+        separator: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[Chunk]:
+        """Split incoming text and yield chunks."""
+        return self.iter_split_stream(
+            [text], separator, chunk_size, chunk_overlap, **kwargs
+        )
+
+    def iter_split_stream(  # type: ignore
+        self,
+        stream: Iterable[str],
+        separator: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[Chunk]:
+        """Split a markdown stream and yield chunks, the same as the whole text.
+
+        Only the lines of the current chunk are kept in memory.
+
+        Args:
+            stream(Iterable[str]): The text blocks
+            separator(str): The separator to use for splitting the text
+            chunk_size(int): The size of each chunk
+            chunk_overlap(int): The overlap between chunks
+        """
         if separator is None:
             separator = self._separator
-        if chunk_size is None:
-            chunk_size = self._chunk_size
-        if chunk_overlap is None:
-            chunk_overlap = self._chunk_overlap
-
         # Split the input text by newline character ("\n").
-        lines = text.split(separator)
-        # Final output
-        lines_with_metadata: List[LineType] = []
+        lines = _iter_stream_splits(stream, separator)
+        lines_with_metadata = self._iter_lines_with_metadata(lines, separator)
+        # lines_with_metadata has each line with associated header metadata
+        # aggregate these into chunks based on common metadata
+        if not self.return_each_line:
+            return self._iter_aggregate_lines(lines_with_metadata)
+        else:
+            return (
+                Document(content=chunk["content"], metadata=chunk["metadata"])
+                for chunk in lines_with_metadata
+            )
+
+    def _iter_lines_with_metadata(
+        self, lines: Iterable[str], separator: str
+    ) -> Iterator[LineType]:
+        """Yield the lines with their header metadata."""
         # Content and metadata of the chunk currently being processed
         current_content: List[str] = []
         current_metadata: Dict[str, str] = {}
@@ -618,15 +846,13 @@ class MarkdownHeaderTextSplitter(TextSplitter):
                         # Update initial_metadata with the current header
                         initial_metadata[name] = header["data"]
 
-                    # Add the previous line to the lines_with_metadata
+                    # Yield the previous line
                     # only if current_content is not empty
                     if current_content:
-                        lines_with_metadata.append(
-                            {
-                                "content": separator.join(current_content),
-                                "metadata": current_metadata.copy(),
-                            }
-                        )
+                        yield {
+                            "content": separator.join(current_content),
+                            "metadata": current_metadata.copy(),
+                        }
                         current_content.clear()
 
                     break
@@ -634,12 +860,10 @@ class MarkdownHeaderTextSplitter(TextSplitter):
                 if stripped_line:
                     current_content.append(stripped_line)
                 elif current_content:
-                    lines_with_metadata.append(
-                        {
-                            "content": separator.join(current_content),
-                            "metadata": current_metadata.copy(),
-                        }
-                    )
+                    yield {
+                        "content": separator.join(current_content),
+                        "metadata": current_metadata.copy(),
+                    }
                     current_content.clear()
 
             # Code block ends
@@ -648,21 +872,10 @@ class MarkdownHeaderTextSplitter(TextSplitter):
 
             current_metadata = initial_metadata.copy()
         if current_content:
-            lines_with_metadata.append(
-                {
-                    "content": separator.join(current_content),
-                    "metadata": current_metadata,
-                }
-            )
-        # lines_with_metadata has each line with associated header metadata
-        # aggregate these into chunks based on common metadata
-        if not self.return_each_line:
-            return self.aggregate_lines_to_chunks(lines_with_metadata)
-        else:
-            return [
-                Document(content=chunk["content"], metadata=chunk["metadata"])
-                for chunk in lines_with_metadata
-            ]
+            yield {
+                "content": separator.join(current_content),
+                "metadata": current_metadata,
+            }
 
     def clean(self, documents: List[dict], filters: Optional[List[str]] = None):
         """Clean the documents."""
@@ -820,6 +1033,21 @@ class ParagraphTextSplitter(CharacterTextSplitter):
         paragraphs = [p.strip() for p in paragraphs if p.strip() != ""]
         return paragraphs
 
+    def iter_split_text(
+        self, text: str, separator: Optional[str] = "\n", **kwargs
+    ) -> Iterator[str]:
+        """Split incoming text and yield chunks."""
+        return self.iter_split_stream([text])
+
+    def iter_split_stream(
+        self, stream: Iterable[str], separator: Optional[str] = "\n", **kwargs
+    ) -> Iterator[str]:
+        """Split a text stream and yield the paragraphs."""
+        for paragraph in _iter_stream_splits(stream, self._separator):
+            paragraph = paragraph.strip()
+            if paragraph:
+                yield paragraph
+
 
 @register_resource(
     _("Separator Text Splitter"),
@@ -853,15 +1081,18 @@ class SeparatorTextSplitter(CharacterTextSplitter):
         self, text: str, separator: Optional[str] = None, **kwargs
     ) -> List[str]:
         """Split incoming text and return chunks."""
+        return list(self.iter_split_text(text, separator, **kwargs))
+
+    def iter_split_stream(
+        self, stream: Iterable[str], separator: Optional[str] = None, **kwargs
+    ) -> Iterator[str]:
+        """Split a text stream and yield chunks, the same as the whole text."""
         if separator is None:
             separator = self._separator
-        if separator:
-            splits = text.split(separator)
-        else:
-            splits = list(text)
+        splits = _iter_stream_splits(stream, separator)
         if self._merge:
-            return self._merge_splits(splits, separator, chunk_overlap=0, **kwargs)
-        return list(filter(None, text.split(separator)))
+            return self._iter_merge_splits(splits, separator, chunk_overlap=0, **kwargs)
+        return filter(None, splits)
 
 
 @register_resource(
@@ -897,20 +1128,16 @@ class PageTextSplitter(TextSplitter):
         """Split incoming text and return chunks."""
         return [text]
 
-    def create_documents(
+    def iter_create_documents(
         self,
-        texts: List[str],
-        metadatas: Optional[List[dict]] = None,
+        texts: Iterable[str],
+        metadatas: Optional[Iterable[dict]] = None,
         separator: Optional[str] = None,
         **kwargs,
-    ) -> List[Chunk]:
-        """Create documents from a list of texts."""
-        _metadatas = metadatas or [{}] * len(texts)
-        chunks = []
-        for i, text in enumerate(texts):
-            new_doc = Chunk(content=text, metadata=copy.deepcopy(_metadatas[i]))
-            chunks.append(new_doc)
-        return chunks
+    ) -> Iterator[Chunk]:
+        """Create documents from texts lazily."""
+        for text, metadata in zip(texts, metadatas or repeat({})):
+            yield Chunk(content=text, metadata=copy.deepcopy(metadata))
 
 
 class RDBTextSplitter(TextSplitter):
@@ -925,9 +1152,10 @@ class RDBTextSplitter(TextSplitter):
         """Split text into a couple of parts."""
         pass
 
-    def split_documents(self, documents: Iterable[Document], **kwargs) -> List[Chunk]:
-        """Split document into chunks."""
-        chunks = []
+    def iter_documents(
+        self, documents: Iterable[Document], **kwargs
+    ) -> Iterator[Chunk]:
+        """Split document into chunks lazily."""
         for doc in documents:
             metadata = doc.metadata
             content = doc.content
@@ -941,14 +1169,11 @@ class RDBTextSplitter(TextSplitter):
                 )
                 table_metadata["part"] = "table"  # identify of table_chunk
                 field_metadata["part"] = "field"  # identify of field_chunk
-                table_chunk = Chunk(content=table_part, metadata=table_metadata)
-                chunks.append(table_chunk)
+                yield Chunk(content=table_part, metadata=table_metadata)
                 field_parts = field_part.split(self._column_separator)
                 for i, sub_part in enumerate(field_parts):
                     sub_metadata = copy.deepcopy(field_metadata)
                     sub_metadata["part_index"] = i
-                    field_chunk = Chunk(content=sub_part, metadata=sub_metadata)
-                    chunks.append(field_chunk)
+                    yield Chunk(content=sub_part, metadata=sub_metadata)
             else:
-                chunks.append(Chunk(content=content, metadata=metadata))
-        return chunks
+                yield Chunk(content=content, metadata=metadata)
@@ -1,21 +1,34 @@
 """Index store base class."""
 
-import asyncio
 import logging
-import time
 from abc import ABC, abstractmethod
 from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Sequence
 
 from dbgpt.core import Chunk
+from dbgpt.storage.ingestion import ProgressCallback, arun_ingestion, run_ingestion
 from dbgpt.storage.vector_store.filters import MetadataFilters
 from dbgpt.util import BaseParameters
-from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
+from dbgpt.util.chat_util import run_async_tasks
+from dbgpt.util.executor_utils import (
+    blocking_func_to_async,
+    blocking_func_to_async_no_executor,
+)
 
 logger = logging.getLogger(__name__)
 
 
+def _iter_chunk_groups(
+    chunks: Iterable[Chunk], group_size: int
+) -> Iterator[List[Chunk]]:
+    """Group the chunks lazily."""
+    it = iter(chunks)
+    while group := list(islice(it, group_size)):
+        yield group
+
+
 @dataclass
 class IndexStoreConfig(BaseParameters):
     """Index store config."""
@@ -109,68 +122,169 @@ class IndexStoreBase(ABC):
         """Whether name exists."""
         return True
 
+    def supports_embedding_stage(self) -> bool:
+        """Whether the chunks can be embedded before they are written.
+
+        The index store which supports it must implement `embed_chunks` and
+        `load_document_with_embeddings`, then the ingestion overlaps the embedding
+        of the next groups with the writes of the embedded groups.
+        """
+        return False
+
+    def embed_chunks(self, chunks: List[Chunk]) -> List[List[float]]:
+        """Embed the chunks to write with `load_document_with_embeddings`.
+
+        Args:
+            chunks(List[Chunk]): document chunks.
+
+        Return:
+            List[List[float]]: The vectors of the chunks.
+        """
+        raise NotImplementedError("Current index store does not support embed_chunks")
+
+    async def aembed_chunks(self, chunks: List[Chunk]) -> List[List[float]]:
+        """Async embed the chunks to write with `aload_document_with_embeddings`."""
+        return await blocking_func_to_async_no_executor(self.embed_chunks, chunks)
+
+    def load_document_with_embeddings(
+        self, chunks: List[Chunk], embeddings: List[List[float]]
+    ) -> List[str]:
+        """Load the embedded document in index database.
+
+        Args:
+            chunks(List[Chunk]): document chunks.
+            embeddings(List[List[float]]): The vectors of the chunks.
+
+        Return:
+            List[str]: chunk ids.
+        """
+        raise NotImplementedError(
+            "Current index store does not support load_document_with_embeddings"
+        )
+
+    async def aload_document_with_embeddings(
+        self, chunks: List[Chunk], embeddings: List[List[float]]
+    ) -> List[str]:
+        """Async load the embedded document in index database."""
+        return await blocking_func_to_async(
+            self._executor, self.load_document_with_embeddings, chunks, embeddings
+        )
+
     def load_document_with_limit(
         self,
-        chunks: List[Chunk],
+        chunks: Iterable[Chunk],
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
+        embed_concurrency: Optional[int] = None,
+        max_pending_groups: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> List[str]:
         """Load document in index database with specified limit.
 
+        The chunk groups are embedded and written in a pipeline, see
+        :func:`dbgpt.storage.ingestion.run_ingestion`.
+
         Args:
-            chunks(List[Chunk]): Document chunks.
+            chunks(Iterable[Chunk]): Document chunks, may be a lazy iterable, e.g.
+                the chunks split while the knowledge is parsed.
             max_chunks_once_load(int): Max number of chunks to load at once.
-            max_threads(int): Max number of threads to use.
+            max_threads(int): Max number of threads to write the chunks.
+            embed_concurrency(int): Max number of threads to embed the chunks,
+                default is max_threads.
+            max_pending_groups(int): Max number of the embedded groups waiting to
+                be written.
+            progress_callback(ProgressCallback): Called after every group is
+                written with the ingestion metrics.
 
         Return:
             List[str]: Chunk ids.
         """
         max_chunks_once_load = max_chunks_once_load or self._max_chunks_once_load
         max_threads = max_threads or self._max_threads
-        # Group the chunks into chunks of size max_chunks
-        chunk_groups = [
-            chunks[i : i + max_chunks_once_load]
-            for i in range(0, len(chunks), max_chunks_once_load)
-        ]
-        logger.info(
-            f"Loading {len(chunks)} chunks in {len(chunk_groups)} groups with "
-            f"{max_threads} threads."
+        chunk_groups = self._group_chunks(chunks, max_chunks_once_load, max_threads)
+        if self.supports_embedding_stage():
+            return run_ingestion(
+                chunk_groups,
+                lambda group, vectors: self.load_document_with_embeddings(
+                    group,
+                    vectors,  # type: ignore
+                ),
+                self.embed_chunks,
+                embed_concurrency=embed_concurrency or max_threads,
+                load_concurrency=max_threads,
+                max_pending_groups=max_pending_groups,
+                progress_callback=progress_callback,
+            )
+        return run_ingestion(
+            chunk_groups,
+            lambda group, _: self.load_document(group),
+            load_concurrency=max_threads,
+            max_pending_groups=max_pending_groups,
+            progress_callback=progress_callback,
         )
-        ids = []
-        loaded_cnt = 0
-        start_time = time.time()
-        with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            tasks = []
-            for chunk_group in chunk_groups:
-                tasks.append(executor.submit(self.load_document, chunk_group))
-            for future in tasks:
-                success_ids = future.result()
-                ids.extend(success_ids)
-                loaded_cnt += len(success_ids)
-                logger.info(f"Loaded {loaded_cnt} chunks, total {len(chunks)} chunks.")
-        logger.info(
-            f"Loaded {len(chunks)} chunks in {time.time() - start_time} seconds"
-        )
-        return ids
 
     async def aload_document_with_limit(
         self,
-        chunks: List[Chunk],
+        chunks: Iterable[Chunk],
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
+        embed_concurrency: Optional[int] = None,
+        max_pending_groups: Optional[int] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> List[str]:
         """Load document in index database with specified limit.
 
+        The chunk groups are embedded and written in a pipeline with a sliding
+        window, see :func:`dbgpt.storage.ingestion.arun_ingestion`.
+
         Args:
-            chunks(List[Chunk]): Document chunks.
+            chunks(Iterable[Chunk]): Document chunks, may be a lazy iterable, e.g.
+                the chunks split while the knowledge is parsed.
             max_chunks_once_load(int): Max number of chunks to load at once.
-            max_threads(int): Max number of threads to use.
+            max_threads(int): Max number of the concurrent writes.
+            embed_concurrency(int): Max number of the concurrent embeddings,
+                default is max_threads.
+            max_pending_groups(int): Max number of the embedded groups waiting to
+                be written.
+            progress_callback(ProgressCallback): Called after every group is
+                written with the ingestion metrics.
 
         Return:
             List[str]: Chunk ids.
         """
         max_chunks_once_load = max_chunks_once_load or self._max_chunks_once_load
         max_threads = max_threads or self._max_threads
+        chunk_groups = self._group_chunks(chunks, max_chunks_once_load, max_threads)
+        if self.supports_embedding_stage():
+            return await arun_ingestion(
+                chunk_groups,
+                lambda group, vectors: self.aload_document_with_embeddings(
+                    group,
+                    vectors,  # type: ignore
+                ),
+                self.aembed_chunks,
+                embed_concurrency=embed_concurrency or max_threads,
+                load_concurrency=max_threads,
+                max_pending_groups=max_pending_groups,
+                progress_callback=progress_callback,
+            )
+        return await arun_ingestion(
+            chunk_groups,
+            lambda group, _: self.aload_document(group),
+            load_concurrency=max_threads,
+            max_pending_groups=max_pending_groups,
+            progress_callback=progress_callback,
+        )
+
+    def _group_chunks(
+        self, chunks: Iterable[Chunk], max_chunks_once_load: int, max_threads: int
+    ) -> Iterable[List[Chunk]]:
+        if not isinstance(chunks, Sequence):
+            logger.info(
+                f"Loading the chunks lazily in groups of {max_chunks_once_load} with "
+                f"{max_threads} threads."
+            )
+            return _iter_chunk_groups(chunks, max_chunks_once_load)
         chunk_groups = [
             chunks[i : i + max_chunks_once_load]
             for i in range(0, len(chunks), max_chunks_once_load)
@@ -179,32 +293,7 @@ class IndexStoreBase(ABC):
             f"Loading {len(chunks)} chunks in {len(chunk_groups)} groups with "
             f"{max_threads} threads."
         )
-        tasks = []
-        for chunk_group in chunk_groups:
-            tasks.append(self.aload_document(chunk_group))
-
-        results = await self._run_tasks_with_concurrency(tasks, max_threads)
-
-        ids = []
-        loaded_cnt = 0
-        for idx, success_ids in enumerate(results):
-            if isinstance(success_ids, Exception):
-                raise RuntimeError(
-                    f"Failed to load chunk group {idx + 1}: {str(success_ids)}"
-                ) from success_ids
-            ids.extend(success_ids)
-            loaded_cnt += len(success_ids)
-            logger.info(f"Loaded {loaded_cnt} chunks, total {len(chunks)} chunks.")
-
-        return ids
-
-    async def _run_tasks_with_concurrency(self, tasks, max_concurrent):
-        results = []
-        for i in range(0, len(tasks), max_concurrent):
-            batch = tasks[i : i + max_concurrent]
-            batch_results = await asyncio.gather(*batch, return_exceptions=True)
-            results.extend(batch_results)
-        return results
+        return chunk_groups
 
     def similar_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
@@ -243,6 +332,61 @@ class IndexStoreBase(ABC):
             self.similar_search_with_scores, query, topk, score_threshold, filters
         )
 
+    def similar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Similar search with scores of multiple queries.
+
+        Override it if the index store can embed and search the queries in one
+        call.
+
+        Args:
+            texts(List[str]): The query texts.
+            topk(int): The number of similar documents to return of every query.
+            score_threshold(float): score_threshold: Optional, a floating point value
+                between 0 to 1
+            filters(Optional[MetadataFilters]): metadata filters.
+        Return:
+            List[List[Chunk]]: The similar documents of every query.
+        """
+        return [
+            self.similar_search_with_scores(text, topk, score_threshold, filters)
+            for text in texts
+        ]
+
+    async def asimilar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+        concurrency_limit: Optional[int] = None,
+    ) -> List[List[Chunk]]:
+        """Async similar search with scores of multiple queries.
+
+        The queries are searched concurrently by default.
+
+        Args:
+            texts(List[str]): The query texts.
+            topk(int): The number of similar documents to return of every query.
+            score_threshold(float): score_threshold: Optional, a floating point value
+                between 0 to 1
+            filters(Optional[MetadataFilters]): metadata filters.
+            concurrency_limit(Optional[int]): The max number of the concurrent
+                searches, None means no limit.
+        Return:
+            List[List[Chunk]]: The similar documents of every query.
+        """
+        tasks = [
+            self.asimilar_search_with_scores(text, topk, score_threshold, filters)
+            for text in texts
+        ]
+        return await run_async_tasks(tasks=tasks, concurrency_limit=concurrency_limit)
+
     def full_text_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -1 +1,369 @@
-"""Embeddings cache."""
+"""Embeddings cache.
+
+The vectors are content addressed by the model name and the hash of the text, so
+re-embedding a knowledge space only calls the model for the new or changed chunks.
+The vectors are kept in a memory tier in front of an optional persistent tier, and
+are stored as compact float32 or float16 blobs.
+"""
+
+import hashlib
+import logging
+from concurrent.futures import Executor
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from dbgpt.core import Embeddings
+from dbgpt.core.interface.cache import CacheKey, CacheValue
+from dbgpt.util.executor_utils import blocking_func_to_async
+
+from .storage.base import CacheStorage, MemoryCacheStorage
+
+logger = logging.getLogger(__name__)
+
+# The kind of the embedded texts, the query embeddings of some models differ from
+# the document embeddings, e.g. the instruct models
+_KIND_DOCUMENT = "document"
+_KIND_QUERY = "query"
+
+_DTYPES = {"float32": np.float32, "float16": np.float16}
+_DTYPE_CODES = {np.dtype(np.float32): b"\x04", np.dtype(np.float16): b"\x02"}
+_CODE_DTYPES = {code: dtype for dtype, code in _DTYPE_CODES.items()}
+
+
+class EmbeddingCacheKey(CacheKey[Tuple[str, str, bytes]]):
+    """Cache key of an embedding, the model name, the text kind and text hash."""
+
+    def __init__(self, model_name: str, text: str, kind: str = _KIND_DOCUMENT):
+        """Create a new EmbeddingCacheKey."""
+        self.model_name = model_name
+        self.kind = kind
+        self.text_hash = hashlib.sha256(text.encode("utf-8")).digest()
+        self._hash_bytes = hashlib.sha256(self.serialize()).digest()
+
+    def __hash__(self) -> int:
+        """Return the hash value of the key."""
+        return int.from_bytes(self._hash_bytes, "big")
+
+    def __eq__(self, other: Any) -> bool:
+        """Check equality with another key."""
+        if not isinstance(other, EmbeddingCacheKey):
+            return False
+        return self._hash_bytes == other._hash_bytes
+
+    def get_hash_bytes(self) -> bytes:
+        """Return the byte array of hash value."""
+        return self._hash_bytes
+
+    def get_value(self) -> Tuple[str, str, bytes]:
+        """Return the model name, text kind and text hash."""
+        return self.model_name, self.kind, self.text_hash
+
+    def to_dict(self) -> Dict:
+        """Convert to dict."""
+        return {
+            "model_name": self.model_name,
+            "kind": self.kind,
+            "text_hash": self.text_hash.hex(),
+        }
+
+    def serialize(self) -> bytes:
+        """Serialize the key to compact bytes, no serializer is needed."""
+        return (
+            self.model_name.encode("utf-8")
+            + b"\x00"
+            + self.kind.encode("utf-8")
+            + b"\x00"
+            + self.text_hash
+        )
+
+    def __str__(self) -> str:
+        """Return string representation."""
+        return f"{self.model_name}:{self.kind}:{self.text_hash.hex()[:16]}"
+
+
+class EmbeddingCacheValue(CacheValue[List[float]]):
+    """Cache value of an embedding, stored as a float32 or float16 blob."""
+
+    def __init__(self, vector: np.ndarray):
+        """Create a new EmbeddingCacheValue."""
+        self.vector = vector
+
+    def get_value(self) -> List[float]:
+        """Return the vector."""
+        return self.vector.astype(np.float32).tolist()
+
+    def to_dict(self) -> Dict:
+        """Convert to dict."""
+        return {"vector": self.get_value()}
+
+    def serialize(self) -> bytes:
+        """Serialize the vector to a dtype code followed by the raw bytes."""
+        return _DTYPE_CODES[self.vector.dtype] + self.vector.tobytes()
+
+    @staticmethod
+    def deserialize(data: bytes) -> "EmbeddingCacheValue":
+        """Deserialize the bytes of `serialize`."""
+        dtype = _CODE_DTYPES[data[:1]]
+        return EmbeddingCacheValue(np.frombuffer(data[1:], dtype=dtype))
+
+
+class EmbeddingCache:
+    """Two tier cache of the embeddings.
+
+    The memory tier is looked up first, then the persistent tier, whose hits are
+    promoted to the memory tier.
+    """
+
+    def __init__(
+        self,
+        memory_storage: Optional[CacheStorage] = None,
+        persist_storage: Optional[CacheStorage] = None,
+        dtype: str = "float32",
+    ):
+        """Create a new EmbeddingCache.
+
+        Args:
+            memory_storage (Optional[CacheStorage]): The memory tier, default is a
+                MemoryCacheStorage of 256 MB.
+            persist_storage (Optional[CacheStorage]): The persistent tier, e.g. a
+                DiskCacheStorage.
+            dtype (str): The dtype to store the vectors, float32 or float16.
+        """
+        if dtype not in _DTYPES:
+            raise ValueError(
+                f"Unsupported dtype: {dtype}, must be one of {list(_DTYPES)}"
+            )
+        self._memory_storage = memory_storage or MemoryCacheStorage()
+        self._persist_storage = persist_storage
+        self._dtype = _DTYPES[dtype]
+
+    def get_many(
+        self, model_name: str, texts: Sequence[str], kind: str = _KIND_DOCUMENT
+    ) -> List[Optional[List[float]]]:
+        """Return the cached vectors of the texts, None for the missing ones."""
+        results: List[Optional[List[float]]] = []
+        for text in texts:
+            key = EmbeddingCacheKey(model_name, text, kind)
+            value: Optional[EmbeddingCacheValue] = None
+            item = self._memory_storage.get(key)
+            if item:
+                value = EmbeddingCacheValue.deserialize(item.value_data)
+            elif self._persist_storage:
+                item = self._persist_storage.get(key)
+                if item:
+                    value = EmbeddingCacheValue.deserialize(item.value_data)
+                    self._memory_storage.set(key, value)
+            results.append(value.get_value() if value else None)
+        return results
+
+    def set_many(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        vectors: Sequence[List[float]],
+        kind: str = _KIND_DOCUMENT,
+    ) -> None:
+        """Cache the vectors of the texts."""
+        for text, vector in zip(texts, vectors):
+            key = EmbeddingCacheKey(model_name, text, kind)
+            value = EmbeddingCacheValue(np.asarray(vector, dtype=self._dtype))
+            self._memory_storage.set(key, value)
+            if self._persist_storage:
+                self._persist_storage.set(key, value)
+
+
+def create_embedding_cache(
+    max_memory_mb: int = 256,
+    persist_dir: Optional[str] = None,
+    dtype: str = "float32",
+) -> EmbeddingCache:
+    """Create an embedding cache, persisted in the directory if provided.
+
+    The persistent tier uses the DiskCacheStorage, it is skipped if rocksdict is not
+    installed.
+
+    Args:
+        max_memory_mb (int): The max memory of the memory tier in MB.
+        persist_dir (Optional[str]): The directory of the persistent tier.
+        dtype (str): The dtype to store the vectors, float32 or float16.
+    """
+    persist_storage: Optional[CacheStorage] = None
+    if persist_dir:
+        try:
+            from .storage.disk.disk_storage import DiskCacheStorage
+
+            persist_storage = DiskCacheStorage(persist_dir)
+        except ImportError as e:
+            logger.warning(
+                f"Can't import DiskCacheStorage, the embedding cache is only kept in "
+                f"memory, import error message: {str(e)}"
+            )
+    return EmbeddingCache(
+        MemoryCacheStorage(max_memory_mb=max_memory_mb),
+        persist_storage,
+        dtype=dtype,
+    )
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps any embeddings with an embedding cache.
+
+    Only the texts missing from the cache are sent to the wrapped embeddings, the
+    duplicated texts are embedded once and the misses are sent in batches of
+    `batch_size`. The asynchronous methods access the cache in the executor, the
+    persistent tier reads and writes the disk.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """Create a new CachedEmbeddings.
+
+        Args:
+            embeddings (Embeddings): The embeddings to wrap.
+            model_name (str): The model name, the cached vectors are isolated by it.
+            cache (Optional[EmbeddingCache]): The cache, default is a memory cache.
+            batch_size (Optional[int]): The max number of texts sent to the wrapped
+                embeddings in one call, None to send all the misses at once.
+            executor (Optional[Executor]): The executor to access the cache in the
+                asynchronous methods, default is the executor of the event loop.
+        """
+        self._embeddings = embeddings
+        self._model_name = model_name
+        self._cache = cache or EmbeddingCache()
+        self._batch_size = batch_size
+        self._executor = executor
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """Return the wrapped embeddings."""
+        return self._embeddings
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward the missing attributes to the wrapped embeddings.
+
+        So the attributes of the model, e.g. the model name and the dimension, are
+        still accessible through the cache.
+        """
+        # Not set yet, e.g. when unpickled
+        embeddings = self.__dict__.get("_embeddings")
+        if embeddings is None:
+            raise AttributeError(name)
+        return getattr(embeddings, name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed search docs."""
+        return self._embed(texts, _KIND_DOCUMENT, self._embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed query text."""
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed multiple query texts."""
+        return self._embed(texts, _KIND_QUERY, self._embeddings.embed_queries)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed search docs."""
+        return await self._aembed(
+            texts, _KIND_DOCUMENT, self._embeddings.aembed_documents
+        )
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Asynchronous Embed query text."""
+        return (await self.aembed_queries([text]))[0]
+
+    async def aembed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Asynchronous Embed multiple query texts."""
+        return await self._aembed(texts, _KIND_QUERY, self._embeddings.aembed_queries)
+
+    def _embed(
+        self,
+        texts: List[str],
+        kind: str,
+        embed_func: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        results, missing = self._lookup(texts, kind)
+        for batch in self._batches(list(missing)):
+            self._fill(kind, results, missing, batch, embed_func(batch))
+        return results  # type: ignore
+
+    async def _aembed(
+        self,
+        texts: List[str],
+        kind: str,
+        embed_func: Callable[[List[str]], Awaitable[List[List[float]]]],
+    ) -> List[List[float]]:
+        results, missing = await blocking_func_to_async(
+            self._executor,
+            self._lookup,
+            texts,
+            kind,  # type: ignore
+        )
+        for batch in self._batches(list(missing)):
+            vectors = await embed_func(batch)
+            await blocking_func_to_async(
+                self._executor,  # type: ignore
+                self._fill,
+                kind,
+                results,
+                missing,
+                batch,
+                vectors,
+            )
+        return results  # type: ignore
+
+    def _lookup(
+        self, texts: List[str], kind: str
+    ) -> Tuple[List[Optional[List[float]]], Dict[str, List[int]]]:
+        """Look up the cache, return the results and the indexes of missing texts.
+
+        The duplicated missing texts are embedded only once.
+        """
+        results = self._cache.get_many(self._model_name, texts, kind)
+        missing: Dict[str, List[int]] = {}
+        hits = 0
+        for i, (text, vector) in enumerate(zip(texts, results)):
+            if vector is None:
+                missing.setdefault(text, []).append(i)
+            else:
+                hits += 1
+        logger.debug(
+            f"Embedding cache of {self._model_name}: {hits} hits, {len(missing)} "
+            f"misses of {len(texts)} texts"
+        )
+        return results, missing
+
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        if not texts:
+            return []
+        size = self._batch_size or len(texts)
+        return [texts[i : i + size] for i in range(0, len(texts), size)]
+
+    def _fill(
+        self,
+        kind: str,
+        results: List[Optional[List[float]]],
+        missing: Dict[str, List[int]],
+        batch: List[str],
+        vectors: List[List[float]],
+    ) -> None:
+        self._cache.set_many(self._model_name, batch, vectors, kind)
+        for text, vector in zip(batch, vectors):
+            for i in missing[text]:
+                results[i] = vector
@@ -116,6 +116,16 @@ class LLMCacheKey(CacheKey[LLMCacheKeyData]):
         """Return the real object of current cache key."""
         return self.config
 
+    def get_similarity_text(self) -> Optional[str]:
+        """Return the prompt to embed for the similarity match."""
+        return self.config.prompt
+
+    def get_similarity_scope(self) -> bytes:
+        """Return the hash of all parameters except the prompt."""
+        scope = asdict(self.config)
+        scope.pop("prompt")
+        return hashlib.sha256(repr(sorted(scope.items())).encode("utf-8")).digest()
+
 
 class LLMCacheValue(CacheValue[LLMCacheValueData]):
     """Cache value for LLM."""
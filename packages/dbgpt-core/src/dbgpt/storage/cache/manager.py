@@ -8,7 +8,7 @@ from typing import Optional, Type, cast
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
 from dbgpt.core import CacheConfig, CacheKey, CacheValue, Serializable, Serializer
-from dbgpt.core.interface.cache import K, V
+from dbgpt.core.interface.cache import K, RetrievalPolicy, V
 from dbgpt.util.executor_utils import ExecutorFactory, blocking_func_to_async
 from dbgpt.util.i18n_utils import _
 from dbgpt.util.parameter_utils import BaseParameters
@@ -48,6 +48,62 @@ class ModelCacheParameters(BaseParameters):
             "help": _("The persist directory, default is model_cache"),
         },
     )
+    cache_policy: str = field(
+        default="lru",
+        metadata={
+            "help": _("The eviction policy of the memory cache, default is lru"),
+            "valid_values": ["lru", "lfu", "fifo", "ttl", "size"],
+        },
+    )
+    ttl_seconds: Optional[int] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The time to live of the cache entries in seconds, required by the "
+                "ttl eviction policy"
+            ),
+        },
+    )
+    retrieval_policy: str = field(
+        default="exact_match",
+        metadata={
+            "help": _(
+                "The retrieval policy, similarity_match serves the cached answer of "
+                "a similar prompt, its index is kept in memory and is empty after a "
+                "restart, default is exact_match"
+            ),
+            "valid_values": ["exact_match", "similarity_match"],
+        },
+    )
+    similarity_threshold: float = field(
+        default=0.95,
+        metadata={
+            "help": _(
+                "The min cosine similarity of prompts for the similarity_match "
+                "retrieval policy, default is 0.95"
+            ),
+        },
+    )
+    enable_embedding_cache: bool = field(
+        default=False,
+        metadata={
+            "help": _(
+                "Whether to cache the embeddings by the model name and text hash, "
+                "default is False. The cache is persisted in the '<persist_dir>"
+                "_embedding' directory when the storage type is disk"
+            ),
+        },
+    )
+    embedding_cache_dtype: str = field(
+        default="float32",
+        metadata={
+            "help": _(
+                "The dtype to store the cached embeddings, float16 halves the "
+                "size, default is float32"
+            ),
+            "valid_values": ["float32", "float16"],
+        },
+    )
 
 
 class CacheManager(BaseComponent, ABC):
@@ -145,7 +201,14 @@ class LocalCacheManager(CacheManager):
 
 
 def initialize_cache(
-    system_app: SystemApp, storage_type: str, max_memory_mb: int, persist_dir: str
+    system_app: SystemApp,
+    storage_type: str,
+    max_memory_mb: int,
+    persist_dir: str,
+    cache_policy: Optional[str] = None,
+    ttl_seconds: Optional[int] = None,
+    retrieval_policy: Optional[str] = None,
+    similarity_threshold: float = 0.95,
 ):
     """Initialize cache manager.
 
@@ -154,6 +217,12 @@ def initialize_cache(
         storage_type (str): The storage type.
         max_memory_mb (int): The max memory in MB.
         persist_dir (str): The persist directory.
+        cache_policy (Optional[str]): The eviction policy of the memory cache.
+        ttl_seconds (Optional[int]): The time to live of the memory cache entries.
+        retrieval_policy (Optional[str]): The retrieval policy, default is
+            exact_match.
+        similarity_threshold (float): The min cosine similarity of the
+            similarity_match retrieval policy.
     """
     from dbgpt.util.serialization.json_serialization import JsonSerializer
 
@@ -171,9 +240,36 @@ def initialize_cache(
                 f"Can't import DiskCacheStorage, use MemoryCacheStorage, import error "
                 f"message: {str(e)}"
             )
-            cache_storage = MemoryCacheStorage(max_memory_mb=max_memory_mb)
+            cache_storage = MemoryCacheStorage(
+                max_memory_mb=max_memory_mb,
+                cache_policy=cache_policy,
+                ttl_seconds=ttl_seconds,
+            )
     else:
-        cache_storage = MemoryCacheStorage(max_memory_mb=max_memory_mb)
+        cache_storage = MemoryCacheStorage(
+            max_memory_mb=max_memory_mb,
+            cache_policy=cache_policy,
+            ttl_seconds=ttl_seconds,
+        )
+    if retrieval_policy == RetrievalPolicy.SIMILARITY_MATCH:
+        try:
+            from .storage.similarity import SimilarityCacheStorage
+
+            def _create_embeddings():
+                from dbgpt.rag.embedding.embedding_factory import EmbeddingFactory
+
+                return EmbeddingFactory.get_instance(system_app).create()
+
+            cache_storage = SimilarityCacheStorage(
+                cache_storage,
+                _create_embeddings,
+                similarity_threshold=similarity_threshold,
+            )
+        except ImportError as e:
+            logger.warning(
+                f"Can't import SimilarityCacheStorage, use exact match retrieval, "
+                f"import error message: {str(e)}"
+            )
     system_app.register(
         LocalCacheManager, serializer=JsonSerializer(), storage=cache_storage
     )
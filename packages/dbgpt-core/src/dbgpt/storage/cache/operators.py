@@ -3,7 +3,7 @@
 import logging
 from typing import AsyncIterator, Dict, List, Optional, Union, cast
 
-from dbgpt.core import ModelOutput, ModelRequest
+from dbgpt.core import CacheConfig, ModelOutput, ModelRequest
 from dbgpt.core.awel import (
     BaseOperator,
     BranchFunc,
@@ -27,6 +27,7 @@ class CachedModelStreamOperator(StreamifyAbsOperator[ModelRequest, ModelOutput])
 
     Args:
         cache_manager (CacheManager): The cache manager to handle caching operations.
+        cache_config (Optional[CacheConfig]): The cache config to retrieve cache.
         **kwargs: Additional keyword arguments.
 
     Methods:
@@ -34,10 +35,16 @@ class CachedModelStreamOperator(StreamifyAbsOperator[ModelRequest, ModelOutput])
             outputs.
     """
 
-    def __init__(self, cache_manager: CacheManager, **kwargs) -> None:
+    def __init__(
+        self,
+        cache_manager: CacheManager,
+        cache_config: Optional[CacheConfig] = None,
+        **kwargs,
+    ) -> None:
         """Create a new instance of CachedModelStreamOperator."""
         super().__init__(**kwargs)
         self._cache_manager = cache_manager
+        self._cache_config = cache_config
         self._client = LLMCacheClient(cache_manager)
 
     async def streamify(self, input_value: ModelRequest):
@@ -51,7 +58,7 @@ class CachedModelStreamOperator(StreamifyAbsOperator[ModelRequest, ModelOutput])
         """
         cache_dict = _parse_cache_key_dict(input_value)
         llm_cache_key: LLMCacheKey = self._client.new_key(**cache_dict)
-        llm_cache_value = await self._client.get(llm_cache_key)
+        llm_cache_value = await self._client.get(llm_cache_key, self._cache_config)
         logger.info(f"llm_cache_value: {llm_cache_value}")
         if not llm_cache_value:
             raise ValueError(f"Cache value not found for key: {llm_cache_key}")
@@ -65,16 +72,23 @@ class CachedModelOperator(MapOperator[ModelRequest, ModelOutput]):
 
     Args:
         cache_manager (CacheManager): Manager for caching operations.
+        cache_config (Optional[CacheConfig]): The cache config to retrieve cache.
         **kwargs: Additional keyword arguments.
 
     Methods:
         map: Processes a single input with cache support and returns the model output.
     """
 
-    def __init__(self, cache_manager: CacheManager, **kwargs) -> None:
+    def __init__(
+        self,
+        cache_manager: CacheManager,
+        cache_config: Optional[CacheConfig] = None,
+        **kwargs,
+    ) -> None:
         """Create a new instance of CachedModelOperator."""
         super().__init__(**kwargs)
         self._cache_manager = cache_manager
+        self._cache_config = cache_config
         self._client = LLMCacheClient(cache_manager)
 
     async def map(self, input_value: ModelRequest) -> ModelOutput:
@@ -88,7 +102,7 @@ class CachedModelOperator(MapOperator[ModelRequest, ModelOutput]):
         """
         cache_dict = _parse_cache_key_dict(input_value)
         llm_cache_key: LLMCacheKey = self._client.new_key(**cache_dict)
-        llm_cache_value = await self._client.get(llm_cache_key)
+        llm_cache_value = await self._client.get(llm_cache_key, self._cache_config)
         if not llm_cache_value:
             raise ValueError(f"Cache value not found for key: {llm_cache_key}")
         logger.info(f"llm_cache_value: {llm_cache_value}")
@@ -105,6 +119,7 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
         cache_manager (CacheManager): The cache manager for managing cache operations.
         model_task_name (str): The name of the task to process data using the model.
         cache_task_name (str): The name of the task to process data using the cache.
+        cache_config (Optional[CacheConfig]): The cache config to retrieve cache.
         **kwargs: Additional keyword arguments.
     """
 
@@ -113,11 +128,13 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
         cache_manager: CacheManager,
         model_task_name: str,
         cache_task_name: str,
+        cache_config: Optional[CacheConfig] = None,
         **kwargs,
     ):
         """Create a new instance of ModelCacheBranchOperator."""
         super().__init__(branches=None, **kwargs)
         self._cache_manager = cache_manager
+        self._cache_config = cache_config
         self._client = LLMCacheClient(cache_manager)
         self._model_task_name = model_task_name
         self._cache_task_name = cache_task_name
@@ -140,7 +157,7 @@ class ModelCacheBranchOperator(BranchOperator[ModelRequest, Dict]):
                 return False
             cache_dict = _parse_cache_key_dict(input_value)
             cache_key: LLMCacheKey = self._client.new_key(**cache_dict)
-            cache_value = await self._client.get(cache_key)
+            cache_value = await self._client.get(cache_key, self._cache_config)
             logger.debug(
                 f"cache_key: {cache_key}, hash key: {hash(cache_key)}, cache_value: "
                 f"{cache_value}"
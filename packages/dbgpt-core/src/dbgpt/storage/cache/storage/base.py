@@ -1,10 +1,11 @@
 """Base cache storage class."""
 
+import dataclasses
 import logging
+import threading
 from abc import ABC, abstractmethod
-from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional, Set, Union
 
 import msgpack
 
@@ -19,6 +20,8 @@ from dbgpt.core.interface.cache import (
 )
 from dbgpt.util.memory_utils import _get_object_bytes
 
+from .eviction import EvictionPolicy, create_eviction_policy
+
 logger = logging.getLogger(__name__)
 
 
@@ -191,14 +194,56 @@ class CacheStorage(ABC):
         raise NotImplementedError
 
 
+@dataclass
+class CacheStats:
+    """The statistics of a cache storage."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    memory_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the hit rate of the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
 class MemoryCacheStorage(CacheStorage):
-    """A simple in-memory cache storage implementation."""
+    """A simple in-memory cache storage implementation.
+
+    The memory is bounded by `max_memory_mb`, entries are evicted by a pluggable
+    :class:`EvictionPolicy` (LRU, LFU, FIFO, TTL or size aware).
+    """
+
+    def __init__(
+        self,
+        max_memory_mb: int = 256,
+        cache_policy: Optional[Union[CachePolicy, str]] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """Create a new instance of MemoryCacheStorage.
 
-    def __init__(self, max_memory_mb: int = 256):
-        """Create a new instance of MemoryCacheStorage."""
-        self.cache: OrderedDict = OrderedDict()
+        Args:
+            max_memory_mb (int): The max memory in MB.
+            cache_policy (Optional[Union[CachePolicy, str]]): The eviction policy,
+                default is LRU.
+            ttl_seconds (Optional[float]): The time to live of entries, required
+                by the TTL policy.
+        """
+        self.cache: Dict[int, StorageItem] = {}
         self.max_memory = max_memory_mb * 1024 * 1024
         self.current_memory_usage = 0
+        self._cache_policy = CachePolicy(cache_policy or CachePolicy.LRU)
+        self._policy: EvictionPolicy = create_eviction_policy(
+            self._cache_policy, ttl_seconds
+        )
+        self._warned_policies: Set[CachePolicy] = set()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
 
     def check_config(
         self,
@@ -224,13 +269,18 @@ class MemoryCacheStorage(CacheStorage):
         self.check_config(cache_config, raise_error=True)
         # Exact match retrieval
         key_hash = hash(key)
-        item: Optional[StorageItem] = self.cache.get(key_hash)
+        with self._lock:
+            item: Optional[StorageItem] = self.cache.get(key_hash)
+            if item and self._policy.is_expired(key_hash):
+                self._remove(key_hash)
+                self._stats.expirations += 1
+                item = None
+            if not item:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+                self._policy.on_access(key_hash)
         logger.debug(f"MemoryCacheStorage get key {key}, hash {key_hash}, item: {item}")
-
-        if not item:
-            return None
-        # Move the item to the end of the OrderedDict to signify recent use.
-        self.cache.move_to_end(key_hash)
         return item
 
     def set(
@@ -242,15 +292,27 @@ class MemoryCacheStorage(CacheStorage):
         """Set a value in the cache for the provided key."""
         key_hash = hash(key)
         item = StorageItem.build_from_kv(key, value)
-        # Calculate memory size of the new entry
-        new_entry_size = _get_object_bytes(item)
-        # Evict entries if necessary
-        while self.current_memory_usage + new_entry_size > self.max_memory:
-            self._apply_cache_policy(cache_config)
-
-        # Store the item in the cache.
-        self.cache[key_hash] = item
-        self.current_memory_usage += new_entry_size
+        # The bytes of the entry is calculated only once, when it is built
+        new_entry_size = item.length
+        if new_entry_size > self.max_memory:
+            logger.warning(
+                f"MemoryCacheStorage skip key {key}, its size {new_entry_size} bytes "
+                f"exceeds the max memory {self.max_memory} bytes"
+            )
+            return
+        fifo = self._use_fifo(cache_config)
+        with self._lock:
+            if key_hash in self.cache:
+                self._remove(key_hash)
+            self._purge_expired()
+            # Evict entries if necessary
+            while self.current_memory_usage + new_entry_size > self.max_memory:
+                if not self._evict_one(fifo):
+                    break
+            # Store the item in the cache.
+            self.cache[key_hash] = item
+            self._policy.on_insert(key_hash, new_entry_size)
+            self.current_memory_usage += new_entry_size
         logger.debug(f"MemoryCacheStorage set key {key}, hash {key_hash}, item: {item}")
 
     def exists(
@@ -259,9 +321,54 @@ class MemoryCacheStorage(CacheStorage):
         """Check if the key exists in the cache."""
         return self.get(key, cache_config) is not None
 
-    def _apply_cache_policy(self, cache_config: Optional[CacheConfig] = None):
-        # Remove the oldest/newest item based on the cache policy.
-        if cache_config and cache_config.cache_policy == CachePolicy.FIFO:
-            self.cache.popitem(last=False)
-        else:  # Default is LRU
-            self.cache.popitem(last=True)
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache statistics."""
+        with self._lock:
+            return dataclasses.replace(
+                self._stats,
+                entries=len(self.cache),
+                memory_bytes=self.current_memory_usage,
+            )
+
+    def _remove(self, key_hash: int) -> None:
+        item = self.cache.pop(key_hash)
+        self._policy.on_remove(key_hash)
+        self.current_memory_usage -= item.length
+
+    def _purge_expired(self) -> None:
+        while (key_hash := self._policy.pop_expired()) is not None:
+            self._remove(key_hash)
+            self._stats.expirations += 1
+
+    def _use_fifo(self, cache_config: Optional[CacheConfig] = None) -> bool:
+        """Whether to evict the oldest entry for the per call cache policy.
+
+        The per call FIFO policy is still honored, the other per call policies
+        are ignored in favor of the eviction policy of the storage.
+        """
+        policy = cache_config.cache_policy if cache_config else None
+        policy = CachePolicy(policy) if policy else None
+        if not policy or policy in (CachePolicy.LRU, self._cache_policy):
+            return False
+        if policy == CachePolicy.FIFO:
+            return True
+        if policy not in self._warned_policies:
+            self._warned_policies.add(policy)
+            logger.warning(
+                f"The per call cache policy {policy.value} is not supported, "
+                f"MemoryCacheStorage evicts entries by its {self._cache_policy.value} "
+                "policy, please set the cache policy of the storage instead"
+            )
+        return False
+
+    def _evict_one(self, fifo: bool = False) -> bool:
+        if fifo:
+            # The entries are kept in the insertion order
+            key_hash = next(iter(self.cache), None)
+        else:
+            key_hash = self._policy.select_victim()
+        if key_hash is None:
+            return False
+        self._remove(key_hash)
+        self._stats.evictions += 1
+        return True
@@ -0,0 +1,263 @@
+"""Eviction policies for the in-memory cache storage.
+
+Every policy only tracks the keys and their byte sizes; the storage itself owns the
+data. All operations of the built-in policies are O(1).
+"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Type
+
+from dbgpt.core.interface.cache import CachePolicy
+
+
+class EvictionPolicy(ABC):
+    """The base class of cache eviction policies."""
+
+    @abstractmethod
+    def on_insert(self, key: Hashable, size: int) -> None:
+        """Track a new key.
+
+        Args:
+            key (Hashable): The key of the entry.
+            size (int): The bytes of the entry.
+        """
+
+    @abstractmethod
+    def on_access(self, key: Hashable) -> None:
+        """Record a cache hit of the key."""
+
+    @abstractmethod
+    def on_remove(self, key: Hashable) -> None:
+        """Stop tracking the key."""
+
+    @abstractmethod
+    def select_victim(self) -> Optional[Hashable]:
+        """Return the key to evict next, None if there is no key tracked."""
+
+    def is_expired(self, key: Hashable) -> bool:
+        """Return whether the key is expired, only meaningful for TTL policies."""
+        return False
+
+    def pop_expired(self) -> Optional[Hashable]:
+        """Return one expired key if any, only meaningful for TTL policies."""
+        return None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+
+
+class LRUEvictionPolicy(EvictionPolicy):
+    """Least recently used eviction policy."""
+
+    def __init__(self):
+        """Create a new LRU policy."""
+        self._order: OrderedDict = OrderedDict()
+
+    def on_insert(self, key: Hashable, size: int) -> None:
+        """Track a new key as the most recently used one."""
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def on_access(self, key: Hashable) -> None:
+        """Mark the key as the most recently used one."""
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def on_remove(self, key: Hashable) -> None:
+        """Stop tracking the key."""
+        self._order.pop(key, None)
+
+    def select_victim(self) -> Optional[Hashable]:
+        """Return the least recently used key."""
+        return next(iter(self._order), None)
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._order)
+
+
+class FIFOEvictionPolicy(LRUEvictionPolicy):
+    """First in first out eviction policy, accesses do not change the order."""
+
+    def on_access(self, key: Hashable) -> None:
+        """Do nothing, the order only depends on the insertion."""
+
+
+class TTLEvictionPolicy(FIFOEvictionPolicy):
+    """Time to live eviction policy.
+
+    All entries share the same ttl, so the insertion order is also the expiration
+    order: the oldest entry is always the first one to expire.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        """Create a new TTL policy.
+
+        Args:
+            ttl_seconds (float): The seconds an entry lives after it is inserted.
+        """
+        super().__init__()
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than 0")
+        self._ttl_seconds = ttl_seconds
+
+    def on_insert(self, key: Hashable, size: int) -> None:
+        """Track a new key with its expiration time."""
+        self._order.pop(key, None)
+        self._order[key] = time.monotonic() + self._ttl_seconds
+
+    def is_expired(self, key: Hashable) -> bool:
+        """Return whether the key is expired."""
+        expire_at = self._order.get(key)
+        return expire_at is not None and expire_at <= time.monotonic()
+
+    def pop_expired(self) -> Optional[Hashable]:
+        """Return the oldest key if it is expired."""
+        key = self.select_victim()
+        if key is not None and self.is_expired(key):
+            return key
+        return None
+
+
+class LFUEvictionPolicy(EvictionPolicy):
+    """Least frequently used eviction policy.
+
+    Keys are grouped into buckets by access frequency, ties are broken by recency
+    (LRU inside a bucket). The minimal frequency is tracked, so every operation is
+    O(1).
+    """
+
+    def __init__(self):
+        """Create a new LFU policy."""
+        self._freq: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min_freq = 0
+
+    def _add_to_bucket(self, key: Hashable, freq: int) -> None:
+        self._freq[key] = freq
+        self._buckets.setdefault(freq, OrderedDict())[key] = None
+
+    def _remove_from_bucket(self, key: Hashable, freq: int) -> None:
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+
+    def on_insert(self, key: Hashable, size: int) -> None:
+        """Track a new key with frequency 1."""
+        self.on_remove(key)
+        self._add_to_bucket(key, 1)
+        self._min_freq = 1
+
+    def on_access(self, key: Hashable) -> None:
+        """Increase the frequency of the key."""
+        freq = self._freq.get(key)
+        if freq is None:
+            return
+        self._remove_from_bucket(key, freq)
+        self._add_to_bucket(key, freq + 1)
+
+    def on_remove(self, key: Hashable) -> None:
+        """Stop tracking the key."""
+        freq = self._freq.pop(key, None)
+        if freq is None:
+            return
+        self._remove_from_bucket(key, freq)
+        if not self._freq:
+            self._min_freq = 0
+        elif self._min_freq not in self._buckets:
+            # Only reached when the removed key was the last one with the minimal
+            # frequency, the number of distinct frequencies is small.
+            self._min_freq = min(self._buckets)
+
+    def select_victim(self) -> Optional[Hashable]:
+        """Return the least frequently used key."""
+        if not self._freq:
+            return None
+        return next(iter(self._buckets[self._min_freq]))
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._freq)
+
+
+class SizeEvictionPolicy(EvictionPolicy):
+    """Size aware eviction policy.
+
+    Evict the least recently used entry of the largest size class first, so one big
+    entry is dropped instead of many small hot ones. Entries are grouped into
+    power-of-two size classes, which keeps every operation O(1).
+    """
+
+    def __init__(self):
+        """Create a new size aware policy."""
+        self._size_class: Dict[Hashable, int] = {}
+        self._classes: Dict[int, OrderedDict] = {}
+
+    def on_insert(self, key: Hashable, size: int) -> None:
+        """Track a new key in its size class."""
+        self.on_remove(key)
+        size_class = max(size, 1).bit_length()
+        self._size_class[key] = size_class
+        self._classes.setdefault(size_class, OrderedDict())[key] = None
+
+    def on_access(self, key: Hashable) -> None:
+        """Mark the key as the most recently used one of its size class."""
+        size_class = self._size_class.get(key)
+        if size_class is not None:
+            self._classes[size_class].move_to_end(key)
+
+    def on_remove(self, key: Hashable) -> None:
+        """Stop tracking the key."""
+        size_class = self._size_class.pop(key, None)
+        if size_class is None:
+            return
+        entries = self._classes[size_class]
+        del entries[key]
+        if not entries:
+            del self._classes[size_class]
+
+    def select_victim(self) -> Optional[Hashable]:
+        """Return the least recently used key of the largest size class."""
+        if not self._classes:
+            return None
+        # At most 64 size classes
+        return next(iter(self._classes[max(self._classes)]))
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._size_class)
+
+
+_POLICIES: Dict[CachePolicy, Type[EvictionPolicy]] = {
+    CachePolicy.LRU: LRUEvictionPolicy,
+    CachePolicy.FIFO: FIFOEvictionPolicy,
+    CachePolicy.LFU: LFUEvictionPolicy,
+    CachePolicy.SIZE: SizeEvictionPolicy,
+}
+
+
+def create_eviction_policy(
+    cache_policy: Optional[CachePolicy] = None, ttl_seconds: Optional[float] = None
+) -> EvictionPolicy:
+    """Create an eviction policy.
+
+    Args:
+        cache_policy (Optional[CachePolicy]): The cache policy, default is LRU.
+        ttl_seconds (Optional[float]): The ttl in seconds, required by the TTL
+            policy.
+
+    Returns:
+        EvictionPolicy: The eviction policy.
+    """
+    cache_policy = CachePolicy(cache_policy or CachePolicy.LRU)
+    if cache_policy == CachePolicy.TTL:
+        if not ttl_seconds:
+            raise ValueError("ttl_seconds is required by the 'ttl' cache policy")
+        return TTLEvictionPolicy(ttl_seconds)
+    return _POLICIES[cache_policy]()
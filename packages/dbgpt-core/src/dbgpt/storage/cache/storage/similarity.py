@@ -0,0 +1,256 @@
+"""Similarity cache storage.
+
+Serve the cached value of a semantically similar key, e.g. an LLM prompt which only
+differs in wording from a cached one. The embeddings of the keys are kept in a local
+brute-force cosine index next to an exact match storage. The index is in
+memory only and is not rebuilt from a persistent storage after a restart.
+
+The vectors of the recently embedded texts are kept too, the lookups and the store
+of one request, e.g. by the cache branch and the save cache operators, embed the
+prompt only once.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from dbgpt.core import Embeddings
+from dbgpt.core.interface.cache import (
+    CacheConfig,
+    CacheKey,
+    CacheValue,
+    K,
+    RetrievalPolicy,
+    V,
+)
+
+from .base import CacheStorage, StorageItem
+
+logger = logging.getLogger(__name__)
+
+EmbeddingsProvider = Union[Embeddings, Callable[[], Embeddings]]
+
+
+class _VectorIndex:
+    """A brute-force cosine similarity index of normalized float32 vectors.
+
+    The vectors are rows of a matrix whose capacity doubles when it is full, the row
+    of every key is kept in an insertion ordered dict, so adding, removing and
+    evicting the oldest key do not copy the other vectors.
+    """
+
+    _MIN_CAPACITY = 16
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._vectors: Optional[np.ndarray] = None
+        # The key of every used row
+        self._keys: List[CacheKey] = []
+        # The row of every key, in the insertion order
+        self._rows: "OrderedDict[CacheKey, int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._rows
+
+    def add(self, key: CacheKey, vector: np.ndarray) -> None:
+        if key in self._rows:
+            self.remove(key)
+        if len(self._keys) >= self._max_size:
+            # Drop the oldest vector
+            self.remove(next(iter(self._rows)))
+        size = len(self._keys)
+        if self._vectors is None or size == len(self._vectors):
+            capacity = max(min(2 * size, self._max_size), self._MIN_CAPACITY, size + 1)
+            vectors = np.empty((capacity, vector.shape[-1]), dtype=np.float32)
+            if size:
+                vectors[:size] = self._vectors[:size]  # type: ignore
+            self._vectors = vectors
+        self._vectors[size] = vector
+        self._keys.append(key)
+        self._rows[key] = size
+
+    def remove(self, key: CacheKey) -> None:
+        row = self._rows.pop(key)
+        last = len(self._keys) - 1
+        if row != last:
+            # Move the last row to the removed one
+            moved = self._keys[last]
+            self._vectors[row] = self._vectors[last]  # type: ignore
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+
+    def search(self, vector: np.ndarray) -> Optional[Tuple[CacheKey, float]]:
+        if not self._keys:
+            return None
+        scores = self._vectors[: len(self._keys)] @ vector  # type: ignore
+        idx = int(np.argmax(scores))
+        return self._keys[idx], float(scores[idx])
+
+
+class SimilarityCacheStorage(CacheStorage):
+    """Cache storage supporting the similarity match retrieval policy.
+
+    The cache items are saved in the wrapped storage; the embedding of every key
+    which supports the similarity match is indexed by its scope. A similarity match
+    first tries the exact match, then looks up the most similar key in the same
+    scope and returns its item when the cosine similarity is above the threshold.
+
+    The index of the embeddings is only kept in memory, it is empty after a restart
+    even if the wrapped storage is persistent, e.g. the disk storage. The items
+    saved before the restart are only served by the exact match until they are set
+    again.
+    """
+
+    def __init__(
+        self,
+        storage: CacheStorage,
+        embeddings: EmbeddingsProvider,
+        similarity_threshold: float = 0.95,
+        max_index_size: int = 10000,
+        max_recent_vectors: int = 128,
+    ):
+        """Create a new instance of SimilarityCacheStorage.
+
+        Args:
+            storage (CacheStorage): The storage to save the cache items.
+            embeddings (EmbeddingsProvider): The embedding model, or a function
+                returning it, which is called when the first key is embedded.
+            similarity_threshold (float): The default min cosine similarity.
+            max_index_size (int): The max number of vectors of one scope.
+            max_recent_vectors (int): The max number of the vectors of the recently
+                embedded texts, reused by the following lookups and stores.
+        """
+        self._storage = storage
+        self._embeddings_provider = embeddings
+        self._embeddings: Optional[Embeddings] = (
+            embeddings if isinstance(embeddings, Embeddings) else None
+        )
+        self._similarity_threshold = similarity_threshold
+        self._max_index_size = max_index_size
+        self._indexes: Dict[bytes, _VectorIndex] = {}
+        self._max_recent_vectors = max_recent_vectors
+        self._recent_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check_config(
+        self,
+        cache_config: Optional[CacheConfig] = None,
+        raise_error: Optional[bool] = True,
+    ) -> bool:
+        """Check whether the CacheConfig is legal."""
+        if cache_config and cache_config.retrieval_policy not in (
+            RetrievalPolicy.EXACT_MATCH,
+            RetrievalPolicy.SIMILARITY_MATCH,
+        ):
+            if raise_error:
+                raise ValueError(
+                    f"Unsupported retrieval policy: {cache_config.retrieval_policy}"
+                )
+            return False
+        return True
+
+    def get(
+        self, key: CacheKey[K], cache_config: Optional[CacheConfig] = None
+    ) -> Optional[StorageItem]:
+        """Retrieve a storage item from the cache using the provided key.
+
+        The similarity match is the default retrieval policy of this storage, pass a
+        cache config with 'EXACT_MATCH' to disable it.
+        """
+        self.check_config(cache_config, raise_error=True)
+        item = self._storage.get(key)
+        if item or not self._is_similarity_match(cache_config):
+            return item
+        text = key.get_similarity_text()
+        if not text:
+            return None
+        threshold = self._similarity_threshold
+        if cache_config and cache_config.similarity_threshold is not None:
+            threshold = cache_config.similarity_threshold
+
+        vector = self._embed(text)
+        scope = key.get_similarity_scope()
+        with self._lock:
+            index = self._indexes.get(scope)
+            result = index.search(vector) if index else None
+        if not result:
+            return None
+        similar_key, score = result
+        logger.debug(
+            f"SimilarityCacheStorage most similar key: {similar_key}, score: {score}"
+        )
+        if score < threshold:
+            return None
+        item = self._storage.get(similar_key)
+        if not item:
+            # The item has been evicted from the underlying storage
+            with self._lock:
+                self._remove_from_index(scope, similar_key)
+        return item
+
+    def set(
+        self,
+        key: CacheKey[K],
+        value: CacheValue[V],
+        cache_config: Optional[CacheConfig] = None,
+    ) -> None:
+        """Set a value in the cache and index the embedding of the key."""
+        self.check_config(cache_config, raise_error=True)
+        self._storage.set(key, value)
+        text = key.get_similarity_text()
+        if not text:
+            return
+        vector = self._embed(text)
+        scope = key.get_similarity_scope()
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is None:
+                index = _VectorIndex(self._max_index_size)
+                self._indexes[scope] = index
+            index.add(key, vector)
+
+    def _is_similarity_match(self, cache_config: Optional[CacheConfig]) -> bool:
+        return (
+            not cache_config
+            or cache_config.retrieval_policy == RetrievalPolicy.SIMILARITY_MATCH
+        )
+
+    def _remove_from_index(self, scope: bytes, key: CacheKey) -> None:
+        index = self._indexes.get(scope)
+        if index is None or key not in index:
+            return
+        index.remove(key)
+        if not len(index):
+            del self._indexes[scope]
+
+    def _embed(self, text: str) -> np.ndarray:
+        with self._lock:
+            vector = self._recent_vectors.get(text)
+            if vector is not None:
+                self._recent_vectors.move_to_end(text)
+                return vector
+        vector = self._embed_text(text)
+        with self._lock:
+            self._recent_vectors[text] = vector
+            if len(self._recent_vectors) > self._max_recent_vectors:
+                self._recent_vectors.popitem(last=False)
+        return vector
+
+    def _embed_text(self, text: str) -> np.ndarray:
+        if self._embeddings is None:
+            self._embeddings = self._embeddings_provider()  # type: ignore
+        vector = np.asarray(
+            self._embeddings.embed_query(text),  # type: ignore
+            dtype=np.float32,
+        )
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
@@ -0,0 +1,187 @@
+import time
+
+import pytest
+
+from dbgpt.core.interface.cache import CacheConfig, CachePolicy
+
+from ..base import MemoryCacheStorage
+from ..eviction import (
+    FIFOEvictionPolicy,
+    LFUEvictionPolicy,
+    LRUEvictionPolicy,
+    SizeEvictionPolicy,
+    TTLEvictionPolicy,
+    create_eviction_policy,
+)
+
+
+class MockCacheKey:
+    def __init__(self, key: str):
+        self.key = key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return isinstance(other, MockCacheKey) and self.key == other.key
+
+    def get_hash_bytes(self):
+        return self.key.encode()
+
+    def serialize(self):
+        return self.key.encode()
+
+
+class MockCacheValue:
+    def __init__(self, size: int = 10):
+        self.size = size
+
+    def serialize(self):
+        return b"v" * self.size
+
+
+def test_lru_evicts_least_recently_used():
+    policy = LRUEvictionPolicy()
+    for key in ["a", "b", "c"]:
+        policy.on_insert(key, 1)
+    policy.on_access("a")
+    assert policy.select_victim() == "b"
+    policy.on_remove("b")
+    assert policy.select_victim() == "c"
+    assert len(policy) == 2
+
+
+def test_fifo_ignores_access():
+    policy = FIFOEvictionPolicy()
+    for key in ["a", "b"]:
+        policy.on_insert(key, 1)
+    policy.on_access("a")
+    assert policy.select_victim() == "a"
+
+
+def test_lfu_evicts_least_frequently_used():
+    policy = LFUEvictionPolicy()
+    for key in ["a", "b", "c"]:
+        policy.on_insert(key, 1)
+    policy.on_access("a")
+    policy.on_access("a")
+    policy.on_access("b")
+    assert policy.select_victim() == "c"
+    policy.on_remove("c")
+    assert policy.select_victim() == "b"
+    policy.on_remove("b")
+    assert policy.select_victim() == "a"
+    policy.on_remove("a")
+    assert policy.select_victim() is None
+
+
+def test_lfu_remove_min_frequency_key():
+    policy = LFUEvictionPolicy()
+    policy.on_insert("a", 1)
+    policy.on_insert("b", 1)
+    policy.on_access("b")
+    policy.on_remove("a")
+    assert policy.select_victim() == "b"
+
+
+def test_size_evicts_largest_first():
+    policy = SizeEvictionPolicy()
+    policy.on_insert("small", 10)
+    policy.on_insert("large", 10000)
+    policy.on_insert("medium", 500)
+    assert policy.select_victim() == "large"
+    policy.on_remove("large")
+    assert policy.select_victim() == "medium"
+
+
+def test_ttl_expiration():
+    policy = TTLEvictionPolicy(ttl_seconds=0.05)
+    policy.on_insert("a", 1)
+    assert not policy.is_expired("a")
+    assert policy.pop_expired() is None
+    time.sleep(0.06)
+    assert policy.is_expired("a")
+    assert policy.pop_expired() == "a"
+
+
+def test_create_eviction_policy():
+    assert isinstance(create_eviction_policy(), LRUEvictionPolicy)
+    assert isinstance(create_eviction_policy(CachePolicy.LFU), LFUEvictionPolicy)
+    with pytest.raises(ValueError):
+        create_eviction_policy(CachePolicy.TTL)
+
+
+def _new_storage(**kwargs) -> MemoryCacheStorage:
+    storage = MemoryCacheStorage(**kwargs)
+    # Make room for about three small entries
+    item_size = storage_item_size()
+    storage.max_memory = item_size * 3
+    return storage
+
+
+def storage_item_size() -> int:
+    storage = MemoryCacheStorage()
+    storage.set(MockCacheKey("k"), MockCacheValue())
+    return storage.current_memory_usage
+
+
+def test_memory_storage_lru_keeps_hot_entries():
+    storage = _new_storage()
+    for key in ["a", "b", "c"]:
+        storage.set(MockCacheKey(key), MockCacheValue())
+    assert storage.get(MockCacheKey("a")) is not None
+    storage.set(MockCacheKey("d"), MockCacheValue())
+    assert storage.get(MockCacheKey("a")) is not None
+    assert storage.get(MockCacheKey("b")) is None
+
+    stats = storage.stats()
+    assert stats.hits == 2
+    assert stats.misses == 1
+    assert stats.evictions == 1
+    assert stats.entries == 3
+    assert stats.memory_bytes == storage.current_memory_usage
+
+
+def test_memory_storage_overwrite_does_not_leak_memory():
+    storage = _new_storage()
+    storage.set(MockCacheKey("a"), MockCacheValue())
+    usage = storage.current_memory_usage
+    storage.set(MockCacheKey("a"), MockCacheValue())
+    assert storage.current_memory_usage == usage
+    assert storage.stats().entries == 1
+
+
+def test_memory_storage_skip_oversize_entry():
+    storage = _new_storage()
+    storage.set(MockCacheKey("a"), MockCacheValue(size=10 * storage.max_memory))
+    assert storage.get(MockCacheKey("a")) is None
+    assert storage.current_memory_usage == 0
+
+
+def test_memory_storage_ttl():
+    storage = _new_storage(cache_policy="ttl", ttl_seconds=0.05)
+    storage.set(MockCacheKey("a"), MockCacheValue())
+    assert storage.get(MockCacheKey("a")) is not None
+    time.sleep(0.06)
+    assert storage.get(MockCacheKey("a")) is None
+    assert storage.stats().expirations == 1
+    assert storage.current_memory_usage == 0
+
+
+def test_memory_storage_per_call_cache_policy(caplog):
+    storage = _new_storage()
+    fifo_config = CacheConfig(cache_policy=CachePolicy.FIFO)
+    for key in ["a", "b", "c"]:
+        storage.set(MockCacheKey(key), MockCacheValue())
+    assert storage.get(MockCacheKey("a")) is not None
+    # The per call FIFO policy evicts the oldest entry even if it is hot
+    storage.set(MockCacheKey("d"), MockCacheValue(), fifo_config)
+    assert storage.get(MockCacheKey("a")) is None
+    assert storage.get(MockCacheKey("b")) is not None
+
+    # The other per call policies fall back to the storage policy with a warning
+    storage.set(
+        MockCacheKey("e"), MockCacheValue(), CacheConfig(cache_policy=CachePolicy.LFU)
+    )
+    assert storage.get(MockCacheKey("c")) is None
+    assert "per call cache policy lfu is not supported" in caplog.text
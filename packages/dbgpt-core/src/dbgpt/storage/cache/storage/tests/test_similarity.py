@@ -0,0 +1,137 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from dbgpt.core import Embeddings, ModelOutput
+from dbgpt.core.interface.cache import CacheConfig, RetrievalPolicy
+from dbgpt.util.serialization.json_serialization import JsonSerializer
+
+from ...llm_cache import LLMCacheKey, LLMCacheValue
+from ..base import MemoryCacheStorage
+from ..similarity import SimilarityCacheStorage, _VectorIndex
+
+_VOCAB = ["how", "many", "users", "count", "orders", "total", "the", "are", "there"]
+
+
+class MockEmbeddings(Embeddings):
+    """Bag of words embeddings."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        words = text.lower().replace("?", "").split()
+        return [float(words.count(w)) for w in _VOCAB]
+
+
+def _new_key(prompt: str, model_name: str = "model") -> LLMCacheKey:
+    key = LLMCacheKey(prompt=prompt, model_name=model_name)
+    key.set_serializer(JsonSerializer())
+    return key
+
+
+def _new_value(text: str) -> LLMCacheValue:
+    value = LLMCacheValue(output=ModelOutput(text=text, error_code=0))
+    value.set_serializer(JsonSerializer())
+    return value
+
+
+@pytest.fixture
+def storage():
+    return SimilarityCacheStorage(
+        MemoryCacheStorage(), MockEmbeddings(), similarity_threshold=0.8
+    )
+
+
+def test_similarity_match(storage):
+    storage.set(_new_key("How many users are there?"), _new_value("42"))
+    item = storage.get(_new_key("how many users are there"))
+    assert item is not None
+    assert item.value_data == _new_value("42").serialize()
+
+    assert storage.get(_new_key("total orders")) is None
+
+
+def test_exact_match_policy_disables_similarity(storage):
+    storage.set(_new_key("How many users are there?"), _new_value("42"))
+    config = CacheConfig(retrieval_policy=RetrievalPolicy.EXACT_MATCH)
+    assert storage.get(_new_key("how many users are there"), config) is None
+    assert storage.get(_new_key("How many users are there?"), config) is not None
+
+
+def test_similarity_scope(storage):
+    storage.set(_new_key("How many users are there?"), _new_value("42"))
+    assert storage.get(_new_key("how many users are there", "other")) is None
+
+
+def test_similarity_threshold_override(storage):
+    storage.set(_new_key("How many users are there?"), _new_value("42"))
+    config = CacheConfig(
+        retrieval_policy=RetrievalPolicy.SIMILARITY_MATCH, similarity_threshold=0.3
+    )
+    assert storage.get(_new_key("count users there"), config) is not None
+    assert storage.get(_new_key("count users there")) is None
+
+
+def test_lazy_embeddings():
+    calls = []
+
+    def _provider():
+        calls.append(1)
+        return MockEmbeddings()
+
+    storage = SimilarityCacheStorage(MemoryCacheStorage(), _provider)
+    assert not calls
+    storage.set(_new_key("How many users are there?"), _new_value("42"))
+    storage.get(_new_key("how many users are there"))
+    assert len(calls) == 1
+
+
+def test_embed_prompt_once():
+    embedded = []
+
+    class _Embeddings(MockEmbeddings):
+        def embed_query(self, text: str) -> List[float]:
+            embedded.append(text)
+            return super().embed_query(text)
+
+    storage = SimilarityCacheStorage(
+        MemoryCacheStorage(), _Embeddings(), max_recent_vectors=2
+    )
+    prompt = "How many users are there?"
+    # The lookups of the branch and the cache operators, then the store
+    assert storage.get(_new_key(prompt)) is None
+    assert storage.get(_new_key(prompt)) is None
+    storage.set(_new_key(prompt), _new_value("42"))
+    assert storage.get(_new_key("how many users are there")) is not None
+    assert embedded == [prompt, "how many users are there"]
+
+    # The oldest vector is dropped
+    storage.get(_new_key("total orders"))
+    storage.get(_new_key(prompt, "other"))
+    assert embedded[-2:] == ["total orders", prompt]
+
+
+def test_vector_index_add_remove_and_evict():
+    index = _VectorIndex(max_size=40)
+    vectors = np.eye(64, dtype=np.float32)
+    for i in range(50):
+        index.add(f"key_{i}", vectors[i])
+    # The oldest keys are evicted
+    assert len(index) == 40
+    assert "key_9" not in index
+    assert index.search(vectors[10]) == ("key_10", 1.0)
+
+    index.remove("key_20")
+    index.remove("key_49")
+    assert len(index) == 38
+    assert index.search(vectors[20])[0] != "key_20"
+    # The moved row is still found by its key
+    for i in [10, 30, 48]:
+        assert index.search(vectors[i]) == (f"key_{i}", 1.0)
+    # Add an existing key again
+    index.add("key_30", vectors[60])
+    assert index.search(vectors[60]) == ("key_30", 1.0)
+    assert index.search(vectors[30])[1] == 0.0
+    assert len(index) == 38
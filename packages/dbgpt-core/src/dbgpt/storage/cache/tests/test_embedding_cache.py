@@ -0,0 +1,186 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from dbgpt.core import Embeddings
+
+from .. import embedding_cache
+from ..embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    EmbeddingCacheValue,
+)
+from ..storage.base import MemoryCacheStorage
+
+
+class MockEmbeddings(Embeddings):
+    """Embed the text to its length, record the embedded texts."""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls.append([text])
+        return [float(len(text)), 2.0]
+
+
+def test_embed_documents_only_misses():
+    embeddings = MockEmbeddings()
+    cached = CachedEmbeddings(embeddings, "model")
+    assert cached.embed_documents(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert cached.embed_documents(["bb", "ccc", "a", "ccc"]) == [
+        [2.0, 1.0],
+        [3.0, 1.0],
+        [1.0, 1.0],
+        [3.0, 1.0],
+    ]
+    assert embeddings.calls == [["a", "bb"], ["ccc"]]
+
+
+def test_misses_in_batches():
+    embeddings = MockEmbeddings()
+    cached = CachedEmbeddings(embeddings, "model", batch_size=2)
+    texts = ["a", "b", "c", "d", "e"]
+    assert len(cached.embed_documents(texts)) == 5
+    assert embeddings.calls == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def test_query_and_model_isolated():
+    embeddings = MockEmbeddings()
+    cache = EmbeddingCache()
+    cached = CachedEmbeddings(embeddings, "model", cache)
+    cached.embed_documents(["a"])
+    # The query embedding differs from the document embedding
+    assert cached.embed_query("a") == [1.0, 2.0]
+    assert cached.embed_query("a") == [1.0, 2.0]
+    CachedEmbeddings(embeddings, "other_model", cache).embed_documents(["a"])
+    assert embeddings.calls == [["a"], ["a"], ["a"]]
+
+
+def test_persist_tier_promoted_to_memory():
+    persist_storage = MemoryCacheStorage()
+    embeddings = MockEmbeddings()
+    CachedEmbeddings(
+        embeddings, "model", EmbeddingCache(persist_storage=persist_storage)
+    ).embed_documents(["a", "bb"])
+
+    # A new process with an empty memory tier
+    memory_storage = MemoryCacheStorage()
+    cache = EmbeddingCache(memory_storage, persist_storage)
+    cached = CachedEmbeddings(embeddings, "model", cache)
+    assert cached.embed_documents(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert len(embeddings.calls) == 1
+    assert memory_storage.stats().entries == 2
+
+
+def test_float16_blob():
+    storage = MemoryCacheStorage()
+    cached = CachedEmbeddings(
+        MockEmbeddings(), "model", EmbeddingCache(storage, dtype="float16")
+    )
+    cached.embed_documents(["a"])
+    item = storage.cache[next(iter(storage.cache))]
+    # The dtype code and two float16 values
+    assert len(item.value_data) == 1 + 2 * 2
+    assert EmbeddingCacheValue.deserialize(item.value_data).get_value() == [1.0, 1.0]
+
+    with pytest.raises(ValueError):
+        EmbeddingCache(dtype="int8")
+
+
+@pytest.mark.asyncio
+async def test_aembed_documents():
+    embeddings = MockEmbeddings()
+    cached = CachedEmbeddings(embeddings, "model")
+    assert await cached.aembed_documents(["a", "bb"]) == [[1.0, 1.0], [2.0, 1.0]]
+    assert await cached.aembed_documents(["a", "ccc"]) == [[1.0, 1.0], [3.0, 1.0]]
+    assert await cached.aembed_query("a") == [1.0, 2.0]
+    assert embeddings.calls == [["a", "bb"], ["ccc"], ["a"]]
+
+
+class _ThreadRecordStorage(MemoryCacheStorage):
+    """Record the threads of the cache accesses."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def get(self, key, cache_config=None):
+        self.threads.add(threading.get_ident())
+        return super().get(key, cache_config)
+
+    def set(self, key, value, cache_config=None):
+        self.threads.add(threading.get_ident())
+        super().set(key, value, cache_config)
+
+
+@pytest.mark.asyncio
+async def test_aembed_access_cache_in_executor():
+    persist_storage = _ThreadRecordStorage()
+    cache = EmbeddingCache(persist_storage=persist_storage)
+    with ThreadPoolExecutor(1) as executor:
+        cached = CachedEmbeddings(MockEmbeddings(), "model", cache, executor=executor)
+        await cached.aembed_documents(["a", "bb"])
+        await cached.aembed_documents(["a", "ccc"])
+    assert persist_storage.threads
+    assert threading.get_ident() not in persist_storage.threads
+
+
+def test_persist_hit_deserialized_once(monkeypatch):
+    persist_storage = MemoryCacheStorage()
+    CachedEmbeddings(
+        MockEmbeddings(), "model", EmbeddingCache(persist_storage=persist_storage)
+    ).embed_documents(["a"])
+
+    calls = []
+    deserialize = EmbeddingCacheValue.deserialize
+
+    def _deserialize(data):
+        calls.append(data)
+        return deserialize(data)
+
+    monkeypatch.setattr(EmbeddingCacheValue, "deserialize", staticmethod(_deserialize))
+    cache = EmbeddingCache(persist_storage=persist_storage)
+    assert cache.get_many("model", ["a"]) == [[1.0, 1.0]]
+    assert len(calls) == 1
+
+
+def test_hit_count_with_duplicated_texts(caplog):
+    cached = CachedEmbeddings(MockEmbeddings(), "model")
+    cached.embed_documents(["a"])
+    with caplog.at_level(logging.DEBUG, logger=embedding_cache.__name__):
+        cached.embed_documents(["a", "bb", "bb", "bb"])
+    assert "1 hits, 1 misses of 4 texts" in caplog.text
+
+
+def test_forward_model_attributes():
+    embeddings = MockEmbeddings()
+    embeddings.model_name = "mock-model"
+    cached = CachedEmbeddings(embeddings, "model")
+    assert cached.model_name == "mock-model"
+    assert cached.calls is embeddings.calls
+    with pytest.raises(AttributeError):
+        cached.dimension
+
+
+def test_shared_embedding_factory_with_cache():
+    from dbgpt.rag.embedding import WrappedEmbeddingFactory
+
+    embeddings = MockEmbeddings()
+    factory = WrappedEmbeddingFactory(
+        embeddings=embeddings, model_name="model", embedding_cache=EmbeddingCache()
+    )
+    cached = factory.create()
+    assert isinstance(cached, CachedEmbeddings)
+    cached.embed_documents(["a", "bb"])
+    cached.embed_documents(["a", "bb"])
+    assert embeddings.calls == [["a", "bb"]]
+    # Not cached without the cache
+    assert WrappedEmbeddingFactory(embeddings=embeddings).create() is embeddings
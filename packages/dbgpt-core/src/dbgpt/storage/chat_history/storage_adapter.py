@@ -133,6 +133,27 @@ class DBMessageStorageItemAdapter(
             ChatHistoryMessageEntity.index == resource_id.index,
         )
 
+    def get_query_for_identifiers(
+        self,
+        storage_format: Type[ChatHistoryMessageEntity],
+        resource_ids: List[MessageIdentifier],  # type: ignore
+        **kwargs,
+    ):
+        """Get query for identifiers.
+
+        The messages are usually in one conversation, so the query is the product of
+        the conversation ids and the message indexes.
+        """
+        session: Optional[Session] = kwargs.get("session")
+        if session is None:
+            raise Exception("session is None")
+        conv_uids = {resource_id.conv_uid for resource_id in resource_ids}
+        indexes = {resource_id.index for resource_id in resource_ids}
+        return session.query(ChatHistoryMessageEntity).filter(
+            ChatHistoryMessageEntity.conv_uid.in_(conv_uids),
+            ChatHistoryMessageEntity.index.in_(indexes),
+        )
+
 
 def _parse_old_conversations(old_conversations: List[Dict]) -> List[BaseMessage]:
     old_messages_dict = []
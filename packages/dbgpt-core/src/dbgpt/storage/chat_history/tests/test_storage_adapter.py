@@ -1,8 +1,15 @@
 from typing import List
 
 import pytest
-
-from dbgpt.core.interface.message import AIMessage, HumanMessage, StorageConversation
+from sqlalchemy import event
+
+from dbgpt.core.interface.message import (
+    AIMessage,
+    HumanMessage,
+    MessageIdentifier,
+    MessageStorageItem,
+    StorageConversation,
+)
 from dbgpt.core.interface.storage import QuerySpec
 from dbgpt.storage.chat_history.chat_history_db import (
     ChatHistoryEntity,
@@ -218,3 +225,55 @@ def test_query_with_page(
     assert page_result.page_size == 2
     assert len(page_result.items) == 2
     assert page_result.items[0].conv_uid == "conv0"
+
+
+def test_load_and_delete_messages_in_bulk(
+    four_round_conversation: StorageConversation, conv_storage, message_storage
+):
+    statements = []
+
+    def _record_statement(conn, cursor, statement, *args):
+        statements.append(statement.split()[0].upper())
+
+    engine = message_storage.db_manager.engine
+    event.listen(engine, "before_cursor_execute", _record_statement)
+    try:
+        saved_conversation = StorageConversation(
+            conv_uid=four_round_conversation.conv_uid,
+            conv_storage=conv_storage,
+            message_storage=message_storage,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _record_statement)
+    # One query for the conversation, one for its messages
+    assert statements == ["SELECT", "SELECT"]
+    assert [message.content for message in saved_conversation.messages] == [
+        message.content for message in four_round_conversation.messages
+    ]
+
+    message_ids = [
+        MessageIdentifier.from_str_identifier(message_id)
+        for message_id in saved_conversation.message_ids
+    ]
+    # The order of the identifiers is kept, the missing messages are skipped
+    missing = MessageIdentifier(saved_conversation.conv_uid, 100)
+    loaded = message_storage.load_list(
+        [message_ids[3], missing, message_ids[0]], MessageStorageItem
+    )
+    assert [item.index for item in loaded] == [3, 0]
+
+    message_storage.delete_list(message_ids[:2] + [missing])
+    loaded = message_storage.load_list(message_ids, MessageStorageItem)
+    assert [item.index for item in loaded] == list(range(2, 8))
+
+    statements.clear()
+    event.listen(engine, "before_cursor_execute", _record_statement)
+    try:
+        saved_conversation.start_new_round()
+        for i in range(3):
+            saved_conversation.add_user_message(f"hello {i}")
+        saved_conversation.end_current_round()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record_statement)
+    # One INSERT for the new messages, then save the conversation
+    assert statements == ["INSERT", "SELECT", "UPDATE"]
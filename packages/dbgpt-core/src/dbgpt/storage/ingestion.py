@@ -0,0 +1,321 @@
+"""Pipelined ingestion of the chunk groups into an index store.
+
+The chunk groups flow through two stages, the embedding stage and the store write
+stage, each one with its own concurrency. The stages are connected by a bounded
+queue, so the embedding stage is paused when the writes fall behind, and a slow
+group never blocks the other workers like a lock-step wave does.
+
+The chunk groups may be a lazy iterable, e.g. the groups of the chunks split while
+the knowledge is parsed, then a group is only taken when an embedding worker is
+free, and the parsing overlaps the embedding and the writes.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from dbgpt.core import Chunk
+from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
+
+logger = logging.getLogger(__name__)
+
+# Embed a chunk group, return the vectors
+EmbedFunc = Callable[[List[Chunk]], List[List[float]]]
+AsyncEmbedFunc = Callable[[List[Chunk]], Awaitable[List[List[float]]]]
+# Write a chunk group with its vectors (None if not embedded), return the ids
+LoadFunc = Callable[[List[Chunk], Optional[List[List[float]]]], List[str]]
+AsyncLoadFunc = Callable[
+    [List[Chunk], Optional[List[List[float]]]], Awaitable[List[str]]
+]
+
+
+@dataclass
+class IngestionMetrics:
+    """The progress and throughput of an ingestion."""
+
+    # The totals are None when the chunk groups are a lazy iterable
+    total_chunks: Optional[int] = None
+    total_groups: Optional[int] = None
+    embedded_chunks: int = 0
+    loaded_chunks: int = 0
+    loaded_groups: int = 0
+    # The accumulated seconds spent in every stage, may exceed the elapsed time
+    # when the stage runs concurrently
+    embed_seconds: float = 0.0
+    load_seconds: float = 0.0
+    start_time: float = field(default_factory=time.time)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Return the seconds since the ingestion started."""
+        return time.time() - self.start_time
+
+    @property
+    def chunks_per_second(self) -> float:
+        """Return the throughput of the loaded chunks."""
+        elapsed = self.elapsed_seconds
+        return self.loaded_chunks / elapsed if elapsed > 0 else 0.0
+
+    def record_embedded(self, num_chunks: int, seconds: float) -> None:
+        """Record an embedded group."""
+        with self._lock:
+            self.embedded_chunks += num_chunks
+            self.embed_seconds += seconds
+
+    def record_loaded(self, num_chunks: int, seconds: float) -> None:
+        """Record a loaded group."""
+        with self._lock:
+            self.loaded_chunks += num_chunks
+            self.loaded_groups += 1
+            self.load_seconds += seconds
+
+    @classmethod
+    def of(cls, chunk_groups: Iterable[List[Chunk]]) -> "IngestionMetrics":
+        """Create the metrics of the chunk groups, with the totals if known."""
+        if isinstance(chunk_groups, Sequence):
+            return cls(
+                total_chunks=sum(len(group) for group in chunk_groups),
+                total_groups=len(chunk_groups),
+            )
+        return cls()
+
+    def __str__(self) -> str:
+        """Return the progress description."""
+        total_chunks = "" if self.total_chunks is None else f"/{self.total_chunks}"
+        total_groups = "" if self.total_groups is None else f"/{self.total_groups}"
+        return (
+            f"Loaded {self.loaded_chunks}{total_chunks} chunks "
+            f"({self.loaded_groups}{total_groups} groups), embedded "
+            f"{self.embedded_chunks} chunks, {self.chunks_per_second:.1f} chunks/s, "
+            f"embed {self.embed_seconds:.2f}s, load {self.load_seconds:.2f}s, "
+            f"elapsed {self.elapsed_seconds:.2f}s"
+        )
+
+
+ProgressCallback = Callable[[IngestionMetrics], None]
+
+
+class IngestionError(RuntimeError):
+    """Raised when a chunk group fails to be ingested."""
+
+    def __init__(self, group_index: int, cause: BaseException):
+        """Create a new IngestionError of the group (0-based)."""
+        super().__init__(f"Failed to load chunk group {group_index + 1}: {cause}")
+        self.group_index = group_index
+
+
+def _report(
+    metrics: IngestionMetrics, progress_callback: Optional[ProgressCallback]
+) -> None:
+    logger.info(str(metrics))
+    if progress_callback:
+        try:
+            progress_callback(metrics)
+        except Exception as e:
+            logger.warning(f"Ingestion progress callback failed: {e}")
+
+
+def _join_results(results: Dict[int, List[str]]) -> List[str]:
+    return [chunk_id for idx in sorted(results) for chunk_id in results[idx]]
+
+
+async def arun_ingestion(
+    chunk_groups: Iterable[List[Chunk]],
+    load_func: AsyncLoadFunc,
+    embed_func: Optional[AsyncEmbedFunc] = None,
+    embed_concurrency: int = 1,
+    load_concurrency: int = 1,
+    max_pending_groups: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> List[str]:
+    """Ingest the chunk groups through the embedding and store write stages.
+
+    Args:
+        chunk_groups (Iterable[List[Chunk]]): The chunk groups, a lazy iterable is
+            advanced in the default executor.
+        load_func (AsyncLoadFunc): Write a chunk group with its vectors.
+        embed_func (Optional[AsyncEmbedFunc]): Embed a chunk group, None to skip the
+            embedding stage, the store embeds the chunks when writing.
+        embed_concurrency (int): The max number of the concurrent embeddings.
+        load_concurrency (int): The max number of the concurrent writes.
+        max_pending_groups (Optional[int]): The max number of the embedded groups
+            waiting to be written, default is twice the load concurrency.
+        progress_callback (Optional[ProgressCallback]): Called after every group
+            is written.
+
+    Returns:
+        List[str]: The ids of the chunks, in the order of the groups.
+    """
+    metrics = IngestionMetrics.of(chunk_groups)
+    results: Dict[int, List[str]] = {}
+    queue: asyncio.Queue = asyncio.Queue(
+        maxsize=max_pending_groups or 2 * load_concurrency
+    )
+    # Shared by the embedding workers, every group is taken by one worker
+    groups = iter(enumerate(chunk_groups))
+    lazy = not isinstance(chunk_groups, Sequence)
+    groups_lock = asyncio.Lock()
+
+    async def _next_group() -> Optional[Tuple[int, List[Chunk]]]:
+        if not lazy:
+            return next(groups, None)
+        # The lazy groups may parse and split the knowledge, which is blocking
+        async with groups_lock:
+            return await blocking_func_to_async_no_executor(next, groups, None)
+
+    async def _embed_worker():
+        while True:
+            item = await _next_group()
+            if item is None:
+                return
+            idx, group = item
+            vectors = None
+            if embed_func:
+                start = time.perf_counter()
+                try:
+                    vectors = await embed_func(group)
+                except Exception as e:
+                    raise IngestionError(idx, e) from e
+                metrics.record_embedded(len(group), time.perf_counter() - start)
+            # Wait for the store writes when the queue is full
+            await queue.put((idx, group, vectors))
+
+    async def _load_worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            idx, group, vectors = item
+            start = time.perf_counter()
+            try:
+                results[idx] = await load_func(group, vectors)
+            except Exception as e:
+                raise IngestionError(idx, e) from e
+            metrics.record_loaded(len(group), time.perf_counter() - start)
+            _report(metrics, progress_callback)
+
+    async def _close_queue(embed_tasks: List[asyncio.Task]):
+        await asyncio.gather(*embed_tasks)
+        for _ in range(load_concurrency):
+            await queue.put(None)
+
+    num_embed_workers = embed_concurrency
+    if isinstance(chunk_groups, Sequence):
+        num_embed_workers = min(embed_concurrency, len(chunk_groups))
+    embed_tasks = [
+        asyncio.create_task(_embed_worker()) for _ in range(max(1, num_embed_workers))
+    ]
+    load_tasks = [asyncio.create_task(_load_worker()) for _ in range(load_concurrency)]
+    all_tasks = (
+        embed_tasks + load_tasks + [asyncio.create_task(_close_queue(embed_tasks))]
+    )
+    try:
+        done, _ = await asyncio.wait(all_tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if not task.cancelled() and task.exception():
+                raise task.exception()  # type: ignore
+    finally:
+        for task in all_tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*all_tasks, return_exceptions=True)
+    return _join_results(results)
+
+
+def run_ingestion(
+    chunk_groups: Iterable[List[Chunk]],
+    load_func: LoadFunc,
+    embed_func: Optional[EmbedFunc] = None,
+    embed_concurrency: int = 1,
+    load_concurrency: int = 1,
+    max_pending_groups: Optional[int] = None,
+    progress_callback: Optional[ProgressCallback] = None,
+) -> List[str]:
+    """Ingest the chunk groups through the embedding and store write stages.
+
+    The synchronous version of :func:`arun_ingestion`, every stage runs in its own
+    thread pool, and a lazy iterable of the chunk groups is advanced in the calling
+    thread.
+    """
+    metrics = IngestionMetrics.of(chunk_groups)
+    max_pending = max_pending_groups or 2 * load_concurrency
+    results: Dict[int, List[str]] = {}
+
+    def _embed(group: List[Chunk]) -> Optional[List[List[float]]]:
+        if not embed_func:
+            return None
+        start = time.perf_counter()
+        vectors = embed_func(group)
+        metrics.record_embedded(len(group), time.perf_counter() - start)
+        return vectors
+
+    def _load(group: List[Chunk], vectors: Optional[List[List[float]]]) -> List[str]:
+        start = time.perf_counter()
+        ids = load_func(group, vectors)
+        metrics.record_loaded(len(group), time.perf_counter() - start)
+        return ids
+
+    embedding: Deque[Tuple[int, List[Chunk], Future]] = deque()
+    loading: Deque[Tuple[int, Future]] = deque()
+
+    def _wait_loaded():
+        idx, future = loading.popleft()
+        try:
+            results[idx] = future.result()
+        except Exception as e:
+            raise IngestionError(idx, e) from e
+        _report(metrics, progress_callback)
+
+    def _submit_load(load_executor: ThreadPoolExecutor):
+        idx, group, future = embedding.popleft()
+        try:
+            vectors = future.result()
+        except Exception as e:
+            raise IngestionError(idx, e) from e
+        # Wait for the store writes when too many groups are pending
+        while len(loading) >= max_pending:
+            _wait_loaded()
+        loading.append((idx, load_executor.submit(_load, group, vectors)))
+
+    with (
+        ThreadPoolExecutor(
+            max_workers=embed_concurrency, thread_name_prefix="ingestion_embed"
+        ) as embed_executor,
+        ThreadPoolExecutor(
+            max_workers=load_concurrency, thread_name_prefix="ingestion_load"
+        ) as load_executor,
+    ):
+        try:
+            for idx, group in enumerate(chunk_groups):
+                embedding.append((idx, group, embed_executor.submit(_embed, group)))
+                if len(embedding) >= embed_concurrency:
+                    _submit_load(load_executor)
+            while embedding:
+                _submit_load(load_executor)
+            while loading:
+                _wait_loaded()
+        except BaseException:
+            for _, _, future in embedding:
+                future.cancel()
+            for _, future in loading:
+                future.cancel()
+            raise
+    return _join_results(results)
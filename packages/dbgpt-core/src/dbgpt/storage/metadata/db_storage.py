@@ -1,9 +1,9 @@
 """Database storage implementation using SQLAlchemy."""
 
 from contextlib import contextmanager
-from typing import Dict, Iterator, List, Optional, Type, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Type, Union
 
-from sqlalchemy import URL, inspect
+from sqlalchemy import URL, insert, inspect
 from sqlalchemy.orm import DeclarativeMeta, Session
 
 from dbgpt.core import Serializer
@@ -17,6 +17,10 @@ from dbgpt.core.interface.storage import (
 
 from .db_manager import BaseModel, BaseQuery, DatabaseManager
 
+# The max number of the identifiers in one query, the number of the parameters of
+# a statement is limited by the databases, e.g. 999 in the old SQLite versions.
+_LOAD_CHUNK_SIZE = 500
+
 
 def _copy_public_properties(src: BaseModel, dest: BaseModel):
     """Copy public properties from src to dest."""
@@ -28,6 +32,19 @@ def _copy_public_properties(src: BaseModel, dest: BaseModel):
                 setattr(dest, column.key, value)
 
 
+def _to_insert_mapping(model_instance: BaseModel) -> Dict:
+    """Return the column values of a new model instance to insert.
+
+    The None values are skipped, so the defaults of the columns are used.
+    """
+    mapping = {}
+    for column in inspect(model_instance).mapper.column_attrs:
+        value = getattr(model_instance, column.key)
+        if value is not None:
+            mapping[column.key] = value
+    return mapping
+
+
 class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
     """Database storage implementation using SQLAlchemy."""
 
@@ -60,6 +77,14 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
             model_instance = self.adapter.to_storage_format(data)
             session.add(model_instance)
 
+    def save_list(self, data: List[T]) -> None:
+        """Save the data to the storage with a bulk INSERT in one transaction."""
+        if not data:
+            return
+        mappings = [_to_insert_mapping(self.adapter.to_storage_format(d)) for d in data]
+        with self.session() as session:
+            session.execute(insert(self._model_class), mappings)
+
     def update(self, data: T) -> None:
         """Update data in the storage."""
         with self.session() as session:
@@ -99,6 +124,66 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
                 return self.adapter.from_storage_format(model_instance)
             return None
 
+    def load_list(self, resource_id: List[ResourceIdentifier], cls: Type[T]) -> List[T]:
+        """Load the data by identifiers from the storage.
+
+        If the adapter supports
+        :meth:`~dbgpt.core.interface.storage.StorageItemAdapter.get_query_for_identifiers`,
+        the data is loaded with one query per chunk of identifiers. The data is
+        returned in the order of the identifiers, the missing data is skipped.
+        """
+        with self.session() as session:
+            loaded = self._load_by_identifiers(session, resource_id)
+            if loaded is None:
+                model_instances = self._load_one_by_one(session, resource_id)
+                return [self.adapter.from_storage_format(m) for m in model_instances]
+            return [
+                loaded[r.str_identifier][1]
+                for r in resource_id
+                if r.str_identifier in loaded
+            ]
+
+    def _load_one_by_one(
+        self, session: Session, resource_ids: List[ResourceIdentifier]
+    ) -> List[BaseModel]:
+        model_instances = []
+        for r in resource_ids:
+            query = self.adapter.get_query_for_identifier(
+                self._model_class, r, session=session
+            )
+            model_instance = query.with_session(session).first()
+            if model_instance:
+                model_instances.append(model_instance)
+        return model_instances
+
+    def _load_by_identifiers(
+        self, session: Session, resource_ids: List[ResourceIdentifier]
+    ) -> Optional[Dict[str, Tuple[BaseModel, T]]]:
+        """Load the model instances and the data of the identifiers.
+
+        Returns:
+            Optional[Dict[str, Tuple[BaseModel, T]]]: The model instance and the data
+                of every found identifier, None if the adapter can not query many
+                identifiers at once.
+        """
+        loaded: Dict[str, Tuple[BaseModel, T]] = {}
+        wanted = {r.str_identifier for r in resource_ids}
+        for i in range(0, len(resource_ids), _LOAD_CHUNK_SIZE):
+            query = self.adapter.get_query_for_identifiers(
+                self._model_class,
+                resource_ids[i : i + _LOAD_CHUNK_SIZE],
+                session=session,
+            )
+            if query is None:
+                return None
+            for model_instance in query.with_session(session).all():
+                item = self.adapter.from_storage_format(model_instance)
+                # The query may return the data which is not wanted
+                str_identifier = item.identifier.str_identifier
+                if str_identifier in wanted and str_identifier not in loaded:
+                    loaded[str_identifier] = (model_instance, item)
+        return loaded
+
     def delete(self, resource_id: ResourceIdentifier) -> None:
         """Delete data by identifier from the storage."""
         with self.session() as session:
@@ -109,6 +194,25 @@ class SQLAlchemyStorage(StorageInterface[T, BaseModel]):
             if model_instance:
                 session.delete(model_instance)
 
+    def delete_list(self, resource_id: List[ResourceIdentifier]) -> None:
+        """Delete the data by identifiers from the storage in one transaction.
+
+        The data is loaded as :meth:`load_list`, and the DELETE statements are
+        batched by the session.
+        """
+        if not resource_id:
+            return
+        with self.session() as session:
+            loaded = self._load_by_identifiers(session, resource_id)
+            if loaded is None:
+                model_instances = self._load_one_by_one(session, resource_id)
+            else:
+                model_instances = [
+                    model_instance for model_instance, _ in loaded.values()
+                ]
+            for model_instance in model_instances:
+                session.delete(model_instance)
+
     def query(self, spec: QuerySpec, cls: Type[T]) -> List[T]:
         """Query data from the storage.
 
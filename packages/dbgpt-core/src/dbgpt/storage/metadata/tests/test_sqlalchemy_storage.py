@@ -169,3 +169,34 @@ def test_paginate_query(sqlalchemy_storage):
     assert page_result.page == page_number
     assert page_result.total_pages == 4
     assert page_result.total_count == 10
+
+
+class MockBulkStorageItemAdapter(MockStorageItemAdapter):
+    """The adapter which queries many identifiers at once."""
+
+    def get_query_for_identifiers(self, storage_format, resource_ids, **kwargs):
+        session: Session = kwargs.get("session")
+        ids = [int(resource_id.str_identifier) for resource_id in resource_ids]
+        return session.query(storage_format).filter(storage_format.id.in_(ids))
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_save_load_delete_list(db_url, serializer, monkeypatch, bulk):
+    from dbgpt.storage.metadata import db_storage
+
+    monkeypatch.setattr(db_storage, "_LOAD_CHUNK_SIZE", 2)
+    adapter = MockBulkStorageItemAdapter() if bulk else MockStorageItemAdapter()
+    storage = SQLAlchemyStorage(db_url, MockModel, adapter, serializer, base=Base)
+    Base.metadata.create_all(storage.db_manager.engine)
+
+    storage.save_list(
+        [MockStorageItem(MockResourceIdentifier(str(i)), f"data_{i}") for i in range(5)]
+    )
+    ids = [MockResourceIdentifier(str(i)) for i in [4, 1, 9, 3, 1]]
+    loaded = storage.load_list(ids, MockStorageItem)
+    assert [item.data for item in loaded] == ["data_4", "data_1", "data_3", "data_1"]
+
+    storage.delete_list(ids)
+    all_ids = [MockResourceIdentifier(str(i)) for i in range(5)]
+    loaded = storage.load_list(all_ids, MockStorageItem)
+    assert [item.data for item in loaded] == ["data_0", "data_2"]
@@ -0,0 +1,210 @@
+import asyncio
+import threading
+import time
+from typing import List, Optional
+
+import pytest
+
+from dbgpt.core import Chunk
+
+from ..ingestion import IngestionError, arun_ingestion, run_ingestion
+
+
+def _groups(num_groups: int, group_size: int = 2) -> List[List[Chunk]]:
+    return [
+        [Chunk(content=f"{g}-{i}", chunk_id=f"{g}-{i}") for i in range(group_size)]
+        for g in range(num_groups)
+    ]
+
+
+def _ids(groups: List[List[Chunk]]) -> List[str]:
+    return [chunk.chunk_id for group in groups for chunk in group]
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.embedding = 0
+        self.loading = 0
+        self.max_embedding = 0
+        self.max_loading = 0
+        # Whether an embedding ran while a group was written
+        self.overlapped = False
+        self.max_pending = 0
+        self.embedded = 0
+        self.loaded = 0
+
+    def enter(self, stage: str):
+        with self.lock:
+            setattr(self, stage, getattr(self, stage) + 1)
+            self.max_embedding = max(self.max_embedding, self.embedding)
+            self.max_loading = max(self.max_loading, self.loading)
+            if self.embedding and self.loading:
+                self.overlapped = True
+
+    def exit(self, stage: str):
+        with self.lock:
+            setattr(self, stage, getattr(self, stage) - 1)
+            if stage == "embedding":
+                self.embedded += 1
+            else:
+                self.loaded += 1
+            self.max_pending = max(self.max_pending, self.embedded - self.loaded)
+
+
+@pytest.mark.asyncio
+async def test_arun_ingestion_pipeline():
+    stats = _Stats()
+    groups = _groups(8)
+
+    async def _embed(group: List[Chunk]) -> List[List[float]]:
+        stats.enter("embedding")
+        await asyncio.sleep(0.01)
+        stats.exit("embedding")
+        return [[1.0] for _ in group]
+
+    async def _load(group: List[Chunk], vectors: Optional[List[List[float]]]):
+        assert vectors == [[1.0] for _ in group]
+        stats.enter("loading")
+        # The first group is the slowest one
+        await asyncio.sleep(0.05 if group[0].chunk_id == "0-0" else 0.01)
+        stats.exit("loading")
+        return [chunk.chunk_id for chunk in group]
+
+    progress = []
+    ids = await arun_ingestion(
+        groups,
+        _load,
+        _embed,
+        embed_concurrency=2,
+        load_concurrency=3,
+        max_pending_groups=2,
+        progress_callback=lambda m: progress.append(m.loaded_chunks),
+    )
+    assert ids == _ids(groups)
+    assert stats.max_embedding == 2
+    assert stats.max_loading == 3
+    assert stats.overlapped
+    # The loading groups, the queued groups and the groups waiting to be queued
+    assert stats.max_pending <= 3 + 2 + 2
+    assert progress == [2 * i for i in range(1, 9)]
+
+
+@pytest.mark.asyncio
+async def test_arun_ingestion_sliding_window():
+    groups = _groups(11)
+
+    async def _load(group: List[Chunk], _):
+        await asyncio.sleep(0.3 if group[0].chunk_id == "0-0" else 0.02)
+        return [chunk.chunk_id for chunk in group]
+
+    start = time.perf_counter()
+    ids = await arun_ingestion(groups, _load, load_concurrency=2)
+    # Lock-step waves of 2 groups would take 0.3 + 5 * 0.02 seconds
+    assert time.perf_counter() - start < 0.37
+    assert ids == _ids(groups)
+
+
+@pytest.mark.asyncio
+async def test_arun_ingestion_failed():
+    async def _load(group: List[Chunk], _):
+        if group[0].chunk_id == "2-0":
+            raise ValueError("write failed")
+        await asyncio.sleep(0.01)
+        return [chunk.chunk_id for chunk in group]
+
+    with pytest.raises(IngestionError, match="chunk group 3: write failed"):
+        await arun_ingestion(_groups(10), _load, load_concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_arun_ingestion_empty():
+    async def _load(group: List[Chunk], _):
+        return [chunk.chunk_id for chunk in group]
+
+    assert await arun_ingestion([], _load) == []
+
+
+def test_run_ingestion_pipeline():
+    stats = _Stats()
+    groups = _groups(8)
+
+    def _embed(group: List[Chunk]) -> List[List[float]]:
+        stats.enter("embedding")
+        time.sleep(0.01)
+        stats.exit("embedding")
+        return [[1.0] for _ in group]
+
+    def _load(group: List[Chunk], vectors: Optional[List[List[float]]]):
+        assert vectors == [[1.0] for _ in group]
+        stats.enter("loading")
+        time.sleep(0.02)
+        stats.exit("loading")
+        return [chunk.chunk_id for chunk in group]
+
+    ids = run_ingestion(
+        groups,
+        _load,
+        _embed,
+        embed_concurrency=2,
+        load_concurrency=2,
+        max_pending_groups=2,
+    )
+    assert ids == _ids(groups)
+    assert stats.max_embedding <= 2
+    assert stats.max_loading <= 2
+    assert stats.overlapped
+
+
+def test_run_ingestion_failed():
+    def _embed(group: List[Chunk]) -> List[List[float]]:
+        if group[0].chunk_id == "1-0":
+            raise ValueError("embed failed")
+        return [[1.0] for _ in group]
+
+    with pytest.raises(IngestionError, match="chunk group 2: embed failed"):
+        run_ingestion(_groups(4), lambda group, _: [], _embed)
+
+
+@pytest.mark.asyncio
+async def test_arun_ingestion_lazy_groups():
+    groups = _groups(6)
+    taken = []
+
+    def _iter_groups():
+        for group in groups:
+            taken.append(group[0].chunk_id)
+            yield group
+
+    async def _load(group: List[Chunk], _):
+        # A group is only taken when a worker is free
+        assert len(taken) <= groups.index(group) + 2 + 2 + 1
+        await asyncio.sleep(0.01)
+        return [chunk.chunk_id for chunk in group]
+
+    progress = []
+    ids = await arun_ingestion(
+        _iter_groups(),
+        _load,
+        load_concurrency=2,
+        max_pending_groups=2,
+        progress_callback=lambda m: progress.append(str(m)),
+    )
+    assert ids == _ids(groups)
+    assert progress[-1].startswith("Loaded 12 chunks (6 groups)")
+
+
+def test_run_ingestion_lazy_groups():
+    groups = _groups(5)
+
+    def _embed(group: List[Chunk]) -> List[List[float]]:
+        time.sleep(0.01)
+        return [[1.0] for _ in group]
+
+    ids = run_ingestion(
+        (group for group in groups),
+        lambda group, _: [chunk.chunk_id for chunk in group],
+        _embed,
+        embed_concurrency=2,
+    )
+    assert ids == _ids(groups)
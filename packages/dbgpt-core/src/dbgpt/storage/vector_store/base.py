@@ -14,6 +14,7 @@ from dbgpt.storage.vector_store.filters import MetadataFilters
 from dbgpt.util import RegisterParameters
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt.util.i18n_utils import _
+from dbgpt.util.similarity_util import normalize_vectors
 
 logger = logging.getLogger(__name__)
 
@@ -165,6 +166,41 @@ class VectorStoreBase(IndexStoreBase, ABC):
         """Whether vector name exists."""
         return False
 
+    def embed_query(self, text: str) -> Optional[List[float]]:
+        """Embed the query text to search by the vector.
+
+        Override it with `similar_search_with_scores_by_vector` if the vector store
+        can search by the query vector, the query searched many times is embedded
+        only once.
+
+        Args:
+            text(str): The query text.
+        Return:
+            Optional[List[float]]: The query vector, None if the vector store can't
+                search by the vector.
+        """
+        return None
+
+    def similar_search_with_scores_by_vector(
+        self,
+        embedding: List[float],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Similar search with scores by the query vector of `embed_query`.
+
+        Args:
+            embedding(List[float]): The query vector.
+            topk(int): The number of similar documents to return.
+            score_threshold(float): score_threshold: Optional, a floating point value
+                between 0 to 1
+            filters(Optional[MetadataFilters]): metadata filters.
+        Return:
+            List[Chunk]: The similar documents.
+        """
+        raise NotImplementedError
+
     def convert_metadata_filters(self, filters: MetadataFilters) -> Any:
         """Convert metadata filters to vector store filters.
 
@@ -176,12 +212,9 @@ class VectorStoreBase(IndexStoreBase, ABC):
     def _normalization_vectors(self, vectors):
         """Return L2-normalization vectors to scale[0,1].
 
-        Normalization vectors to scale[0,1].
+        Normalize every vector to scale[0,1].
         """
-        import numpy as np
-
-        norm = np.linalg.norm(vectors)
-        return vectors / norm
+        return normalize_vectors(vectors)
 
     def _default_relevance_score_fn(self, distance: float) -> float:
         """Return a similarity score on a scale [0, 1]."""
@@ -2,7 +2,7 @@ import asyncio
 import json
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, is_dataclass
-from typing import Any, Callable, Coroutine, List, Union
+from typing import Any, AsyncIterator, Callable, Coroutine, List, Tuple, Union
 
 from dbgpt._private.pydantic import BaseModel, model_to_json
 
@@ -35,6 +35,59 @@ async def run_async_tasks(
     return await _gather()
 
 
+_STREAM_END = object()
+
+
+async def merge_async_iterators(
+    iterators: List[AsyncIterator[Any]],
+) -> AsyncIterator[Tuple[int, Any]]:
+    """Iterate the async iterators concurrently and merge their items.
+
+    The items are yielded as soon as they are produced, with the index of their
+    iterator. An exception raised by an iterator is raised here, and the other
+    iterators are cancelled when the merged iterator is closed.
+
+    Args:
+        iterators(List[AsyncIterator[Any]]): The async iterators to merge.
+
+    Returns:
+        AsyncIterator[Tuple[int, Any]]: The index of the iterator and the item.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(len(iterators), 1))
+
+    async def _produce(index: int, iterator: AsyncIterator[Any]):
+        try:
+            async for item in iterator:
+                await queue.put((index, item, None))
+        except Exception as e:
+            await queue.put((index, None, e))
+        else:
+            await queue.put((index, _STREAM_END, None))
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    producers = [
+        asyncio.create_task(_produce(i, iterator))
+        for i, iterator in enumerate(iterators)
+    ]
+    remaining = len(producers)
+    try:
+        while remaining:
+            index, item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is _STREAM_END:
+                remaining -= 1
+                continue
+            yield index, item
+    finally:
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+
+
 def run_tasks(
     tasks: List[Callable],
     concurrency_limit: int = None,
@@ -0,0 +1,96 @@
+"""Compact encodings of the embeddings.
+
+Sending the embeddings as JSON float lists is about ten times larger than the
+raw float32 bytes, and encoding and decoding them dominates the bulk embedding
+requests. The embeddings can be sent as:
+
+- ``base64``: every embedding is the base64 of its little-endian float32 bytes,
+  compatible with the `encoding_format` of the OpenAI embeddings API.
+- ``binary``: the response body is the little-endian float32 bytes of all the
+  embeddings, the dimension is in the `X-Embedding-Dimensions` header. It is used
+  between the model workers.
+"""
+
+import base64
+import sys
+from array import array
+from typing import List, Optional, Sequence, Union
+
+EMBEDDING_ENCODING_FLOAT = "float"
+EMBEDDING_ENCODING_BASE64 = "base64"
+EMBEDDING_ENCODING_BINARY = "binary"
+
+EMBEDDINGS_BINARY_MEDIA_TYPE = "application/octet-stream"
+EMBEDDING_DIMENSIONS_HEADER = "X-Embedding-Dimensions"
+
+_NEED_BYTESWAP = sys.byteorder != "little"
+
+
+def _to_bytes(values: array) -> bytes:
+    if _NEED_BYTESWAP:
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(data: bytes) -> array:
+    values = array("f")
+    values.frombytes(data)
+    if _NEED_BYTESWAP:
+        values.byteswap()
+    return values
+
+
+def encode_embedding_base64(embedding: Sequence[float]) -> str:
+    """Encode an embedding to the base64 of its float32 bytes."""
+    return base64.b64encode(_to_bytes(array("f", embedding))).decode("ascii")
+
+
+def decode_embedding(embedding: Union[str, List[float]]) -> List[float]:
+    """Decode an embedding, which is a float list or a base64 string."""
+    if isinstance(embedding, str):
+        return _from_bytes(base64.b64decode(embedding)).tolist()
+    return embedding
+
+
+def embeddings_to_bytes(embeddings: List[List[float]]) -> Optional[bytes]:
+    """Pack the embeddings to float32 bytes.
+
+    Args:
+        embeddings(List[List[float]]): The embeddings.
+
+    Returns:
+        Optional[bytes]: The bytes, None if the embeddings have different
+            dimensions.
+    """
+    if not embeddings:
+        return b""
+    dim = len(embeddings[0])
+    values = array("f")
+    for embedding in embeddings:
+        if len(embedding) != dim:
+            return None
+        values.extend(embedding)
+    return _to_bytes(values)
+
+
+def embeddings_from_bytes(data: bytes, dim: int) -> List[List[float]]:
+    """Unpack the float32 bytes to the embeddings.
+
+    Args:
+        data(bytes): The bytes packed by :func:`embeddings_to_bytes`.
+        dim(int): The dimension of the embeddings.
+
+    Returns:
+        List[List[float]]: The embeddings.
+    """
+    values = _from_bytes(data)
+    if dim <= 0:
+        if values:
+            raise ValueError("The dimension of the embeddings must be positive")
+        return []
+    if len(values) % dim:
+        raise ValueError(
+            f"The number of values {len(values)} is not a multiple of the dimension"
+            f" {dim}"
+        )
+    return [values[i : i + dim].tolist() for i in range(0, len(values), dim)]
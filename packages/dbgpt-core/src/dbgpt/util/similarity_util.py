@@ -1,10 +1,158 @@
-"""Utility functions for calculating similarity."""
+"""Utility functions for calculating similarity.
 
-from typing import TYPE_CHECKING, Any, List, Sequence
+The functions score a batch of queries against a batch of candidates with one
+float32 matrix product, and select the top k candidates by a partial sort, so the
+candidates are never scored one pair at a time in Python.
+"""
+
+from typing import TYPE_CHECKING, Any, List, Sequence, Tuple, Union
+
+import numpy as np
 
 if TYPE_CHECKING:
     from dbgpt.core.interface.embeddings import Embeddings
 
+VectorsLike = Union[np.ndarray, Sequence[float], Sequence[Sequence[float]]]
+
+_METRICS = ["cosine", "dot", "l2"]
+
+
+def as_matrix(vectors: VectorsLike) -> np.ndarray:
+    """Convert the vectors to a 2-D float32 matrix, one vector per row.
+
+    Args:
+        vectors(VectorsLike): A vector or a sequence of vectors.
+
+    Returns:
+        np.ndarray: The float32 matrix.
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    return matrix
+
+
+def normalize_vectors(vectors: VectorsLike) -> np.ndarray:
+    """L2-normalize every vector, the zero vectors are kept as zero.
+
+    Args:
+        vectors(VectorsLike): A vector or a sequence of vectors.
+
+    Returns:
+        np.ndarray: The normalized float32 vectors, in the shape of the input.
+    """
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return array / norms
+
+
+def similarity_matrix(
+    queries: VectorsLike, candidates: VectorsLike, metric: str = "cosine"
+) -> np.ndarray:
+    """Score every query against every candidate.
+
+    Args:
+        queries(VectorsLike): The query vectors, shape (m, d) or (d,).
+        candidates(VectorsLike): The candidate vectors, shape (n, d) or (d,).
+        metric(str): The metric, cosine or dot for the similarity, l2 for the
+            euclidean distance.
+
+    Returns:
+        np.ndarray: The float32 scores of shape (m, n), the higher is more similar
+            except for the l2 distance.
+    """
+    if metric not in _METRICS:
+        raise ValueError(f"Unsupported metric: {metric}, must be one of {_METRICS}")
+    query_matrix, candidate_matrix = as_matrix(queries), as_matrix(candidates)
+    if metric == "cosine":
+        query_matrix = normalize_vectors(query_matrix)
+        candidate_matrix = normalize_vectors(candidate_matrix)
+    scores = query_matrix @ candidate_matrix.T
+    if metric == "l2":
+        # |q - c|^2 = |q|^2 + |c|^2 - 2 q.c
+        squared = (
+            np.einsum("ij,ij->i", query_matrix, query_matrix)[:, None]
+            + np.einsum("ij,ij->i", candidate_matrix, candidate_matrix)[None, :]
+            - 2 * scores
+        )
+        scores = np.sqrt(np.maximum(squared, 0))
+    return scores
+
+
+def top_k(
+    scores: np.ndarray, k: int, largest: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Select the top k scores of every row by a partial sort.
+
+    Args:
+        scores(np.ndarray): The scores, shape (n,) or (m, n).
+        k(int): The number of the scores to select.
+        largest(bool): Select the largest scores, otherwise the smallest ones.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indexes and the scores, sorted from the
+            best to the worst, shape (k,) or (m, k). The ties are ordered by index.
+    """
+    scores = np.asarray(scores)
+    keys = -scores if largest else scores
+    n = scores.shape[-1]
+    k = max(0, min(k, n))
+    if k == 0:
+        indexes = np.zeros(scores.shape[:-1] + (0,), dtype=np.int64)
+    elif k < n:
+        indexes = np.argpartition(keys, k - 1, axis=-1)[..., :k]
+        # Sort by the index first, so the stable sort orders the ties by index
+        indexes = np.sort(indexes, axis=-1)
+    else:
+        indexes = np.broadcast_to(np.arange(n), scores.shape)
+    order = np.argsort(
+        np.take_along_axis(keys, indexes, axis=-1), axis=-1, kind="stable"
+    )
+    indexes = np.take_along_axis(indexes, order, axis=-1)
+    return indexes, np.take_along_axis(scores, indexes, axis=-1)
+
+
+def quantize_int8(vectors: VectorsLike) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantize every vector to int8 with its own scale.
+
+    The int8 vectors take a quarter of the memory of the float32 ones, and are
+    scored by :func:`int8_similarity_matrix`.
+
+    Args:
+        vectors(VectorsLike): A vector or a sequence of vectors.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The int8 matrix and the float32 scale of
+            every row, ``vector ~= codes * scale``.
+    """
+    matrix = as_matrix(vectors)
+    scales = np.abs(matrix).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def int8_similarity_matrix(
+    queries: VectorsLike, codes: np.ndarray, scales: np.ndarray
+) -> np.ndarray:
+    """Score the queries against the int8 quantized candidates by the dot product.
+
+    The queries are quantized too, and the products are accumulated in int32. To
+    score by the cosine similarity, quantize the normalized vectors.
+
+    Args:
+        queries(VectorsLike): The float query vectors, shape (m, d) or (d,).
+        codes(np.ndarray): The int8 candidates of :func:`quantize_int8`.
+        scales(np.ndarray): The scales of the candidates.
+
+    Returns:
+        np.ndarray: The approximated float32 dot products of shape (m, n).
+    """
+    query_codes, query_scales = quantize_int8(queries)
+    products = query_codes.astype(np.int32) @ codes.astype(np.int32).T
+    return products * query_scales[:, None] * scales[None, :]
+
 
 def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float:
     """Calculate the cosine similarity between two vectors.
@@ -16,18 +164,10 @@ def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float
     Returns:
         float: The cosine similarity.
     """
-    try:
-        import numpy as np
-    except ImportError:
-        raise ImportError("numpy is required for SimilarityMetric")
-    dot_product = np.dot(embedding1, embedding2)
-    norm1 = np.linalg.norm(embedding1)
-    norm2 = np.linalg.norm(embedding2)
-    similarity = dot_product / (norm1 * norm2)
-    return similarity
-
-
-def sigmoid_function(x: float) -> float:
+    return float(similarity_matrix(embedding1, embedding2)[0, 0])
+
+
+def sigmoid_function(x: Any) -> Any:
     """Calculate the sigmoid function.
 
     The sigmoid function is defined as:
@@ -37,15 +177,11 @@ def sigmoid_function(x: float) -> float:
     It is used to map the input to a value between 0 and 1.
 
     Args:
-        x(float): The input to the sigmoid function.
+        x(float): The input to the sigmoid function, or an array of inputs.
 
     Returns:
         float: The output of the sigmoid function.
     """
-    try:
-        import numpy as np
-    except ImportError:
-        raise ImportError("numpy is required for sigmoid_function")
     return 1 / (1 + np.exp(-x))
 
 
@@ -62,20 +198,6 @@ def calculate_cosine_similarity(
     Returns:
         numpy.ndarray: The cosine similarity.
     """
-    try:
-        import numpy as np
-    except ImportError:
-        raise ImportError("numpy is required for SimilarityMetric")
-    prediction_vec = np.asarray(embeddings.embed_query(prediction)).reshape(1, -1)
-    context_list = list(contexts)
-    context_list_vec = np.asarray(embeddings.embed_documents(context_list)).reshape(
-        len(contexts), -1
-    )
-    # cos(a,b) = dot(a,b) / (norm(a) * norm(b))
-    dot = np.dot(context_list_vec, prediction_vec.T).reshape(
-        -1,
-    )
-    norm = np.linalg.norm(context_list_vec, axis=1) * np.linalg.norm(
-        prediction_vec, axis=1
-    )
-    return dot / norm
+    prediction_vec = embeddings.embed_query(prediction)
+    context_list_vec = embeddings.embed_documents(list(contexts))
+    return similarity_matrix(prediction_vec, context_list_vec)[0]
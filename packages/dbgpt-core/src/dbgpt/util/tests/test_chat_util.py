@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from dbgpt.util.chat_util import merge_async_iterators
+
+
+async def _produce(name: str, delays, closed=None):
+    try:
+        for i, delay in enumerate(delays):
+            await asyncio.sleep(delay)
+            yield f"{name}{i}"
+    finally:
+        if closed is not None:
+            closed.append(name)
+
+
+@pytest.mark.asyncio
+async def test_merge_async_iterators():
+    iterators = [_produce("a", [0.1, 0.1]), _produce("b", [0.02, 0.02, 0.13])]
+    items = [item async for item in merge_async_iterators(iterators)]
+    assert items == [(1, "b0"), (1, "b1"), (0, "a0"), (1, "b2"), (0, "a1")]
+    assert [item async for item in merge_async_iterators([])] == []
+
+
+@pytest.mark.asyncio
+async def test_merge_async_iterators_error():
+    async def _fail():
+        yield "x0"
+        raise ValueError("failed")
+
+    closed = []
+    merged = merge_async_iterators([_fail(), _produce("a", [10], closed)])
+    assert await merged.__anext__() == (0, "x0")
+    with pytest.raises(ValueError):
+        await merged.__anext__()
+    # The other iterators are cancelled
+    assert closed == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_merge_async_iterators_close():
+    closed = []
+    iterators = [_produce(name, [0, 10], closed) for name in ["a", "b"]]
+    merged = merge_async_iterators(iterators)
+    assert (await merged.__anext__())[1].endswith("0")
+    await merged.aclose()
+    assert sorted(closed) == ["a", "b"]
@@ -0,0 +1,35 @@
+import base64
+import struct
+
+import pytest
+
+from dbgpt.util.embedding_utils import (
+    decode_embedding,
+    embeddings_from_bytes,
+    embeddings_to_bytes,
+    encode_embedding_base64,
+)
+
+_EMBEDDINGS = [[0.5, -1.25, 3.0], [0.0, 2.5, -0.125]]
+
+
+def test_base64_embedding():
+    encoded = encode_embedding_base64(_EMBEDDINGS[0])
+    # Little-endian float32, the same as the OpenAI embeddings API
+    assert base64.b64decode(encoded) == struct.pack("<3f", *_EMBEDDINGS[0])
+    assert decode_embedding(encoded) == _EMBEDDINGS[0]
+    assert decode_embedding(_EMBEDDINGS[1]) is _EMBEDDINGS[1]
+    # The values are rounded to float32
+    assert decode_embedding(encode_embedding_base64([0.1]))[0] == pytest.approx(0.1)
+
+
+def test_binary_embeddings():
+    data = embeddings_to_bytes(_EMBEDDINGS)
+    assert len(data) == 6 * 4
+    assert embeddings_from_bytes(data, 3) == _EMBEDDINGS
+    assert embeddings_to_bytes([]) == b""
+    assert embeddings_from_bytes(b"", 0) == []
+    # The embeddings with different dimensions can not be packed
+    assert embeddings_to_bytes([[1.0], [1.0, 2.0]]) is None
+    with pytest.raises(ValueError):
+        embeddings_from_bytes(data, 4)
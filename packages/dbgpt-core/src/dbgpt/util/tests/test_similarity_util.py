@@ -0,0 +1,107 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from dbgpt.core import Embeddings
+from dbgpt.util.similarity_util import (
+    calculate_cosine_similarity,
+    cosine_similarity,
+    int8_similarity_matrix,
+    normalize_vectors,
+    quantize_int8,
+    similarity_matrix,
+    top_k,
+)
+
+
+class _FixedEmbeddings(Embeddings):
+    def __init__(self, vectors):
+        self._vectors = vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._vectors[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vectors[text]
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(42)
+    return rng.standard_normal((3, 16)), rng.standard_normal((50, 16))
+
+
+def test_normalize_vectors():
+    normalized = normalize_vectors([[3.0, 4.0], [0.0, 0.0]])
+    assert normalized.dtype == np.float32
+    np.testing.assert_allclose(normalized, [[0.6, 0.8], [0.0, 0.0]])
+    np.testing.assert_allclose(normalize_vectors([0.0, 2.0]), [0.0, 1.0])
+
+
+def test_similarity_matrix(vectors):
+    queries, candidates = vectors
+    expected_dot = queries @ candidates.T
+    expected_cosine = expected_dot / np.outer(
+        np.linalg.norm(queries, axis=1), np.linalg.norm(candidates, axis=1)
+    )
+    expected_l2 = np.linalg.norm(queries[:, None] - candidates[None], axis=2)
+
+    scores = similarity_matrix(queries, candidates)
+    assert scores.shape == (3, 50)
+    assert scores.dtype == np.float32
+    np.testing.assert_allclose(scores, expected_cosine, atol=1e-5)
+    np.testing.assert_allclose(
+        similarity_matrix(queries, candidates, "dot"), expected_dot, atol=1e-4
+    )
+    np.testing.assert_allclose(
+        similarity_matrix(queries, candidates, "l2"), expected_l2, atol=1e-4
+    )
+    assert cosine_similarity(queries[0], candidates[0]) == pytest.approx(
+        expected_cosine[0, 0], abs=1e-5
+    )
+    with pytest.raises(ValueError):
+        similarity_matrix(queries, candidates, "manhattan")
+
+
+def test_top_k():
+    scores = np.array([0.1, 0.5, 0.9, 0.5, 0.2])
+    indexes, values = top_k(scores, 3)
+    assert indexes.tolist() == [2, 1, 3]
+    assert values.tolist() == [0.9, 0.5, 0.5]
+    assert top_k(scores, 2, largest=False)[0].tolist() == [0, 4]
+    assert top_k(scores, 10)[0].tolist() == [2, 1, 3, 4, 0]
+    assert top_k(scores, 0)[0].tolist() == []
+
+    indexes, values = top_k(np.vstack([scores, -scores]), 2)
+    assert indexes.tolist() == [[2, 1], [0, 4]]
+    assert values.shape == (2, 2)
+
+
+def test_top_k_matches_full_sort(vectors):
+    queries, candidates = vectors
+    scores = similarity_matrix(queries, candidates)
+    indexes, _ = top_k(scores, 5)
+    for row, row_scores in zip(indexes, scores):
+        assert row.tolist() == np.argsort(-row_scores, kind="stable")[:5].tolist()
+
+
+def test_int8_similarity_matrix(vectors):
+    queries, candidates = vectors
+    codes, scales = quantize_int8(normalize_vectors(candidates))
+    assert codes.dtype == np.int8
+    assert scales.shape == (50,)
+    approx = int8_similarity_matrix(normalize_vectors(queries), codes, scales)
+    exact = similarity_matrix(queries, candidates)
+    np.testing.assert_allclose(approx, exact, atol=0.02)
+    assert top_k(approx, 1)[0].tolist() == top_k(exact, 1)[0].tolist()
+
+
+def test_calculate_cosine_similarity():
+    embeddings = _FixedEmbeddings(
+        {"query": [1.0, 0.0], "same": [2.0, 0.0], "orthogonal": [0.0, 1.0]}
+    )
+    similarity = calculate_cosine_similarity(
+        embeddings, "query", ["same", "orthogonal"]
+    )
+    np.testing.assert_allclose(similarity, [1.0, 0.0], atol=1e-6)
@@ -3,7 +3,7 @@
 import logging
 import re
 from dataclasses import dataclass, field
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
 
 import sqlparse
 from sqlalchemy import MetaData, text
@@ -15,6 +15,7 @@ from dbgpt.core.awel.flow import (
 )
 from dbgpt.datasource.parameter import BaseDatasourceParameters
 from dbgpt.datasource.rdbms.base import RDBMSConnector
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 from dbgpt_ext.datasource.schema import DBType
 
@@ -373,6 +374,7 @@ class ClickhouseConnector(RDBMSConnector):
             column_comments = [row for block in stream for row in block]
             return column_comments
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self):
         """Get table simple info."""
         # group_concat() not supported in clickhouse, use arrayStringConcat+groupArray
@@ -430,6 +432,36 @@ class ClickhouseConnector(RDBMSConnector):
         result.insert(0, field_names)
         return result
 
+    def query_batches(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        max_rows: Optional[int] = None,
+    ) -> Iterator[Tuple[List[str], List]]:
+        """Query data from clickhouse and yield the results block by block."""
+        logger.info(f"Query[{query}] in batches of {batch_size}, max_rows={max_rows}")
+        if not query:
+            return
+        stream = self.client.query_row_block_stream(
+            query, parameters=params, settings={"max_block_size": batch_size}
+        )
+        with stream:
+            field_names = list(stream.source.column_names)
+            remaining = max_rows
+            yielded = False
+            for block in stream:
+                if remaining is not None:
+                    block = block[:remaining]
+                    remaining -= len(block)
+                if block:
+                    yielded = True
+                    yield field_names, block
+                if remaining is not None and remaining <= 0:
+                    break
+            if not yielded:
+                yield field_names, []
+
     def __sql_parse(self, sql):
         sql = sql.strip()
         parsed = sqlparse.parse(sql)[0]
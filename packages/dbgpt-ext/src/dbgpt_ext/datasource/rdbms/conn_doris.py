@@ -13,8 +13,11 @@ from dbgpt.core.awel.flow import (
     auto_register_resource,
 )
 from dbgpt.datasource.rdbms.base import RDBMSConnector, RDBMSDatasourceParameters
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 
+from .conn_mysql import mysql_schema_fingerprint
+
 
 @auto_register_resource(
     label=_("Apache Doris datasource"),
@@ -55,6 +58,10 @@ class DorisConnector(RDBMSConnector):
         """Return the parameter class."""
         return DorisParameters
 
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Return the checksum of the tables and columns of current database."""
+        return mysql_schema_fingerprint(self)
+
     @classmethod
     def from_uri_db(
         cls,
@@ -83,22 +90,22 @@ class DorisConnector(RDBMSConnector):
             )
             table_results = set(row[0] for row in table_results)  # noqa: C401
             self._all_tables = table_results
-            self._metadata.reflect(bind=self._engine)
+            self._reflect_tables()
             return self._all_tables
 
     def get_grants(self):
         """Get grants."""
         try:
-        with self.session_scope() as session:
-            cursor = session.execute(text("SHOW GRANTS"))
-            grants = cursor.fetchall()
-            if len(grants) == 0:
-                return []
-            if len(grants[0]) == 2:
-                grants_list = [x[1] for x in grants]
-            else:
-                grants_list = [x[2] for x in grants]
-            return grants_list
+            with self.session_scope() as session:
+                cursor = session.execute(text("SHOW GRANTS"))
+                grants = cursor.fetchall()
+                if len(grants) == 0:
+                    return []
+                if len(grants[0]) == 2:
+                    grants_list = [x[1] for x in grants]
+                else:
+                    grants_list = [x[2] for x in grants]
+                return grants_list
         except Exception:
             # If SHOW GRANTS fails, return empty list
             return []
@@ -242,6 +249,7 @@ class DorisConnector(RDBMSConnector):
         with self.session_scope() as session:
             return session.execute(text("select database()")).scalar()
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self):
         """Get table simple info."""
         with self.session_scope() as session:
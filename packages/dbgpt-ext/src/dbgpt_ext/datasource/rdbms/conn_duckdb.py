@@ -12,6 +12,7 @@ from dbgpt.core.awel.flow import (
 )
 from dbgpt.datasource.parameter import BaseDatasourceParameters
 from dbgpt.datasource.rdbms.base import RDBMSConnector
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 
 
@@ -108,6 +109,19 @@ class DuckDbConnector(RDBMSConnector):
                 (table_comment[0], table_comment[1]) for table_comment in table_comments
             ]
 
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Return the checksum of the columns of current schema."""
+        with self.session_scope() as session:
+            row = session.execute(
+                text(
+                    "SELECT COUNT(*), SUM(LENGTH(table_name) + LENGTH(column_name) "
+                    "+ LENGTH(data_type)) FROM information_schema.columns "
+                    "WHERE table_schema = current_schema()"
+                )
+            ).fetchone()
+            return str(tuple(row or ()))
+
+    @schema_cached("table_simple_info")
     def table_simple_info(self) -> Iterable[str]:
         """Get table simple info."""
         _tables_sql = """
@@ -14,6 +14,7 @@ from dbgpt.core.awel.flow import (
 )
 from dbgpt.datasource.parameter import BaseDatasourceParameters
 from dbgpt.datasource.rdbms.base import RDBMSConnector
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 
 
@@ -155,6 +156,7 @@ class HiveConnector(RDBMSConnector):
             )
         return cast(HiveConnector, cls.from_uri(db_url, engine_args, **kwargs))
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self):
         """Get table simple info."""
         return []
@@ -11,6 +11,7 @@ from dbgpt.core.awel.flow import (
     auto_register_resource,
 )
 from dbgpt.datasource.rdbms.base import RDBMSConnector, RDBMSDatasourceParameters
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 
 
@@ -53,6 +54,7 @@ class MSSQLConnector(RDBMSConnector):
         """Return the parameter class."""
         return MSSQLParameters
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self) -> Iterable[str]:
         """Get table simple info."""
         _tables_sql = """
@@ -1,7 +1,9 @@
 """MySQL connector."""
 
 from dataclasses import dataclass, field
-from typing import Type
+from typing import Optional, Type
+
+from sqlalchemy import text
 
 from dbgpt.core.awel.flow import (
     TAGS_ORDER_HIGH,
@@ -37,6 +39,31 @@ class MySQLParameters(RDBMSDatasourceParameters):
         return MySQLConnector.from_parameters(self)
 
 
+def mysql_schema_fingerprint(connector: RDBMSConnector) -> Optional[str]:
+    """Return the information_schema checksum of the tables and columns.
+
+    Shared by the MySQL compatible connectors.
+
+    Args:
+        connector (RDBMSConnector): The connector of current database.
+    """
+    with connector.session_scope() as session:
+        columns = session.execute(
+            text(
+                "SELECT COUNT(*), SUM(LENGTH(TABLE_NAME) + LENGTH(COLUMN_NAME) "
+                "+ LENGTH(COLUMN_TYPE)) FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE()"
+            )
+        ).fetchone()
+        tables = session.execute(
+            text(
+                "SELECT COUNT(*), MAX(CREATE_TIME) FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE()"
+            )
+        ).fetchone()
+        return f"{tuple(columns or ())}|{tuple(tables or ())}"
+
+
 class MySQLConnector(RDBMSConnector):
     """MySQL connector."""
 
@@ -50,3 +77,7 @@ class MySQLConnector(RDBMSConnector):
     def param_class(cls) -> Type[RDBMSDatasourceParameters]:
         """Return the parameter class."""
         return MySQLParameters
+
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Return the checksum of the tables and columns of current database."""
+        return mysql_schema_fingerprint(self)
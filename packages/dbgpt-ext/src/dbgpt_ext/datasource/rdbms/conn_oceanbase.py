@@ -2,7 +2,7 @@
 
 import logging
 from dataclasses import dataclass, field
-from typing import Type
+from typing import Optional, Type
 
 from dbgpt.core.awel.flow import (
     TAGS_ORDER_HIGH,
@@ -12,6 +12,8 @@ from dbgpt.core.awel.flow import (
 from dbgpt.datasource.rdbms.base import RDBMSConnector, RDBMSDatasourceParameters
 from dbgpt.util.i18n_utils import _
 
+from .conn_mysql import mysql_schema_fingerprint
+
 logger = logging.getLogger(__name__)
 
 
@@ -55,6 +57,10 @@ class OceanBaseConnector(RDBMSConnector):
         """Return the parameter class."""
         return OceanBaseParameters
 
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Return the checksum of the tables and columns of current database."""
+        return mysql_schema_fingerprint(self)
+
     def get_users(self):
         """Get_users."""
         return []
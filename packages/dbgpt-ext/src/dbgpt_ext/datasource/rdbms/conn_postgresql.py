@@ -6,7 +6,7 @@ from typing import Any, Iterable, List, Optional, Tuple, Type, cast
 from urllib.parse import quote
 from urllib.parse import quote_plus as urlquote
 
-from sqlalchemy import text
+from sqlalchemy import MetaData, text
 
 from dbgpt.core.awel.flow import (
     TAGS_ORDER_HIGH,
@@ -14,6 +14,7 @@ from dbgpt.core.awel.flow import (
     auto_register_resource,
 )
 from dbgpt.datasource.rdbms.base import RDBMSConnector, RDBMSDatasourceParameters
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
@@ -126,9 +127,28 @@ class PostgreSQLConnector(RDBMSConnector):
             self._all_tables = table_results.union(view_results)
 
             # Reflect with schema
-            self._metadata.reflect(bind=self._engine, schema=schema)
+            self._reflect_tables(schema)
             return self._all_tables
 
+    def _reflect_metadata(self) -> MetaData:
+        metadata = super()._reflect_metadata()
+        # Reflect the tables of the schema like the connector without the cache
+        metadata.reflect(bind=self._engine, schema=self._schema or "public")
+        return metadata
+
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Return the checksum of the columns of current schema."""
+        with self.session_scope() as session:
+            row = session.execute(
+                text(
+                    "SELECT COUNT(*), SUM(LENGTH(table_name) + LENGTH(column_name) "
+                    "+ LENGTH(data_type)) FROM information_schema.columns "
+                    "WHERE table_schema = :schema"
+                ),
+                {"schema": self._schema or "public"},
+            ).fetchone()
+            return str(tuple(row or ()))
+
     def get_grants(self):
         """Get grants."""
         with self.session_scope() as session:
@@ -285,6 +305,7 @@ class PostgreSQLConnector(RDBMSConnector):
         with self.session_scope() as session:
             return session.execute(text("SELECT current_database()")).scalar()
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self):
         """Get table simple info."""
         _sql = """
@@ -1,6 +1,7 @@
 """SQLite connector."""
 
 import dataclasses
+import hashlib
 import logging
 import os
 import tempfile
@@ -15,6 +16,7 @@ from dbgpt.core.awel.flow import (
 )
 from dbgpt.datasource.parameter import BaseDatasourceParameters
 from dbgpt.datasource.rdbms.base import RDBMSConnector
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
@@ -175,9 +177,17 @@ class SQLiteConnector(RDBMSConnector):
             table_results = set(row[0] for row in table_results)  # noqa
             view_results = set(row[0] for row in view_results)  # noqa
             self._all_tables = table_results.union(view_results)
-            self._metadata.reflect(bind=self._engine)
+            self._reflect_tables()
             return self._all_tables
 
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Return the checksum of the DDL in sqlite_master."""
+        with self.session_scope() as session:
+            rows = session.execute(
+                text("SELECT type, name, sql FROM sqlite_master ORDER BY type, name")
+            ).fetchall()
+            return hashlib.md5(repr(rows).encode("utf-8")).hexdigest()
+
     def _write(self, write_sql):
         logger.info(f"Write[{write_sql}]")
         with self.session_scope() as session:
@@ -214,6 +224,7 @@ class SQLiteConnector(RDBMSConnector):
             db_name = db_name[:-3]
         return db_name
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self) -> Iterable[str]:
         """Get table simple info."""
         _tables_sql = """
@@ -339,6 +350,7 @@ class SQLiteTempConnector(SQLiteConnector):
                     }
                     session.execute(text(insert_sql), param_dict)
                 session.commit()
+            self.invalidate_schema_cache()
             self._sync_tables_from_db()
 
     def __enter__(self):
@@ -13,8 +13,10 @@ from dbgpt.core.awel.flow import (
     auto_register_resource,
 )
 from dbgpt.datasource.rdbms.base import RDBMSConnector, RDBMSDatasourceParameters
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 
+from .conn_mysql import mysql_schema_fingerprint
 from .dialect.starrocks.sqlalchemy import *  # noqa
 
 
@@ -54,6 +56,10 @@ class StarRocksConnector(RDBMSConnector):
         """Return the parameter class."""
         return StarRocksParameters
 
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Return the checksum of the tables and columns of current database."""
+        return mysql_schema_fingerprint(self)
+
     @classmethod
     def from_uri_db(
         cls: Type["StarRocksConnector"],
@@ -85,7 +91,7 @@ class StarRocksConnector(RDBMSConnector):
             table_results = set(row[0] for row in table_results)  # noqa: C401
             # view_results = set(row[0] for row in view_results)
             self._all_tables = table_results
-            self._metadata.reflect(bind=self._engine)
+            self._reflect_tables()
             return self._all_tables
 
     def get_grants(self):
@@ -192,6 +198,7 @@ class StarRocksConnector(RDBMSConnector):
         with self.session_scope() as session:
             return session.execute(text("select database()")).scalar()
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self):
         """Get table simple info."""
         _sql = """
@@ -15,6 +15,7 @@ from dbgpt.core.awel.flow import (
     auto_register_resource,
 )
 from dbgpt.datasource.rdbms.base import RDBMSConnector, RDBMSDatasourceParameters
+from dbgpt.datasource.rdbms.schema_cache import schema_cached
 from dbgpt.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
@@ -107,7 +108,7 @@ table name should keep its schema name in "
                 )
             )
             self._all_tables = {row[0] for row in table_results}
-            self._metadata.reflect(bind=self._engine)
+            self._reflect_tables()
             return self._all_tables
 
     def get_grants(self):
@@ -286,6 +287,7 @@ table name should keep its schema name in "
         with self.session_scope() as session:
             return session.execute(text("SELECT current_schema()")).scalar()
 
+    @schema_cached("table_simple_info")
     def table_simple_info(self):
         """Get table simple info."""
         _sql = """
@@ -2,12 +2,14 @@
 Run unit test with command: pytest dbgpt/datasource/rdbms/tests/test_conn_sqlite.py
 """
 
+import logging
 import os
 import tempfile
 
 import pytest
+from sqlalchemy import MetaData, text
 
-from dbgpt_ext.datasource.rdbms.conn_sqlite import SQLiteConnector
+from dbgpt_ext.datasource.rdbms.conn_sqlite import SQLiteConnector, SQLiteTempConnector
 
 
 @pytest.fixture
@@ -139,3 +141,135 @@ def test_db_dir_exist_dir():
         db = SQLiteConnector.from_file_path(file_path)
         assert os.path.exists(existing_dir) is True
         assert list(db.get_table_names()) == []
+
+
+def test_schema_cache_invalidated_by_ddl(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    assert db.table_simple_info() == ["test(id);"]
+    db.run("CREATE TABLE test2 (name TEXT);")
+    assert sorted(db.table_simple_info()) == ["test(id);", "test2(name);"]
+
+
+def test_schema_cache_shared_by_connectors(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    conn1 = SQLiteConnector.from_file_path(db._engine.url.database)
+    conn2 = SQLiteConnector.from_file_path(db._engine.url.database)
+    assert conn1._schema_cache is db._schema_cache
+    assert conn1._metadata is conn2._metadata
+    assert "test" in conn2._metadata.tables
+
+
+def test_schema_cache_reflect_once(db, monkeypatch):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.invalidate_schema_cache()
+    reflected = []
+    reflect = MetaData.reflect
+
+    def _reflect(self, *args, **kwargs):
+        reflected.append(self)
+        return reflect(self, *args, **kwargs)
+
+    monkeypatch.setattr(MetaData, "reflect", _reflect)
+    conn1 = SQLiteConnector.from_file_path(db._engine.url.database)
+    conn2 = SQLiteConnector.from_file_path(db._engine.url.database)
+    assert len(reflected) == 1
+    assert conn1._metadata is conn2._metadata is reflected[0]
+    assert set(conn2.get_table_names()) == {"test"}
+
+
+def test_create_temp_tables_reload_metadata():
+    with SQLiteTempConnector.create_temporary_db() as db:
+        db.create_temp_tables({"test": {"columns": {"id": "INTEGER"}, "data": [(1,)]}})
+        assert "test" in db._metadata.tables
+        assert "CREATE TABLE test" in db.get_table_info()
+
+
+def test_schema_cache_detect_external_ddl(db):
+    db.run("CREATE TABLE test (id INTEGER);")
+    db.table_simple_info()
+    # Change the schema out of the connector, it is detected by the fingerprint
+    # after the ttl
+    with db.session_scope() as session:
+        session.execute(text("CREATE TABLE test2 (name TEXT)"))
+    assert db.table_simple_info() == ["test(id);"]
+    db._schema_cache._ttl = 0
+    assert sorted(db.table_simple_info()) == ["test(id);", "test2(name);"]
+
+
+def test_schema_cache_disabled():
+    with tempfile.NamedTemporaryFile(suffix=".db") as temp_db_file:
+        conn = SQLiteConnector.from_file_path(temp_db_file.name, schema_cache_ttl=None)
+        assert conn._schema_cache is None
+        conn.run("CREATE TABLE test (id INTEGER);")
+        assert conn.table_simple_info() == ["test(id);"]
+
+
+def _insert_rows(db, num_rows: int):
+    db.run("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);")
+    with db.session_scope() as session:
+        for i in range(num_rows):
+            session.execute(
+                text("insert into test(id, name) values (:id, :name)"),
+                {"id": i, "name": f"name_{i}"},
+            )
+
+
+def test_query_batches(db):
+    _insert_rows(db, 25)
+    batches = list(db.query_batches("select * from test", batch_size=10))
+    assert [len(rows) for _, rows in batches] == [10, 10, 5]
+    assert all(field_names == ["id", "name"] for field_names, _ in batches)
+    assert batches[2][1][-1] == (24, "name_24")
+
+
+def test_query_batches_max_rows(db):
+    _insert_rows(db, 25)
+    batches = list(db.query_batches("select * from test", batch_size=10, max_rows=15))
+    assert [len(rows) for _, rows in batches] == [10, 5]
+
+
+def test_query_batches_empty_result(db):
+    _insert_rows(db, 0)
+    assert list(db.query_batches("select * from test")) == [(["id", "name"], [])]
+
+
+def test_query_df_chunks(db):
+    _insert_rows(db, 5)
+    chunks = list(db.query_df_chunks("select * from test", chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert list(chunks[0].columns) == ["id", "name"]
+
+
+def test_query_ex_max_rows(db):
+    _insert_rows(db, 5)
+    field_names, result = db.query_ex("select * from test", max_rows=2)
+    assert field_names == ["id", "name"]
+    assert result == [(0, "name_0"), (1, "name_1")]
+
+
+def test_run_to_df(db):
+    _insert_rows(db, 5)
+    df = db.run_to_df("select * from test")
+    assert list(df.columns) == ["id", "name"]
+    assert df["id"].tolist() == [0, 1, 2, 3, 4]
+
+    df = db.run_to_df("select * from test", max_rows=3)
+    assert df["id"].tolist() == [0, 1, 2]
+
+    df = db.run_to_df("select * from test where id > 100")
+    assert df.empty
+    assert list(df.columns) == ["id", "name"]
+
+
+def test_run_to_df_truncated(db, caplog):
+    _insert_rows(db, 25)
+    with caplog.at_level(logging.WARNING):
+        df = db.run_to_df("select * from test", max_rows=10)
+    assert df["id"].tolist() == list(range(10))
+    assert "truncated to 10 rows" in caplog.text
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING):
+        df = db.run_to_df("select * from test", max_rows=25)
+    assert len(df) == 25
+    assert "truncated" not in caplog.text
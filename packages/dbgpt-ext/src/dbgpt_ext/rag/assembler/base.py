@@ -56,10 +56,9 @@ class BaseAssembler(ABC):
         """Load knowledge Pipeline."""
         if not knowledge:
             raise ValueError("knowledge must be provided.")
-        with root_tracer.start_span("BaseAssembler.knowledge.load"):
-            documents = knowledge.load()
-        with root_tracer.start_span("BaseAssembler.chunk_manager.split"):
-            self._chunks = self._chunk_manager.split(documents)
+        with root_tracer.start_span("BaseAssembler.chunk_manager.iter_chunks"):
+            # The knowledge is parsed and split one document at a time
+            self._chunks = list(self._chunk_manager.iter_chunks())
 
     @abstractmethod
     def as_retriever(self, **kwargs: Any) -> BaseRetriever:
@@ -6,10 +6,12 @@ from typing import Any, List, Optional
 
 from dbgpt.core import Chunk
 from dbgpt.rag.knowledge.base import Knowledge
+from dbgpt.storage.full_text.base import FullTextStoreBase
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt_ext.rag.assembler.base import BaseAssembler
 from dbgpt_ext.rag.chunk_manager import ChunkParameters
 from dbgpt_ext.rag.retriever.bm25 import BM25Retriever
+from dbgpt_ext.storage.full_text.local_bm25 import LocalBM25Config, LocalBM25Store
 from dbgpt_ext.storage.vector_store.elastic_store import ElasticsearchStoreConfig
 
 
@@ -39,41 +41,64 @@ class BM25Assembler(BaseAssembler):
         retriever = assembler.as_retriever(3)
         chunks = retriever.retrieve_with_scores("what is awel talk about", 0.3)
         print(f"bm25 rag example results:{chunks}")
+
+    Without an elasticsearch config, the chunks are indexed by the built-in
+    :class:`LocalBM25Store`, pass ``full_text_store`` to use another store.
     """
 
     def __init__(
         self,
         knowledge: Knowledge,
-        es_config: ElasticsearchStoreConfig,
+        es_config: Optional[ElasticsearchStoreConfig] = None,
         name: Optional[str] = "dbgpt",
         k1: Optional[float] = 2.0,
         b: Optional[float] = 0.75,
         chunk_parameters: Optional[ChunkParameters] = None,
         executor: Optional[Executor] = None,
+        full_text_store: Optional[FullTextStoreBase] = None,
         **kwargs: Any,
     ) -> None:
         """Initialize with BM25 Assembler arguments.
 
         Args:
             knowledge: (Knowledge) Knowledge datasource.
-            es_config: (ElasticsearchStoreConfig) Elasticsearch config.
+            es_config: (Optional[ElasticsearchStoreConfig]) Elasticsearch config.
             k1 (Optional[float]): Controls non-linear term frequency normalization
             (saturation). The default value is 2.0.
             b (Optional[float]): Controls to what degree document length normalizes
             tf values. The default value is 0.75.
             chunk_parameters: (Optional[ChunkParameters]) ChunkManager to use for
                 chunking.
+            full_text_store: (Optional[FullTextStoreBase]) The full text store to
+                index the chunks, default is a LocalBM25Store if es_config is None.
         """
+        self._es_config = es_config
+        self._index_name = name
+        self._k1 = k1
+        self._b = b
+        self._executor = executor or ThreadPoolExecutor()
+        if knowledge is None:
+            raise ValueError("knowledge datasource must be provided.")
+        if full_text_store is None and es_config is None:
+            full_text_store = LocalBM25Store(LocalBM25Config(), name=name, k1=k1, b=b)
+        self._full_text_store = full_text_store
+        if full_text_store is None:
+            self._init_es_index()
+        super().__init__(
+            knowledge=knowledge,
+            chunk_parameters=chunk_parameters,
+            **kwargs,
+        )
+
+    def _init_es_index(self) -> None:
         from elasticsearch import Elasticsearch
 
-        self._es_config = es_config
+        es_config = self._es_config
+        k1, b = self._k1, self._b
         self._es_url = es_config.uri
         self._es_port = es_config.port
         self._es_username = es_config.user
         self._es_password = es_config.password
-        self._index_name = name
-        self._k1 = k1
-        self._b = b
         if self._es_username and self._es_password:
             self._es_client = Elasticsearch(
                 hosts=[f"http://{self._es_url}:{self._es_port}"],
@@ -105,30 +130,23 @@ class BM25Assembler(BaseAssembler):
             }
         }
 
-        self._executor = executor or ThreadPoolExecutor()
-        if knowledge is None:
-            raise ValueError("knowledge datasource must be provided.")
         if not self._es_client.indices.exists(index=self._index_name):
             self._es_client.indices.create(
                 index=self._index_name,
                 mappings=self._es_mappings,
                 settings=self._es_index_settings,
             )
-        super().__init__(
-            knowledge=knowledge,
-            chunk_parameters=chunk_parameters,
-            **kwargs,
-        )
 
     @classmethod
     def load_from_knowledge(
         cls,
         knowledge: Knowledge,
-        es_config: ElasticsearchStoreConfig,
+        es_config: Optional[ElasticsearchStoreConfig] = None,
         name: Optional[str] = "dbgpt",
         k1: Optional[float] = 2.0,
         b: Optional[float] = 0.75,
         chunk_parameters: Optional[ChunkParameters] = None,
+        full_text_store: Optional[FullTextStoreBase] = None,
     ) -> "BM25Assembler":
         """Load document full text into elasticsearch from path.
 
@@ -140,6 +158,8 @@ class BM25Assembler(BaseAssembler):
             b: (Optional[float]) BM25 parameter b.
             chunk_parameters: (Optional[ChunkParameters]) ChunkManager to use for
                 chunking.
+            full_text_store: (Optional[FullTextStoreBase]) The full text store to
+                index the chunks.
 
         Returns:
              BM25Assembler
@@ -151,18 +171,20 @@ class BM25Assembler(BaseAssembler):
             k1=k1,
             b=b,
             chunk_parameters=chunk_parameters,
+            full_text_store=full_text_store,
         )
 
     @classmethod
     async def aload_from_knowledge(
         cls,
         knowledge: Knowledge,
-        es_config: ElasticsearchStoreConfig,
+        es_config: Optional[ElasticsearchStoreConfig] = None,
         name: Optional[str] = "dbgpt",
         k1: Optional[float] = 2.0,
         b: Optional[float] = 0.75,
         chunk_parameters: Optional[ChunkParameters] = None,
         executor: Optional[ThreadPoolExecutor] = None,
+        full_text_store: Optional[FullTextStoreBase] = None,
     ) -> "BM25Assembler":
         """Load document full text into elasticsearch from path.
 
@@ -174,6 +196,8 @@ class BM25Assembler(BaseAssembler):
             chunk_parameters: (Optional[ChunkParameters]) ChunkManager to use for
                 chunking.
             executor: (Optional[ThreadPoolExecutor]) executor.
+            full_text_store: (Optional[FullTextStoreBase]) The full text store to
+                index the chunks.
 
         Returns:
              BM25Assembler
@@ -187,6 +211,7 @@ class BM25Assembler(BaseAssembler):
             k1=k1,
             b=b,
             chunk_parameters=chunk_parameters,
+            full_text_store=full_text_store,
         )
 
     def persist(self, **kwargs) -> List[str]:
@@ -195,6 +220,8 @@ class BM25Assembler(BaseAssembler):
         Returns:
             List[str]: List of chunk ids.
         """
+        if self._full_text_store is not None:
+            return self._full_text_store.load_document(self._chunks)
         try:
             from elasticsearch.helpers import bulk
         except ImportError:
@@ -239,6 +266,12 @@ class BM25Assembler(BaseAssembler):
         Returns:
             BM25Retriever
         """
+        if self._full_text_store is not None:
+            return BM25Retriever(
+                top_k=top_k,
+                es_index=self._index_name,
+                full_text_store=self._full_text_store,
+            )
         return BM25Retriever(
             top_k=top_k, es_index=self._index_name, es_client=self._es_client
         )
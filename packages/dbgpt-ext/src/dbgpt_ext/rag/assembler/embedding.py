@@ -1,17 +1,23 @@
 """Embedding Assembler."""
 
+import logging
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, List, Optional
+from typing import Any, Iterable, Iterator, List, Optional, cast
 
 from dbgpt.core import Chunk, Embeddings
 from dbgpt.rag.knowledge.base import Knowledge
 from dbgpt.rag.retriever import BaseRetriever, RetrieverStrategy
 from dbgpt.rag.retriever.embedding import EmbeddingRetriever
 from dbgpt.storage.base import IndexStoreBase
-from dbgpt.util.executor_utils import blocking_func_to_async
+from dbgpt.util.executor_utils import (
+    blocking_func_to_async,
+    blocking_func_to_async_no_executor,
+)
 
 from ..assembler.base import BaseAssembler
-from ..chunk_manager import ChunkParameters
+from ..chunk_manager import ChunkDelta, ChunkParameters
+
+logger = logging.getLogger(__name__)
 
 
 class EmbeddingAssembler(BaseAssembler):
@@ -28,6 +34,24 @@ class EmbeddingAssembler(BaseAssembler):
             knowledge=knowledge,
             embedding_model="text2vec",
         )
+
+    To re-sync a changed document, pass the chunk ids stored by the last persist,
+    only the new chunks are embedded and stored, and the removed chunks are
+    deleted:
+
+    .. code-block:: python
+
+        assembler = EmbeddingAssembler.load_from_knowledge(
+            knowledge=knowledge,
+            index_store=index_store,
+            existing_chunk_ids=last_chunk_ids,
+            chunk_namespace=document_id,
+        )
+        last_chunk_ids = assembler.persist()
+
+    With ``lazy_load=True``, the knowledge is parsed and split while persisting, so
+    the first chunks are embedded before the whole document is split, call
+    :meth:`get_chunks` after :meth:`persist`.
     """
 
     def __init__(
@@ -36,6 +60,9 @@ class EmbeddingAssembler(BaseAssembler):
         index_store: IndexStoreBase,
         chunk_parameters: Optional[ChunkParameters] = None,
         retrieve_strategy: Optional[RetrieverStrategy] = RetrieverStrategy.EMBEDDING,
+        existing_chunk_ids: Optional[List[str]] = None,
+        chunk_namespace: Optional[str] = None,
+        lazy_load: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialize with Embedding Assembler arguments.
@@ -48,17 +75,39 @@ class EmbeddingAssembler(BaseAssembler):
             keyword_store: (Optional[IndexStoreBase]) IndexStoreBase to use.
             embedding_model: (Optional[str]) Embedding model to use.
             embeddings: (Optional[Embeddings]) Embeddings to use.
+            existing_chunk_ids: (Optional[List[str]]) The chunk ids of the document
+                already in the index store, enable the delta mode if provided.
+            chunk_namespace: (Optional[str]) Isolate the chunk ids of the document
+                in the delta mode, default is the knowledge path.
+            lazy_load: (bool) Load and split the knowledge while persisting.
         """
         if knowledge is None:
             raise ValueError("knowledge datasource must be provided.")
         self._index_store = index_store
         self._retrieve_strategy = retrieve_strategy
+        self._lazy_load = lazy_load
 
         super().__init__(
             knowledge=knowledge,
             chunk_parameters=chunk_parameters,
             **kwargs,
         )
+        self._existing_chunk_ids = existing_chunk_ids
+        self._chunk_namespace = chunk_namespace
+        if self._chunk_namespace is None:
+            self._chunk_namespace = str(getattr(knowledge, "_path", None) or "")
+        self._delta: Optional[ChunkDelta] = None
+        if existing_chunk_ids is not None and not self._lazy_load:
+            self._delta = self._chunk_manager.diff(
+                self._chunks, existing_chunk_ids, self._chunk_namespace
+            )
+            self._log_delta()
+
+    def load_knowledge(self, knowledge: Knowledge) -> None:
+        """Load knowledge Pipeline, skipped in the lazy mode."""
+        if self._lazy_load:
+            return
+        super().load_knowledge(knowledge)
 
     @classmethod
     def load_from_knowledge(
@@ -69,6 +118,9 @@ class EmbeddingAssembler(BaseAssembler):
         embedding_model: Optional[str] = None,
         embeddings: Optional[Embeddings] = None,
         retrieve_strategy: Optional[RetrieverStrategy] = RetrieverStrategy.EMBEDDING,
+        existing_chunk_ids: Optional[List[str]] = None,
+        chunk_namespace: Optional[str] = None,
+        lazy_load: bool = False,
     ) -> "EmbeddingAssembler":
         """Load document embedding into vector store from path.
 
@@ -80,6 +132,11 @@ class EmbeddingAssembler(BaseAssembler):
             embedding_model: (Optional[str]) Embedding model to use.
             embeddings: (Optional[Embeddings]) Embeddings to use.
             retrieve_strategy: (Optional[RetrieverStrategy]) Retriever strategy.
+            existing_chunk_ids: (Optional[List[str]]) The chunk ids of the document
+                already in the index store, enable the delta mode if provided.
+            chunk_namespace: (Optional[str]) Isolate the chunk ids of the document
+                in the delta mode.
+            lazy_load: (bool) Load and split the knowledge while persisting.
 
         Returns:
              EmbeddingAssembler
@@ -91,6 +148,9 @@ class EmbeddingAssembler(BaseAssembler):
             embedding_model=embedding_model,
             embeddings=embeddings,
             retrieve_strategy=retrieve_strategy,
+            existing_chunk_ids=existing_chunk_ids,
+            chunk_namespace=chunk_namespace,
+            lazy_load=lazy_load,
         )
 
     @classmethod
@@ -101,6 +161,9 @@ class EmbeddingAssembler(BaseAssembler):
         chunk_parameters: Optional[ChunkParameters] = None,
         executor: Optional[ThreadPoolExecutor] = None,
         retrieve_strategy: Optional[RetrieverStrategy] = RetrieverStrategy.EMBEDDING,
+        existing_chunk_ids: Optional[List[str]] = None,
+        chunk_namespace: Optional[str] = None,
+        lazy_load: bool = False,
     ) -> "EmbeddingAssembler":
         """Load document embedding into vector store from path.
 
@@ -111,6 +174,11 @@ class EmbeddingAssembler(BaseAssembler):
             index_store: (IndexStoreBase) Index store to use.
             executor: (Optional[ThreadPoolExecutor) ThreadPoolExecutor to use.
             retrieve_strategy: (Optional[RetrieverStrategy]) Retriever strategy.
+            existing_chunk_ids: (Optional[List[str]]) The chunk ids of the document
+                already in the index store, enable the delta mode if provided.
+            chunk_namespace: (Optional[str]) Isolate the chunk ids of the document
+                in the delta mode.
+            lazy_load: (bool) Load and split the knowledge while persisting.
 
         Returns:
              EmbeddingAssembler
@@ -123,6 +191,9 @@ class EmbeddingAssembler(BaseAssembler):
             index_store,
             chunk_parameters,
             retrieve_strategy,
+            existing_chunk_ids=existing_chunk_ids,
+            chunk_namespace=chunk_namespace,
+            lazy_load=lazy_load,
         )
 
     def persist(self, **kwargs) -> List[str]:
@@ -133,9 +204,18 @@ class EmbeddingAssembler(BaseAssembler):
         """
         max_chunks_once_load = kwargs.get("max_chunks_once_load")
         max_threads = kwargs.get("max_threads")
-        return self._index_store.load_document_with_limit(
-            self._chunks, max_chunks_once_load, max_threads
-        )
+        chunks = self._chunks_to_persist()
+        ids = []
+        if chunks:
+            ids = self._index_store.load_document_with_limit(
+                chunks, max_chunks_once_load, max_threads
+            )
+        if self._delta is None:
+            return ids
+        # Delete the removed chunks after the new chunks are stored
+        if self._delta.removed_ids:
+            self._index_store.delete_by_ids(",".join(self._delta.removed_ids))
+        return self._delta_chunk_ids(ids)
 
     async def apersist(self, **kwargs) -> List[str]:
         """Persist chunks into store.
@@ -146,10 +226,78 @@ class EmbeddingAssembler(BaseAssembler):
         # persist chunks into vector store
         max_chunks_once_load = kwargs.get("max_chunks_once_load")
         max_threads = kwargs.get("max_threads")
-        return await self._index_store.aload_document_with_limit(
-            self._chunks, max_chunks_once_load, max_threads
+        chunks = self._chunks_to_persist()
+        ids = []
+        if chunks:
+            ids = await self._index_store.aload_document_with_limit(
+                chunks, max_chunks_once_load, max_threads
+            )
+        if self._delta is None:
+            return ids
+        # Delete the removed chunks after the new chunks are stored
+        if self._delta.removed_ids:
+            await blocking_func_to_async_no_executor(
+                self._index_store.delete_by_ids, ",".join(self._delta.removed_ids)
+            )
+        return self._delta_chunk_ids(ids)
+
+    def _chunks_to_persist(self) -> Iterable[Chunk]:
+        """Return the chunks to store, lazily in the lazy mode."""
+        if self._lazy_load:
+            return self._iter_load_chunks()
+        if self._delta is None:
+            return self._chunks
+        return self._delta.new_chunks
+
+    def _iter_load_chunks(self) -> Iterator[Chunk]:
+        """Load and split the knowledge, yield the chunks to store.
+
+        All the chunks are kept for :meth:`get_chunks`, and the delta is created
+        once the knowledge is split.
+        """
+        self._chunks = []
+        chunks = self._chunk_manager.iter_chunks()
+        if self._existing_chunk_ids is None:
+            for chunk in chunks:
+                self._chunks.append(chunk)
+                yield chunk
+        else:
+            existing = set(self._existing_chunk_ids)
+            for chunk in self._chunk_manager.iter_assign_fingerprints(
+                chunks, cast(str, self._chunk_namespace)
+            ):
+                self._chunks.append(chunk)
+                if chunk.chunk_id not in existing:
+                    yield chunk
+            self._delta = ChunkDelta.of(self._chunks, self._existing_chunk_ids)
+            self._log_delta()
+        # The knowledge is loaded, persist the same chunks next time
+        self._lazy_load = False
+
+    def _log_delta(self) -> None:
+        delta = cast(ChunkDelta, self._delta)
+        logger.info(
+            f"Delta sync of {len(delta.chunks)} chunks: "
+            f"{len(delta.new_chunks)} new, "
+            f"{len(delta.unchanged_ids)} unchanged, "
+            f"{len(delta.removed_ids)} removed"
         )
 
+    def _delta_chunk_ids(self, new_ids: List[str]) -> List[str]:
+        """Return the stored ids of all the chunks of the document, in order.
+
+        Some index stores generate their own ids instead of the chunk ids.
+        """
+        delta = cast(ChunkDelta, self._delta)
+        stored_ids = dict(zip([chunk.chunk_id for chunk in delta.new_chunks], new_ids))
+        return [
+            stored_ids.get(chunk.chunk_id, chunk.chunk_id) for chunk in delta.chunks
+        ]
+
+    def get_delta(self) -> Optional[ChunkDelta]:
+        """Return the chunk delta of the delta mode, None if not enabled."""
+        return self._delta
+
     def _extract_info(self, chunks) -> List[Chunk]:
         """Extract info from chunks."""
         return []
@@ -1,7 +1,11 @@
 """Module for ChunkManager."""
 
+import json
+import uuid
+from collections import Counter
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
 
 from dbgpt._private.pydantic import BaseModel, Field
 from dbgpt.core import Chunk, Document
@@ -120,6 +124,38 @@ class ChunkParameters(BaseModel):
     )
 
 
+@dataclass
+class ChunkDelta:
+    """The difference between the chunks of a document and its stored chunks."""
+
+    # All the chunks of the document, with the fingerprint ids
+    chunks: List[Chunk]
+    # The chunks which are not stored yet
+    new_chunks: List[Chunk]
+    # The ids of the stored chunks which are still in the document
+    unchanged_ids: List[str]
+    # The ids of the stored chunks which are removed from the document
+    removed_ids: List[str]
+
+    @classmethod
+    def of(cls, chunks: List[Chunk], existing_ids: Sequence[str]) -> "ChunkDelta":
+        """Create the delta of the fingerprinted chunks and the stored chunk ids."""
+        existing = set(existing_ids)
+        current = {chunk.chunk_id for chunk in chunks}
+        return cls(
+            chunks=chunks,
+            new_chunks=[chunk for chunk in chunks if chunk.chunk_id not in existing],
+            unchanged_ids=[
+                chunk.chunk_id for chunk in chunks if chunk.chunk_id in existing
+            ],
+            removed_ids=[
+                chunk_id
+                for chunk_id in dict.fromkeys(existing_ids)
+                if chunk_id and chunk_id not in current
+            ],
+        )
+
+
 class ChunkManager:
     """Manager for chunks."""
 
@@ -160,6 +196,33 @@ class ChunkManager:
         else:
             return text_splitter.split_documents(documents)
 
+    def iter_split(self, documents: Iterable[Document]) -> Iterator[Chunk]:
+        """Split the documents into chunks lazily, one document at a time.
+
+        The langchain and llama-index splitters split all the documents at once.
+        """
+        text_splitter = self._select_text_splitter()
+        if self._splitter_type in (SplitterType.LANGCHAIN, SplitterType.LLAMA_INDEX):
+            yield from self.split(list(documents))
+        else:
+            yield from text_splitter.iter_documents(documents)
+
+    def iter_chunks(self) -> Iterator[Chunk]:
+        """Load and split the knowledge into chunks lazily.
+
+        A plain text knowledge is split as a stream of text blocks, see
+        :meth:`Knowledge.load_stream`, the other knowledge is split one document at
+        a time.
+        """
+        if self._splitter_type == SplitterType.USER_DEFINE:
+            stream = self._knowledge.load_stream()
+            if stream is not None:
+                blocks, metadata = stream
+                text_splitter = self._select_text_splitter()
+                yield from text_splitter.iter_stream_documents(blocks, metadata)
+                return
+        yield from self.iter_split(self._knowledge.iter_load())
+
     def split_with_summary(
         self, document: Any, chunk_strategy: ChunkStrategy
     ) -> List[Chunk]:
@@ -217,3 +280,79 @@ class ChunkManager:
             separator=self._chunk_parameters.separator,
             enable_merge=self._chunk_parameters.enable_merge,
         )
+
+    def splitter_signature(self) -> Dict[str, Any]:
+        """Return the parameters of the text splitter, which decide the chunks."""
+        text_splitter = self._select_text_splitter()
+        signature: Dict[str, Any] = {
+            "splitter": type(text_splitter).__name__,
+            "splitter_type": str(self._splitter_type),
+            "chunk_strategy": self._chunk_strategy,
+        }
+        for key, value in sorted(vars(text_splitter).items()):
+            if isinstance(value, (str, int, float, bool)) or value is None:
+                signature[key] = value
+        return signature
+
+    def assign_fingerprints(
+        self, chunks: Sequence[Chunk], namespace: str = ""
+    ) -> List[Chunk]:
+        """Replace the chunk ids with the fingerprints of the chunks.
+
+        The fingerprint is a UUID derived from the namespace, the splitter
+        parameters, the content and metadata of the chunk, so re-splitting an
+        unchanged document gives the same ids. The repeated chunks of a document
+        are numbered to keep their ids unique.
+
+        Args:
+            chunks(Sequence[Chunk]): The chunks of one document.
+            namespace(str): Isolate the ids of the documents, e.g. the document id.
+
+        Returns:
+            List[Chunk]: The chunks, updated in place.
+        """
+        return list(self.iter_assign_fingerprints(chunks, namespace))
+
+    def iter_assign_fingerprints(
+        self, chunks: Iterable[Chunk], namespace: str = ""
+    ) -> Iterator[Chunk]:
+        """Replace the chunk ids with the fingerprints lazily.
+
+        See :meth:`assign_fingerprints`.
+        """
+        signature = json.dumps(self.splitter_signature(), sort_keys=True)
+        occurrences: Counter = Counter()
+        for chunk in chunks:
+            key = "\x00".join(
+                [
+                    namespace,
+                    signature,
+                    chunk.content,
+                    json.dumps(chunk.metadata, sort_keys=True, default=str),
+                ]
+            )
+            occurrence = occurrences[key]
+            occurrences[key] += 1
+            chunk.chunk_id = str(
+                uuid.uuid5(uuid.NAMESPACE_OID, f"{key}\x00{occurrence}")
+            )
+            yield chunk
+
+    def diff(
+        self,
+        chunks: Sequence[Chunk],
+        existing_ids: Sequence[str],
+        namespace: str = "",
+    ) -> ChunkDelta:
+        """Diff the chunks of a document against its stored chunk ids.
+
+        Args:
+            chunks(Sequence[Chunk]): The chunks of the document, their ids are
+                replaced with the fingerprints.
+            existing_ids(Sequence[str]): The ids of the stored chunks.
+            namespace(str): Isolate the ids of the documents, e.g. the document id.
+
+        Returns:
+            ChunkDelta: The chunks to store and the ids to delete.
+        """
+        return ChunkDelta.of(self.assign_fingerprints(chunks, namespace), existing_ids)
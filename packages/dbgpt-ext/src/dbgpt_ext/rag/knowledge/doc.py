@@ -11,6 +11,8 @@ from dbgpt.rag.knowledge.base import (
     KnowledgeType,
 )
 
+from .extraction import run_extraction
+
 
 class Word97DocParser:
     """Parser for Microsoft Word 97-2003 (.doc) binary files.
@@ -554,6 +556,16 @@ class Word97DocParser:
         return "".join(full_text)
 
 
+def _extract_doc_paragraphs(path: str) -> List[str]:
+    """Extract the paragraphs of the doc file, run in the extraction processes."""
+    content = []
+    with Word97DocParser(path) as parser:
+        paragraphs = parser.extract_text_by_paragraphs()
+        for i, para in enumerate(paragraphs):
+            content.append(para)
+    return content
+
+
 class Word97DocKnowledge(Knowledge):
     """Microsoft Word 97-2003 (.doc)."""
 
@@ -564,6 +576,7 @@ class Word97DocKnowledge(Knowledge):
         encoding: Optional[str] = "utf-16-le",
         loader: Optional[Any] = None,
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        extract_workers: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """Create  Microsoft Word 97-2003 (.doc) Knowledge with Knowledge arguments.
@@ -573,6 +586,8 @@ class Word97DocKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             encoding(str, optional): .doc encoding
             loader(Any, optional): loader
+            extract_workers(int, optional): number of the processes to extract the
+                documents, 0 to extract in the current process
         """
         super().__init__(
             path=file_path,
@@ -582,6 +597,7 @@ class Word97DocKnowledge(Knowledge):
             **kwargs,
         )
         self._encoding = encoding
+        self._extract_workers = extract_workers
 
     def _load(self) -> List[Document]:
         """Load doc document from loader."""
@@ -589,11 +605,9 @@ class Word97DocKnowledge(Knowledge):
             documents = self._loader.load()
         else:
             docs = []
-            content = []
-            with Word97DocParser(self._path) as parser:
-                paragraphs = parser.extract_text_by_paragraphs()
-                for i, para in enumerate(paragraphs):
-                    content.append(para)
+            content = run_extraction(
+                _extract_doc_paragraphs, self._path, max_workers=self._extract_workers
+            )
 
             metadata = {"source": self._path}
             if self._metadata:
@@ -14,6 +14,8 @@ from dbgpt.rag.knowledge.base import (
     KnowledgeType,
 )
 
+from .extraction import run_extraction
+
 
 def load_from_xml_v2(base_uri, rels_item_xml):
     """Return |_SerializedRelationships| instance loaded with the relationships.
@@ -30,6 +32,19 @@ def load_from_xml_v2(base_uri, rels_item_xml):
     return srels
 
 
+def _extract_docx_paragraphs(path: str) -> List[str]:
+    """Extract the paragraphs of the docx file, run in the extraction processes."""
+    _SerializedRelationships.load_from_xml = load_from_xml_v2  # type: ignore
+    doc = docx.Document(path)
+    content = []
+
+    for i in range(len(doc.paragraphs)):
+        para = doc.paragraphs[i]
+        text = para.text
+        content.append(text)
+    return content
+
+
 class DocxKnowledge(Knowledge):
     """Docx Knowledge."""
 
@@ -40,6 +55,7 @@ class DocxKnowledge(Knowledge):
         encoding: Optional[str] = "utf-8",
         loader: Optional[Any] = None,
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        extract_workers: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """Create Docx Knowledge with Knowledge arguments.
@@ -49,6 +65,8 @@ class DocxKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             encoding(str, optional): csv encoding
             loader(Any, optional): loader
+            extract_workers(int, optional): number of the processes to extract the
+                documents, 0 to extract in the current process
         """
         super().__init__(
             path=file_path,
@@ -58,6 +76,7 @@ class DocxKnowledge(Knowledge):
             **kwargs,
         )
         self._encoding = encoding
+        self._extract_workers = extract_workers
 
     def _load(self) -> List[Document]:
         """Load docx document from loader."""
@@ -65,14 +84,11 @@ class DocxKnowledge(Knowledge):
             documents = self._loader.load()
         else:
             docs = []
-            _SerializedRelationships.load_from_xml = load_from_xml_v2  # type: ignore
-            doc = docx.Document(self._path)
-            content = []
-
-            for i in range(len(doc.paragraphs)):
-                para = doc.paragraphs[i]
-                text = para.text
-                content.append(text)
+            content = run_extraction(
+                _extract_docx_paragraphs,
+                self._path,
+                max_workers=self._extract_workers,
+            )
             metadata = {"source": self._path}
             if self._metadata:
                 metadata.update(self._metadata)  # type: ignore
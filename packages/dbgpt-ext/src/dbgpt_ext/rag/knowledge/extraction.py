@@ -0,0 +1,163 @@
+"""Process pool to extract the knowledge documents.
+
+Parsing PDF, DOCX, PPTX and DOC files is CPU-bound Python code, which holds the
+GIL of the process it runs in. The knowledge classes of these files run their
+parsers in a shared process pool, so the API process stays responsive and the
+files of a bulk upload are parsed on several cores.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_WORKERS: Optional[int] = None
+# The default upper limit of the worker processes, every spawned worker imports
+# the parsers and takes its own memory
+_MAX_DEFAULT_WORKERS = 4
+_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+# Set in the worker processes, the extraction in a worker runs inline
+_IN_WORKER = False
+
+
+def set_default_extract_workers(max_workers: Optional[int]) -> None:
+    """Set the default number of the extraction worker processes.
+
+    Args:
+        max_workers(Optional[int]): The number of the worker processes, None to use
+            the number of the CPUs up to 4, 0 to extract in the calling process.
+    """
+    global _DEFAULT_MAX_WORKERS
+    _DEFAULT_MAX_WORKERS = max_workers
+
+
+def resolve_extract_workers(max_workers: Optional[int] = None) -> int:
+    """Return the number of the worker processes, 0 means extract inline."""
+    if _IN_WORKER:
+        return 0
+    if max_workers is None:
+        max_workers = _DEFAULT_MAX_WORKERS
+    if max_workers is None:
+        max_workers = min(_MAX_DEFAULT_WORKERS, os.cpu_count() or 1)
+    return max(0, max_workers)
+
+
+def _init_worker() -> None:
+    global _IN_WORKER
+    _IN_WORKER = True
+
+
+def get_extract_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared process pool with the number of workers.
+
+    The workers are spawned instead of forked, forking a process with running
+    threads may deadlock the child.
+    """
+    with _POOLS_LOCK:
+        pool = _POOLS.get(max_workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            _POOLS[max_workers] = pool
+        return pool
+
+
+def shutdown_extract_pools() -> None:
+    """Shut down all the extraction process pools."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_pool(max_workers: int, pool: ProcessPoolExecutor) -> None:
+    with _POOLS_LOCK:
+        if _POOLS.get(max_workers) is pool:
+            del _POOLS[max_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(max_workers: int, func: Callable[..., Any], args: Tuple) -> Future:
+    pool = get_extract_pool(max_workers)
+    try:
+        return pool.submit(func, *args)
+    except BrokenProcessPool:
+        # A worker was killed, e.g. by the OOM killer, start a new pool
+        logger.warning("The extraction process pool is broken, restarting it")
+        _discard_pool(max_workers, pool)
+        return get_extract_pool(max_workers).submit(func, *args)
+
+
+def run_extraction(
+    func: Callable[..., Any], *args: Any, max_workers: Optional[int] = None
+) -> Any:
+    """Run an extraction function in the process pool and wait for the result.
+
+    Args:
+        func(Callable[..., Any]): A module-level function, the arguments and the
+            result must be picklable.
+        *args(Any): The arguments of the function.
+        max_workers(Optional[int]): The number of the worker processes, see
+            :func:`set_default_extract_workers`.
+
+    Returns:
+        Any: The result of the function.
+    """
+    workers = resolve_extract_workers(max_workers)
+    if workers == 0:
+        return func(*args)
+    return _submit(workers, func, args).result()
+
+
+def iter_extraction(
+    func: Callable[..., Any],
+    args_list: Iterable[Tuple],
+    max_workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator[Any]:
+    """Run an extraction function on every arguments in the process pool.
+
+    The results are yielded in the order of the arguments as soon as they are
+    ready, and at most ``max_pending`` tasks are submitted ahead of the consumer.
+
+    Args:
+        func(Callable[..., Any]): A module-level function, the arguments and the
+            result must be picklable.
+        args_list(Iterable[Tuple]): The arguments of every task.
+        max_workers(Optional[int]): The number of the worker processes, see
+            :func:`set_default_extract_workers`.
+        max_pending(Optional[int]): The max number of the submitted tasks, default
+            is twice the number of the workers.
+
+    Returns:
+        Iterator[Any]: The results of the tasks.
+    """
+    workers = resolve_extract_workers(max_workers)
+    if workers == 0:
+        for args in args_list:
+            yield func(*args)
+        return
+    max_pending = max_pending or 2 * workers
+    pending: Deque[Future] = deque()
+    try:
+        for args in args_list:
+            pending.append(_submit(workers, func, args))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # The consumer stopped early or a task failed
+        for future in pending:
+            future.cancel()
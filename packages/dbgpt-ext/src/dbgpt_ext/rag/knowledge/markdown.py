@@ -1,6 +1,6 @@
 """Markdown Knowledge."""
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from dbgpt.core import Document
 from dbgpt.rag.knowledge.base import (
@@ -9,6 +9,7 @@ from dbgpt.rag.knowledge.base import (
     Knowledge,
     KnowledgeType,
 )
+from dbgpt.rag.text_splitter import iter_text_blocks
 from dbgpt_ext.rag import ChunkParameters
 
 
@@ -50,16 +51,30 @@ class MarkdownKnowledge(Knowledge):
                 raise ValueError("file path is required")
             with open(self._path, encoding=self._encoding, errors="ignore") as f:
                 markdown_text = f.read()
-                metadata = {
-                    "source": self._path,
-                    "title": self._path.rsplit("/", 1)[-1],
-                }
-                if self._metadata:
-                    metadata.update(self._metadata)  # type: ignore
+                metadata = self._document_metadata()
                 documents = [Document(content=markdown_text, metadata=metadata)]
                 return documents
         return [Document.langchain2doc(lc_document) for lc_document in documents]
 
+    def load_stream(self) -> Optional[Tuple[Iterator[str], Dict[str, Any]]]:
+        """Return the text blocks of the file, read lazily."""
+        if self._loader or not self._path:
+            return None
+        return self._iter_text_blocks(), self._document_metadata()
+
+    def _iter_text_blocks(self) -> Iterator[str]:
+        with open(self._path, encoding=self._encoding, errors="ignore") as f:
+            yield from iter_text_blocks(f)
+
+    def _document_metadata(self) -> Dict[str, Any]:
+        metadata = {
+            "source": self._path,
+            "title": self._path.rsplit("/", 1)[-1],
+        }
+        if self._metadata:
+            metadata.update(self._metadata)  # type: ignore
+        return metadata
+
     def extract(
         self,
         documents: List[Document],
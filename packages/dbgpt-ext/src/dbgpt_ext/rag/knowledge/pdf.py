@@ -4,7 +4,7 @@ import json
 import os
 import re
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 from dbgpt.component import logger
 from dbgpt.core import Document
@@ -15,6 +15,11 @@ from dbgpt.rag.knowledge.base import (
     KnowledgeType,
 )
 
+from .extraction import iter_extraction, run_extraction
+
+# The number of the pages extracted by a task of the process pool
+_PAGES_PER_TASK = 8
+
 
 class PDFKnowledge(Knowledge):
     """PDF Knowledge."""
@@ -26,6 +31,7 @@ class PDFKnowledge(Knowledge):
         loader: Optional[Any] = None,
         language: Optional[str] = "zh",
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        extract_workers: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """Create PDF Knowledge with Knowledge arguments.
@@ -35,6 +41,8 @@ class PDFKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             loader(Any, optional): loader
             language(str, optional): language
+            extract_workers(int, optional): number of the processes to extract the
+                pages, 0 to extract in the current process
         """
         super().__init__(
             path=file_path,
@@ -44,7 +52,7 @@ class PDFKnowledge(Knowledge):
             **kwargs,
         )
         self._language = language
-        self._pdf_processor = PDFProcessor(filepath=self._path)
+        self._extract_workers = extract_workers
         self.all_title: List[dict] = []
         self.all_text: List[dict] = []
 
@@ -131,129 +139,168 @@ class PDFKnowledge(Knowledge):
         """Load pdf document from loader."""
         if self._loader:
             documents = self._loader.load()
-        else:
-            self._pdf_processor.pdf_to_json()
-            file_title = self.file_path.rsplit("/", 1)[-1].replace(".pdf", "")
-            self.all_text = list(self._pdf_processor.all_text.values())
-            self.process_text_data()
-            temp_table = []
-            temp_title = None
-            page_documents = []
-            merged_data = {}  # type: ignore # noqa
-            for i, data in enumerate(self.all_text):
-                content_type = data.get("type")
-                inside_content = data.get("inside")
-                page = data.get("page")
-
-                if content_type == "excel":
-                    temp_table.append(inside_content)
-                    if temp_title is None:
-                        for j in range(i - 1, -1, -1):
-                            if self.all_text[j]["type"] == "excel":
-                                break
-                            if self.all_text[j]["type"] == "text":
-                                content = self.all_text[j]["inside"]
-                                if re.match(
-                                    r"^\d+\.\d+", content
-                                ) or content.startswith("§"):
-                                    temp_title = content.strip()
-                                    break
-                                else:
-                                    temp_title = content.strip()
-                                    break
-                elif content_type == "text":
-                    if page in merged_data:
-                        # page merge
-                        merged_data[page]["inside_content"] += " " + inside_content
-                    else:
-                        merged_data[page] = {
-                            "inside_content": inside_content,
-                            "type": "text",
-                        }
+            return [Document.langchain2doc(lc_document) for lc_document in documents]
+        return list(self._iter_page_documents())
 
-                    # merge excel table
-                    if temp_table:
-                        table_meta = {
-                            "title": temp_title or temp_table[0],
-                            "type": "excel",
-                        }
-                        self.all_title.append(table_meta)
-
-                        # markdown format
-                        markdown_tables = []
-                        if temp_table:
-                            header = eval(temp_table[0])
-                            markdown_tables.append(header)
-                            for entry in temp_table[1:]:
-                                row = eval(entry)
-                                markdown_tables.append(row)
-                            markdown_output = "| " + " | ".join(header) + " |\n"
-                            markdown_output += (
-                                "| " + " | ".join(["---"] * len(header)) + " |\n"
-                            )
-                            for row in markdown_tables[1:]:
-                                markdown_output += "| " + " | ".join(row) + " |\n"
+    def iter_load(self) -> Iterator[Document]:
+        """Load the pdf document lazily, a page is yielded once extracted."""
+        if self._loader:
+            yield from self.load()
+        else:
+            yield from self._iter_page_documents()
 
-                            #  merged content
-                            merged_data[page]["excel_content"] = temp_table
-                            merged_data[page]["markdown_output"] = markdown_output
+    def _iter_rows(self) -> Iterator[dict]:
+        """Extract the rows of the pages in the process pool, in the page order."""
+        page_count = run_extraction(
+            _count_pdf_pages, self._path, max_workers=self._extract_workers
+        )
+        tasks = [
+            (self._path, start, min(start + _PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, _PAGES_PER_TASK)
+        ]
+        allrow = 0
+        for rows in iter_extraction(
+            _extract_pdf_pages, tasks, max_workers=self._extract_workers
+        ):
+            for row in rows:
+                row["allrow"] = allrow
+                allrow += 1
+                yield row
+
+    def _iter_page_documents(self) -> Iterator[Document]:
+        """Merge the rows into the page documents.
+
+        The rows of a page never change after a row of a later page is read, so
+        the page is yielded then.
+        """
+        file_title = self.file_path.rsplit("/", 1)[-1].replace(".pdf", "")
+        self.all_text = []
+        self.all_title = []
+        # The titles of the tables, after the titles of the text
+        table_titles = []
+        temp_table = []
+        temp_title = None
+        merged_data = {}  # type: ignore # noqa
+        page = None
+        for i, data in enumerate(self._iter_rows()):
+            self.all_text.append(data)
+            content_type = data.get("type")
+            inside_content = data.get("inside")
+            page = data.get("page")
+            for finished_page in [p for p in merged_data if p != page]:
+                yield self._page_document(
+                    finished_page, merged_data.pop(finished_page), file_title
+                )
 
-                        temp_title = None
-                        temp_table = []
+            if content_type == "excel":
+                temp_table.append(inside_content)
+                if temp_title is None:
+                    for j in range(i - 1, -1, -1):
+                        if self.all_text[j]["type"] == "excel":
+                            break
+                        if self.all_text[j]["type"] == "text":
+                            content = self.all_text[j]["inside"]
+                            if re.match(r"^\d+\.\d+", content) or content.startswith(
+                                "§"
+                            ):
+                                temp_title = content.strip()
+                                break
+                            else:
+                                temp_title = content.strip()
+                                break
+            elif content_type == "text":
+                if page in merged_data:
+                    # page merge
+                    merged_data[page]["inside_content"] += " " + inside_content
+                else:
+                    merged_data[page] = {
+                        "inside_content": inside_content,
+                        "type": "text",
+                    }
 
-            # deal last excel
-            if temp_table:
-                table_meta = {
-                    "title": temp_title or temp_table[0],
-                    "table": temp_table,
-                    "type": "excel",
-                }
-                self.all_title.append(table_meta)
-                # markdown format
-                markdown_tables = []
+                # merge excel table
                 if temp_table:
-                    header = eval(temp_table[0])
-                    markdown_tables.append(header)
-                    for entry in temp_table[1:]:
-                        row = eval(entry)
-                        markdown_tables.append(row)
-                    markdown_output = "| " + " | ".join(header) + " |\n"
-                    markdown_output += "| " + " | ".join(["---"] * len(header)) + " |\n"
-                    for row in markdown_tables[1:]:
-                        markdown_output += "| " + " | ".join(row) + " |\n"
-                    #  merged content
-                    merged_data[page]["excel_content"] = temp_table
-                    merged_data[page]["markdown_output"] = markdown_output
-
-            for page, content in merged_data.items():
-                inside_content = content["inside_content"]
-                if "markdown_output" in content:
-                    markdown_content = content["markdown_output"]
-                    content_metadata = {
-                        "page": page,
+                    table_meta = {
+                        "title": temp_title or temp_table[0],
                         "type": "excel",
-                        "title": file_title,
-                        "source": self.file_path,
                     }
-                    page_documents.append(
-                        Document(
-                            content=inside_content + "\n" + markdown_content,
-                            metadata=content_metadata,
-                        )
-                    )
-                else:
-                    content_metadata = {
-                        "page": page,
-                        "type": "text",
-                        "title": file_title,
-                        "source": self.file_path,
-                    }
-                    page_documents.append(
-                        Document(content=inside_content, metadata=content_metadata)
-                    )
+                    table_titles.append(table_meta)
 
-            return page_documents
-        return [Document.langchain2doc(lc_document) for lc_document in documents]
+                    # markdown format
+                    markdown_tables = []
+                    if temp_table:
+                        header = eval(temp_table[0])
+                        markdown_tables.append(header)
+                        for entry in temp_table[1:]:
+                            row = eval(entry)
+                            markdown_tables.append(row)
+                        markdown_output = "| " + " | ".join(header) + " |\n"
+                        markdown_output += (
+                            "| " + " | ".join(["---"] * len(header)) + " |\n"
+                        )
+                        for row in markdown_tables[1:]:
+                            markdown_output += "| " + " | ".join(row) + " |\n"
+
+                        #  merged content
+                        merged_data[page]["excel_content"] = temp_table
+                        merged_data[page]["markdown_output"] = markdown_output
+
+                    temp_title = None
+                    temp_table = []
+
+        # deal last excel
+        if temp_table:
+            table_meta = {
+                "title": temp_title or temp_table[0],
+                "table": temp_table,
+                "type": "excel",
+            }
+            table_titles.append(table_meta)
+            # markdown format
+            markdown_tables = []
+            if temp_table:
+                header = eval(temp_table[0])
+                markdown_tables.append(header)
+                for entry in temp_table[1:]:
+                    row = eval(entry)
+                    markdown_tables.append(row)
+                markdown_output = "| " + " | ".join(header) + " |\n"
+                markdown_output += "| " + " | ".join(["---"] * len(header)) + " |\n"
+                for row in markdown_tables[1:]:
+                    markdown_output += "| " + " | ".join(row) + " |\n"
+                #  merged content
+                merged_data[page]["excel_content"] = temp_table
+                merged_data[page]["markdown_output"] = markdown_output
+
+        for page, content in merged_data.items():
+            yield self._page_document(page, content, file_title)
+
+        self.process_text_data()
+        self.all_title.extend(table_titles)
+
+    def _page_document(
+        self, page: int, content: Dict[str, Any], file_title: str
+    ) -> Document:
+        inside_content = content["inside_content"]
+        if "markdown_output" in content:
+            markdown_content = content["markdown_output"]
+            content_metadata = {
+                "page": page,
+                "type": "excel",
+                "title": file_title,
+                "source": self.file_path,
+            }
+            return Document(
+                content=inside_content + "\n" + markdown_content,
+                metadata=content_metadata,
+            )
+        content_metadata = {
+            "page": page,
+            "type": "text",
+            "title": file_title,
+            "source": self.file_path,
+        }
+        return Document(content=inside_content, metadata=content_metadata)
 
     @classmethod
     def support_chunk_strategy(cls) -> List[ChunkStrategy]:
@@ -499,10 +546,25 @@ class PDFProcessor:
 
     def pdf_to_json(self):
         """Process pdf."""
-        for i in range(len(self.pdf.pages)):
+        self.extract_pages(0, len(self.pdf.pages))
+
+    def extract_pages(self, start: int, end: int):
+        """Process the pages in the range [start, end).
+
+        A range not starting from the first page is processed like the rows of the
+        pages before are extracted, the rows are numbered from 0.
+        """
+        if start > 0 and not self.all_text:
+            # The second row of the first page is the header
+            self.last_num = -1
+        for i in range(start, end):
             self.extract_text_and_tables(self.pdf.pages[i])
             logger.info(f"{self.filepath} page {i} extract text success")
 
+    def close(self):
+        """Close the pdf file."""
+        self.pdf.close()
+
     def save_all_text(self, path):
         """Save all text."""
         directory = os.path.dirname(path)
@@ -511,3 +573,25 @@ class PDFProcessor:
         for key in self.all_text.keys():
             with open(path, "a+", encoding="utf-8") as file:
                 file.write(json.dumps(self.all_text[key], ensure_ascii=False) + "\n")
+
+
+def _count_pdf_pages(filepath: str) -> int:
+    """Return the number of the pages of the pdf file."""
+    processor = PDFProcessor(filepath)
+    try:
+        return len(processor.pdf.pages)
+    finally:
+        processor.close()
+
+
+def _extract_pdf_pages(filepath: str, start: int, end: int) -> List[dict]:
+    """Extract the rows of the pages in the range [start, end).
+
+    Run in the extraction process pool, the rows are numbered from 0.
+    """
+    processor = PDFProcessor(filepath)
+    try:
+        processor.extract_pages(start, end)
+        return list(processor.all_text.values())
+    finally:
+        processor.close()
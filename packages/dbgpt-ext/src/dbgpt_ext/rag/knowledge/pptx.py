@@ -10,6 +10,23 @@ from dbgpt.rag.knowledge.base import (
     KnowledgeType,
 )
 
+from .extraction import run_extraction
+
+
+def _extract_pptx_slides(path: str) -> List[str]:
+    """Extract the text of every slide, run in the extraction processes."""
+    from pptx import Presentation
+
+    pr = Presentation(path)
+    slides = []
+    for slide in pr.slides:
+        content = ""
+        for shape in slide.shapes:
+            if hasattr(shape, "text") and shape.text:
+                content += shape.text
+        slides.append(content)
+    return slides
+
 
 class PPTXKnowledge(Knowledge):
     """PPTX Knowledge."""
@@ -21,6 +38,7 @@ class PPTXKnowledge(Knowledge):
         loader: Optional[Any] = None,
         language: Optional[str] = "zh",
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
+        extract_workers: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
         """Create PPTX knowledge with PDF Knowledge arguments.
@@ -29,6 +47,8 @@ class PPTXKnowledge(Knowledge):
             file_path:(Optional[str]) file path
             knowledge_type:(KnowledgeType) knowledge type
             loader:(Optional[Any]) loader
+            extract_workers:(Optional[int]) number of the processes to extract the
+                slides, 0 to extract in the current process
         """
         super().__init__(
             path=file_path,
@@ -38,21 +58,18 @@ class PPTXKnowledge(Knowledge):
             **kwargs,
         )
         self._language = language
+        self._extract_workers = extract_workers
 
     def _load(self) -> List[Document]:
         """Load pdf document from loader."""
         if self._loader:
             documents = self._loader.load()
         else:
-            from pptx import Presentation
-
-            pr = Presentation(self._path)
+            slides = run_extraction(
+                _extract_pptx_slides, self._path, max_workers=self._extract_workers
+            )
             docs = []
-            for slide in pr.slides:
-                content = ""
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text:
-                        content += shape.text
+            for content in slides:
                 metadata = {"source": self._path}
                 if self._metadata:
                     metadata.update(self._metadata)  # type: ignore
@@ -18,7 +18,7 @@ def mock_docx_document():
 
 def test_load_from_docx(mock_docx_document):
     file_path = "test_document.docx"
-    knowledge = DocxKnowledge(file_path=file_path)
+    knowledge = DocxKnowledge(file_path=file_path, extract_workers=0)
     documents = knowledge._load()
 
     assert len(documents) == 1
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from .. import extraction, pdf
+from ..extraction import (
+    iter_extraction,
+    resolve_extract_workers,
+    run_extraction,
+    set_default_extract_workers,
+)
+from ..pdf import PDFKnowledge
+
+
+@pytest.fixture(autouse=True)
+def shutdown_pools():
+    yield
+    extraction.shutdown_extract_pools()
+    set_default_extract_workers(None)
+
+
+def test_resolve_extract_workers():
+    assert resolve_extract_workers(3) == 3
+    assert resolve_extract_workers(0) == 0
+    assert resolve_extract_workers() == min(4, os.cpu_count() or 1)
+    set_default_extract_workers(0)
+    assert resolve_extract_workers() == 0
+    assert resolve_extract_workers(2) == 2
+
+
+def test_run_extraction_in_process_pool():
+    assert run_extraction(os.getpid, max_workers=0) == os.getpid()
+    assert run_extraction(os.getpid, max_workers=1) != os.getpid()
+    # The extraction runs inline in the workers
+    assert run_extraction(resolve_extract_workers, max_workers=1) == 0
+
+
+def test_iter_extraction_keeps_order():
+    args_list = [(2, i) for i in range(10)]
+    expected = [2**i for i in range(10)]
+    assert list(iter_extraction(pow, args_list, max_workers=2)) == expected
+    assert list(iter_extraction(pow, args_list, max_workers=0)) == expected
+    with pytest.raises(ZeroDivisionError):
+        list(iter_extraction(divmod, [(1, 1), (1, 0)], max_workers=2))
+
+
+def _row(page: int, type: str, inside: str) -> dict:
+    return {"page": page, "type": type, "inside": inside}
+
+
+_ROWS = [
+    _row(1, "text", "§1总则"),
+    _row(1, "text", "first page"),
+    _row(2, "text", "table title"),
+    _row(2, "excel", "['name', 'value']"),
+    _row(2, "excel", "['a', '1']"),
+    _row(2, "text", "after table"),
+    _row(3, "text", "third page"),
+]
+
+
+def test_pdf_page_documents_are_streamed(monkeypatch):
+    read_rows = []
+
+    def _iter_rows(self):
+        for row in _ROWS:
+            read_rows.append(row)
+            yield row
+
+    monkeypatch.setattr(PDFKnowledge, "_iter_rows", _iter_rows)
+    knowledge = PDFKnowledge(file_path="/tmp/report.pdf", extract_workers=0)
+    documents = knowledge.iter_load()
+
+    first = next(documents)
+    assert first.content == "§1总则 first page"
+    assert first.metadata == {
+        "page": 1,
+        "type": "text",
+        "title": "report",
+        "source": "/tmp/report.pdf",
+    }
+    # The first page is yielded once the second page starts
+    assert len(read_rows) == 3
+
+    rest = list(documents)
+    assert [doc.metadata["page"] for doc in rest] == [2, 3]
+    assert rest[0].metadata["type"] == "excel"
+    assert rest[0].content == (
+        "table title after table\n| name | value |\n| --- | --- |\n| a | 1 |\n"
+    )
+    assert knowledge.all_title == [
+        {"id": "1", "first_title": "1总则", "second_title": [], "table": []},
+        {"title": "table title", "type": "excel"},
+    ]
+    assert [doc.content for doc in knowledge._load()] == [
+        doc.content for doc in [first] + rest
+    ]
+
+
+def test_pdf_rows_are_extracted_by_page_ranges(monkeypatch):
+    tasks = []
+
+    def _extract_pdf_pages(filepath, start, end):
+        tasks.append((filepath, start, end))
+        return [
+            _row(page + 1, "text", f"page {page + 1}") for page in range(start, end)
+        ]
+
+    monkeypatch.setattr(pdf, "_PAGES_PER_TASK", 2)
+    monkeypatch.setattr(pdf, "_count_pdf_pages", lambda filepath: 5)
+    monkeypatch.setattr(pdf, "_extract_pdf_pages", _extract_pdf_pages)
+    knowledge = PDFKnowledge(file_path="/tmp/report.pdf", extract_workers=0)
+    documents = knowledge._load()
+
+    assert tasks == [
+        ("/tmp/report.pdf", 0, 2),
+        ("/tmp/report.pdf", 2, 4),
+        ("/tmp/report.pdf", 4, 5),
+    ]
+    assert [doc.content for doc in documents] == [f"page {i}" for i in range(1, 6)]
+    assert [row["allrow"] for row in knowledge.all_text] == list(range(5))
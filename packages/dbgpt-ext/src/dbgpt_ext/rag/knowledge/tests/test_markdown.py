@@ -27,3 +27,12 @@ def test_load_from_markdown(mock_file_open):
     assert len(documents) == 1
     assert documents[0].content == MOCK_MARKDOWN_DATA
     assert documents[0].metadata["source"] == file_path
+
+
+def test_load_stream(tmp_path):
+    file_path = tmp_path / "test_document.md"
+    file_path.write_text(MOCK_MARKDOWN_DATA, encoding="utf-8")
+    knowledge = MarkdownKnowledge(file_path=str(file_path))
+    blocks, metadata = knowledge.load_stream()
+    assert "".join(blocks) == MOCK_MARKDOWN_DATA
+    assert metadata == {"source": str(file_path), "title": "test_document.md"}
@@ -25,7 +25,7 @@ def mock_pdf_open_and_reader():
 
 def test_load_from_pdf(mock_pdf_open_and_reader):
     file_path = "test_document"
-    knowledge = PDFKnowledge(file_path=file_path)
+    knowledge = PDFKnowledge(file_path=file_path, extract_workers=0)
     documents = knowledge._load()
 
     assert len(documents) == len(MOCK_PDF_PAGES)
@@ -36,3 +36,22 @@ def test_load_from_txt(mock_file_open, mock_chardet_detect):
     mock_file_open.assert_called_once_with(file_path, "rb")
 
     mock_chardet_detect.assert_called_once()
+
+
+def test_load_stream(tmp_path):
+    from dbgpt_ext.rag.chunk_manager import ChunkManager, ChunkParameters
+
+    file_path = tmp_path / "test_document.txt"
+    file_path.write_text("Ascii line.\n" * 3 + "第二段文本。\n" * 3, encoding="utf-8")
+    knowledge = TXTKnowledge(file_path=str(file_path), metadata={"doc": "1"})
+    blocks, metadata = knowledge.load_stream()
+    assert "".join(blocks) == file_path.read_text(encoding="utf-8")
+    assert metadata == {"source": str(file_path), "doc": "1"}
+
+    chunk_parameters = ChunkParameters(
+        chunk_strategy="CHUNK_BY_SIZE", chunk_size=32, chunk_overlap=8
+    )
+    streamed = list(ChunkManager(knowledge, chunk_parameters).iter_chunks())
+    loaded = ChunkManager(knowledge, chunk_parameters).split(knowledge.load())
+    assert [chunk.content for chunk in streamed] == [chunk.content for chunk in loaded]
+    assert streamed[0].metadata == loaded[0].metadata
@@ -1,6 +1,6 @@
 """TXT Knowledge."""
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import chardet
 
@@ -11,6 +11,10 @@ from dbgpt.rag.knowledge.base import (
     Knowledge,
     KnowledgeType,
 )
+from dbgpt.rag.text_splitter import iter_text_blocks
+
+# The number of bytes to detect the encoding of a streamed file
+_ENCODING_SAMPLE_SIZE = 64 * 1024
 
 
 class TXTKnowledge(Knowledge):
@@ -53,13 +57,31 @@ class TXTKnowledge(Knowledge):
                     text = raw_text.decode("utf-8")
                 else:
                     text = raw_text.decode(result["encoding"])
-            metadata = {"source": self._path}
-            if self._metadata:
-                metadata.update(self._metadata)  # type: ignore
-            return [Document(content=text, metadata=metadata)]
+            return [Document(content=text, metadata=self._document_metadata())]
 
         return [Document.langchain2doc(lc_document) for lc_document in documents]
 
+    def load_stream(self) -> Optional[Tuple[Iterator[str], Dict[str, Any]]]:
+        """Return the text blocks of the file, read lazily."""
+        if self._loader or not self._path:
+            return None
+        return self._iter_text_blocks(), self._document_metadata()
+
+    def _iter_text_blocks(self) -> Iterator[str]:
+        with open(self._path, "rb") as f:
+            encoding = chardet.detect(f.read(_ENCODING_SAMPLE_SIZE))["encoding"]
+        if not encoding or encoding.lower() == "ascii":
+            # The rest of the file may have non-ascii characters
+            encoding = "utf-8"
+        with open(self._path, "r", encoding=encoding) as f:
+            yield from iter_text_blocks(f)
+
+    def _document_metadata(self) -> Dict[str, Any]:
+        metadata = {"source": self._path}
+        if self._metadata:
+            metadata.update(self._metadata)  # type: ignore
+        return metadata
+
     @classmethod
     def support_chunk_strategy(cls):
         """Return support chunk strategy."""
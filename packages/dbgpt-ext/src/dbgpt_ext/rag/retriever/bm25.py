@@ -8,6 +8,7 @@ from dbgpt.core import Chunk
 from dbgpt.rag.retriever.base import BaseRetriever
 from dbgpt.rag.retriever.rerank import DefaultRanker, Ranker
 from dbgpt.rag.retriever.rewrite import QueryRewrite
+from dbgpt.storage.full_text.base import FullTextStoreBase
 from dbgpt.storage.vector_store.filters import MetadataFilters
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt_app.base import logger
@@ -32,6 +33,7 @@ class BM25Retriever(BaseRetriever):
         k1: Optional[float] = 2.0,
         b: Optional[float] = 0.75,
         executor: Optional[Executor] = None,
+        full_text_store: Optional[FullTextStoreBase] = None,
     ):
         """Create BM25Retriever.
 
@@ -46,6 +48,9 @@ class BM25Retriever(BaseRetriever):
             b (Optional[float]): Controls to what degree document length normalizes
             tf values. The default value is 0.75.
             executor (Optional[Executor]): executor
+            full_text_store (Optional[FullTextStoreBase]): search the full text
+                store instead of the elasticsearch index, e.g. the built-in
+                LocalBM25Store.
 
         Returns:
             BM25Retriever: BM25 retriever
@@ -53,6 +58,14 @@ class BM25Retriever(BaseRetriever):
         super().__init__()
         self._top_k = top_k
         self._query_rewrite = query_rewrite
+        self._full_text_store = full_text_store
+        self._index_name = es_index
+        if full_text_store is None:
+            self._init_es_index(es_client, k1, b)
+        self._rerank = rerank or DefaultRanker(self._top_k)
+        self._executor = executor or ThreadPoolExecutor()
+
+    def _init_es_index(self, es_client: Any, k1: Optional[float], b: Optional[float]):
         try:
             from elasticsearch import Elasticsearch
         except ImportError:
@@ -79,15 +92,12 @@ class BM25Retriever(BaseRetriever):
                 }
             },
         }
-        self._index_name = es_index
         if not self._es_client.indices.exists(index=self._index_name):
             self._es_client.indices.create(
                 index=self._index_name,
                 mappings=self._es_mappings,
                 settings=self._es_index_settings,
             )
-        self._rerank = rerank or DefaultRanker(self._top_k)
-        self._executor = executor or ThreadPoolExecutor()
 
     def _retrieve(
         self, query: str, filters: Optional[MetadataFilters] = None
@@ -100,6 +110,8 @@ class BM25Retriever(BaseRetriever):
         Return:
             List[Chunk]: list of chunks
         """
+        if self._full_text_store is not None:
+            return self._full_text_store.similar_search(query, self._top_k, filters)
         es_query = {"query": {"match": {"content": query}}}
         res = self._es_client.search(index=self._index_name, body=es_query)
 
@@ -129,6 +141,10 @@ class BM25Retriever(BaseRetriever):
         Return:
             List[Chunk]: list of chunks with score
         """
+        if self._full_text_store is not None:
+            return self._full_text_store.similar_search_with_scores(
+                query, self._top_k, score_threshold, filters
+            )
         es_query = {"query": {"match": {"content": query}}}
         res = self._es_client.search(index=self._index_name, body=es_query)
 
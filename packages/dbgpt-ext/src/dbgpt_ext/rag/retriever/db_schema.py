@@ -1,7 +1,7 @@
 """DBSchema retriever."""
 
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from dbgpt._private.config import Config
 from dbgpt.core import Chunk
@@ -9,7 +9,11 @@ from dbgpt.datasource.base import BaseConnector
 from dbgpt.rag.retriever.base import BaseRetriever
 from dbgpt.rag.retriever.rerank import DefaultRanker, Ranker
 from dbgpt.storage.vector_store.base import VectorStoreBase
-from dbgpt.storage.vector_store.filters import MetadataFilter, MetadataFilters
+from dbgpt.storage.vector_store.filters import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
 from dbgpt.util.chat_util import run_tasks
 from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
 
@@ -187,19 +191,101 @@ class DBSchemaRetriever(BaseRetriever):
         """
         return await self._aretrieve(query, filters)
 
-    def _retrieve_field(self, table_chunk: Chunk, query) -> Chunk:
+    def _retrieve_field(
+        self, table_chunk: Chunk, query, query_vector: Optional[List[float]] = None
+    ) -> Chunk:
         metadata = table_chunk.metadata
         metadata["part"] = "field"
         filters = [MetadataFilter(key=k, value=v) for k, v in metadata.items()]
-        field_chunks = self._field_vector_store_connector.similar_search_with_scores(
-            query, self._top_k, 0, MetadataFilters(filters=filters)
+        field_chunks = self._search_fields(
+            query, query_vector, self._top_k, MetadataFilters(filters=filters)
         )
+        return self._merge_fields(table_chunk, field_chunks)
+
+    def _search_fields(
+        self,
+        query,
+        query_vector: Optional[List[float]],
+        limit: int,
+        filters: MetadataFilters,
+    ) -> List[Chunk]:
+        """Search the fields by the query vector if the query is embedded."""
+        store = self._field_vector_store_connector
+        if query_vector is None:
+            return store.similar_search_with_scores(query, limit, 0, filters)
+        return store.similar_search_with_scores_by_vector(
+            query_vector, limit, 0, filters
+        )
+
+    def _merge_fields(self, table_chunk: Chunk, field_chunks: List[Chunk]) -> Chunk:
         field_contents = [chunk.content.strip() for chunk in field_chunks]
         table_chunk.content += (
             "\n" + self._separator + "\n" + self._column_separator.join(field_contents)
         )
         return self._deserialize_table_chunk(table_chunk)
 
+    def _retrieve_fields(self, table_chunks: List[Chunk], query) -> List[Chunk]:
+        """Retrieve the fields of all the separated tables in one search.
+
+        The fields of the tables are searched by one filtered query of
+        `top_k * len(table_chunks)` fields, then grouped by the table and the top
+        `top_k` fields of every table are kept. If the search is full, the tables
+        with less than `top_k` fields in the results are searched separately and
+        concurrently, the fields of a few tables never take the place of the others.
+
+        The query is embedded once for all the searches if the field vector store
+        can search by the query vector.
+        """
+        if len(table_chunks) == 1:
+            return [self._retrieve_field(table_chunks[0], query)]
+        query_vector = self._field_vector_store_connector.embed_query(query)
+        table_names = [chunk.metadata.get("table_name") for chunk in table_chunks]
+        filters = MetadataFilters(
+            filters=[
+                MetadataFilter(key="part", value="field"),
+                MetadataFilter(
+                    key="table_name", operator=FilterOperator.IN, value=table_names
+                ),
+            ]
+        )
+        limit = self._top_k * len(table_chunks)
+        try:
+            field_chunks = self._search_fields(query, query_vector, limit, filters)
+        except Exception as e:
+            logger.warning(
+                f"Search the fields of multiple tables failed, search the tables "
+                f"separately: {e}"
+            )
+            tasks = [
+                lambda c=chunk: self._retrieve_field(c, query, query_vector)
+                for chunk in table_chunks
+            ]
+            return run_tasks(tasks, concurrency_limit=3)
+
+        # All the fields of the tables are in the results if the search is not full
+        exhausted = len(field_chunks) < limit
+        table_fields: Dict[str, List[Chunk]] = {name: [] for name in table_names}
+        for field_chunk in field_chunks:
+            fields = table_fields.get(field_chunk.metadata.get("table_name"))
+            if fields is not None and len(fields) < self._top_k:
+                fields.append(field_chunk)
+        results: List[Optional[Chunk]] = []
+        top_up_tasks = []
+        for table_chunk, table_name in zip(table_chunks, table_names):
+            fields = table_fields[table_name]
+            if len(fields) >= self._top_k or (exhausted and fields):
+                results.append(self._merge_fields(table_chunk, fields))
+            else:
+                # The fields of other tables are more similar to the query
+                results.append(None)
+                top_up_tasks.append(
+                    lambda c=table_chunk: self._retrieve_field(c, query, query_vector)
+                )
+        if top_up_tasks:
+            top_up_results = iter(run_tasks(top_up_tasks, concurrency_limit=3))
+            results = [r if r is not None else next(top_up_results) for r in results]
+        return results  # type: ignore
+
     def _similarity_search(
         self, query, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -218,14 +304,9 @@ class DBSchemaRetriever(BaseRetriever):
         if not separated_chunks:
             return [self._deserialize_table_chunk(chunk) for chunk in not_sep_chunks]
 
-        # Create tasks list
         # The fields of table is too large, and it has to be separated into chunks,
-        # so we need to retrieve fields of each table separately
-        tasks = [
-            lambda c=chunk: self._retrieve_field(c, query) for chunk in separated_chunks
-        ]
-        # Run tasks concurrently
-        separated_result = run_tasks(tasks, concurrency_limit=3)
+        # so we need to retrieve the fields of the tables
+        separated_result = self._retrieve_fields(separated_chunks, query)
 
         # Combine and return results
         return not_sep_chunks + separated_result
@@ -29,6 +29,8 @@ def mock_field_vector_store_connector():
     mock_connector.similar_search_with_scores.return_value = [
         Chunk(content="Field summary")
     ] * 4
+    # Search by the query text
+    mock_connector.embed_query.return_value = None
     return mock_connector
 
 
@@ -64,3 +66,212 @@ def test_retrieve_with_mocked_summary(dbstruct_retriever):
 async def async_mock_parse_db_summary() -> str:
     """Asynchronous patch for _parse_db_summary method."""
     return "Table summary"
+
+
+def _table_chunk(table_name: str) -> Chunk:
+    return Chunk(
+        content=f"table_name: {table_name}",
+        metadata={"table_name": table_name, "separated": 1, "part": "table"},
+    )
+
+
+def _field_chunk(table_name: str, field: str) -> Chunk:
+    return Chunk(
+        content=f"{table_name}.{field}",
+        metadata={"table_name": table_name, "separated": 1, "part": "field"},
+    )
+
+
+def test_retrieve_fields_of_tables_in_one_search(
+    mock_table_vector_store_connector, mock_field_vector_store_connector
+):
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _table_chunk("orders"),
+        Chunk(content="Table summary"),
+        _table_chunk("users"),
+    ]
+    mock_field_vector_store_connector.similar_search_with_scores.return_value = [
+        _field_chunk("orders", "amount"),
+        _field_chunk("users", "name"),
+        _field_chunk("orders", "user_id"),
+        _field_chunk("orders", "created_at"),
+        _field_chunk("users", "age"),
+    ]
+    retriever = DBSchemaRetriever(
+        table_vector_store_connector=mock_table_vector_store_connector,
+        field_vector_store_connector=mock_field_vector_store_connector,
+        top_k=2,
+    )
+    chunks = retriever._retrieve("query")
+
+    mock_field_vector_store_connector.similar_search_with_scores.assert_called_once()
+    args = mock_field_vector_store_connector.similar_search_with_scores.call_args[0]
+    assert args[1] == 4
+    table_filter = args[3].filters[1]
+    assert table_filter.key == "table_name"
+    assert table_filter.value == ["orders", "users"]
+
+    assert chunks[0].content == "Table summary"
+    assert chunks[1].content.endswith("orders.amount,\r\n    orders.user_id")
+    assert chunks[2].content.endswith("users.name,\r\n    users.age")
+
+
+def test_retrieve_fields_of_table_missing_in_search(
+    mock_table_vector_store_connector, mock_field_vector_store_connector
+):
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _table_chunk("orders"),
+        _table_chunk("users"),
+    ]
+    mock_field_vector_store_connector.similar_search_with_scores.side_effect = [
+        [_field_chunk("orders", "amount"), _field_chunk("orders", "user_id")],
+        [_field_chunk("users", "name")],
+    ]
+    retriever = DBSchemaRetriever(
+        table_vector_store_connector=mock_table_vector_store_connector,
+        field_vector_store_connector=mock_field_vector_store_connector,
+        top_k=1,
+    )
+    chunks = retriever._retrieve("query")
+
+    # The fields of users are searched separately
+    assert mock_field_vector_store_connector.similar_search_with_scores.call_count == 2
+    assert chunks[1].content.endswith("users.name")
+    assert chunks[0].content.endswith("orders.amount")
+
+
+def test_retrieve_fields_of_skewed_tables(
+    mock_table_vector_store_connector, mock_field_vector_store_connector
+):
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _table_chunk("orders"),
+        _table_chunk("users"),
+        _table_chunk("items"),
+    ]
+    # The fields of orders take most of the results of the shared search
+    shared_fields = [_field_chunk("orders", f"f{i}") for i in range(7)] + [
+        _field_chunk("users", "name"),
+        _field_chunk("users", "age"),
+    ]
+    table_fields = {
+        "users": [
+            _field_chunk("users", "name"),
+            _field_chunk("users", "age"),
+            _field_chunk("users", "email"),
+        ],
+        "items": [_field_chunk("items", "price"), _field_chunk("items", "title")],
+    }
+
+    def _search(query, top_k, score_threshold, filters):
+        table_name = {f.key: f.value for f in filters.filters}["table_name"]
+        if isinstance(table_name, list):
+            return shared_fields
+        return table_fields[table_name][:top_k]
+
+    mock_field_vector_store_connector.similar_search_with_scores.side_effect = _search
+    retriever = DBSchemaRetriever(
+        table_vector_store_connector=mock_table_vector_store_connector,
+        field_vector_store_connector=mock_field_vector_store_connector,
+        top_k=3,
+    )
+    chunks = retriever._retrieve("query")
+
+    # The shared search and the top up of users and items
+    assert mock_field_vector_store_connector.similar_search_with_scores.call_count == 3
+    assert chunks[0].content.endswith("orders.f0,\r\n    orders.f1,\r\n    orders.f2")
+    assert chunks[1].content.endswith("users.age,\r\n    users.email")
+    assert chunks[2].content.endswith("items.price,\r\n    items.title")
+
+
+def test_retrieve_fields_not_full_search(
+    mock_table_vector_store_connector, mock_field_vector_store_connector
+):
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _table_chunk("orders"),
+        _table_chunk("users"),
+    ]
+    mock_field_vector_store_connector.similar_search_with_scores.return_value = [
+        _field_chunk("orders", "amount"),
+        _field_chunk("users", "name"),
+    ]
+    retriever = DBSchemaRetriever(
+        table_vector_store_connector=mock_table_vector_store_connector,
+        field_vector_store_connector=mock_field_vector_store_connector,
+        top_k=2,
+    )
+    chunks = retriever._retrieve("query")
+
+    # All the fields are in the results, no table is searched again
+    mock_field_vector_store_connector.similar_search_with_scores.assert_called_once()
+    assert chunks[0].content.endswith("orders.amount")
+    assert chunks[1].content.endswith("users.name")
+
+
+def test_retrieve_fields_embed_query_once(
+    mock_table_vector_store_connector, mock_field_vector_store_connector
+):
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _table_chunk("orders"),
+        _table_chunk("users"),
+        _table_chunk("items"),
+    ]
+    mock_field_vector_store_connector.embed_query.return_value = [0.1, 0.2]
+    table_fields = {
+        "users": [_field_chunk("users", "name"), _field_chunk("users", "age")],
+        "items": [_field_chunk("items", "price")],
+    }
+
+    def _search(embedding, top_k, score_threshold, filters):
+        assert embedding == [0.1, 0.2]
+        table_name = {f.key: f.value for f in filters.filters}["table_name"]
+        if isinstance(table_name, list):
+            return [_field_chunk("orders", f"f{i}") for i in range(top_k)]
+        return table_fields[table_name][:top_k]
+
+    search = mock_field_vector_store_connector.similar_search_with_scores_by_vector
+    search.side_effect = _search
+    retriever = DBSchemaRetriever(
+        table_vector_store_connector=mock_table_vector_store_connector,
+        field_vector_store_connector=mock_field_vector_store_connector,
+        top_k=2,
+    )
+    chunks = retriever._retrieve("query")
+
+    # The shared search and the top up of users and items use the same vector
+    mock_field_vector_store_connector.embed_query.assert_called_once_with("query")
+    mock_field_vector_store_connector.similar_search_with_scores.assert_not_called()
+    assert search.call_count == 3
+    assert chunks[0].content.endswith("orders.f0,\r\n    orders.f1")
+    assert chunks[1].content.endswith("users.name,\r\n    users.age")
+    assert chunks[2].content.endswith("items.price")
+
+
+def test_retrieve_fields_fallback_by_vector(
+    mock_table_vector_store_connector, mock_field_vector_store_connector
+):
+    mock_table_vector_store_connector.similar_search_with_scores.return_value = [
+        _table_chunk("orders"),
+        _table_chunk("users"),
+    ]
+    mock_field_vector_store_connector.embed_query.return_value = [0.1, 0.2]
+
+    def _search(embedding, top_k, score_threshold, filters):
+        table_name = {f.key: f.value for f in filters.filters}["table_name"]
+        if isinstance(table_name, list):
+            raise ValueError("The IN operator is not supported")
+        return [_field_chunk(table_name, "id")]
+
+    search = mock_field_vector_store_connector.similar_search_with_scores_by_vector
+    search.side_effect = _search
+    retriever = DBSchemaRetriever(
+        table_vector_store_connector=mock_table_vector_store_connector,
+        field_vector_store_connector=mock_field_vector_store_connector,
+        top_k=2,
+    )
+    chunks = retriever._retrieve("query")
+
+    # The tables are searched separately by the same vector
+    mock_field_vector_store_connector.embed_query.assert_called_once_with("query")
+    assert search.call_count == 3
+    assert chunks[0].content.endswith("orders.id")
+    assert chunks[1].content.endswith("users.id")
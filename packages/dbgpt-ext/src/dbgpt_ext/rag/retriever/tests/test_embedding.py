@@ -1,9 +1,9 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from dbgpt.core import Chunk
-from dbgpt.rag.retriever.embedding import EmbeddingRetriever
+from dbgpt.rag.retriever.embedding import EmbeddingRetriever, _merge_candidates
 
 
 @pytest.fixture
@@ -37,3 +37,49 @@ def test_retrieve(query, top_k, mock_vector_store_connector, embedding_retriever
     retrieved_chunks = embedding_retriever._retrieve(query)
 
     assert len(retrieved_chunks) == top_k
+
+
+def test_merge_candidates_keep_best_score():
+    chunks = _merge_candidates(
+        [
+            [Chunk(chunk_id="a", score=0.5), Chunk(chunk_id="b", score=0.7)],
+            [Chunk(chunk_id="c", score=0.6), Chunk(chunk_id="a", score=0.9)],
+        ]
+    )
+    assert [chunk.chunk_id for chunk in chunks] == ["a", "b", "c"]
+    assert [chunk.score for chunk in chunks] == [0.9, 0.7, 0.6]
+
+
+@pytest.mark.asyncio
+async def test_aretrieve_with_score_batch_rewritten_queries(
+    query, top_k, mock_vector_store_connector
+):
+    query_rewrite = MagicMock()
+    query_rewrite.rewrite = AsyncMock(return_value=["rewritten query"])
+    mock_vector_store_connector.asimilar_search = AsyncMock(
+        return_value=[Chunk(content="context")]
+    )
+    mock_vector_store_connector.asimilar_search_with_scores_batch = AsyncMock(
+        return_value=[
+            [Chunk(chunk_id="a", content="a", score=0.5)],
+            [
+                Chunk(chunk_id="a", content="a", score=0.8),
+                Chunk(chunk_id="b", content="b", score=0.6),
+            ],
+        ]
+    )
+    retriever = EmbeddingRetriever(
+        top_k=top_k,
+        query_rewrite=query_rewrite,
+        index_store=mock_vector_store_connector,
+    )
+
+    chunks = await retriever._aretrieve_with_score(query, 0.3)
+
+    mock_vector_store_connector.asimilar_search_with_scores_batch.assert_awaited_once()
+    args = mock_vector_store_connector.asimilar_search_with_scores_batch.call_args
+    assert args.args[0] == [query, "rewritten query"]
+    assert [(chunk.chunk_id, chunk.score) for chunk in chunks] == [
+        ("a", 0.8),
+        ("b", 0.6),
+    ]
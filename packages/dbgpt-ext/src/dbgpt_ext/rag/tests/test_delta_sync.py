@@ -0,0 +1,175 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from dbgpt.storage.base import IndexStoreBase
+from dbgpt_ext.rag.assembler.embedding import EmbeddingAssembler
+from dbgpt_ext.rag.chunk_manager import ChunkManager, ChunkParameters
+from dbgpt_ext.rag.knowledge.string import StringKnowledge
+
+_PAGE = "First paragraph.\n\nSecond paragraph.\n\nThird paragraph."
+
+
+def _chunk_parameters(**kwargs) -> ChunkParameters:
+    return ChunkParameters(
+        chunk_strategy="CHUNK_BY_SEPARATOR",
+        separator="\n\n",
+        enable_merge=False,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def index_store():
+    store = MagicMock(spec=IndexStoreBase)
+    store.load_document_with_limit.side_effect = lambda chunks, *args: [
+        chunk.chunk_id for chunk in chunks
+    ]
+    return store
+
+
+def _split(text: str, chunk_parameters: ChunkParameters):
+    knowledge = StringKnowledge(text=text)
+    manager = ChunkManager(knowledge, chunk_parameters)
+    return manager, manager.split(knowledge.load())
+
+
+def test_fingerprints_are_stable():
+    manager, chunks = _split(_PAGE, _chunk_parameters())
+    ids = [chunk.chunk_id for chunk in manager.assign_fingerprints(chunks, "doc")]
+    _, chunks_again = _split(_PAGE, _chunk_parameters())
+    assert [
+        chunk.chunk_id for chunk in manager.assign_fingerprints(chunks_again, "doc")
+    ] == ids
+    assert len(set(ids)) == 3
+
+    other_namespace = manager.assign_fingerprints(chunks_again, "other_doc")
+    assert not set(ids) & {chunk.chunk_id for chunk in other_namespace}
+
+
+def test_fingerprints_depend_on_splitter_parameters():
+    manager, chunks = _split(_PAGE, _chunk_parameters())
+    other_manager, other_chunks = _split(_PAGE, _chunk_parameters(chunk_size=256))
+    ids = {chunk.chunk_id for chunk in manager.assign_fingerprints(chunks)}
+    other_ids = {
+        chunk.chunk_id for chunk in other_manager.assign_fingerprints(other_chunks)
+    }
+    assert not ids & other_ids
+
+
+def test_repeated_chunks_have_unique_ids():
+    manager, chunks = _split("Same.\n\nSame.\n\nSame.", _chunk_parameters())
+    assert len({chunk.chunk_id for chunk in manager.assign_fingerprints(chunks)}) == 3
+
+
+def test_diff():
+    manager, chunks = _split(_PAGE, _chunk_parameters())
+    old_ids = [chunk.chunk_id for chunk in manager.assign_fingerprints(chunks, "doc")]
+
+    edited = "First paragraph.\n\nSecond paragraph, edited.\n\nThird paragraph."
+    manager, chunks = _split(edited, _chunk_parameters())
+    delta = manager.diff(chunks, old_ids, "doc")
+    assert delta.unchanged_ids == [old_ids[0], old_ids[2]]
+    assert [chunk.content for chunk in delta.new_chunks] == [
+        "Second paragraph, edited."
+    ]
+    assert delta.removed_ids == [old_ids[1]]
+    assert [chunk.chunk_id for chunk in delta.chunks] == [
+        old_ids[0],
+        delta.new_chunks[0].chunk_id,
+        old_ids[2],
+    ]
+
+
+def test_delta_persist(index_store):
+    assembler = EmbeddingAssembler.load_from_knowledge(
+        knowledge=StringKnowledge(text=_PAGE),
+        index_store=index_store,
+        chunk_parameters=_chunk_parameters(),
+        existing_chunk_ids=[],
+        chunk_namespace="doc",
+    )
+    old_ids = assembler.persist()
+    assert len(old_ids) == 3
+    index_store.delete_by_ids.assert_not_called()
+
+    index_store.reset_mock()
+    edited = "First paragraph.\n\nThird paragraph.\n\nFourth paragraph."
+    assembler = EmbeddingAssembler.load_from_knowledge(
+        knowledge=StringKnowledge(text=edited),
+        index_store=index_store,
+        chunk_parameters=_chunk_parameters(),
+        existing_chunk_ids=old_ids,
+        chunk_namespace="doc",
+    )
+    new_ids = assembler.persist()
+
+    loaded = index_store.load_document_with_limit.call_args[0][0]
+    assert [chunk.content for chunk in loaded] == ["Fourth paragraph."]
+    index_store.delete_by_ids.assert_called_once_with(old_ids[1])
+    assert new_ids[:2] == [old_ids[0], old_ids[2]]
+    assert new_ids[2] == loaded[0].chunk_id
+
+
+@pytest.mark.asyncio
+async def test_delta_apersist_unchanged(index_store):
+    manager, chunks = _split(_PAGE, _chunk_parameters())
+    old_ids = [chunk.chunk_id for chunk in manager.assign_fingerprints(chunks, "doc")]
+    assembler = await EmbeddingAssembler.aload_from_knowledge(
+        knowledge=StringKnowledge(text=_PAGE),
+        index_store=index_store,
+        chunk_parameters=_chunk_parameters(),
+        existing_chunk_ids=old_ids,
+        chunk_namespace="doc",
+    )
+    assert await assembler.apersist() == old_ids
+    index_store.aload_document_with_limit.assert_not_called()
+    index_store.delete_by_ids.assert_not_called()
+
+
+def test_persist_without_delta(index_store):
+    assembler = EmbeddingAssembler.load_from_knowledge(
+        knowledge=StringKnowledge(text=_PAGE),
+        index_store=index_store,
+        chunk_parameters=_chunk_parameters(),
+    )
+    assert assembler.get_delta() is None
+    assert len(assembler.persist()) == 3
+
+
+def test_lazy_delta_persist(index_store):
+    old_ids = EmbeddingAssembler.load_from_knowledge(
+        knowledge=StringKnowledge(text=_PAGE),
+        index_store=index_store,
+        chunk_parameters=_chunk_parameters(),
+        existing_chunk_ids=[],
+        chunk_namespace="doc",
+    ).persist()
+
+    index_store.reset_mock()
+    loaded = []
+
+    def _load(chunks, *args):
+        loaded.extend(chunks)
+        return [chunk.chunk_id for chunk in loaded]
+
+    index_store.load_document_with_limit.side_effect = _load
+    edited = "First paragraph.\n\nThird paragraph.\n\nFourth paragraph."
+    assembler = EmbeddingAssembler.load_from_knowledge(
+        knowledge=StringKnowledge(text=edited),
+        index_store=index_store,
+        chunk_parameters=_chunk_parameters(),
+        existing_chunk_ids=old_ids,
+        chunk_namespace="doc",
+        lazy_load=True,
+    )
+    # The knowledge is split while persisting
+    assert assembler.get_chunks() == []
+    assert assembler.get_delta() is None
+    new_ids = assembler.persist()
+
+    assert [chunk.content for chunk in loaded] == ["Fourth paragraph."]
+    index_store.delete_by_ids.assert_called_once_with(old_ids[1])
+    assert new_ids == [old_ids[0], old_ids[2], loaded[0].chunk_id]
+    assert [chunk.chunk_id for chunk in assembler.get_chunks()] == new_ids
+    assert assembler.get_delta().unchanged_ids == [old_ids[0], old_ids[2]]
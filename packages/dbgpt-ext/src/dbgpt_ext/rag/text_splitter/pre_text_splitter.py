@@ -1,6 +1,6 @@
 """Pre text splitter."""
 
-from typing import Iterable, List
+from typing import Iterable, Iterator, List
 
 from dbgpt.core import Chunk, Document
 from dbgpt.rag.text_splitter.text_splitter import TextSplitter
@@ -36,9 +36,15 @@ class PreTextSplitter(TextSplitter):
 
     def split_documents(self, documents: Iterable[Document], **kwargs) -> List[Chunk]:
         """Split documents by pre separator."""
+        return list(self.iter_documents(documents, **kwargs))
+
+    def iter_documents(
+        self, documents: Iterable[Document], **kwargs
+    ) -> Iterator[Chunk]:
+        """Split documents by pre separator lazily."""
 
         def generator() -> Iterable[Document]:
             for doc in documents:
                 yield from _single_document_split(doc, pre_separator=self.pre_separator)
 
-        return self._impl.split_documents(generator())
+        return self._impl.iter_documents(generator())
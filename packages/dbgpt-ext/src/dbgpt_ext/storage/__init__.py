@@ -57,6 +57,15 @@ def _import_elastic() -> Tuple[Type, Type]:
     return ElasticStore, ElasticsearchStoreConfig
 
 
+def _import_local() -> Tuple[Type, Type]:
+    from dbgpt_ext.storage.vector_store.local_store import (
+        LocalVectorConfig,
+        LocalVectorStore,
+    )
+
+    return LocalVectorStore, LocalVectorConfig
+
+
 def _import_builtin_knowledge_graph() -> Tuple[Type, Type]:
     from dbgpt_ext.storage.knowledge_graph.knowledge_graph import (
         BuiltinKnowledgeGraph,
@@ -101,6 +110,8 @@ def _select_rag_storage(name: str) -> Tuple[Type, Type]:
         return _import_oceanbase()
     elif name == "ElasticSearch":
         return _import_elastic()
+    elif name == "Local":
+        return _import_local()
     elif name == "KnowledgeGraph":
         return _import_builtin_knowledge_graph()
     elif name == "CommunitySummaryKnowledgeGraph":
@@ -129,6 +140,7 @@ def scan_storage_configs():
         "dbgpt_ext.storage.vector_store",
         "dbgpt_ext.storage.knowledge_graph",
         "dbgpt_ext.storage.graph_store",
+        "dbgpt_ext.storage.full_text",
     ]
 
     scanner = ModelScanner[IndexStoreConfig]()
@@ -149,6 +161,7 @@ __vector_store__ = [
     "OceanBase",
     "PGVector",
     "ElasticSearch",
+    "Local",
 ]
 
 __knowledge_graph__ = ["KnowledgeGraph", "CommunitySummaryKnowledgeGraph", "OpenSPG"]
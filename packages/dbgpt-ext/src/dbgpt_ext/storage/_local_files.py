@@ -0,0 +1,94 @@
+"""The helpers shared by the local stores persisted to the directories."""
+
+import hashlib
+import os
+import re
+import threading
+from typing import Any, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Windows
+    fcntl = None  # type: ignore
+
+from dbgpt.storage.vector_store.filters import FilterOperator
+
+
+class _FileLock:
+    """A reentrant lock of the threads and the processes writing a path.
+
+    The thread lock is held first, then the exclusive lock of the ``<path>.lock``
+    file. The lock file is kept when the path is removed, the waiting processes
+    always lock the same file.
+
+    The lock requires ``fcntl``, on the other platforms only the threads are locked.
+    """
+
+    def __init__(self, path: str, thread_lock: "threading.RLock"):
+        self._lock_path = path.rstrip(os.sep) + ".lock"
+        self._thread_lock = thread_lock
+        self._depth = 0
+        self._file: Any = None
+
+    def __enter__(self) -> "_FileLock":
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                os.makedirs(os.path.dirname(self._lock_path) or ".", exist_ok=True)
+                self._file = open(self._lock_path, "a")
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            except BaseException:
+                if self._file:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._depth -= 1
+        if self._depth == 0 and self._file is not None:
+            # Closing the file releases the lock
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+def _collection_dir_name(name: Optional[str]) -> str:
+    """Return the directory name of the collection."""
+    name = name or "default"
+    if re.match(r"^[a-zA-Z0-9_][-a-zA-Z0-9_.]{0,62}$", name) and ".." not in name:
+        return name
+    return hashlib.sha256(name.encode("utf-8")).hexdigest()
+
+
+def _file_stat(path: str) -> Optional[Tuple[int, int]]:
+    """Return the inode and size of the file, None if not exists."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+def _as_list(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _compare(left: Any, operator: FilterOperator, right: Any) -> bool:
+    try:
+        if operator == FilterOperator.GT:
+            return left > right
+        elif operator == FilterOperator.GTE:
+            return left >= right
+        elif operator == FilterOperator.LT:
+            return left < right
+        return left <= right
+    except TypeError:
+        return False
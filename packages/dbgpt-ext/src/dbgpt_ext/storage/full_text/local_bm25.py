@@ -0,0 +1,714 @@
+"""Local BM25 full text store.
+
+An in-process BM25 inverted index for the keyword retrieval, no Elasticsearch
+cluster is needed. Every index is a directory of:
+
+- ``records.jsonl``: the id, content and metadata of every row, and the deleted
+  rows, replayed when the index is opened.
+- ``postings.json`` and ``postings/<generation>/``: the snapshot of the postings
+  of the first rows, stored as compact arrays and memory-mapped for searching:
+  ``offsets.i64`` (the postings range of every term), ``docs.i32`` (the rows),
+  ``tfs.i32`` (the term frequencies) and ``lengths.i32`` (the row lengths).
+
+The rows added after the snapshot are kept in the in-memory tail postings, they
+are merged into a new snapshot once the tail is large enough. The deleted rows
+are skipped by a bitmap, and dropped from the postings when they are merged.
+
+Like the local vector store, the writes and the merges of the processes sharing an
+index are serialized by the ``<index>.lock`` file next to the directory.
+
+A query is scored by gathering the postings of its terms and accumulating the
+BM25 contribution of every posting with numpy, only the rows containing a query
+term are scored.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dbgpt.configs.model_config import PILOT_PATH, resolve_root_path
+from dbgpt.core import Chunk
+from dbgpt.storage.base import IndexStoreConfig
+from dbgpt.storage.full_text.base import FullTextStoreBase
+from dbgpt.storage.vector_store.base import VectorStoreConfig
+from dbgpt.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from dbgpt.util.i18n_utils import _
+from dbgpt.util.similarity_util import top_k
+from dbgpt_ext.storage._local_files import (
+    _as_list,
+    _collection_dir_name,
+    _compare,
+    _file_stat,
+    _FileLock,
+)
+
+logger = logging.getLogger(__name__)
+
+_RECORDS_FILE = "records.jsonl"
+_POSTINGS_META_FILE = "postings.json"
+_POSTINGS_DIR = "postings"
+
+# Merge the tail postings into the snapshot after this number of rows are added
+_MERGE_MIN_ROWS = 1000
+# Rewrite the index when the deleted rows exceed the alive rows
+_COMPACT_MIN_DELETED_ROWS = 1000
+
+_TOKENIZERS = ["cjk", "jieba"]
+
+# Chinese, Japanese and Korean characters, they are not separated by spaces
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN_PATTERN = re.compile(rf"[{_CJK_CHARS}]+|[^\W_{_CJK_CHARS}]+")
+_CJK_PATTERN = re.compile(rf"[{_CJK_CHARS}]")
+
+
+def _cjk_bigrams(run: str) -> List[str]:
+    """Split a CJK run into the characters and the overlapping bigrams."""
+    tokens = list(run)
+    tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _tokenize(text: str, split_cjk: Callable[[str], List[str]]) -> List[str]:
+    tokens: List[str] = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        if _CJK_PATTERN.match(word):
+            tokens.extend(split_cjk(word))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def get_tokenizer(name: str = "cjk") -> Callable[[str], List[str]]:
+    """Get the tokenizer of the BM25 index.
+
+    Both tokenizers split the other text into the lowercase words and numbers,
+    they only differ in the CJK text:
+
+    - ``cjk``: the characters and the overlapping bigrams, no dependency.
+    - ``jieba``: the words segmented by jieba in the search mode.
+
+    Args:
+        name(str): The tokenizer name, cjk or jieba.
+
+    Returns:
+        Callable[[str], List[str]]: The tokenizer.
+    """
+    if name == "cjk":
+        return lambda text: _tokenize(text, _cjk_bigrams)
+    elif name == "jieba":
+        try:
+            import jieba
+        except ImportError:
+            raise ValueError("Please install it with `pip install jieba`.")
+
+        def _split_jieba(run: str) -> List[str]:
+            return [w for w in jieba.lcut_for_search(run) if w.strip()]
+
+        return lambda text: _tokenize(text, _split_jieba)
+    raise ValueError(f"Unsupported tokenizer: {name}, must be one of {_TOKENIZERS}")
+
+
+@dataclass
+class LocalBM25Config(VectorStoreConfig):
+    """Local BM25 full text store config."""
+
+    __type__ = "local_bm25"
+
+    persist_path: Optional[str] = field(
+        default=os.getenv("LOCAL_BM25_PERSIST_PATH", None),
+        metadata={
+            "help": _("The persist path of the BM25 index."),
+        },
+    )
+    tokenizer: str = field(
+        default="cjk",
+        metadata={
+            "help": _(
+                "The tokenizer, cjk splits the CJK text into characters and bigrams, "
+                "jieba segments it into words and requires jieba."
+            ),
+            "valid_values": _TOKENIZERS,
+        },
+    )
+
+    def create_store(self, **kwargs) -> "LocalBM25Store":
+        """Create index store."""
+        return LocalBM25Store(config=self, **kwargs)
+
+
+class _BM25Index:
+    """The rows and postings of one index, shared by all the stores of the index."""
+
+    def __init__(self, path: str, tokenizer: str):
+        self.path = path
+        self._tokenizer_name = tokenizer
+        self._tokenize = get_tokenizer(tokenizer)
+        self._lock = threading.RLock()
+        # The writes also lock the other processes out
+        self._write_lock = _FileLock(path, self._lock)
+        self._reset()
+        self._load()
+
+    def _reset(self) -> None:
+        self.ids: List[str] = []
+        self.contents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.lengths = np.zeros(0, dtype=np.int32)
+        self._tail_lengths: List[int] = []
+        # The alive row of every id
+        self._id_rows: Dict[str, int] = {}
+        # The identity of the records file, a snapshot of another file is ignored
+        self._records_uid: Optional[str] = None
+        self._records_stat: Optional[Tuple[int, int]] = None
+        self._records_offset = 0
+        # The snapshot postings of the first `_snapshot_rows` rows
+        self._snapshot_rows = 0
+        self._vocab: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.int32)
+        # The tail postings of the rows after the snapshot: term -> (rows, tfs)
+        self._tail: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._avg_length: Optional[float] = None
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.ids)
+
+    @property
+    def num_alive(self) -> int:
+        return len(self._id_rows)
+
+    def _file(self, *names: str) -> str:
+        return os.path.join(self.path, *names)
+
+    def _load(self) -> None:
+        """Replay the records appended since the last load."""
+        records_path = self._file(_RECORDS_FILE)
+        if not os.path.exists(records_path):
+            return
+        with open(records_path, "rb") as f:
+            f.seek(self._records_offset)
+            data = f.read()
+        # Ignore the last line if it is partially written
+        end = data.rfind(b"\n") + 1
+        records = [json.loads(line) for line in data[:end].splitlines() if line]
+        # A snapshot of the rows not read yet is ignored
+        max_rows = self.num_rows + sum(1 for record in records if "id" in record)
+        for record in records:
+            self._replay(record, max_rows)
+        self._records_offset += end
+        self._records_stat = _file_stat(records_path)
+        self.lengths = np.concatenate(
+            [
+                self.lengths[: self._snapshot_rows],
+                np.asarray(self._tail_lengths, dtype=np.int32),
+            ]
+        )
+        alive = np.zeros(self.num_rows, dtype=bool)
+        alive[list(self._id_rows.values())] = True
+        self.alive = alive
+        self._avg_length = None
+        if self.num_rows - self._snapshot_rows >= _MERGE_MIN_ROWS:
+            self._merge()
+
+    def _replay(self, record: Dict[str, Any], max_rows: int) -> None:
+        if "deleted" in record:
+            for row in record["deleted"]:
+                self._delete_row(row)
+            return
+        if "uid" in record:
+            self._records_uid = record["uid"]
+            self._open_snapshot(max_rows)
+            return
+        row = len(self.ids)
+        chunk_id = record["id"]
+        self.ids.append(chunk_id)
+        self.contents.append(record["content"])
+        self.metadatas.append(record["metadata"])
+        old_row = self._id_rows.get(chunk_id)
+        if old_row is not None:
+            self._delete_row(old_row)
+        self._id_rows[chunk_id] = row
+        if row >= self._snapshot_rows:
+            self._add_tail_postings(row, record["content"])
+
+    def _delete_row(self, row: int) -> None:
+        chunk_id = self.ids[row]
+        if self._id_rows.get(chunk_id) == row:
+            del self._id_rows[chunk_id]
+
+    def _add_tail_postings(self, row: int, content: str) -> None:
+        term_freqs = Counter(self._tokenize(content))
+        for term, tf in term_freqs.items():
+            rows, tfs = self._tail.setdefault(term, ([], []))
+            rows.append(row)
+            tfs.append(tf)
+        self._tail_lengths.append(sum(term_freqs.values()))
+
+    def _open_snapshot(self, max_rows: int) -> None:
+        """Open the postings snapshot of the records file, if any."""
+        try:
+            with open(self._file(_POSTINGS_META_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return
+        if (
+            meta["uid"] != self._records_uid
+            or meta["tokenizer"] != self._tokenizer_name
+            or meta["rows"] > max_rows
+        ):
+            return
+        snapshot_dir = self._file(_POSTINGS_DIR, meta["generation"])
+        num_terms, num_postings = len(meta["terms"]), meta["postings"]
+        try:
+            offsets = _open_array(snapshot_dir, "offsets.i64", num_terms + 1)
+            docs = _open_array(snapshot_dir, "docs.i32", num_postings)
+            tfs = _open_array(snapshot_dir, "tfs.i32", num_postings)
+            lengths = _open_array(snapshot_dir, "lengths.i32", meta["rows"])
+        except (FileNotFoundError, ValueError) as e:
+            # Replaced by another process, the rows are tokenized again
+            logger.warning(f"Open the BM25 postings {snapshot_dir} failed: {e}")
+            return
+        self._terms = meta["terms"]
+        self._vocab = {term: i for i, term in enumerate(self._terms)}
+        self._offsets, self._docs, self._tfs = offsets, docs, tfs
+        self.lengths = lengths
+        self._snapshot_rows = meta["rows"]
+
+    def _merge(self) -> None:
+        """Merge the tail postings into a new snapshot, drop the deleted rows."""
+        # A merge may start from the refresh of a search
+        with self._write_lock:
+            self._merge_tail()
+
+    def _merge_tail(self) -> None:
+        terms = list(self._terms)
+        vocab = dict(self._vocab)
+        term_parts = [np.repeat(np.arange(len(terms)), np.diff(self._offsets))]
+        doc_parts = [np.asarray(self._docs)]
+        tf_parts = [np.asarray(self._tfs)]
+        for term, (rows, tfs) in self._tail.items():
+            term_id = vocab.get(term)
+            if term_id is None:
+                term_id = vocab[term] = len(terms)
+                terms.append(term)
+            term_parts.append(np.full(len(rows), term_id))
+            doc_parts.append(np.asarray(rows, dtype=np.int32))
+            tf_parts.append(np.asarray(tfs, dtype=np.int32))
+        term_ids = np.concatenate(term_parts)
+        docs = np.concatenate(doc_parts)
+        tfs = np.concatenate(tf_parts)
+        keep = self.alive[docs]
+        term_ids, docs, tfs = term_ids[keep], docs[keep], tfs[keep]
+        # The postings of a term are kept in the row order by the stable sort
+        order = np.argsort(term_ids, kind="stable")
+        counts = np.bincount(term_ids, minlength=len(terms))
+        used = counts > 0
+        offsets = np.zeros(int(np.count_nonzero(used)) + 1, dtype=np.int64)
+        np.cumsum(counts[used], out=offsets[1:])
+
+        generation = uuid.uuid4().hex
+        snapshot_dir = self._file(_POSTINGS_DIR, generation)
+        os.makedirs(snapshot_dir)
+        for name, array in [
+            ("offsets.i64", offsets),
+            ("docs.i32", docs[order].astype(np.int32)),
+            ("tfs.i32", tfs[order].astype(np.int32)),
+            ("lengths.i32", self.lengths.astype(np.int32)),
+        ]:
+            array.tofile(os.path.join(snapshot_dir, name))
+        meta = {
+            "uid": self._records_uid,
+            "tokenizer": self._tokenizer_name,
+            "generation": generation,
+            "rows": self.num_rows,
+            "postings": len(docs),
+            "terms": [term for term, u in zip(terms, used.tolist()) if u],
+        }
+        meta_path = self._file(_POSTINGS_META_FILE)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(meta_path + ".tmp", meta_path)
+        for name in os.listdir(self._file(_POSTINGS_DIR)):
+            if name != generation:
+                shutil.rmtree(self._file(_POSTINGS_DIR, name), ignore_errors=True)
+        self._tail = {}
+        self._tail_lengths = []
+        self._open_snapshot(self.num_rows)
+
+    def refresh(self) -> None:
+        """Load the rows written by the other processes."""
+        stat = _file_stat(self._file(_RECORDS_FILE))
+        with self._lock:
+            if stat == self._records_stat:
+                return
+            if (
+                stat is None
+                or self._records_stat is None
+                or stat[0] != self._records_stat[0]
+                or stat[1] < self._records_offset
+            ):
+                # The index is rewritten or removed
+                self._reset()
+            self._load()
+
+    def add(
+        self, ids: List[str], contents: List[str], metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """Append the rows, the rows of the existing ids are replaced."""
+        with self._write_lock:
+            self.refresh()
+            records: List[Dict[str, Any]] = []
+            if self._records_uid is None:
+                os.makedirs(self.path, exist_ok=True)
+                records.append({"uid": uuid.uuid4().hex})
+            records.extend(
+                {"id": chunk_id, "content": content, "metadata": metadata}
+                for chunk_id, content, metadata in zip(ids, contents, metadatas)
+            )
+            self._append_records(records)
+
+    def delete(self, ids: List[str]) -> List[str]:
+        """Delete the rows of the ids, return the deleted ids."""
+        with self._write_lock:
+            self.refresh()
+            rows = [self._id_rows[i] for i in ids if i in self._id_rows]
+            if not rows:
+                return []
+            deleted_ids = [self.ids[row] for row in rows]
+            self._append_records([{"deleted": rows}])
+            deleted = self.num_rows - self.num_alive
+            if deleted >= _COMPACT_MIN_DELETED_ROWS and deleted > self.num_alive:
+                self._compact()
+            return deleted_ids
+
+    def truncate(self) -> List[str]:
+        """Delete all the rows, return the deleted ids."""
+        with self._write_lock:
+            self.refresh()
+            ids = list(self._id_rows)
+            self.remove()
+            return ids
+
+    def remove(self) -> None:
+        """Remove the files of the index."""
+        with self._write_lock:
+            if os.path.exists(self.path):
+                shutil.rmtree(self.path)
+            self._reset()
+
+    def _append_records(self, records: List[Dict[str, Any]]) -> None:
+        lines = "".join(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in records
+        )
+        with open(self._file(_RECORDS_FILE), "ab") as f:
+            f.write(lines.encode("utf-8"))
+        self._load()
+
+    def _compact(self) -> None:
+        """Rewrite the index with only the alive rows."""
+        logger.info(
+            f"Compact the local BM25 index {self.path}, "
+            f"{self.num_alive}/{self.num_rows} rows are alive"
+        )
+        tmp_records = self._file(_RECORDS_FILE + ".tmp")
+        with open(tmp_records, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"uid": uuid.uuid4().hex}) + "\n")
+            for row in sorted(self._id_rows.values()):
+                record = {
+                    "id": self.ids[row],
+                    "content": self.contents[row],
+                    "metadata": self.metadatas[row],
+                }
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        os.replace(tmp_records, self._file(_RECORDS_FILE))
+        self._reset()
+        self._load()
+
+    def _term_postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the rows and term frequencies of a term."""
+        doc_parts, tf_parts = [], []
+        term_id = self._vocab.get(term)
+        if term_id is not None:
+            start, end = self._offsets[term_id], self._offsets[term_id + 1]
+            doc_parts.append(self._docs[start:end])
+            tf_parts.append(self._tfs[start:end])
+        tail = self._tail.get(term)
+        if tail is not None:
+            doc_parts.append(np.asarray(tail[0], dtype=np.int32))
+            tf_parts.append(np.asarray(tail[1], dtype=np.int32))
+        if not doc_parts:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+        return np.concatenate(doc_parts), np.concatenate(tf_parts)
+
+    def search(
+        self,
+        text: str,
+        topk: int,
+        k1: float,
+        b: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search the rows of the highest BM25 scores."""
+        terms = set(self._tokenize(text))
+        self.refresh()
+        with self._lock:
+            if not terms or topk <= 0 or self.num_alive == 0:
+                return []
+            ids, contents, metadatas = self.ids, self.contents, self.metadatas
+            alive, lengths = self.alive, self.lengths
+            num_alive = self.num_alive
+            if self._avg_length is None:
+                self._avg_length = float(lengths[alive].mean()) or 1.0
+            avg_length = self._avg_length
+            postings = [self._term_postings(term) for term in terms]
+        doc_parts, tf_parts, idf_parts = [], [], []
+        for docs, tfs in postings:
+            keep = alive[docs]
+            df = int(np.count_nonzero(keep))
+            if df == 0:
+                continue
+            # The Lucene BM25 idf, it is always positive
+            idf = np.log1p((num_alive - df + 0.5) / (df + 0.5))
+            doc_parts.append(docs[keep])
+            tf_parts.append(tfs[keep])
+            idf_parts.append(np.full(df, idf, dtype=np.float32))
+        if not doc_parts:
+            return []
+        docs = np.concatenate(doc_parts)
+        tfs = np.concatenate(tf_parts).astype(np.float32)
+        norms = k1 * (1.0 - b + b * lengths[docs] / avg_length)
+        weights = np.concatenate(idf_parts) * tfs * (k1 + 1.0) / (tfs + norms)
+        rows, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+        if filters and filters.filters:
+            matched = np.fromiter(
+                (_match_filters(metadatas[row], filters) for row in rows.tolist()),
+                dtype=bool,
+                count=len(rows),
+            )
+            rows, scores = rows[matched], scores[matched]
+        indexes, top_scores = top_k(scores, topk)
+        return [
+            Chunk(
+                content=contents[row],
+                metadata=metadatas[row],
+                score=score,
+                chunk_id=ids[row],
+                retriever="full_text",
+            )
+            for row, score in zip(rows[indexes].tolist(), top_scores.tolist())
+        ]
+
+
+_INDEXES: Dict[str, _BM25Index] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _get_index(path: str, tokenizer: str) -> _BM25Index:
+    """Get the shared index of the path, open it if not opened."""
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(path)
+        if index is None:
+            index = _BM25Index(path, tokenizer)
+            _INDEXES[path] = index
+        return index
+
+
+class LocalBM25Store(FullTextStoreBase):
+    """Local BM25 full text store."""
+
+    def __init__(
+        self,
+        config: LocalBM25Config,
+        name: Optional[str] = "dbgpt",
+        k1: Optional[float] = 2.0,
+        b: Optional[float] = 0.75,
+        executor: Optional[Executor] = None,
+        persist_dir: Optional[str] = None,
+    ):
+        """Create a LocalBM25Store instance.
+
+        Args:
+            config(LocalBM25Config): The store config.
+            name(str): The index name.
+            k1(Optional[float]): Controls non-linear term frequency normalization
+                (saturation). The default value is 2.0.
+            b(Optional[float]): Controls to what degree document length normalizes
+                tf values. The default value is 0.75.
+            executor(Optional[Executor]): The executor of the async methods.
+            persist_dir(Optional[str]): The directory of the index, default is the
+                index name under the persist path.
+        """
+        super().__init__(executor)
+        self._config = config
+        self._k1 = k1 or 2.0
+        self._b = b or 0.75
+        if persist_dir is None:
+            persist_path = config.persist_path or os.path.join(PILOT_PATH, "data")
+            persist_dir = os.path.join(
+                resolve_root_path(persist_path),
+                "local_bm25",
+                _collection_dir_name(name),
+            )
+        self._index = _get_index(persist_dir, config.tokenizer)
+
+    def get_config(self) -> IndexStoreConfig:
+        """Get the store config."""
+        return self._config
+
+    def load_document(self, chunks: List[Chunk]) -> List[str]:
+        """Load document in the BM25 index.
+
+        Args:
+            chunks(List[Chunk]): document chunks.
+
+        Return:
+            List[str]: chunk ids.
+        """
+        if not chunks:
+            return []
+        ids = [chunk.chunk_id for chunk in chunks]
+        self._index.add(
+            ids,
+            [chunk.content for chunk in chunks],
+            [chunk.metadata or {} for chunk in chunks],
+        )
+        return ids
+
+    def similar_search(
+        self, text: str, topk: int, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        """Search similar text.
+
+        Args:
+            text(str): text.
+            topk(int): topk.
+            filters(MetadataFilters): filters.
+
+        Return:
+            List[Chunk]: similar text.
+        """
+        return self._index.search(text, topk, self._k1, self._b, filters)
+
+    def similar_search_with_scores(
+        self,
+        text,
+        top_k: int = 10,
+        score_threshold: float = 0.3,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search similar text with scores.
+
+        Args:
+            text(str): text.
+            top_k(int): top k.
+            score_threshold(float): The min BM25 score.
+            filters(MetadataFilters): filters.
+
+        Return:
+            List[Chunk]: similar text with scores.
+        """
+        chunks = self._index.search(text, top_k, self._k1, self._b, filters)
+        chunks_with_scores = [
+            chunk for chunk in chunks if chunk.score >= (score_threshold or 0.0)
+        ]
+        if score_threshold is not None and len(chunks_with_scores) == 0:
+            logger.warning(
+                "No relevant docs were retrieved using the relevance score"
+                f" threshold {score_threshold}"
+            )
+        return chunks_with_scores
+
+    def full_text_search(
+        self, text: str, topk: int, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        """Full text search in the BM25 index."""
+        return self.similar_search(text, topk, filters)
+
+    def is_support_full_text_search(self) -> bool:
+        """Support full text search."""
+        return True
+
+    def delete_by_ids(self, ids: str) -> List[str]:
+        """Delete document by ids.
+
+        Args:
+            ids(str): document ids, separated by comma.
+        Return:
+            return ids.
+        """
+        return self._index.delete(ids.split(","))
+
+    def delete_vector_name(self, index_name: str):
+        """Delete index by name.
+
+        Args:
+            index_name(str): The name of index to delete.
+        """
+        self._index.remove()
+
+    def truncate(self) -> List[str]:
+        """Truncate the index."""
+        return self._index.truncate()
+
+
+def _open_array(directory: str, name: str, size: int) -> np.ndarray:
+    """Memory-map an array file of the postings snapshot."""
+    dtype = np.int64 if name.endswith(".i64") else np.int32
+    path = os.path.join(directory, name)
+    if os.path.getsize(path) != size * np.dtype(dtype).itemsize:
+        raise ValueError(f"The size of {path} does not match the snapshot")
+    if size == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(size,))
+
+
+def _match_filter(metadata: Dict[str, Any], metadata_filter: MetadataFilter) -> bool:
+    key, value = metadata_filter.key, metadata_filter.value
+    operator = metadata_filter.operator
+    if operator == FilterOperator.EXISTS:
+        return (key in metadata) == bool(value)
+    if key not in metadata:
+        return False
+    actual = metadata[key]
+    if operator in (FilterOperator.EQ, FilterOperator.IN):
+        return actual in _as_list(value)
+    elif operator == FilterOperator.NE:
+        return actual != value
+    elif operator == FilterOperator.NIN:
+        return actual not in _as_list(value)
+    elif operator in (
+        FilterOperator.GT,
+        FilterOperator.GTE,
+        FilterOperator.LT,
+        FilterOperator.LTE,
+    ):
+        return _compare(actual, operator, value)
+    raise ValueError(f"Local BM25 store operator {operator} not supported")
+
+
+def _match_filters(metadata: Dict[str, Any], filters: MetadataFilters) -> bool:
+    matches = (_match_filter(metadata, f) for f in filters.filters)
+    if filters.condition == FilterCondition.OR:
+        return any(matches)
+    return all(matches)
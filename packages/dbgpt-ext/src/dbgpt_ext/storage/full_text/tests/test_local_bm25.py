@@ -0,0 +1,241 @@
+import math
+import multiprocessing
+from collections import Counter
+from typing import List
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from dbgpt_ext.rag.assembler.bm25 import BM25Assembler
+from dbgpt_ext.rag.knowledge.string import StringKnowledge
+from dbgpt_ext.storage import _local_files
+from dbgpt_ext.storage.full_text import local_bm25
+from dbgpt_ext.storage.full_text.local_bm25 import (
+    LocalBM25Config,
+    LocalBM25Store,
+    get_tokenizer,
+)
+
+_TEXTS = [
+    "DB-GPT is an AI native data app development framework",
+    "The data app framework supports text to SQL and RAG",
+    "Text to SQL converts the natural language into SQL",
+    "数据库连接池的配置方法",
+    "知识库支持关键词检索和向量检索",
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_indexes():
+    local_bm25._INDEXES.clear()
+    yield
+    local_bm25._INDEXES.clear()
+
+
+def _create_store(path, name: str = "test_space") -> LocalBM25Store:
+    return LocalBM25Config(persist_path=str(path)).create_store(name=name)
+
+
+def _chunks() -> List[Chunk]:
+    return [
+        Chunk(chunk_id=f"id_{i}", content=text, metadata={"page": i})
+        for i, text in enumerate(_TEXTS)
+    ]
+
+
+def _bm25_scores(query: str, texts: List[str], k1: float = 2.0, b: float = 0.75):
+    """Score the texts one by one, the reference of the vectorized scoring."""
+    tokenize = get_tokenizer()
+    docs = [Counter(tokenize(text)) for text in texts]
+    avg_length = sum(sum(doc.values()) for doc in docs) / len(docs)
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(1 for d in docs if term in d)
+            if term not in doc:
+                continue
+            idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+            tf = doc[term]
+            norm = k1 * (1 - b + b * sum(doc.values()) / avg_length)
+            score += idf * tf * (k1 + 1) / (tf + norm)
+        scores.append(score)
+    return scores
+
+
+def test_tokenizer():
+    tokenize = get_tokenizer("cjk")
+    assert tokenize("Hello, DB-GPT 数据库!") == [
+        "hello",
+        "db",
+        "gpt",
+        "数",
+        "据",
+        "库",
+        "数据",
+        "据库",
+    ]
+    assert tokenize("v2版本") == ["v2", "版", "本", "版本"]
+    with pytest.raises(ValueError):
+        get_tokenizer("whitespace")
+
+
+def test_search_scores(tmp_path):
+    store = _create_store(tmp_path)
+    store.load_document(_chunks())
+    for query in ["text to SQL", "data framework", "数据库检索"]:
+        expected = _bm25_scores(query, _TEXTS)
+        results = store.similar_search_with_scores(query, 10, 0.0)
+        assert [chunk.score for chunk in results] == pytest.approx(
+            sorted((s for s in expected if s > 0), reverse=True), rel=1e-5
+        )
+        for chunk in results:
+            assert chunk.score == pytest.approx(expected[int(chunk.chunk_id[3:])])
+
+    results = store.similar_search("数据库", 1)
+    assert [chunk.chunk_id for chunk in results] == ["id_3"]
+    assert results[0].metadata == {"page": 3}
+    assert results[0].retriever == "full_text"
+    assert store.full_text_search("unknown words", 3) == []
+    assert store.similar_search_with_scores("SQL", 3, 100.0) == []
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        (
+            MetadataFilters(filters=[MetadataFilter(key="page", value=2)]),
+            ["id_2"],
+        ),
+        (
+            MetadataFilters(
+                filters=[
+                    MetadataFilter(key="page", operator=FilterOperator.LT, value=2),
+                    MetadataFilter(key="page", value=2),
+                ],
+                condition=FilterCondition.OR,
+            ),
+            ["id_0", "id_1", "id_2"],
+        ),
+        (
+            MetadataFilters(
+                filters=[
+                    MetadataFilter(key="page", operator=FilterOperator.GTE, value=1),
+                    MetadataFilter(key="page", operator=FilterOperator.NE, value=2),
+                ],
+            ),
+            ["id_1"],
+        ),
+    ],
+)
+def test_search_with_filters(tmp_path, filters, expected):
+    store = _create_store(tmp_path)
+    store.load_document(_chunks())
+    results = store.similar_search("text to SQL data", 5, filters)
+    assert sorted(chunk.chunk_id for chunk in results) == sorted(expected)
+
+
+@pytest.mark.parametrize("merge_min_rows", [1000, 2])
+def test_incremental_update_and_reopen(tmp_path, monkeypatch, merge_min_rows):
+    monkeypatch.setattr(local_bm25, "_MERGE_MIN_ROWS", merge_min_rows)
+    store = _create_store(tmp_path)
+    store.load_document(_chunks()[:3])
+    store.load_document(_chunks()[3:])
+    assert store.delete_by_ids("id_2,id_missing") == ["id_2"]
+    store.load_document([Chunk(chunk_id="id_0", content="replaced SQL content")])
+
+    texts = ["replaced SQL content", _TEXTS[1], _TEXTS[3], _TEXTS[4]]
+    expected = _bm25_scores("SQL", texts)
+    results = store.similar_search_with_scores("SQL", 5, 0.0)
+    assert [chunk.chunk_id for chunk in results] == ["id_0", "id_1"]
+    assert [chunk.score for chunk in results] == pytest.approx(expected[:2], rel=1e-5)
+
+    # Open the persisted index again
+    local_bm25._INDEXES.clear()
+    reopened = _create_store(tmp_path)
+    # The first 5 rows are read from the merged postings
+    assert reopened._index._snapshot_rows == (5 if merge_min_rows == 2 else 0)
+    results = reopened.similar_search_with_scores("SQL", 5, 0.0)
+    assert [chunk.chunk_id for chunk in results] == ["id_0", "id_1"]
+    assert [chunk.score for chunk in results] == pytest.approx(expected[:2], rel=1e-5)
+    assert reopened.similar_search("检索", 5)[0].chunk_id == "id_4"
+
+
+def test_refresh_rows_written_by_other_instance(tmp_path):
+    store = _create_store(tmp_path)
+    store.load_document(_chunks()[:2])
+    index = store._index
+    local_bm25._INDEXES.clear()
+    _create_store(tmp_path).load_document(_chunks()[2:])
+    assert store._index is index
+    assert store.similar_search("数据库", 1)[0].chunk_id == "id_3"
+
+
+def test_compact_deleted_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_bm25, "_COMPACT_MIN_DELETED_ROWS", 1)
+    monkeypatch.setattr(local_bm25, "_MERGE_MIN_ROWS", 2)
+    store = _create_store(tmp_path)
+    store.load_document(_chunks())
+    store.delete_by_ids("id_0,id_1,id_2")
+    assert store._index.num_rows == 2
+    assert store.similar_search("SQL", 5) == []
+    assert [chunk.chunk_id for chunk in store.similar_search("检索", 5)] == ["id_4"]
+
+
+def test_truncate_and_delete(tmp_path):
+    store = _create_store(tmp_path)
+    store.load_document(_chunks())
+    assert sorted(store.truncate()) == [f"id_{i}" for i in range(5)]
+    assert store.similar_search("SQL", 5) == []
+    store.load_document(_chunks())
+    store.delete_vector_name("test_space")
+    assert store.similar_search("SQL", 5) == []
+
+
+def test_bm25_assembler_with_local_store(tmp_path):
+    store = _create_store(tmp_path)
+    assembler = BM25Assembler.load_from_knowledge(
+        knowledge=StringKnowledge(text="\n\n".join(_TEXTS)),
+        full_text_store=store,
+    )
+    assert len(assembler.persist()) == len(assembler.get_chunks())
+    retriever = assembler.as_retriever(1)
+    chunks = retriever.retrieve_with_scores("natural language", 0.0)
+    assert len(chunks) == 1
+    assert "natural language" in chunks[0].content
+
+
+def _add_rows(path, worker: int, num_rows: int):
+    local_bm25._INDEXES.clear()
+    store = _create_store(path)
+    for i in range(num_rows):
+        store.load_document(
+            [Chunk(chunk_id=f"w{worker}_{i}", content=f"worker{worker} row{i}")]
+        )
+
+
+@pytest.mark.skipif(_local_files.fcntl is None, reason="Requires fcntl")
+def test_write_from_multiple_processes(tmp_path, monkeypatch):
+    # Merge the postings often, the merges also run in parallel
+    monkeypatch.setattr(local_bm25, "_MERGE_MIN_ROWS", 7)
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=_add_rows, args=(tmp_path, worker, 20))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    store = _create_store(tmp_path)
+    assert len(set(store._index.ids)) == store._index.num_alive == 80
+    results = store.similar_search_with_scores("worker2 row13", 1, 0.0)
+    assert results[0].chunk_id == "w2_13"
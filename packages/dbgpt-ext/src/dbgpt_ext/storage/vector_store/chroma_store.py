@@ -18,6 +18,7 @@ from dbgpt.storage.vector_store.base import (
 )
 from dbgpt.storage.vector_store.filters import FilterOperator, MetadataFilters
 from dbgpt.util import string_utils
+from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
 from dbgpt.util.i18n_utils import _
 
 logger = logging.getLogger(__name__)
@@ -200,23 +201,96 @@ class ChromaStore(VectorStoreBase):
             topk=topk,
             filters=filters,
         )
-        chunks = [
-            (
-                Chunk(
-                    content=chroma_result[0],
-                    metadata=chroma_result[1] or {},
-                    score=(1 - chroma_result[2]),
-                    chunk_id=chroma_result[3],
-                )
+        chunks = self._to_chunks(chroma_results, 0)
+        return self.filter_by_score_threshold(chunks, score_threshold)
+
+    def embed_query(self, text: str) -> Optional[List[float]]:
+        """Embed the query text to search by the vector."""
+        if self.embeddings is None:
+            raise ValueError("Chroma Embeddings is None")
+        return self.embeddings.embed_query(text)
+
+    def similar_search_with_scores_by_vector(
+        self,
+        embedding: List[float],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search similar documents with scores by the query vector."""
+        where_filters = self.convert_metadata_filters(filters) if filters else None
+        chroma_results = self._collection.query(
+            query_embeddings=[embedding],  # type: ignore
+            n_results=topk,
+            where=where_filters,
+        )
+        chunks = self._to_chunks(chroma_results, 0)
+        return self.filter_by_score_threshold(chunks, score_threshold)
+
+    def similar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Search similar documents with scores of multiple queries.
+
+        All the queries are embedded in one call and searched by one Chroma query.
+        """
+        if not texts:
+            return []
+        where_filters = self.convert_metadata_filters(filters) if filters else None
+        if self.embeddings is None:
+            raise ValueError("Chroma Embeddings is None")
+        query_embeddings = self.embeddings.embed_queries(texts)
+        chroma_results = self._collection.query(
+            query_embeddings=query_embeddings,  # type: ignore
+            n_results=topk,
+            where=where_filters,
+        )
+        return [
+            self.filter_by_score_threshold(
+                self._to_chunks(chroma_results, i), score_threshold
             )
-            for chroma_result in zip(
-                chroma_results["documents"][0],
-                chroma_results["metadatas"][0],
-                chroma_results["distances"][0],
-                chroma_results["ids"][0],
+            for i in range(len(texts))
+        ]
+
+    async def asimilar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+        concurrency_limit: Optional[int] = None,
+    ) -> List[List[Chunk]]:
+        """Async search similar documents with scores of multiple queries."""
+        return await blocking_func_to_async_no_executor(
+            self.similar_search_with_scores_batch,
+            texts,
+            topk,
+            score_threshold,
+            filters,
+        )
+
+    def _to_chunks(self, chroma_results, index: int) -> List[Chunk]:
+        """Convert the results of the query at the index to chunks."""
+        if not chroma_results:
+            return []
+        return [
+            Chunk(
+                content=content,
+                metadata=metadata or {},
+                score=(1 - distance),
+                chunk_id=chunk_id,
+            )
+            for content, metadata, distance, chunk_id in zip(
+                chroma_results["documents"][index],
+                chroma_results["metadatas"][index],
+                chroma_results["distances"][index],
+                chroma_results["ids"][index],
             )
         ]
-        return self.filter_by_score_threshold(chunks, score_threshold)
 
     async def afull_text_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
@@ -255,13 +329,41 @@ class ChromaStore(VectorStoreBase):
     def load_document(self, chunks: List[Chunk]) -> List[str]:
         """Load document to vector store."""
         logger.info("ChromaStore load document")
+        return self._load_chunks(chunks)
+
+    def supports_embedding_stage(self) -> bool:
+        """Whether the chunks can be embedded before they are written."""
+        return self.embeddings is not None
+
+    def embed_chunks(self, chunks: List[Chunk]) -> List[List[float]]:
+        """Embed the chunks to write with `load_document_with_embeddings`."""
+        return self.embeddings.embed_documents([chunk.content for chunk in chunks])
+
+    async def aembed_chunks(self, chunks: List[Chunk]) -> List[List[float]]:
+        """Async embed the chunks to write with `aload_document_with_embeddings`."""
+        return await self.embeddings.aembed_documents(
+            [chunk.content for chunk in chunks]
+        )
+
+    def load_document_with_embeddings(
+        self, chunks: List[Chunk], embeddings: List[List[float]]
+    ) -> List[str]:
+        """Load the embedded document to vector store."""
+        logger.info("ChromaStore load embedded document")
+        return self._load_chunks(chunks, embeddings)
+
+    def _load_chunks(
+        self, chunks: List[Chunk], embeddings: Optional[List[List[float]]] = None
+    ) -> List[str]:
         texts = [chunk.content for chunk in chunks]
         metadatas = [chunk.metadata for chunk in chunks]
         ids = [chunk.chunk_id for chunk in chunks]
         chroma_metadatas = [
             _transform_chroma_metadata(metadata) for metadata in metadatas
         ]
-        self._add_texts(texts=texts, metadatas=chroma_metadatas, ids=ids)
+        self._add_texts(
+            texts=texts, metadatas=chroma_metadatas, ids=ids, embeddings=embeddings
+        )
         return ids
 
     def delete_vector_name(self, vector_name: str):
@@ -378,6 +480,7 @@ class ChromaStore(VectorStoreBase):
         texts: Iterable[str],
         ids: List[str],
         metadatas: Optional[List[Mapping[str, Union[str, int, float, bool]]]] = None,
+        embeddings: Optional[List[List[float]]] = None,
     ) -> List[str]:
         """Add texts to Chroma collection.
 
@@ -385,12 +488,13 @@ class ChromaStore(VectorStoreBase):
             texts(Iterable[str]): texts.
             metadatas(Optional[List[dict]]): metadatas.
             ids(Optional[List[str]]): ids.
+            embeddings(Optional[List[List[float]]]): The vectors of the texts,
+                embedded here if not provided.
         Returns:
             List[str]: ids.
         """
-        embeddings = None
         texts = list(texts)
-        if self.embeddings is not None:
+        if embeddings is None and self.embeddings is not None:
             embeddings = self.embeddings.embed_documents(texts)
         if metadatas:
             try:
@@ -462,6 +566,10 @@ def _convert_chroma_filter_operator(operator: str) -> str:
         return "$gte"
     elif operator == FilterOperator.LTE:
         return "$lte"
+    elif operator == FilterOperator.IN:
+        return "$in"
+    elif operator == FilterOperator.NIN:
+        return "$nin"
     else:
         raise ValueError(f"Chroma Where operator {operator} not supported")
 
@@ -0,0 +1,815 @@
+"""Local vector store.
+
+An in-process vector store for the small and medium knowledge spaces, no server is
+needed. Every collection is a directory of:
+
+- ``vectors.f32``: the L2-normalized float32 matrix, appended row by row and
+  memory-mapped for searching.
+- ``records.jsonl``: the id, content and metadata of every row, and the deleted
+  rows, replayed when the collection is opened.
+- ``hnsw.bin``: the optional HNSW graph of the rows, requires ``hnswlib``.
+
+The metadata filters are evaluated by the bitmaps of the metadata values, and the
+rows are scored by one matrix product and selected by a partial sort.
+
+The processes sharing a collection write it under an exclusive lock of the
+``<collection>.lock`` file next to the directory, the readers load the appended
+rows without locking. The lock requires ``fcntl``, on the other platforms only one
+process may write a collection.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dbgpt.configs.model_config import PILOT_PATH, resolve_root_path
+from dbgpt.core import Chunk, Embeddings
+from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
+from dbgpt.storage.vector_store.base import (
+    _COMMON_PARAMETERS,
+    _VECTOR_STORE_COMMON_PARAMETERS,
+    VectorStoreBase,
+    VectorStoreConfig,
+)
+from dbgpt.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
+from dbgpt.util.i18n_utils import _
+from dbgpt.util.similarity_util import normalize_vectors, top_k
+from dbgpt_ext.storage._local_files import (
+    _as_list,
+    _collection_dir_name,
+    _compare,
+    _file_stat,
+    _FileLock,
+    _is_scalar,
+)
+
+logger = logging.getLogger(__name__)
+
+_VECTORS_FILE = "vectors.f32"
+_RECORDS_FILE = "records.jsonl"
+_HNSW_FILE = "hnsw.bin"
+
+# Below this number of candidate rows, the exact flat search is fast enough
+_FLAT_SEARCH_MAX_ROWS = 20000
+# Save the HNSW graph after this number of rows are added to it
+_HNSW_SAVE_MIN_ROWS = 1000
+# Rewrite the collection when the deleted rows exceed the alive rows
+_COMPACT_MIN_DELETED_ROWS = 1000
+
+_INDEX_TYPES = ["flat", "hnsw"]
+
+
+@register_resource(
+    _("Local Vector Config"),
+    "local_vector_config",
+    category=ResourceCategory.VECTOR_STORE,
+    description=_("Local vector store config."),
+    parameters=[
+        *_COMMON_PARAMETERS,
+        Parameter.build_from(
+            _("Persist Path"),
+            "persist_path",
+            str,
+            description=_("the persist path of vector store."),
+            optional=True,
+            default=None,
+        ),
+        Parameter.build_from(
+            _("Index Type"),
+            "index_type",
+            str,
+            description=_("the index type of vector store, flat or hnsw."),
+            optional=True,
+            default="flat",
+        ),
+    ],
+)
+@dataclass
+class LocalVectorConfig(VectorStoreConfig):
+    """Local vector store config."""
+
+    __type__ = "local"
+
+    persist_path: Optional[str] = field(
+        default=os.getenv("LOCAL_VECTOR_PERSIST_PATH", None),
+        metadata={
+            "help": _("The persist path of vector store."),
+        },
+    )
+    index_type: str = field(
+        default="flat",
+        metadata={
+            "help": _(
+                "The index type, flat for the exact search, hnsw for the approximate "
+                "search of the large collections, requires hnswlib."
+            ),
+            "valid_values": _INDEX_TYPES,
+        },
+    )
+    hnsw_m: int = field(
+        default=16,
+        metadata={
+            "help": _("The max number of the neighbors of a node in the HNSW graph."),
+        },
+    )
+    hnsw_ef_construction: int = field(
+        default=200,
+        metadata={
+            "help": _("The size of the candidate list when building the HNSW graph."),
+        },
+    )
+    hnsw_ef_search: int = field(
+        default=64,
+        metadata={
+            "help": _("The size of the candidate list when searching the HNSW graph."),
+        },
+    )
+    enable_full_text: bool = field(
+        default=False,
+        metadata={
+            "help": _(
+                "Whether to keep a BM25 index of the chunks for the full text and "
+                "hybrid search, the chunk contents are stored in it again."
+            ),
+        },
+    )
+    tokenizer: str = field(
+        default="cjk",
+        metadata={
+            "help": _("The tokenizer of the BM25 index, cjk or jieba."),
+        },
+    )
+
+    def create_store(self, **kwargs) -> "LocalVectorStore":
+        """Create index store."""
+        return LocalVectorStore(vector_store_config=self, **kwargs)
+
+
+class _LocalCollection:
+    """The rows of one collection, shared by all the stores of the collection."""
+
+    def __init__(self, path: str, config: LocalVectorConfig):
+        self.path = path
+        self._config = config
+        self._lock = threading.RLock()
+        # The writes also lock the other processes out
+        self._write_lock = _FileLock(path, self._lock)
+        self._reset()
+        self._load()
+
+    def _reset(self) -> None:
+        self.dim: Optional[int] = None
+        self.ids: List[str] = []
+        self.contents: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        # The alive row of every id
+        self._id_rows: Dict[str, int] = {}
+        # The rows of every metadata value: key -> value -> rows
+        self._postings: Dict[str, Dict[Any, List[int]]] = {}
+        self._bitmaps: Dict[Tuple[str, Any], np.ndarray] = {}
+        self._records_stat: Optional[Tuple[int, int]] = None
+        self._records_offset = 0
+        self._hnsw: Any = None
+        self._hnsw_rows = 0
+        self._hnsw_unavailable = False
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.ids)
+
+    @property
+    def num_alive(self) -> int:
+        return len(self._id_rows)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load(self) -> None:
+        """Replay the records appended since the last load."""
+        records_path = self._file(_RECORDS_FILE)
+        if not os.path.exists(records_path):
+            return
+        with open(records_path, "rb") as f:
+            f.seek(self._records_offset)
+            data = f.read()
+        # Ignore the last line if it is partially written
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line:
+                self._replay(json.loads(line))
+        self._records_offset += end
+        self._records_stat = _file_stat(records_path)
+        self._open_matrix()
+
+    def _replay(self, record: Dict[str, Any]) -> None:
+        if "deleted" in record:
+            for row in record["deleted"]:
+                self._delete_row(row)
+            return
+        if "dim" in record:
+            self.dim = record["dim"]
+            return
+        row = len(self.ids)
+        chunk_id = record["id"]
+        self.ids.append(chunk_id)
+        self.contents.append(record["content"])
+        self.metadatas.append(record["metadata"])
+        old_row = self._id_rows.get(chunk_id)
+        if old_row is not None:
+            self._delete_row(old_row)
+        self._id_rows[chunk_id] = row
+        for key, value in record["metadata"].items():
+            if _is_scalar(value):
+                self._postings.setdefault(key, {}).setdefault(value, []).append(row)
+
+    def _delete_row(self, row: int) -> None:
+        chunk_id = self.ids[row]
+        if self._id_rows.get(chunk_id) == row:
+            del self._id_rows[chunk_id]
+
+    def _open_matrix(self) -> None:
+        num_rows = self.num_rows
+        if self.dim is None or num_rows == 0:
+            self.matrix = np.zeros((0, self.dim or 0), dtype=np.float32)
+        else:
+            self.matrix = np.memmap(
+                self._file(_VECTORS_FILE),
+                dtype=np.float32,
+                mode="r",
+                shape=(num_rows, self.dim),
+            )
+        alive = np.zeros(num_rows, dtype=bool)
+        alive[list(self._id_rows.values())] = True
+        self.alive = alive
+        self._bitmaps = {}
+
+    def refresh(self) -> None:
+        """Load the rows written by the other processes."""
+        stat = _file_stat(self._file(_RECORDS_FILE))
+        with self._lock:
+            if stat == self._records_stat:
+                return
+            if (
+                stat is None
+                or self._records_stat is None
+                or stat[0] != self._records_stat[0]
+                or stat[1] < self._records_offset
+            ):
+                # The collection is rewritten or removed
+                self._reset()
+            self._load()
+
+    def add(
+        self,
+        ids: List[str],
+        contents: List[str],
+        metadatas: List[Dict[str, Any]],
+        vectors: np.ndarray,
+    ) -> None:
+        """Append the rows, the rows of the existing ids are replaced."""
+        vectors = normalize_vectors(np.asarray(vectors, dtype=np.float32))
+        with self._write_lock:
+            self.refresh()
+            records = []
+            if self.dim is None:
+                os.makedirs(self.path, exist_ok=True)
+                records.append({"dim": int(vectors.shape[1])})
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"The dimension of the vectors {vectors.shape[1]} does not match "
+                    f"the collection dimension {self.dim}"
+                )
+            records.extend(
+                {"id": chunk_id, "content": content, "metadata": metadata}
+                for chunk_id, content, metadata in zip(ids, contents, metadatas)
+            )
+            # Write the vectors first, the rows without records are ignored
+            with open(self._file(_VECTORS_FILE), "r+b" if self.dim else "wb") as f:
+                f.seek(self.num_rows * vectors.shape[1] * 4)
+                f.write(vectors.tobytes())
+                f.truncate()
+            self._append_records(records)
+
+    def delete(self, ids: List[str]) -> List[str]:
+        """Delete the rows of the ids, return the deleted ids."""
+        with self._write_lock:
+            self.refresh()
+            rows = [self._id_rows[i] for i in ids if i in self._id_rows]
+            if not rows:
+                return []
+            deleted_ids = [self.ids[row] for row in rows]
+            self._append_records([{"deleted": rows}])
+            deleted = self.num_rows - self.num_alive
+            if deleted >= _COMPACT_MIN_DELETED_ROWS and deleted > self.num_alive:
+                self._compact()
+            return deleted_ids
+
+    def truncate(self) -> List[str]:
+        """Delete all the rows, return the deleted ids."""
+        with self._write_lock:
+            self.refresh()
+            ids = list(self._id_rows)
+            self.remove()
+            return ids
+
+    def remove(self) -> None:
+        """Remove the files of the collection."""
+        with self._write_lock:
+            if os.path.exists(self.path):
+                shutil.rmtree(self.path)
+            self._reset()
+
+    def _append_records(self, records: List[Dict[str, Any]]) -> None:
+        lines = "".join(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in records
+        )
+        with open(self._file(_RECORDS_FILE), "ab") as f:
+            f.write(lines.encode("utf-8"))
+        self._load()
+
+    def _compact(self) -> None:
+        """Rewrite the collection with only the alive rows."""
+        logger.info(
+            f"Compact the local vector collection {self.path}, "
+            f"{self.num_alive}/{self.num_rows} rows are alive"
+        )
+        rows = sorted(self._id_rows.values())
+        tmp_vectors = self._file(_VECTORS_FILE + ".tmp")
+        tmp_records = self._file(_RECORDS_FILE + ".tmp")
+        with open(tmp_vectors, "wb") as f:
+            for start in range(0, len(rows), 4096):
+                f.write(np.asarray(self.matrix[rows[start : start + 4096]]).tobytes())
+        with open(tmp_records, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"dim": self.dim}) + "\n")
+            for row in rows:
+                record = {
+                    "id": self.ids[row],
+                    "content": self.contents[row],
+                    "metadata": self.metadatas[row],
+                }
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        hnsw_path = self._file(_HNSW_FILE)
+        if os.path.exists(hnsw_path):
+            os.remove(hnsw_path)
+        os.replace(tmp_vectors, self._file(_VECTORS_FILE))
+        os.replace(tmp_records, self._file(_RECORDS_FILE))
+        self._reset()
+        self._load()
+
+    def filter_mask(self, filters: Optional[MetadataFilters]) -> np.ndarray:
+        """Return the bitmap of the alive rows matching the filters."""
+        if not filters or not filters.filters:
+            return self.alive
+        masks = [self._filter_bitmap(f) for f in filters.filters]
+        if filters.condition == FilterCondition.OR:
+            mask = np.logical_or.reduce(masks)
+        else:
+            mask = np.logical_and.reduce(masks)
+        return mask & self.alive
+
+    def _filter_bitmap(self, metadata_filter: MetadataFilter) -> np.ndarray:
+        key, value = metadata_filter.key, metadata_filter.value
+        operator = metadata_filter.operator
+        values = self._postings.get(key, {})
+        if operator == FilterOperator.EQ and _is_scalar(value):
+            return self._bitmap(key, value)
+        elif operator in (FilterOperator.EQ, FilterOperator.IN):
+            return self._union(key, [v for v in _as_list(value) if v in values])
+        elif operator == FilterOperator.NE:
+            return self._union(key, [v for v in values if v != value])
+        elif operator == FilterOperator.NIN:
+            excluded = _as_list(value)
+            return self._union(key, [v for v in values if v not in excluded])
+        elif operator == FilterOperator.EXISTS:
+            exists = self._union(key, list(values))
+            return exists if value else ~exists
+        elif operator in (
+            FilterOperator.GT,
+            FilterOperator.GTE,
+            FilterOperator.LT,
+            FilterOperator.LTE,
+        ):
+            return self._union(key, [v for v in values if _compare(v, operator, value)])
+        raise ValueError(f"Local vector store operator {operator} not supported")
+
+    def _bitmap(self, key: str, value: Any) -> np.ndarray:
+        cache_key = (key, value)
+        bitmap = self._bitmaps.get(cache_key)
+        if bitmap is None:
+            bitmap = np.zeros(self.num_rows, dtype=bool)
+            rows = self._postings.get(key, {}).get(value)
+            if rows:
+                bitmap[rows] = True
+            self._bitmaps[cache_key] = bitmap
+        return bitmap
+
+    def _union(self, key: str, values: List[Any]) -> np.ndarray:
+        bitmap = np.zeros(self.num_rows, dtype=bool)
+        for value in values:
+            bitmap |= self._bitmap(key, value)
+        return bitmap
+
+    def search(
+        self, queries: np.ndarray, topk: int, filters: Optional[MetadataFilters]
+    ) -> List[List[Chunk]]:
+        """Search the most similar rows of every query."""
+        self.refresh()
+        with self._lock:
+            # The compaction replaces the lists and the matrix, the snapshot is
+            # still consistent after the lock is released
+            ids, contents, metadatas = self.ids, self.contents, self.metadatas
+            matrix = self.matrix
+            mask = self.filter_mask(filters)
+            num_candidates = int(np.count_nonzero(mask))
+            if num_candidates == 0 or topk <= 0:
+                return [[] for _ in range(len(queries))]
+            results = None
+            if (
+                self._config.index_type == "hnsw"
+                and num_candidates > _FLAT_SEARCH_MAX_ROWS
+            ):
+                results = self._hnsw_search(queries, topk, mask, num_candidates)
+        if results is None:
+            results = _flat_search(matrix, queries, topk, mask, num_candidates)
+        return [
+            [
+                Chunk(
+                    content=contents[row],
+                    metadata=metadatas[row],
+                    score=score,
+                    chunk_id=ids[row],
+                )
+                for row, score in rows
+            ]
+            for rows in results
+        ]
+
+    def _hnsw_search(
+        self,
+        queries: np.ndarray,
+        topk: int,
+        mask: np.ndarray,
+        num_candidates: int,
+    ) -> Optional[List[List[Tuple[int, float]]]]:
+        """Search by the HNSW graph, None if it is not available."""
+        index = self._ensure_hnsw()
+        if index is None:
+            return None
+        k = min(topk, num_candidates)
+        index.set_ef(max(self._config.hnsw_ef_search, k))
+        # The deleted rows are still in the graph, skip them by the filter
+        row_filter = None if num_candidates == self.num_rows else lambda r: mask[r]
+        try:
+            labels, distances = index.knn_query(
+                normalize_vectors(queries), k=k, filter=row_filter
+            )
+        except RuntimeError as e:
+            logger.warning(f"HNSW search failed, fall back to flat search: {e}")
+            return None
+        # The inner product distance is 1 - similarity
+        return [
+            list(zip(rows.tolist(), (1.0 - dists).tolist()))
+            for rows, dists in zip(labels, distances)
+        ]
+
+    def _ensure_hnsw(self) -> Any:
+        """Return the HNSW graph with all the rows added, None if not installed."""
+        try:
+            import hnswlib
+        except ImportError:
+            if not self._hnsw_unavailable:
+                logger.warning(
+                    "Can't import hnswlib, fall back to flat search, please install "
+                    "it with `pip install hnswlib`."
+                )
+                self._hnsw_unavailable = True
+            return None
+        num_rows = self.num_rows
+        hnsw_path = self._file(_HNSW_FILE)
+        if self._hnsw is None:
+            index = hnswlib.Index(space="ip", dim=self.dim)
+            loaded = False
+            if os.path.exists(hnsw_path):
+                try:
+                    index.load_index(hnsw_path, max_elements=num_rows)
+                    loaded = index.get_current_count() <= num_rows
+                except Exception as e:
+                    logger.warning(f"Load the HNSW graph {hnsw_path} failed: {e}")
+            if not loaded:
+                index = hnswlib.Index(space="ip", dim=self.dim)
+                index.init_index(
+                    max_elements=num_rows,
+                    ef_construction=self._config.hnsw_ef_construction,
+                    M=self._config.hnsw_m,
+                )
+            self._hnsw = index
+            self._hnsw_rows = index.get_current_count()
+        if self._hnsw_rows < num_rows:
+            added = num_rows - self._hnsw_rows
+            if self._hnsw.get_max_elements() < num_rows:
+                self._hnsw.resize_index(max(num_rows, 2 * self._hnsw_rows))
+            self._hnsw.add_items(
+                np.asarray(self.matrix[self._hnsw_rows :]),
+                np.arange(self._hnsw_rows, num_rows),
+            )
+            self._hnsw_rows = num_rows
+            if added >= _HNSW_SAVE_MIN_ROWS:
+                # The other processes never load a partially written graph
+                tmp_path = f"{hnsw_path}.{os.getpid()}.tmp"
+                self._hnsw.save_index(tmp_path)
+                os.replace(tmp_path, hnsw_path)
+        return self._hnsw
+
+
+_COLLECTIONS: Dict[str, _LocalCollection] = {}
+_COLLECTIONS_LOCK = threading.Lock()
+
+
+def _get_collection(path: str, config: LocalVectorConfig) -> _LocalCollection:
+    """Get the shared collection of the path, open it if not opened."""
+    with _COLLECTIONS_LOCK:
+        collection = _COLLECTIONS.get(path)
+        if collection is None:
+            collection = _LocalCollection(path, config)
+            _COLLECTIONS[path] = collection
+        return collection
+
+
+@register_resource(
+    _("Local Vector Store"),
+    "local_vector_store",
+    category=ResourceCategory.VECTOR_STORE,
+    description=_("Local vector store."),
+    parameters=[
+        Parameter.build_from(
+            _("Local Config"),
+            "vector_store_config",
+            LocalVectorConfig,
+            description=_("the local config of vector store."),
+            optional=True,
+            default=None,
+        ),
+        *_VECTOR_STORE_COMMON_PARAMETERS,
+    ],
+)
+class LocalVectorStore(VectorStoreBase):
+    """Local vector store."""
+
+    def __init__(
+        self,
+        vector_store_config: LocalVectorConfig,
+        name: Optional[str],
+        embedding_fn: Optional[Embeddings] = None,
+        max_chunks_once_load: Optional[int] = None,
+        max_threads: Optional[int] = None,
+    ) -> None:
+        """Create a LocalVectorStore instance.
+
+        Args:
+            vector_store_config(LocalVectorConfig): vector store config.
+            name(str): collection name.
+            embedding_fn(Embeddings): embedding function.
+            max_chunks_once_load(int): max chunks once load.
+            max_threads(int): max threads.
+        """
+        super().__init__(
+            max_chunks_once_load=max_chunks_once_load, max_threads=max_threads
+        )
+        if vector_store_config.index_type not in _INDEX_TYPES:
+            raise ValueError(
+                f"Unsupported index type: {vector_store_config.index_type}, "
+                f"must be one of {_INDEX_TYPES}"
+            )
+        self._vector_store_config = vector_store_config
+        self.embeddings = embedding_fn
+        if not self.embeddings:
+            raise ValueError("Embeddings is None")
+        persist_path = vector_store_config.persist_path or os.path.join(
+            PILOT_PATH, "data"
+        )
+        self.persist_dir = os.path.join(resolve_root_path(persist_path), "local_vector")
+        self._collection_name = _collection_dir_name(name)
+        collection_path = os.path.join(self.persist_dir, self._collection_name)
+        self._collection = _get_collection(collection_path, vector_store_config)
+        self._full_text_store = None
+        if vector_store_config.enable_full_text:
+            from dbgpt_ext.storage.full_text.local_bm25 import (
+                LocalBM25Config,
+                LocalBM25Store,
+            )
+
+            self._full_text_store = LocalBM25Store(
+                LocalBM25Config(tokenizer=vector_store_config.tokenizer),
+                persist_dir=os.path.join(collection_path, "bm25"),
+            )
+
+    def get_config(self) -> LocalVectorConfig:
+        """Get the vector store config."""
+        return self._vector_store_config
+
+    def similar_search_with_scores(
+        self, text, topk, score_threshold, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        """Search similar documents with scores.
+
+        Return docs and the cosine similarity scores, the higher is more similar.
+
+        Args:
+            text(str): query text
+            topk(int): return docs nums. Defaults to 4.
+            score_threshold(float): score_threshold: Optional, a floating point value
+                between 0 to 1 to filter the resulting set of retrieved docs,0 is
+                dissimilar, 1 is most similar.
+            filters(MetadataFilters): metadata filters, defaults to None
+        """
+        if not text:
+            return []
+        query_embedding = self.embeddings.embed_query(text)
+        return self._search([query_embedding], topk, score_threshold, filters)[0]
+
+    def embed_query(self, text: str) -> Optional[List[float]]:
+        """Embed the query text to search by the vector."""
+        return self.embeddings.embed_query(text)
+
+    def similar_search_with_scores_by_vector(
+        self,
+        embedding: List[float],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[Chunk]:
+        """Search similar documents with scores by the query vector."""
+        return self._search([embedding], topk, score_threshold, filters)[0]
+
+    def similar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Search similar documents with scores of multiple queries.
+
+        All the queries are embedded in one call and scored by one matrix product.
+        """
+        if not texts:
+            return []
+        query_embeddings = self.embeddings.embed_queries(texts)
+        return self._search(query_embeddings, topk, score_threshold, filters)
+
+    async def asimilar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+        concurrency_limit: Optional[int] = None,
+    ) -> List[List[Chunk]]:
+        """Async search similar documents with scores of multiple queries."""
+        return await blocking_func_to_async_no_executor(
+            self.similar_search_with_scores_batch,
+            texts,
+            topk,
+            score_threshold,
+            filters,
+        )
+
+    def _search(
+        self,
+        query_embeddings: List[List[float]],
+        topk: int,
+        score_threshold: Optional[float],
+        filters: Optional[MetadataFilters],
+    ) -> List[List[Chunk]]:
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        return [
+            self.filter_by_score_threshold(chunks, score_threshold)
+            for chunks in self._collection.search(queries, topk, filters)
+        ]
+
+    def full_text_search(
+        self, text: str, topk: int, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        """Full text search by the BM25 index of the collection."""
+        if self._full_text_store is None:
+            return super().full_text_search(text, topk, filters)
+        return self._full_text_store.full_text_search(text, topk, filters)
+
+    def is_support_full_text_search(self) -> bool:
+        """Whether the collection has a BM25 index."""
+        return self._full_text_store is not None
+
+    def vector_name_exists(self) -> bool:
+        """Whether vector name exists."""
+        self._collection.refresh()
+        return self._collection.num_alive > 0
+
+    def load_document(self, chunks: List[Chunk]) -> List[str]:
+        """Load document to vector store."""
+        logger.info("LocalVectorStore load document")
+        return self.load_document_with_embeddings(chunks, self.embed_chunks(chunks))
+
+    def supports_embedding_stage(self) -> bool:
+        """Whether the chunks can be embedded before they are written."""
+        return True
+
+    def embed_chunks(self, chunks: List[Chunk]) -> List[List[float]]:
+        """Embed the chunks to write with `load_document_with_embeddings`."""
+        return self.embeddings.embed_documents([chunk.content for chunk in chunks])
+
+    async def aembed_chunks(self, chunks: List[Chunk]) -> List[List[float]]:
+        """Async embed the chunks to write with `aload_document_with_embeddings`."""
+        return await self.embeddings.aembed_documents(
+            [chunk.content for chunk in chunks]
+        )
+
+    def load_document_with_embeddings(
+        self, chunks: List[Chunk], embeddings: List[List[float]]
+    ) -> List[str]:
+        """Load the embedded document to vector store."""
+        if not chunks:
+            return []
+        ids = [chunk.chunk_id for chunk in chunks]
+        self._collection.add(
+            ids,
+            [chunk.content for chunk in chunks],
+            [chunk.metadata or {} for chunk in chunks],
+            np.asarray(embeddings, dtype=np.float32),
+        )
+        if self._full_text_store is not None:
+            self._full_text_store.load_document(chunks)
+        return ids
+
+    def delete_vector_name(self, vector_name: str):
+        """Delete vector name."""
+        logger.info(f"local vector_name:{vector_name} begin delete...")
+        self._collection.remove()
+        if self._full_text_store is not None:
+            self._full_text_store.delete_vector_name(vector_name)
+        return True
+
+    def delete_by_ids(self, ids):
+        """Delete vector by ids.
+
+        Args:
+            ids (str): Comma-separated string of IDs to delete.
+        """
+        logger.info("begin delete local vector ids")
+        if self._full_text_store is not None:
+            self._full_text_store.delete_by_ids(ids)
+        return self._collection.delete(ids.split(","))
+
+    def truncate(self) -> List[str]:
+        """Truncate data index_name."""
+        logger.info(f"begin truncate local vector collection:{self._collection_name}")
+        if self._full_text_store is not None:
+            self._full_text_store.truncate()
+        return self._collection.truncate()
+
+    def convert_metadata_filters(self, filters: MetadataFilters) -> np.ndarray:
+        """Convert metadata filters to the bitmap of the matching rows.
+
+        Args:
+            filters(MetadataFilters): metadata filters.
+        Returns:
+            np.ndarray: The bitmap of the alive rows matching the filters.
+        """
+        self._collection.refresh()
+        return self._collection.filter_mask(filters)
+
+
+def _flat_search(
+    matrix: np.ndarray,
+    queries: np.ndarray,
+    topk: int,
+    mask: np.ndarray,
+    num_candidates: int,
+) -> List[List[Tuple[int, float]]]:
+    """Score the candidate rows by one matrix product, return the top k rows."""
+    queries = normalize_vectors(queries)
+    if num_candidates == len(mask):
+        indexes, scores = top_k(queries @ matrix.T, topk)
+        rows = indexes
+    else:
+        candidates = np.flatnonzero(mask)
+        indexes, scores = top_k(queries @ matrix[candidates].T, topk)
+        rows = candidates[indexes]
+    return [
+        list(zip(query_rows, query_scores))
+        for query_rows, query_scores in zip(rows.tolist(), scores.tolist())
+    ]
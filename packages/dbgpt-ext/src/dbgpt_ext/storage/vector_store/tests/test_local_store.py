@@ -0,0 +1,282 @@
+import multiprocessing
+from typing import List
+
+import numpy as np
+import pytest
+
+from dbgpt.core import Chunk, Embeddings
+from dbgpt.storage.vector_store.filters import (
+    FilterCondition,
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+)
+from dbgpt_ext.storage import _local_files
+from dbgpt_ext.storage.vector_store import local_store
+from dbgpt_ext.storage.vector_store.local_store import (
+    LocalVectorConfig,
+    LocalVectorStore,
+)
+
+_WORDS = ["apple", "banana", "cherry", "grape", "lemon", "mango", "peach", "plum"]
+
+
+class _WordEmbeddings(Embeddings):
+    """Embed the texts by the counts of the words."""
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        words = text.split()
+        return [float(words.count(word)) for word in _WORDS]
+
+
+@pytest.fixture(autouse=True)
+def clear_collections():
+    local_store._COLLECTIONS.clear()
+    yield
+    local_store._COLLECTIONS.clear()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return _create_store(tmp_path)
+
+
+def _create_store(path, name: str = "test_space") -> LocalVectorStore:
+    config = LocalVectorConfig(persist_path=str(path))
+    return config.create_store(name=name, embedding_fn=_WordEmbeddings())
+
+
+def _chunks() -> List[Chunk]:
+    return [
+        Chunk(
+            chunk_id=f"id_{i}",
+            content=f"{word} {word} {_WORDS[(i + 1) % len(_WORDS)]}",
+            metadata={"source": f"doc_{i % 2}", "page": i},
+        )
+        for i, word in enumerate(_WORDS)
+    ]
+
+
+def test_similar_search_with_scores(store):
+    store.load_document(_chunks())
+    assert store.vector_name_exists()
+
+    results = store.similar_search_with_scores("banana", 3, 0.0)
+    assert [chunk.chunk_id for chunk in results[:2]] == ["id_1", "id_0"]
+    assert results[0].content == "banana banana cherry"
+    assert results[0].metadata == {"source": "doc_1", "page": 1}
+    assert results[0].score == pytest.approx(2 / np.sqrt(5))
+    assert results[1].score == pytest.approx(1 / np.sqrt(5))
+    assert results[2].score == pytest.approx(0.0)
+
+    assert len(store.similar_search_with_scores("banana", 3, 0.5)) == 1
+
+
+def test_similar_search_batch(store):
+    store.load_document(_chunks())
+    results = store.similar_search_with_scores_batch(["apple", "plum"], 1, 0.0)
+    assert [[chunk.chunk_id for chunk in chunks] for chunks in results] == [
+        ["id_0"],
+        ["id_7"],
+    ]
+
+
+def test_similar_search_by_vector(store):
+    store.load_document(_chunks())
+    embedding = store.embed_query("banana")
+    filters = MetadataFilters(filters=[MetadataFilter(key="source", value="doc_0")])
+    results = store.similar_search_with_scores_by_vector(embedding, 3, 0.0, filters)
+    assert results == store.similar_search_with_scores("banana", 3, 0.0, filters)
+    assert results[0].chunk_id == "id_0"
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        (
+            MetadataFilters(filters=[MetadataFilter(key="source", value="doc_1")]),
+            ["id_1", "id_3", "id_5", "id_7"],
+        ),
+        (
+            MetadataFilters(
+                filters=[
+                    MetadataFilter(
+                        key="page", operator=FilterOperator.IN, value=[2, 5, 9]
+                    )
+                ]
+            ),
+            ["id_2", "id_5"],
+        ),
+        (
+            MetadataFilters(
+                filters=[
+                    MetadataFilter(key="source", value="doc_0"),
+                    MetadataFilter(key="page", operator=FilterOperator.GTE, value=4),
+                ]
+            ),
+            ["id_4", "id_6"],
+        ),
+        (
+            MetadataFilters(
+                condition=FilterCondition.OR,
+                filters=[
+                    MetadataFilter(key="page", operator=FilterOperator.LT, value=1),
+                    MetadataFilter(key="page", operator=FilterOperator.GT, value=6),
+                ],
+            ),
+            ["id_0", "id_7"],
+        ),
+        (
+            MetadataFilters(
+                filters=[
+                    MetadataFilter(
+                        key="source", operator=FilterOperator.NE, value="doc_0"
+                    ),
+                    MetadataFilter(
+                        key="page", operator=FilterOperator.NIN, value=[1, 3]
+                    ),
+                ]
+            ),
+            ["id_5", "id_7"],
+        ),
+    ],
+)
+def test_search_with_filters(store, filters, expected):
+    store.load_document(_chunks())
+    results = store.similar_search_with_scores("apple", 10, 0.0, filters)
+    assert sorted(chunk.chunk_id for chunk in results) == expected
+
+
+def test_delete_and_upsert(store):
+    store.load_document(_chunks())
+    store.delete_by_ids("id_0,id_1,missing")
+    results = store.similar_search_with_scores("apple banana", 8, 0.0)
+    assert {chunk.chunk_id for chunk in results} == {f"id_{i}" for i in range(2, 8)}
+
+    store.load_document(
+        [Chunk(chunk_id="id_2", content="apple", metadata={"source": "new"})]
+    )
+    results = store.similar_search_with_scores("apple", 1, 0.0)
+    assert results[0].chunk_id == "id_2"
+    assert results[0].content == "apple"
+    filters = MetadataFilters(filters=[MetadataFilter(key="source", value="doc_0")])
+    results = store.similar_search_with_scores("apple", 8, 0.0, filters)
+    assert sorted(chunk.chunk_id for chunk in results) == ["id_4", "id_6"]
+
+
+def test_reopen_persisted_collection(tmp_path):
+    store = _create_store(tmp_path)
+    store.load_document(_chunks())
+    store.delete_by_ids("id_3")
+
+    local_store._COLLECTIONS.clear()
+    reopened = _create_store(tmp_path)
+    assert reopened.vector_name_exists()
+    results = reopened.similar_search_with_scores("grape lemon", 2, 0.0)
+    assert [chunk.chunk_id for chunk in results] == ["id_4", "id_2"]
+    assert isinstance(reopened._collection.matrix, np.memmap)
+
+
+def test_refresh_rows_written_by_other_instance(tmp_path):
+    store = _create_store(tmp_path)
+    store.load_document(_chunks()[:4])
+    local_store._COLLECTIONS.clear()
+    other = _create_store(tmp_path)
+    other.load_document(_chunks()[4:])
+
+    results = store.similar_search_with_scores("plum", 1, 0.0)
+    assert results[0].chunk_id == "id_7"
+
+
+def test_compact_deleted_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_store, "_COMPACT_MIN_DELETED_ROWS", 2)
+    store = _create_store(tmp_path)
+    store.load_document(_chunks())
+    store.delete_by_ids(",".join(f"id_{i}" for i in range(5)))
+
+    collection = store._collection
+    assert collection.num_rows == 3
+    assert collection.ids == ["id_5", "id_6", "id_7"]
+    results = store.similar_search_with_scores("mango peach", 1, 0.0)
+    assert [chunk.chunk_id for chunk in results] == ["id_5"]
+
+
+def test_truncate_and_delete(store):
+    ids = store.load_document(_chunks())
+    assert sorted(store.truncate()) == sorted(ids)
+    assert not store.vector_name_exists()
+    assert store.similar_search_with_scores("apple", 3, 0.0) == []
+
+    store.load_document(_chunks())
+    assert store.delete_vector_name("test_space")
+    assert not store.vector_name_exists()
+
+
+def test_hnsw_index_type(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_store, "_FLAT_SEARCH_MAX_ROWS", 0)
+    config = LocalVectorConfig(persist_path=str(tmp_path), index_type="hnsw")
+    store = config.create_store(name="hnsw_space", embedding_fn=_WordEmbeddings())
+    store.load_document(_chunks())
+    results = store.similar_search_with_scores("cherry", 2, 0.0)
+    assert [chunk.chunk_id for chunk in results] == ["id_2", "id_1"]
+
+
+def test_embedding_stage(store):
+    chunks = _chunks()
+    assert store.supports_embedding_stage()
+    vectors = store.embed_chunks(chunks)
+    assert store.load_document_with_embeddings(chunks, vectors) == [
+        chunk.chunk_id for chunk in chunks
+    ]
+    with pytest.raises(ValueError):
+        store.load_document_with_embeddings(chunks[:1], [[1.0, 2.0]])
+
+
+def test_full_text_search(tmp_path):
+    assert not _create_store(tmp_path).is_support_full_text_search()
+    config = LocalVectorConfig(persist_path=str(tmp_path), enable_full_text=True)
+    store = config.create_store(name="hybrid_space", embedding_fn=_WordEmbeddings())
+    assert store.is_support_full_text_search()
+    store.load_document(_chunks())
+    results = store.full_text_search("cherry", 3)
+    assert [chunk.chunk_id for chunk in results] == ["id_2", "id_1"]
+    assert results[0].retriever == "full_text"
+
+    store.delete_by_ids("id_2")
+    assert [chunk.chunk_id for chunk in store.full_text_search("cherry", 3)] == ["id_1"]
+    store.truncate()
+    assert store.full_text_search("cherry", 3) == []
+
+
+def _add_rows(path, worker: int, num_rows: int):
+    local_store._COLLECTIONS.clear()
+    store = _create_store(path)
+    for i in range(num_rows):
+        word = _WORDS[(worker + i) % len(_WORDS)]
+        store.load_document(
+            [Chunk(chunk_id=f"w{worker}_{i}", content=word, metadata={"i": i})]
+        )
+
+
+@pytest.mark.skipif(_local_files.fcntl is None, reason="Requires fcntl")
+def test_write_from_multiple_processes(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    processes = [
+        ctx.Process(target=_add_rows, args=(tmp_path, worker, 20))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    collection = _create_store(tmp_path)._collection
+    assert collection.num_alive == 80
+    # Every vector is written at the row of its record
+    embeddings = _WordEmbeddings()
+    for row, content in enumerate(collection.contents):
+        assert np.allclose(collection.matrix[row], embeddings.embed_query(content))
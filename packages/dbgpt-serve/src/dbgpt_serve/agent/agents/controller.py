@@ -317,6 +317,8 @@ class MultiAgents(BaseComponent, ABC):
             )
             # init agent memory
             agent_memory = self.get_or_build_agent_memory(conv_id, gpts_name)
+            # Stream the changed views only, the client rebuilds the message
+            vis_delta = ext_info.pop("vis_delta", False)
 
             task = None
             try:
@@ -335,11 +337,15 @@ class MultiAgents(BaseComponent, ABC):
                     )
                 )
                 if enable_verbose:
-                    async for chunk in multi_agents.chat_messages(agent_conv_id):
+                    async for chunk in multi_agents.chat_messages(
+                        agent_conv_id, incremental=vis_delta
+                    ):
                         if chunk:
                             try:
                                 chunk = json.dumps(
-                                    {"vis": chunk},
+                                    {"vis_delta": chunk}
+                                    if vis_delta
+                                    else {"vis": chunk},
                                     default=serialize,
                                     ensure_ascii=False,
                                 )
@@ -629,18 +635,10 @@ class MultiAgents(BaseComponent, ABC):
         conv_id: str,
         user_code: str = None,
         system_app: str = None,
+        incremental: bool = False,
     ):
-        while True:
-            queue = self.memory.queue(conv_id)
-            if not queue:
-                break
-            item = await queue.get()
-            if item == "[DONE]":
-                queue.task_done()
-                break
-            else:
-                yield item
-                await asyncio.sleep(0.005)
+        async for item in self.memory.chat_messages(conv_id, incremental):
+            yield item
 
     async def stable_message(
         self, conv_id: str, user_code: str = None, system_app: str = None
@@ -74,6 +74,29 @@ class ServeConfig(BaseServeConfig):
         default=3,
         metadata={"help": _("knowledge rerank top k")},
     )
+    rerank_batch_size: int = field(
+        default=32,
+        metadata={"help": _("The max number of the chunks of a rerank model call")},
+    )
+    rerank_max_candidates: Optional[int] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The max number of the chunks to rerank, the chunks of the highest "
+                "retrieval scores are kept, None means no limit"
+            )
+        },
+    )
+    extract_workers: Optional[int] = field(
+        default=None,
+        metadata={
+            "help": _(
+                "The number of the processes to parse the PDF, DOCX, PPTX and DOC "
+                "files, default is the number of the CPUs up to 4, 0 to parse in "
+                "the server process"
+            )
+        },
+    )
 
 
 @dataclass
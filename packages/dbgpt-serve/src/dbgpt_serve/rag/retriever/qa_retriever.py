@@ -8,7 +8,7 @@ from dbgpt.core import Chunk
 from dbgpt.rag.retriever.base import BaseRetriever
 from dbgpt.storage.vector_store.filters import MetadataFilters
 from dbgpt.util.executor_utils import ExecutorFactory, blocking_func_to_async
-from dbgpt.util.similarity_util import calculate_cosine_similarity
+from dbgpt.util.similarity_util import calculate_cosine_similarity, top_k
 from dbgpt.util.string_utils import remove_trailing_punctuation
 from dbgpt_serve.rag.models.models import KnowledgeSpaceDao
 
@@ -191,16 +191,16 @@ class QARetriever(BaseRetriever):
     ) -> List[Chunk]:
         """Rerank candidates using cosine similarity."""
         if len(candidates_with_scores) > self._top_k:
-            for candidate in candidates_with_scores:
-                similarity = calculate_cosine_similarity(
-                    embeddings=self._embedding_fn,
-                    prediction=query,
-                    contexts=[candidate.content],
-                )
-                score = float(similarity.mean())
-                candidate.score = score
-            candidates_with_scores.sort(key=lambda x: x.score, reverse=True)
-            candidates_with_scores = candidates_with_scores[: self._top_k]
+            # Embed the query once and all the candidates in one batch
+            similarities = calculate_cosine_similarity(
+                embeddings=self._embedding_fn,
+                prediction=query,
+                contexts=[candidate.content for candidate in candidates_with_scores],
+            )
+            indexes = top_k(similarities, self._top_k)[0]
+            candidates_with_scores = [
+                candidates_with_scores[i] for i in indexes.tolist()
+            ]
             candidates_with_scores = [
                 Chunk(
                     content=candidate.content,
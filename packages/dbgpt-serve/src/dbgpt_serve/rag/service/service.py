@@ -29,6 +29,7 @@ from dbgpt_app.knowledge.request.request import BusinessFieldType
 from dbgpt_ext.rag.assembler import EmbeddingAssembler
 from dbgpt_ext.rag.chunk_manager import ChunkParameters
 from dbgpt_ext.rag.knowledge import KnowledgeFactory
+from dbgpt_ext.rag.knowledge.extraction import set_default_extract_workers
 from dbgpt_serve.core import BaseService, blocking_func_to_async
 
 from ..api.schemas import (
@@ -92,6 +93,7 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         self._document_dao = self._document_dao or KnowledgeDocumentDao()
         self._chunk_dao = self._chunk_dao or DocumentChunkDao()
         self._system_app = system_app
+        set_default_extract_workers(self._serve_config.extract_workers)
 
     @property
     def storage_manager(self):
@@ -594,18 +596,26 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                 else:
                     max_chunks_once_load = self.config.max_chunks_once_load
                     max_threads = self.config.max_threads
+                    # Only store the changed chunks when the document is synced
+                    # again
+                    existing_chunk_ids = (
+                        doc.vector_ids.split(",") if doc.vector_ids else []
+                    )
                     assembler = await EmbeddingAssembler.aload_from_knowledge(
                         knowledge=knowledge,
                         index_store=storage_connector,
                         chunk_parameters=chunk_parameters,
+                        existing_chunk_ids=existing_chunk_ids,
+                        chunk_namespace=f"{doc.space}:{doc.id}",
+                        # Embed the chunks while the document is parsed and split
+                        lazy_load=True,
                     )
-
-                    chunk_docs = assembler.get_chunks()
-                    doc.chunk_size = len(chunk_docs)
                     vector_ids = await assembler.apersist(
                         max_chunks_once_load=max_chunks_once_load,
                         max_threads=max_threads,
                     )
+                    chunk_docs = assembler.get_chunks()
+                    doc.chunk_size = len(chunk_docs)
             doc.status = SyncStatus.FINISHED.name
             doc.result = "document persist into index store success"
             if vector_ids is not None:
@@ -657,7 +667,12 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             rerank_embeddings = RerankEmbeddingFactory.get_instance(
                 self._system_app
             ).create()
-            reranker = RerankEmbeddingsRanker(rerank_embeddings, topk=reranker_top_k)
+            reranker = RerankEmbeddingsRanker(
+                rerank_embeddings,
+                topk=reranker_top_k,
+                batch_size=self._serve_config.rerank_batch_size,
+                max_candidates=self._serve_config.rerank_max_candidates,
+            )
             if top_k < reranker_top_k or self._top_k < 20:
                 # We use reranker, so if the top_k is less than 20,
                 # we need to set it to 20
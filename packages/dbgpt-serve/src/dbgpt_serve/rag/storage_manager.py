@@ -11,6 +11,7 @@ from dbgpt.storage.base import IndexStoreBase
 from dbgpt.storage.full_text.base import FullTextStoreBase
 from dbgpt.storage.vector_store.base import VectorStoreBase, VectorStoreConfig
 from dbgpt_ext.storage.full_text.elasticsearch import ElasticDocumentStore
+from dbgpt_ext.storage.full_text.local_bm25 import LocalBM25Config, LocalBM25Store
 from dbgpt_ext.storage.knowledge_graph.knowledge_graph import BuiltinKnowledgeGraph
 
 
@@ -132,6 +133,13 @@ class StorageManager(BaseComponent):
         app_config = self.system_app.config.configs.get("app_config")
         rag_config = app_config.rag
         storage_config = app_config.rag.storage
+        if isinstance(storage_config.full_text, LocalBM25Config):
+            return LocalBM25Store(
+                storage_config.full_text,
+                name=index_name,
+                k1=rag_config.bm25_k1,
+                b=rag_config.bm25_b,
+            )
         return ElasticDocumentStore(
             es_config=storage_config.full_text,
             name=index_name,
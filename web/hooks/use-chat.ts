@@ -37,6 +37,11 @@ const useChat = ({ queryAgentURL = '/api/v1/chat/completions', app_code }: Props
         conv_uid: chatId,
         app_code,
       };
+      // The agent chat streams the changed views only, rebuild the whole message here
+      let views: string[] = [];
+      if (scene === 'chat_agent') {
+        params.ext_info = { ...data?.ext_info, vis_delta: true };
+      }
       try {
         await fetchEventSource(`${process.env.API_BASE_URL ?? ''}${queryAgentURL}`, {
           method: 'POST',
@@ -70,7 +75,13 @@ const useChat = ({ queryAgentURL = '/api/v1/chat/completions', app_code }: Props
             let message = event.data;
             try {
               if (scene === 'chat_agent') {
-                message = JSON.parse(message).vis;
+                const parsed = JSON.parse(message);
+                if (parsed.vis_delta) {
+                  views = views.slice(0, parsed.vis_delta.offset).concat(parsed.vis_delta.parts);
+                  message = views.join('\n');
+                } else {
+                  message = parsed.vis;
+                }
               } else {
                 message = JSON.parse(message);
               }